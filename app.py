@@ -1,22 +1,52 @@
 # app.py - CONFIGURADO PARA PRODUÇÃO COM VARIÁVEIS DE AMBIENTE
-from flask import Flask, render_template, jsonify, request, session, redirect
+from flask import Flask, jsonify, request, session, redirect, Response
 from flask_cors import CORS  # ADICIONADO CORS
 from apimercadopago import criar_preferencia_pagamento, testar_conexao_direta, verificar_ambiente_mercado_pago
-from produtos import Produto, GerenciadorProdutos
+from produtos import Produto, GerenciadorProdutos, TIPOS_CHAVE_ORDENACAO
 from produtos_data import criar_produtos_iniciais
+from database import get_db_connection, ler_versao, incrementar_versao
+from cache_ttl import CacheTTL
+from carrinho import precificar_carrinho, ErroCarrinho
+from migracoes import aplicar_migracoes
+from manutencao import AgendadorManutencao
+from fila_webhooks import ConsumidorWebhooks, enfileirar
+from reconciliacao import ReconciliadorPagamentos
+from paginas import PaginasEstaticas, PaginasCompiladas
+from ativos import Ativos
+import produtos_db
+import idempotencia
+import estoque
+import pedidos
+import estatisticas
+import relatorios
+import registro
+import metricas
 import json
+import logging
 import os
 import time
 import hashlib
-import sqlite3  # ADICIONADO PARA BANCO DE DADOS
-from datetime import datetime
+import base64
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import secrets
+import threading
+import atexit
 
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
 
-app = Flask(__name__)
+# Logs estruturados (JSON), com nível por módulo e escrita fora da thread da requisição
+registro.configurar_logging()
+logger = logging.getLogger('app')
+# Registros por requisição (páginas, listagens): amostrados conforme LOG_AMOSTRAGEM
+logger_acessos = logging.getLogger('app.acessos')
+
+# A rota /static é do módulo de ativos (CSS/JS com hash no nome e cache imutável)
+app = Flask(__name__, static_folder=None)
+ativos = Ativos(app)
+# Latência e contagem por endpoint + GET /metrics (Prometheus); antes dos outros before_request
+metricas.instrumentar(app)
 
 # ========== CONFIGURAÇÃO CORS ==========
 # ADICIONADO: Permitir CORS para resolver erros de conexão
@@ -24,7 +54,7 @@ CORS(app, resources={
     r"/*": {
         "origins": "*",  # Permite todas as origens (ajuste conforme necessário)
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization", "Idempotency-Key"]
     }
 })
 
@@ -68,10 +98,8 @@ ADMIN_PASSWORD_HASH = os.environ.get('ADMIN_PASSWORD_HASH', '')
 
 # Verificação de segurança
 if not ADMIN_PASSWORD_HASH:
-    print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] AVISO: ADMIN_PASSWORD_HASH não configurado!")
-    print(f"   Configure no .env: ADMIN_PASSWORD_HASH=hash_gerado_com_sha256")
-    print(f"   Gerar hash: python -c \"import hashlib; print(hashlib.sha256('senha'.encode()).hexdigest())\"")
-    print(f"   Painel admin estará INACESSÍVEL até configurar!")
+    logger.error("❌ ADMIN_PASSWORD_HASH não configurado: painel admin INACESSÍVEL até configurar! "
+                 "Configure no .env: ADMIN_PASSWORD_HASH=<sha256 da senha>")
     # Define um hash inválido para bloquear acesso
     ADMIN_PASSWORD_HASH = "CONFIGURE_ADMIN_PASSWORD_HASH_IN_ENV"
 
@@ -98,73 +126,25 @@ app.config['SESSION_COOKIE_SAMESITE'] = os.environ.get('SESSION_COOKIE_SAMESITE'
 DEFAULT_FRETE = float(os.environ.get('DEFAULT_FRETE', 5.00))
 FRETE_GRATIS_ACIMA = float(os.environ.get('FRETE_GRATIS_ACIMA', 150.00))
 
+# Checkout repetido: quanto tempo esperar a requisição original terminar
+IDEMPOTENCIA_ESPERA = float(os.environ.get('IDEMPOTENCIA_ESPERA', 5))
+
 # ========== BANCO DE DADOS ==========
-DATABASE = 'database.db'
 
 def init_db():
-    """Inicializa o banco de dados SQLite"""
+    """Inicializa o banco de dados SQLite aplicando as migrações pendentes"""
     try:
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
-        
-        # Tabela de tokens de admin
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS admin_tokens (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                token TEXT UNIQUE NOT NULL,
-                email TEXT NOT NULL,
-                expires_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela de usuários/clientes
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                phone TEXT,
-                address TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela de pedidos
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS orders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                items TEXT,
-                total REAL,
-                status TEXT DEFAULT 'pendente',
-                payment_id TEXT,
-                external_reference TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Banco de dados inicializado!")
+        versao = aplicar_migracoes()
+        logger.info("✅ Banco de dados inicializado! (esquema versão %s)", versao)
         
     except Exception as e:
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro ao inicializar banco de dados: {str(e)}")
+        logger.error("❌ Erro ao inicializar banco de dados: %s", e)
 
 # Inicializar banco de dados
 init_db()
 
 # ========== FUNÇÕES AUXILIARES BANCO DE DADOS ==========
 
-def get_db_connection():
-    """Obtém conexão com o banco de dados"""
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
-
 def create_user(name, email, password, phone=None, address=None):
     """Cria um novo usuário no banco de dados"""
     try:
@@ -214,6 +194,33 @@ def authenticate_user(email, password):
 
 # ========== FUNÇÕES DE GERENCIAMENTO DE TOKENS ADMIN ==========
 
+# Cache em memória dos tokens já validados (evita uma consulta ao banco por requisição admin)
+ADMIN_TOKEN_CACHE_TTL = float(os.environ.get('ADMIN_TOKEN_CACHE_TTL', 60))
+ADMIN_TOKEN_CACHE_MAX = int(os.environ.get('ADMIN_TOKEN_CACHE_MAX', 1024))
+# Intervalo máximo (s) para perceber um logout feito em outro worker
+ADMIN_TOKEN_GERACAO_INTERVALO = float(os.environ.get('ADMIN_TOKEN_GERACAO_INTERVALO', 1.0))
+
+# Contador em version_counters incrementado a cada token removido
+TOKENS_GERACAO = 'admin_tokens'
+
+cache_tokens_admin = CacheTTL(ADMIN_TOKEN_CACHE_MAX, ADMIN_TOKEN_CACHE_TTL, nome='tokens_admin')
+tokens_geracao_local = {"valor": None, "verificado_em": 0.0}
+tokens_geracao_lock = threading.Lock()
+
+def verificar_geracao_tokens():
+    """Esvazia o cache de tokens se outro worker removeu algum token"""
+    agora = time.monotonic()
+    if agora - tokens_geracao_local["verificado_em"] < ADMIN_TOKEN_GERACAO_INTERVALO:
+        return
+    with tokens_geracao_lock:
+        if agora - tokens_geracao_local["verificado_em"] < ADMIN_TOKEN_GERACAO_INTERVALO:
+            return
+        geracao = ler_versao(TOKENS_GERACAO)
+        if geracao != tokens_geracao_local["valor"]:
+            cache_tokens_admin.limpar()
+            tokens_geracao_local["valor"] = geracao
+        tokens_geracao_local["verificado_em"] = agora
+
 def save_admin_token(token, email, expires_in_hours=24):
     """Salva um token de admin no banco de dados"""
     try:
@@ -232,32 +239,40 @@ def save_admin_token(token, email, expires_in_hours=24):
         conn.close()
         return True
     except Exception as e:
-        print(f"❌ Erro ao salvar token: {str(e)}")
+        logger.error("❌ Erro ao salvar token: %s", e)
         return False
 
 def verify_admin_token(token):
     """Verifica se um token de admin é válido"""
     try:
+        verificar_geracao_tokens()
+        email_cache = cache_tokens_admin.get(token)
+        if email_cache is not None:
+            return {"valid": True, "email": email_cache}
+        
         conn = get_db_connection()
         cursor = conn.cursor()
         
+        # token é UNIQUE: busca de uma linha pelo índice, escolhido pelo planejador
+        agora = datetime.now().timestamp()
         cursor.execute('''
-            SELECT * FROM admin_tokens 
+            SELECT email, expires_at FROM admin_tokens
             WHERE token = ? AND expires_at > ?
-        ''', (token, datetime.now().timestamp()))
+        ''', (token, agora))
         
         token_data = cursor.fetchone()
         conn.close()
         
         if token_data:
-            # Token válido
+            # Token válido: fica em cache, sem ultrapassar a própria expiração
+            cache_tokens_admin.set(token, token_data['email'], ttl=float(token_data['expires_at']) - agora)
             return {"valid": True, "email": token_data['email']}
         else:
             # Token inválido ou expirado
             return {"valid": False, "error": "Token inválido ou expirado"}
             
     except Exception as e:
-        print(f"❌ Erro ao verificar token: {str(e)}")
+        logger.error("❌ Erro ao verificar token: %s", e)
         return {"valid": False, "error": str(e)}
 
 def delete_admin_token(token):
@@ -267,11 +282,14 @@ def delete_admin_token(token):
         cursor = conn.cursor()
         
         cursor.execute('DELETE FROM admin_tokens WHERE token = ?', (token,))
+        # Avisar os outros workers para descartarem seus caches de tokens
+        incrementar_versao(TOKENS_GERACAO, conn)
         conn.commit()
         conn.close()
+        cache_tokens_admin.invalidar(token)
         return True
     except Exception as e:
-        print(f"❌ Erro ao deletar token: {str(e)}")
+        logger.error("❌ Erro ao deletar token: %s", e)
         return False
 
 def cleanup_expired_tokens():
@@ -286,10 +304,10 @@ def cleanup_expired_tokens():
         conn.close()
         
         if deleted_count > 0:
-            print(f"🧹 [{datetime.now().strftime('%H:%M:%S')}] Limpos {deleted_count} tokens expirados")
+            logger.info("🧹 Limpos %s tokens expirados", deleted_count)
             
     except Exception as e:
-        print(f"❌ Erro ao limpar tokens expirados: {str(e)}")
+        logger.error("❌ Erro ao limpar tokens expirados: %s", e)
 
 # ========== INICIALIZAÇÃO DO SISTEMA ==========
 
@@ -303,22 +321,22 @@ for produto in criar_produtos_iniciais():
 def verificar_admin_senha(senha_fornecida):
     """Verifica se a senha do admin está correta (aceita texto ou hash)"""
     if not senha_fornecida or not ADMIN_PASSWORD_HASH:
-        print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Tentativa de login sem senha ou hash não configurado")
+        logger.warning("⚠️ Tentativa de login sem senha ou hash não configurado")
         return False
     
     # Se o hash estiver configurado como placeholder, bloqueia
     if ADMIN_PASSWORD_HASH == "CONFIGURE_ADMIN_PASSWORD_HASH_IN_ENV":
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Acesso negado: ADMIN_PASSWORD_HASH não configurado no .env")
+        logger.error("❌ Acesso negado: ADMIN_PASSWORD_HASH não configurado no .env")
         return False
     
     # Se a senha fornecida tem 64 caracteres (hash SHA256), assume que é um hash
     if len(senha_fornecida) == 64 and all(c in '0123456789abcdefABCDEF' for c in senha_fornecida):
         # O frontend enviou um hash SHA256
-        print(f"🔐 [{datetime.now().strftime('%H:%M:%S')}] Recebido hash SHA256 do frontend")
+        logger.debug("🔐 Recebido hash SHA256 do frontend")
         return senha_fornecida.lower() == ADMIN_PASSWORD_HASH.lower()
     else:
         # O frontend enviou senha em texto
-        print(f"🔐 [{datetime.now().strftime('%H:%M:%S')}] Recebido senha em texto do frontend")
+        logger.debug("🔐 Recebido senha em texto do frontend")
         hash_senha = hashlib.sha256(senha_fornecida.encode()).hexdigest()
         return hash_senha.lower() == ADMIN_PASSWORD_HASH.lower()
 
@@ -347,99 +365,267 @@ def verificar_autenticacao_admin():
         auth_header = request.headers.get('Authorization')
         
         if not auth_header or not auth_header.startswith('Bearer '):
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Autenticação falhou: Cabeçalho Authorization ausente ou mal formatado")
+            logger.warning("⚠️ Autenticação falhou: Cabeçalho Authorization ausente ou mal formatado")
             return False
         
         # Extrair e verificar o token
         token = auth_header.replace('Bearer ', '').strip()
         
         if not token:
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Autenticação falhou: Token vazio")
+            logger.warning("⚠️ Autenticação falhou: Token vazio")
             return False
         
         # Verificar token
         if verificar_token_api(token):
-            print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Autenticação bem-sucedida via token API")
+            logger.debug("✅ Autenticação bem-sucedida via token API")
             return True
         else:
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Autenticação falhou: Token/senha inválido")
+            logger.warning("⚠️ Autenticação falhou: Token/senha inválido")
             return False
     
     # Em desenvolvimento ou debug, pode permitir sem autenticação
-    print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Modo desenvolvimento: Autenticação simplificada")
+    logger.debug("⚠️ Modo desenvolvimento: Autenticação simplificada")
     return True
 
+# ========== CATÁLOGO COMPARTILHADO ENTRE WORKERS ==========
+
+# Versão do catálogo compartilhado que este worker tem carregada em memória
+catalogo_versao_local = 0
+# Versão do estoque (reservas do checkout), sincronizada à parte do catálogo
+estoque_versao_local = 0
+catalogo_lock = threading.Lock()
+
+def carregar_produtos_banco():
+    """Carrega o catálogo inteiro do banco de dados para a memória"""
+    global catalogo_versao_local, estoque_versao_local
+    with catalogo_lock:
+        # Lida antes do catálogo: reservas gravadas no meio da carga são reaplicadas depois
+        versao_estoque = ler_versao(estoque.ESTOQUE_VERSAO)
+        versao, produtos_banco, _ = produtos_db.carregar_alteracoes(0)
+        gerenciador.limpar()
+        for produto in produtos_banco:
+            gerenciador.adicionar_produto(produto)
+        catalogo_versao_local = versao
+        estoque_versao_local = versao_estoque
+    logger.info("✅ Carregados %s produtos do banco (versão %s)", len(gerenciador), versao)
+
+def sincronizar_catalogo():
+    """Aplica as alterações que outros workers gravaram desde a última leitura"""
+    global catalogo_versao_local
+    
+    # Verificação barata: uma leitura de contador numa conexão persistente
+    versao = ler_versao(produtos_db.CATALOGO_VERSAO)
+    if versao == catalogo_versao_local:
+        return False
+    
+    with catalogo_lock:
+        if versao == catalogo_versao_local:
+            return False
+        # Só as linhas alteradas depois da versão local são lidas
+        nova_versao, alterados, removidos = produtos_db.carregar_alteracoes(catalogo_versao_local)
+        for produto_id in removidos:
+            gerenciador.remover_produto(produto_id)
+        for produto in alterados:
+            gerenciador.adicionar_produto(produto)
+        logger.info(
+            "🔁 Catálogo sincronizado (versão %s → %s): %s alterados, %s removidos",
+            catalogo_versao_local, nova_versao, len(alterados), len(removidos),
+            extra={"versao_anterior": catalogo_versao_local, "versao": nova_versao,
+                   "alterados": len(alterados), "removidos": len(removidos)}
+        )
+        catalogo_versao_local = nova_versao
+        return True
+
+def sincronizar_estoque():
+    """Aplica o estoque alterado por reservas de outros workers, sem recarregar produtos"""
+    global estoque_versao_local
+    
+    versao = ler_versao(estoque.ESTOQUE_VERSAO)
+    if versao == estoque_versao_local:
+        return False
+    
+    with catalogo_lock:
+        if versao == estoque_versao_local:
+            return False
+        nova_versao, alterados = estoque.carregar_alteracoes(estoque_versao_local)
+        for produto_id, quantidade in alterados:
+            gerenciador.atualizar_estoque(produto_id, quantidade)
+        estoque_versao_local = nova_versao
+        return True
+
+@metricas.ao_coletar
+def atualizar_metricas_catalogo():
+    """Tamanho do catálogo deste worker, gravado a cada coleta do /metrics"""
+    metricas.CATALOGO_PRODUTOS.set(len(gerenciador))
+
+def registrar_versao_gravada(versao):
+    """Avança a versão local após uma gravação deste worker, se não houver alterações alheias pendentes"""
+    global catalogo_versao_local
+    with catalogo_lock:
+        if versao == catalogo_versao_local + 1:
+            catalogo_versao_local = versao
+
+def persistir_produto(produto, gravar_estoque=False):
+    """Grava um produto no banco (upsert de uma linha; o estoque só se ``gravar_estoque``)"""
+    try:
+        registrar_versao_gravada(produtos_db.salvar_produto(produto, gravar_estoque))
+        return True
+    except Exception as e:
+        logger.error("❌ Erro ao gravar produto %s: %s", produto.id, e)
+        # Memória e banco podem ter divergido: volta ao estado do banco
+        carregar_produtos_banco()
+        return False
+
+def persistir_remocao(produto_id):
+    """Remove um produto do banco"""
+    try:
+        registrar_versao_gravada(produtos_db.remover_produto(produto_id))
+        return True
+    except Exception as e:
+        logger.error("❌ Erro ao remover produto %s do banco: %s", produto_id, e)
+        carregar_produtos_banco()
+        return False
+
 def salvar_produtos_json():
-    """Salva os produtos em um arquivo JSON"""
+    """Exporta o catálogo atual para o arquivo JSON de backup"""
     try:
         produtos_json = gerenciador.to_json()
-        with open(PRODUTOS_BACKUP_FILE, 'w', encoding='utf-8') as f:
+        # Grava num arquivo temporário e troca atomicamente, para nunca
+        # deixar um backup pela metade
+        caminho_temp = f"{PRODUTOS_BACKUP_FILE}.{os.getpid()}.tmp"
+        with open(caminho_temp, 'w', encoding='utf-8') as f:
             json.dump(produtos_json, f, ensure_ascii=False, indent=2)
-        print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Produtos salvos em {PRODUTOS_BACKUP_FILE} ({len(produtos_json)} produtos)")
+        os.replace(caminho_temp, PRODUTOS_BACKUP_FILE)
+        logger.info("✅ Produtos salvos em %s (%s produtos)", PRODUTOS_BACKUP_FILE, len(produtos_json))
         return True
     except Exception as e:
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro ao salvar produtos: {str(e)}")
+        logger.error("❌ Erro ao salvar produtos: %s", e)
         return False
 
-def carregar_produtos_backup():
-    """Carrega produtos do arquivo de backup se existir"""
+def ler_produtos_backup():
+    """Lê os produtos do arquivo de backup JSON (usado para migrar o catálogo para o banco)"""
     try:
         with open(PRODUTOS_BACKUP_FILE, 'r', encoding='utf-8') as f:
             produtos_data = json.load(f)
         
-        print(f"📦 [{datetime.now().strftime('%H:%M:%S')}] Carregando {len(produtos_data)} produtos do backup...")
+        logger.info("📦 Lendo %s produtos do backup...", len(produtos_data))
         
-        # Limpar produtos atuais
-        gerenciador.produtos.clear()
-        
-        # Adicionar produtos do backup
+        produtos_backup = []
         for produto_data in produtos_data:
             try:
-                produto = Produto.from_dict(produto_data)
-                gerenciador.adicionar_produto(produto)
+                produtos_backup.append(Produto.from_dict(produto_data))
             except Exception as e:
-                print(f"⚠️ Erro ao carregar produto {produto_data.get('id')}: {str(e)}")
+                logger.warning("⚠️ Erro ao carregar produto %s: %s", produto_data.get('id'), e)
         
-        print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Carregados {len(gerenciador.produtos)} produtos do backup")
-        return True
+        return produtos_backup
     except FileNotFoundError:
-        print(f"ℹ️ [{datetime.now().strftime('%H:%M:%S')}] Nenhum backup encontrado, usando produtos iniciais")
-        return False
+        logger.info("ℹ️ Nenhum backup encontrado, usando produtos iniciais")
+        return []
     except Exception as e:
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro ao carregar backup: {str(e)}")
-        return False
+        logger.error("❌ Erro ao carregar backup: %s", e)
+        return []
 
-# Carregar produtos do backup (se existir) ao iniciar
-print(f"🔄 [{datetime.now().strftime('%H:%M:%S')}] Inicializando sistema...")
-print(f"🔧 Ambiente: {FLASK_ENV}")
-print(f"🐛 Debug: {FLASK_DEBUG}")
-print(f"📧 Admin email: {ADMIN_EMAIL}")
-print(f"🔐 Admin hash configurado: {'✅ Sim' if ADMIN_PASSWORD_HASH and ADMIN_PASSWORD_HASH != 'CONFIGURE_ADMIN_PASSWORD_HASH_IN_ENV' else '❌ Não (configure no .env)'}")
-print(f"🔑 Token API configurado: {'✅ Sim' if ADMIN_API_TOKEN else '⚠️ Não (usando senha como fallback)'}")
+# Carregar produtos do banco de dados ao iniciar
+logger.info("🔄 Inicializando sistema...")
+logger.info("🔧 Ambiente: %s", FLASK_ENV)
+logger.info("🐛 Debug: %s", FLASK_DEBUG)
+logger.info("📧 Admin email: %s", ADMIN_EMAIL)
+logger.info("🔐 Admin hash configurado: %s", '✅ Sim' if ADMIN_PASSWORD_HASH and ADMIN_PASSWORD_HASH != 'CONFIGURE_ADMIN_PASSWORD_HASH_IN_ENV' else '❌ Não (configure no .env)')
+logger.info("🔑 Token API configurado: %s", '✅ Sim' if ADMIN_API_TOKEN else '⚠️ Não (usando senha como fallback)')
 
 # Verificar configuração Render
 if RENDER_EXTERNAL_URL:
-    print(f"🌐 Render URL configurada: {RENDER_EXTERNAL_URL}")
-    print(f"🔒 Esquema preferido: {PREFERRED_URL_SCHEME}")
-    print(f"🔄 Forçar HTTPS: {'✅ Sim' if FORCE_HTTPS else '❌ Não'}")
-    print(f"🔓 Permitir HTTP: {'✅ Sim' if ALLOW_HTTP else '❌ Não'}")
-
-carregar_produtos_backup()
-
-# Verificar se há produtos iniciais
-if len(gerenciador.produtos) == 0:
-    print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Nenhum produto carregado. Adicionando produtos iniciais...")
-    for produto in criar_produtos_iniciais():
-        gerenciador.adicionar_produto(produto)
+    logger.info("🌐 Render URL configurada: %s", RENDER_EXTERNAL_URL)
+    logger.info("🔒 Esquema preferido: %s", PREFERRED_URL_SCHEME)
+    logger.info("🔄 Forçar HTTPS: %s", '✅ Sim' if FORCE_HTTPS else '❌ Não')
+    logger.info("🔓 Permitir HTTP: %s", '✅ Sim' if ALLOW_HTTP else '❌ Não')
+
+# Catálogo vazio no banco: migrar do backup JSON (ou usar os produtos iniciais)
+if produtos_db.contar_produtos() == 0:
+    produtos_migrados = ler_produtos_backup()
+    if not produtos_migrados:
+        logger.warning("⚠️ Nenhum produto carregado. Adicionando produtos iniciais...")
+        produtos_migrados = criar_produtos_iniciais()
+    produtos_db.salvar_produtos(produtos_migrados)
+    logger.info("📦 %s produtos gravados no banco de dados", len(produtos_migrados))
+
+carregar_produtos_banco()
+
+logger.info("✅ Sistema inicializado com %s produtos", len(gerenciador))
+
+# ========== FILA DE NOTIFICAÇÕES DO MERCADO PAGO ==========
+
+# O webhook só grava em webhook_inbox; este consumidor aplica as notificações em lotes
+WEBHOOK_CONSUMIDOR_ATIVO = os.environ.get('WEBHOOK_CONSUMIDOR_ATIVO', 'True').lower() == 'true'
+
+consumidor_webhooks = ConsumidorWebhooks()
+
+if WEBHOOK_CONSUMIDOR_ATIVO:
+    consumidor_webhooks.iniciar()
+    atexit.register(consumidor_webhooks.parar)
+
+# ========== MANUTENÇÃO EM SEGUNDO PLANO ==========
+
+# Um agendador por worker, mas só o detentor do lease no banco executa as tarefas
+MANUTENCAO_ATIVA = os.environ.get('MANUTENCAO_ATIVA', 'True').lower() == 'true'
+MANUTENCAO_INTERVALO_TOKENS = float(os.environ.get('MANUTENCAO_INTERVALO_TOKENS', 600))
+MANUTENCAO_INTERVALO_OTIMIZAR = float(os.environ.get('MANUTENCAO_INTERVALO_OTIMIZAR', 6 * 3600))
+MANUTENCAO_INTERVALO_VACUUM = float(os.environ.get('MANUTENCAO_INTERVALO_VACUUM', 24 * 3600))
+MANUTENCAO_INTERVALO_BACKUP = float(os.environ.get('MANUTENCAO_INTERVALO_BACKUP', 3600))
+MANUTENCAO_INTERVALO_RECONCILIACAO = float(os.environ.get('MANUTENCAO_INTERVALO_RECONCILIACAO', 300))
+MANUTENCAO_INTERVALO_RESERVAS = float(os.environ.get('MANUTENCAO_INTERVALO_RESERVAS', 60))
+
+def otimizar_banco():
+    """Atualiza as estatísticas usadas pelo planejador de consultas do SQLite"""
+    conn = get_db_connection()
+    try:
+        conn.execute('ANALYZE')
+        conn.execute('PRAGMA optimize')
+        conn.commit()
+    finally:
+        conn.close()
+
+def compactar_banco():
+    """VACUUM: devolve ao sistema o espaço de linhas apagadas (tokens, pedidos antigos)"""
+    conn = get_db_connection()
+    try:
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+
+def backup_catalogo():
+    """Exporta o catálogo para o JSON de backup e compacta o WAL"""
+    sincronizar_catalogo()
     salvar_produtos_json()
+    conn = get_db_connection()
+    try:
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    finally:
+        conn.close()
+
+# Pedidos pendentes sem webhook: consulta o status no gateway em lotes
+reconciliador = ReconciliadorPagamentos()
 
-print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Sistema inicializado com {len(gerenciador.produtos)} produtos")
+agendador = AgendadorManutencao()
+agendador.registrar('limpar_tokens_expirados', MANUTENCAO_INTERVALO_TOKENS, cleanup_expired_tokens)
+agendador.registrar('backup_catalogo', MANUTENCAO_INTERVALO_BACKUP, backup_catalogo)
+agendador.registrar('limpar_idempotencia', MANUTENCAO_INTERVALO_TOKENS, idempotencia.limpar_expiradas)
+agendador.registrar('limpar_webhooks_processados', MANUTENCAO_INTERVALO_OTIMIZAR, consumidor_webhooks.limpar_processadas)
+agendador.registrar('reconciliar_pagamentos', MANUTENCAO_INTERVALO_RECONCILIACAO, reconciliador.executar)
+agendador.registrar('liberar_reservas_expiradas', MANUTENCAO_INTERVALO_RESERVAS, estoque.liberar_expiradas)
+agendador.registrar('otimizar_banco', MANUTENCAO_INTERVALO_OTIMIZAR, otimizar_banco)
+agendador.registrar('vacuum_banco', MANUTENCAO_INTERVALO_VACUUM, compactar_banco)
 
-# Limpar tokens expirados ao iniciar
-cleanup_expired_tokens()
+if MANUTENCAO_ATIVA:
+    agendador.iniciar()
+    # Libera o lease ao encerrar o worker, para outro assumir sem esperar expirar
+    atexit.register(agendador.parar)
 
 # ========== MIDDLEWARE PARA TRATAR HTTP/HTTPS NO RENDER ==========
 
+# Endpoints que leem ou alteram o catálogo e precisam vê-lo atualizado
+ENDPOINTS_CATALOGO = {'get_produtos', 'search_produtos', 'checkout', 'api_admin_products', 'admin_stats', 'metrics'}
+
 @app.before_request
 def before_request():
     """Middleware para lidar com HTTP/HTTPS no Render"""
@@ -454,35 +640,42 @@ def before_request():
             https_url = request.url.replace('http://', 'https://', 1)
             return redirect(https_url, code=301)
     
-    # Limpar tokens expirados a cada 10 minutos
-    if request.endpoint and 'admin' in request.endpoint:
-        current_time = datetime.now().timestamp()
-        if current_time % 600 < 1:  # Aproximadamente a cada 10 minutos
-            cleanup_expired_tokens()
+    # Sincronizar catálogo e estoque alterados por outro worker
+    if request.endpoint in ENDPOINTS_CATALOGO:
+        try:
+            sincronizar_catalogo()
+            sincronizar_estoque()
+        except Exception as e:
+            logger.warning("⚠️ Erro ao sincronizar catálogo: %s", e)
     
     # Continuar com a requisição normalmente
     return None
 
 # ========== ROTAS PRINCIPAIS ==========
 
+# Páginas sem variáveis de template: renderizadas e comprimidas (gzip/brotli) uma vez por worker
+paginas_estaticas = PaginasEstaticas(app, ('index.html', 'admin.html', 'checkout.html'))
+for _template, _tamanhos in paginas_estaticas.tamanhos().items():
+    logger.info("📄 %s pré-renderizado", _template, extra={"template": _template, "bytes": _tamanhos})
+
 @app.route('/')
 def index():
     """Página principal"""
-    print(f"🌐 [{datetime.now().strftime('%H:%M:%S')}] Página principal acessada")
-    return render_template('index.html')
+    logger_acessos.info("🌐 Página principal acessada")
+    return paginas_estaticas.servir('index.html', request)
 
 @app.route('/checkout.html')
 def checkout_page():
     """Página de checkout"""
-    print(f"💰 [{datetime.now().strftime('%H:%M:%S')}] Página de checkout acessada")
-    return render_template('checkout.html')
+    logger_acessos.info("💰 Página de checkout acessada")
+    return paginas_estaticas.servir('checkout.html', request)
 
 # ========== ROTA DE REDIRECIONAMENTO ADMIN ==========
 
 @app.route('/admin/redirect')
 def admin_redirect():
     """Rota de redirecionamento para admin após login"""
-    print(f"🔄 [{datetime.now().strftime('%H:%M:%S')}] Redirecionamento para admin")
+    logger_acessos.info("🔄 Redirecionamento para admin")
     
     # Verificar se há token na URL ou sessão
     token = request.args.get('token')
@@ -491,10 +684,10 @@ def admin_redirect():
         # Verificar se o token é válido
         token_result = verify_admin_token(token)
         if token_result["valid"]:
-            print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Token válido, redirecionando para admin")
+            logger_acessos.info("✅ Token válido, redirecionando para admin")
             return redirect('/admin')
         else:
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Token inválido, redirecionando para login")
+            logger.warning("⚠️ Token inválido, redirecionando para login")
             return redirect('/?login=admin')
     else:
         # Se não houver token, verificar se está na sessão
@@ -502,10 +695,10 @@ def admin_redirect():
             # Verificar se é admin
             user_email = session.get('user_email')
             if user_email == ADMIN_EMAIL:
-                print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Admin na sessão, redirecionando")
+                logger_acessos.info("✅ Admin na sessão, redirecionando")
                 return redirect('/admin')
     
-    print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Nenhuma autenticação encontrada, redirecionando para login")
+    logger_acessos.info("⚠️ Nenhuma autenticação encontrada, redirecionando para login")
     return redirect('/?login=admin')
 
 # ========== ROTAS DE AUTENTICAÇÃO E USUÁRIO ==========
@@ -561,7 +754,7 @@ def register_user():
             }), 400
             
     except Exception as e:
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro no cadastro: {str(e)}")
+        logger.error("❌ Erro no cadastro: %s", e)
         return jsonify({
             "success": False,
             "error": "Erro interno no servidor"
@@ -586,9 +779,7 @@ def login_user():
         email = dados.get('email', dados.get('username', '')).strip()
         senha = dados.get('senha', dados.get('password', ''))
         
-        print(f"🔐 [{datetime.now().strftime('%H:%M:%S')}] Tentativa de login recebida")
-        print(f"   Email: {email}")
-        print(f"   Senha fornecida (tamanho): {len(senha) if senha else 0}")
+        logger.info("🔐 Tentativa de login recebida", extra={"email": email})
         
         # Validações básicas
         if not email or not senha:
@@ -596,11 +787,11 @@ def login_user():
         
         # VERIFICAÇÃO ESPECIAL PARA ADMIN
         if email == ADMIN_EMAIL:
-            print(f"🔐 [{datetime.now().strftime('%H:%M:%S')}] Login de admin detectado")
+            logger.debug("🔐 Login de admin detectado")
             
             # Verificar senha do admin
             if verificar_admin_senha(senha):
-                print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Login admin bem-sucedido para {email}")
+                logger.info("✅ Login admin bem-sucedido para %s", email)
                 
                 # Gerar token seguro
                 token = secrets.token_urlsafe(64)
@@ -624,14 +815,14 @@ def login_user():
                     "requires_auth": True
                 })
             else:
-                print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Senha incorreta para admin")
+                logger.warning("⚠️ Senha incorreta para admin")
                 return jsonify({
                     "success": False,
                     "error": "Senha incorreta"
                 }), 401
         
         # SE NÃO FOR ADMIN, FAZ LOGIN DE USUÁRIO COMUM
-        print(f"👤 [{datetime.now().strftime('%H:%M:%S')}] Tentando login de usuário comum: {email}")
+        logger.debug("👤 Tentando login de usuário comum: %s", email)
         
         # Autenticar usuário (EM PRODUÇÃO, USE HASH DE SENHA!)
         resultado = authenticate_user(email, senha)
@@ -642,7 +833,7 @@ def login_user():
             session['user_name'] = resultado["user"]["name"]
             session['user_email'] = resultado["user"]["email"]
             
-            print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Login usuário bem-sucedido para {email}")
+            logger.info("✅ Login usuário bem-sucedido para %s", email)
             
             return jsonify({
                 "success": True,
@@ -656,16 +847,14 @@ def login_user():
                 "redirect_url": "/"  # Redireciona para a página principal
             })
         else:
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Login usuário falhou: {resultado.get('error')}")
+            logger.warning("⚠️ Login usuário falhou: %s", resultado.get('error'))
             return jsonify({
                 "success": False,
                 "error": resultado.get("error", "E-mail ou senha incorretos")
             }), 401
             
     except Exception as e:
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro no login: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erro no login: %s", e)
         return jsonify({
             "success": False,
             "error": f"Erro interno no servidor: {str(e)}"
@@ -698,15 +887,112 @@ def check_user_session():
 
 # ========== API DE PRODUTOS (PÚBLICA) ==========
 
+# Parâmetros que ativam a listagem filtrada/paginada em /api/produtos
+PARAMETROS_LISTAGEM = {'category', 'onSale', 'gender', 'color', 'minPrice', 'maxPrice', 'sort', 'cursor', 'limit'}
+LISTAGEM_LIMITE_PADRAO = 24
+LISTAGEM_LIMITE_MAXIMO = 100
+
+def codificar_cursor(ordenacao, chave):
+    """Gera um cursor opaco a partir da chave de ordenação do último item"""
+    bruto = json.dumps({"s": ordenacao, "k": list(chave)}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(bruto).decode('ascii').rstrip('=')
+
+def decodificar_cursor(cursor, ordenacao):
+    """Recupera a chave de ordenação de um cursor gerado por codificar_cursor.
+
+    A chave precisa ter o formato da ordenação (quantidade e tipo de cada
+    posição): comparada com as chaves do catálogo, outra coisa daria TypeError.
+    """
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        dados = json.loads(bruto)
+        if dados.get("s") != ordenacao:
+            raise ValueError("cursor de outra ordenação")
+        chave = tuple(dados["k"])
+        tipos = TIPOS_CHAVE_ORDENACAO[ordenacao]
+        if len(chave) != len(tipos) or any(
+                isinstance(valor, bool) or not isinstance(valor, tipo) for valor, tipo in zip(chave, tipos)):
+            raise ValueError("chave fora do formato da ordenação")
+        return chave
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+def listar_produtos_paginado():
+    """Listagem filtrada, ordenada e paginada usando os índices do catálogo"""
+    args = request.args
+    
+    filtros = {}
+    if args.get('category'):
+        filtros['category'] = args['category']
+    if args.get('gender'):
+        filtros['gender'] = args['gender']
+    if args.get('color'):
+        filtros['color'] = args['color']
+    if args.get('onSale'):
+        filtros['on_sale'] = args['onSale'].lower() in ('1', 'true', 'sim', 'yes')
+    
+    preco_min = float(args['minPrice']) if args.get('minPrice') else None
+    preco_max = float(args['maxPrice']) if args.get('maxPrice') else None
+    
+    ordenacao = args.get('sort', 'default')
+    limite = min(max(int(args.get('limit', LISTAGEM_LIMITE_PADRAO)), 1), LISTAGEM_LIMITE_MAXIMO)
+    apos = decodificar_cursor(args['cursor'], ordenacao) if args.get('cursor') else None
+    
+    pagina, total, proximo = gerenciador.listar_filtrado(
+        filtros, preco_min, preco_max, ordenacao=ordenacao, apos=apos, limite=limite
+    )
+    
+    return jsonify({
+        "products": [produto.to_dict() for produto in pagina],
+        "count": len(pagina),
+        "total": total,
+        "next_cursor": codificar_cursor(ordenacao, proximo) if proximo is not None else None
+    })
+
 @app.route('/api/produtos')
 def get_produtos():
-    """API: Retorna todos os produtos"""
+    """API: Retorna todos os produtos (ou uma página filtrada, se houver parâmetros)"""
     try:
-        produtos_json = gerenciador.to_json()
-        print(f"🛍️ [{datetime.now().strftime('%H:%M:%S')}] API produtos: retornando {len(produtos_json)} produtos")
-        return jsonify(produtos_json)
+        if PARAMETROS_LISTAGEM.intersection(request.args):
+            try:
+                return listar_produtos_paginado()
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        
+        # Catálogo pré-serializado, reconstruído só quando o admin altera algo
+        corpo, etag = gerenciador.to_json_bytes()
+        logger_acessos.info("🛍️ API produtos: retornando %s produtos", len(gerenciador))
+        
+        resposta = Response(corpo, mimetype='application/json')
+        resposta.set_etag(etag)
+        resposta.headers['Cache-Control'] = 'no-cache'
+        # Responde 304 quando o If-None-Match do cliente bate com o ETag atual
+        return resposta.make_conditional(request)
     except Exception as e:
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro na API produtos: {str(e)}")
+        logger.error("❌ Erro na API produtos: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+BUSCA_LIMITE_PADRAO = 10
+BUSCA_LIMITE_MAXIMO = 50
+
+@app.route('/api/produtos/search')
+def search_produtos():
+    """API: Busca textual de produtos (typeahead)"""
+    try:
+        consulta = request.args.get('q', '').strip()
+        try:
+            limite = min(max(int(request.args.get('limit', BUSCA_LIMITE_PADRAO)), 1), BUSCA_LIMITE_MAXIMO)
+        except ValueError:
+            return jsonify({"error": "Parâmetro limit inválido"}), 400
+        
+        produtos_encontrados = gerenciador.buscar_texto(consulta, limite) if consulta else []
+        return jsonify({
+            "query": consulta,
+            "products": [produto.to_dict() for produto in produtos_encontrados],
+            "count": len(produtos_encontrados)
+        })
+    except Exception as e:
+        logger.error("❌ Erro na busca de produtos: %s", e)
         return jsonify({"error": str(e)}), 500
 
 # ========== CHECKOUT E PAGAMENTO ==========
@@ -718,8 +1004,6 @@ def checkout():
         return '', 200  # Responde preflight CORS
     
     try:
-        print(f"=== [{datetime.now().strftime('%H:%M:%S')}] INICIANDO PROCESSAMENTO DE CHECKOUT ===")
-        
         dados = request.get_json()
         
         if not dados:
@@ -736,24 +1020,21 @@ def checkout():
                 "error": "Carrinho vazio"
             }), 400
         
-        # VALOR DO FRETE - Usar variável de ambiente
-        frete_valor = float(dados.get('frete', DEFAULT_FRETE))
-        
-        # Aplicar frete grátis se configurado
-        if FRETE_GRATIS_ACIMA > 0:
-            total_produtos = sum(float(item.get('price', 0)) * int(item.get('quantity', 1)) for item in carrinho)
-            if total_produtos >= FRETE_GRATIS_ACIMA:
-                frete_valor = 0.00
-                print(f"🚚 [{datetime.now().strftime('%H:%M:%S')}] Frete grátis aplicado (compra acima de R$ {FRETE_GRATIS_ACIMA:.2f})")
-        
-        # Calcular total dos produtos
-        total_produtos = 0
-        for item in carrinho:
-            item_price = float(item.get('price', 0))
-            item_quantity = int(item.get('quantity', 1))
-            total_produtos += item_price * item_quantity
+        # Preços, estoque e frete vêm do catálogo do servidor, calculados uma única vez
+        # (preço e frete enviados pelo cliente são ignorados)
+        try:
+            precificado = precificar_carrinho(gerenciador, carrinho, DEFAULT_FRETE, FRETE_GRATIS_ACIMA)
+        except ErroCarrinho as e:
+            return jsonify({
+                "success": False,
+                "error": str(e),
+                "problems": e.problemas
+            }), e.status
         
-        total_com_frete = total_produtos + frete_valor
+        carrinho = precificado.itens()
+        frete_valor = precificado.frete
+        total_produtos = precificado.subtotal
+        total_com_frete = precificado.total
         
         # Validar dados do cliente
         nome = dados.get('nome', '').strip()
@@ -776,39 +1057,68 @@ def checkout():
             "email": email
         }
 
-        # Criar preferência no Mercado Pago COM FRETE
-        resultado = criar_preferencia_pagamento(dados_cliente, carrinho, frete_valor, request.url_root)
+        # Idempotência: cliques repetidos e novas tentativas reutilizam a mesma preferência
+        chave_cliente = request.headers.get('Idempotency-Key', '').strip()[:200]
+        if chave_cliente:
+            chave = f"cliente:{chave_cliente}"
+            fingerprint = idempotencia.impressao_digital(dados)
+            ttl = idempotencia.IDEMPOTENCIA_TTL
+        else:
+            chave = idempotencia.chave_derivada(nome, email, carrinho, frete_valor)
+            fingerprint = chave
+            ttl = idempotencia.IDEMPOTENCIA_TTL_DERIVADA
+
+        reserva = idempotencia.reservar(chave, fingerprint, ttl)
+        if reserva.estado == 'em_andamento':
+            reserva = idempotencia.aguardar(chave, fingerprint, IDEMPOTENCIA_ESPERA) or reserva
+        if reserva.estado == 'concluida':
+            logger.info("♻️ Checkout repetido, devolvendo preferência existente (%s)", reserva.external_reference)
+            return jsonify(reserva.resposta), reserva.http_status, {"Idempotent-Replayed": "true"}
+        if reserva.estado == 'em_andamento':
+            return jsonify({
+                "success": False,
+                "error": "Este pedido já está sendo processado. Aguarde alguns segundos."
+            }), 409, {"Retry-After": "2"}
+        if reserva.estado == 'conflito':
+            return jsonify({
+                "success": False,
+                "error": "Idempotency-Key já usada com outro conteúdo"
+            }), 422
+
+        # Separa o estoque antes de ir ao gateway (débito atômico no banco, vale para todos os workers)
+        try:
+            estoque.reservar(
+                reserva.external_reference,
+                [(linha.produto.id, linha.quantidade) for linha in precificado.linhas]
+            )
+        except estoque.EstoqueInsuficiente as e:
+            idempotencia.liberar(chave, reserva.dono)
+            return jsonify({
+                "success": False,
+                "error": "Estoque insuficiente",
+                "problems": [{"id": e.produto_id, "error": "Estoque insuficiente", "available": e.disponivel}]
+            }), 409
+        except Exception:
+            idempotencia.liberar(chave, reserva.dono)
+            raise
+
+        try:
+            # Criar preferência no Mercado Pago COM FRETE
+            resultado = criar_preferencia_pagamento(
+                dados_cliente, carrinho, frete_valor, request.url_root,
+                external_reference=reserva.external_reference,
+                precificado=precificado
+            )
+        except Exception:
+            estoque.cancelar_reserva(reserva.external_reference)
+            idempotencia.liberar(chave, reserva.dono)
+            raise
         
         if resultado.get('sucesso'):
             # Salvar pedido no banco de dados (se usuário logado)
             user_id = session.get('user_id') if 'user_id' in session else None
             
-            try:
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO orders (user_id, items, total, status, payment_id, external_reference)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    user_id,
-                    json.dumps(carrinho),
-                    total_com_frete,
-                    'pendente',
-                    resultado.get('id_preferencia'),
-                    resultado.get('external_reference')
-                ))
-                
-                conn.commit()
-                order_id = cursor.lastrowid
-                conn.close()
-                
-                print(f"📦 [{datetime.now().strftime('%H:%M:%S')}] Pedido salvo no banco (ID: {order_id})")
-                
-            except Exception as db_error:
-                print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Erro ao salvar pedido no banco: {str(db_error)}")
-            
-            return jsonify({
+            corpo_resposta = {
                 "success": True,
                 "message": "Pagamento criado com sucesso!",
                 "redirect_url": resultado['url_pagamento'],
@@ -817,25 +1127,84 @@ def checkout():
                 "frete_valor": frete_valor,
                 "total_produtos": total_produtos,
                 "total_com_frete": total_com_frete,
-                "frete_gratis": frete_valor == 0 and FRETE_GRATIS_ACIMA > 0,
+                "frete_gratis": precificado.frete_gratis,
                 "detalhes": {
                     "produtos": total_produtos,
+                    "descontos": precificado.descontos,
                     "frete": frete_valor,
                     "total": total_com_frete,
                     "frete_gratis_minimo": FRETE_GRATIS_ACIMA if FRETE_GRATIS_ACIMA > 0 else None
                 }
-            })
+            }
+            
+            # Pedido, itens e resposta da chave de idempotência na mesma transação
+            conn = get_db_connection()
+            try:
+                order_id = pedidos.inserir_pedido(
+                    conn,
+                    user_id,
+                    carrinho,
+                    total_com_frete,
+                    'pendente',
+                    resultado.get('id_preferencia'),
+                    resultado.get('external_reference')
+                )
+                
+                chave_mantida = idempotencia.concluir(conn, chave, reserva.dono, corpo_resposta)
+                if chave_mantida:
+                    conn.commit()
+                    logger.info(
+                        "📦 Pedido salvo no banco (ID: %s)", order_id,
+                        extra={"order_id": order_id, "external_reference": resultado.get('external_reference'),
+                               "total": total_com_frete, "itens": len(carrinho)}
+                    )
+                else:
+                    # Outra requisição assumiu a chave e grava o pedido
+                    conn.rollback()
+                
+            except Exception as db_error:
+                conn.rollback()
+                # Sem pedido gravado, o webhook não teria o que atualizar: devolve o
+                # estoque (se a chave ainda era desta requisição) e responde erro
+                if idempotencia.liberar(chave, reserva.dono):
+                    estoque.cancelar_reserva(reserva.external_reference)
+                logger.error("❌ Erro ao salvar pedido no banco: %s", db_error,
+                             extra={"external_reference": reserva.external_reference})
+                return jsonify({
+                    "success": False,
+                    "error": "Erro ao registrar o pedido. Tente novamente."
+                }), 500
+            finally:
+                conn.close()
+            
+            if not chave_mantida:
+                # Só responde sucesso com a resposta que a outra requisição gravou junto do pedido
+                final = idempotencia.aguardar(chave, fingerprint, IDEMPOTENCIA_ESPERA)
+                if final is None:
+                    return jsonify({
+                        "success": False,
+                        "error": "Este pedido já está sendo processado. Aguarde alguns segundos."
+                    }), 409, {"Retry-After": "2"}
+                return jsonify(final.resposta), final.http_status, {"Idempotent-Replayed": "true"}
+            
+            return jsonify(corpo_resposta)
         else:
+            estoque.cancelar_reserva(reserva.external_reference)
+            idempotencia.liberar(chave, reserva.dono)
             error_msg = resultado.get('error', 'Erro desconhecido no Mercado Pago')
+            if resultado.get('temporario'):
+                # Gateway lento/ocupado: o cliente pode tentar de novo em instantes
+                return jsonify({
+                    "success": False,
+                    "error": f"Erro ao processar pagamento: {error_msg}"
+                }), 503, {"Retry-After": "5"}
             return jsonify({
                 "success": False,
                 "error": f"Erro ao processar pagamento: {error_msg}"
             }), 500
     
     except Exception as e:
-        print(f"❌ ERRO CRÍTICO NO CHECKOUT: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ ERRO CRÍTICO NO CHECKOUT: %s", e)
         
         return jsonify({
             "success": False,
@@ -844,10 +1213,18 @@ def checkout():
 
 # ========== ROTAS DE CALLBACK DO MERCADO PAGO ==========
 
+# Páginas de retorno do pagamento: só payment_id, status, referência e URL de
+# retorno variam. Pré-renderizadas em fragmentos, cada acesso só emenda os valores.
+paginas_callback = PaginasCompiladas(app, {
+    template: (('payment_id', 'status', 'external_reference', 'redirect_url'), ('external_reference',))
+    for template in ('pagamentoaprovado.html', 'pagamentorecusado.html', 'pagamentopendente.html')
+})
+
 @app.route('/callback/success')
 def callback_success():
     """Callback para pagamento aprovado"""
-    print(f"=== [{datetime.now().strftime('%H:%M:%S')}] CALLBACK SUCCESS CHAMADO ===")
+    logger.info("↩️ Callback success chamado", extra={"payment_id": request.args.get('payment_id'),
+                                                    "external_reference": request.args.get('external_reference')})
     
     # Parâmetros retornados pelo Mercado Pago
     payment_id = request.args.get('payment_id')
@@ -863,13 +1240,13 @@ def callback_success():
     
     # Se não houver parâmetros, pode ser acesso direto à página
     if not payment_id and not external_reference:
-        print(f"Acesso direto à página de sucesso (sem parâmetros)")
-        return render_template('pagamentoaprovado.html',
-                              payment_id="Não disponível",
-                              status="approved",
-                              mensagem="Pagamento processado com sucesso!",
-                              redirect_url="/",
-                              redirect_time=60)
+        logger.debug("Acesso direto à página de sucesso (sem parâmetros)")
+        return paginas_callback.renderizar('pagamentoaprovado.html',
+                                           payment_id="Não disponível",
+                                           status="approved",
+                                           mensagem="Pagamento processado com sucesso!",
+                                           redirect_url="/",
+                                           redirect_time=60)
     
     # Se chegou sem payment_id mas estamos no callback, tenta buscar da sessão
     if not payment_id:
@@ -877,18 +1254,19 @@ def callback_success():
         payment_id = external_reference or f"REF_{int(time.time())}"
     
     # Redirecionar para página de sucesso com os dados
-    return render_template('pagamentoaprovado.html', 
-                          payment_id=payment_id,
-                          status=status or "approved",
-                          external_reference=external_reference,
-                          mensagem="Pagamento aprovado com sucesso!",
-                          redirect_url="/",
-                          redirect_time=60)
+    return paginas_callback.renderizar('pagamentoaprovado.html', 
+                                       payment_id=payment_id,
+                                       status=status or "approved",
+                                       external_reference=external_reference,
+                                       mensagem="Pagamento aprovado com sucesso!",
+                                       redirect_url="/",
+                                       redirect_time=60)
 
 @app.route('/callback/failure')
 def callback_failure():
     """Callback para pagamento recusado"""
-    print(f"=== [{datetime.now().strftime('%H:%M:%S')}] CALLBACK FAILURE CHAMADO ===")
+    logger.info("↩️ Callback failure chamado", extra={"payment_id": request.args.get('payment_id'),
+                                                    "external_reference": request.args.get('external_reference')})
     
     # Parâmetros retornados pelo Mercado Pago
     payment_id = request.args.get('payment_id')
@@ -905,18 +1283,19 @@ def callback_failure():
     if not payment_id:
         payment_id = external_reference or f"REF_{int(time.time())}"
     
-    return render_template('pagamentorecusado.html',
-                          status=status or "rejected",
-                          payment_id=payment_id,
-                          external_reference=external_reference,
-                          mensagem="Pagamento recusado. Tente novamente ou use outro método de pagamento.",
-                          redirect_url="/checkout.html",
-                          redirect_time=60)
+    return paginas_callback.renderizar('pagamentorecusado.html',
+                                       status=status or "rejected",
+                                       payment_id=payment_id,
+                                       external_reference=external_reference,
+                                       mensagem="Pagamento recusado. Tente novamente ou use outro método de pagamento.",
+                                       redirect_url="/checkout.html",
+                                       redirect_time=60)
 
 @app.route('/callback/pending')
 def callback_pending():
     """Callback para pagamento pendente"""
-    print(f"=== [{datetime.now().strftime('%H:%M:%S')}] CALLBACK PENDING CHAMADO ===")
+    logger.info("↩️ Callback pending chamado", extra={"payment_id": request.args.get('payment_id'),
+                                                    "external_reference": request.args.get('external_reference')})
     
     # Parâmetros retornados pelo Mercado Pago
     payment_id = request.args.get('payment_id')
@@ -933,66 +1312,45 @@ def callback_pending():
     if not payment_id:
         payment_id = external_reference or f"REF_{int(time.time())}"
     
-    return render_template('pagamentopendente.html',
-                          status=status or "pending",
-                          payment_id=payment_id,
-                          external_reference=external_reference,
-                          mensagem="Pagamento pendente de confirmação. Você receberá uma notificação quando for processado.",
-                          redirect_url="/",
-                          redirect_time=60)
+    return paginas_callback.renderizar('pagamentopendente.html',
+                                       status=status or "pending",
+                                       payment_id=payment_id,
+                                       external_reference=external_reference,
+                                       mensagem="Pagamento pendente de confirmação. Você receberá uma notificação quando for processado.",
+                                       redirect_url="/",
+                                       redirect_time=60)
 
 # ========== WEBHOOK PARA NOTIFICAÇÕES ==========
 
 @app.route('/webhook/mercadopago', methods=['POST'])
 def webhook_mercadopago():
-    """Webhook para receber notificações do Mercado Pago"""
-    print(f"=== [{datetime.now().strftime('%H:%M:%S')}] WEBHOOK RECEBIDO ===")
-    
-    if request.is_json:
-        data = request.get_json()
-        print(f"Dados recebidos: {data}")
-        
-        # Tipo de notificação
-        if 'type' in data:
-            tipo = data['type']
-            print(f"Tipo de notificação: {tipo}")
-            
-            if tipo == 'payment':
-                # Detalhes do pagamento
-                payment_id = data.get('data', {}).get('id')
-                print(f"Payment ID na notificação: {payment_id}")
-                
-                # Atualizar status do pedido no banco de dados
-                try:
-                    conn = get_db_connection()
-                    cursor = conn.cursor()
-                    
-                    cursor.execute('''
-                        UPDATE orders 
-                        SET status = 'pago' 
-                        WHERE payment_id = ? OR external_reference = ?
-                    ''', (payment_id, payment_id))
-                    
-                    conn.commit()
-                    conn.close()
-                    
-                    print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Status do pedido atualizado para 'pago'")
-                    
-                except Exception as e:
-                    print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Erro ao atualizar status do pedido: {str(e)}")
-        
-        return jsonify({"status": "received"}), 200
-    else:
-        print(f"Webhook recebeu dados não JSON")
+    """Webhook para receber notificações do Mercado Pago.
+
+    Só grava a notificação na fila (webhook_inbox) e responde; o consumidor
+    em segundo plano consulta o pagamento e atualiza o pedido.
+    """
+    dados = request.get_json(silent=True) if request.is_json else None
+    if dados is None and not request.args:
+        logger.warning("⚠️ Webhook recebeu dados não JSON")
         return jsonify({"error": "Invalid format"}), 400
+    
+    try:
+        if enfileirar(dados, request.args):
+            consumidor_webhooks.notificar()
+    except Exception as e:
+        # Sem 200 o Mercado Pago reenvia a notificação mais tarde
+        logger.error("❌ Erro ao enfileirar webhook: %s", e)
+        return jsonify({"error": "Temporarily unavailable"}), 503
+    
+    return jsonify({"status": "received"}), 200
 
 # ========== PAINEL DE ADMINISTRAÇÃO ==========
 
 @app.route('/admin')
 def admin_panel():
     """Página do painel de administrador"""
-    print(f"⚙️ [{datetime.now().strftime('%H:%M:%S')}] Painel admin acessado")
-    return render_template('admin.html')
+    logger_acessos.info("⚙️ Painel admin acessado")
+    return paginas_estaticas.servir('admin.html', request)
 
 # ========== ROTA DE LOGIN ADMIN (BACKUP/COMPATIBILIDADE) ==========
 
@@ -1006,7 +1364,7 @@ def admin_login():
         dados = request.get_json()
         
         if not dados:
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Dados de login não recebidos")
+            logger.error("❌ Dados de login não recebidos")
             return jsonify({
                 "success": False,
                 "error": "Nenhum dado recebido"
@@ -1016,11 +1374,11 @@ def admin_login():
         email = dados.get('email', '').strip()
         password = dados.get('password', dados.get('senha', ''))
         
-        print(f"🔐 [{datetime.now().strftime('%H:%M:%S')}] Tentativa de login admin via rota específica")
+        logger.info("🔐 Tentativa de login admin via rota específica")
         
         # Verificar se é o email correto
         if email != ADMIN_EMAIL:
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Email não autorizado: {email} (esperado: {ADMIN_EMAIL})")
+            logger.error("❌ Email não autorizado: %s (esperado: %s)", email, ADMIN_EMAIL)
             return jsonify({
                 "success": False,
                 "error": "Acesso não autorizado"
@@ -1028,7 +1386,7 @@ def admin_login():
         
         # Verificar senha usando sistema compatível
         if verificar_admin_senha(password):
-            print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Login admin bem-sucedido via rota específica")
+            logger.info("✅ Login admin bem-sucedido via rota específica")
             
             # Gerar token seguro
             token = secrets.token_urlsafe(64)
@@ -1055,13 +1413,13 @@ def admin_login():
                 "requires_auth": True
             })
         else:
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Senha incorreta para admin")
+            logger.warning("⚠️ Senha incorreta para admin")
             return jsonify({
                 "success": False,
                 "error": "Senha incorreta"
             }), 401
     except Exception as e:
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro no login admin: {str(e)}")
+        logger.error("❌ Erro no login admin: %s", e)
         return jsonify({
             "success": False,
             "error": f"Erro interno: {str(e)}"
@@ -1154,7 +1512,7 @@ def api_admin_products():
     try:
         # VERIFICAÇÃO DE AUTENTICAÇÃO OBRIGATÓRIA
         if not verificar_autenticacao_admin():
-            print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Acesso negado à API admin - Autenticação falhou")
+            logger.warning("⚠️ Acesso negado à API admin - Autenticação falhou")
             return jsonify({
                 "success": False,
                 "error": "Não autorizado. Token de autenticação necessário.",
@@ -1165,7 +1523,7 @@ def api_admin_products():
         if request.method == 'GET':
             # Retorna todos os produtos
             produtos_json = gerenciador.to_json()
-            print(f"📦 [{datetime.now().strftime('%H:%M:%S')}] API Admin GET: retornando {len(produtos_json)} produtos")
+            logger_acessos.info("📦 API Admin GET: retornando %s produtos", len(produtos_json))
             
             return jsonify({
                 "success": True,
@@ -1178,13 +1536,13 @@ def api_admin_products():
             # Adiciona um novo produto
             dados = request.get_json()
             
-            print(f"➕ [{datetime.now().strftime('%H:%M:%S')}] API Admin POST: Adicionando novo produto")
+            logger.info("➕ API Admin POST: Adicionando novo produto")
             
             # Validação
             campos_obrigatorios = ['name', 'price', 'code', 'category']
             for campo in campos_obrigatorios:
                 if campo not in dados or not dados[campo]:
-                    print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Campo obrigatório faltando: {campo}")
+                    logger.error("❌ Campo obrigatório faltando: %s", campo)
                     return jsonify({
                         "success": False,
                         "error": f"Campo '{campo}' é obrigatório"
@@ -1195,34 +1553,31 @@ def api_admin_products():
                 if price <= 0:
                     raise ValueError("Preço deve ser maior que zero")
             except (ValueError, TypeError) as e:
-                print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Preço inválido: {dados.get('price')} - Erro: {str(e)}")
+                logger.error("❌ Preço inválido: %s - Erro: %s", dados.get('price'), e)
                 return jsonify({
                     "success": False,
                     "error": "Preço inválido"
                 }), 400
             
             # Verificar se o código já existe
-            codigo_existente = any(p.code == dados['code'] for p in gerenciador.produtos)
+            codigo_existente = gerenciador.buscar_por_codigo(dados['code']) is not None
             if codigo_existente:
-                print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Código já existe: {dados['code']}")
+                logger.warning("⚠️ Código já existe: %s", dados['code'])
                 return jsonify({
                     "success": False,
                     "error": f"Código {dados['code']} já está em uso"
                 }), 400
             
             # Gerar ID único
-            if gerenciador.produtos:
-                novo_id = max([p.id for p in gerenciador.produtos]) + 1
-            else:
-                novo_id = 1
+            novo_id = gerenciador.proximo_id()
             
-            print(f"🆔 [{datetime.now().strftime('%H:%M:%S')}] Novo ID gerado: {novo_id}")
+            logger.info("🆔 Novo ID gerado: %s", novo_id)
             
             # Processar imagem padrão se não fornecida
             imagem = dados.get('image', '').strip()
             if not imagem:
                 imagem = '/static/images/default-product.jpg'
-                print(f"🖼️ [{datetime.now().strftime('%H:%M:%S')}] Usando imagem padrão")
+                logger.info("🖼️ Usando imagem padrão")
             
             # Processar tamanhos
             sizes_input = dados.get('sizes', '')
@@ -1272,16 +1627,17 @@ def api_admin_products():
                 updated_at=datetime.now().isoformat()
             )
             
-            print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Produto criado: {novo_produto.name} (ID: {novo_id}, Cód: {novo_produto.code}) - R$ {novo_produto.price}")
+            logger.info("✅ Produto criado: %s (ID: %s, Cód: %s) - R$ %s", novo_produto.name, novo_id, novo_produto.code, novo_produto.price)
             
             # Adicionar ao gerenciador
             gerenciador.adicionar_produto(novo_produto)
             
-            # Salvar em arquivo JSON
-            salvar_produtos_json()
-            
-            # Log para debug
-            print(f"📊 [{datetime.now().strftime('%H:%M:%S')}] Total de produtos após adição: {len(gerenciador.produtos)}")
+            # Gravar no banco de dados (upsert de uma linha)
+            if not persistir_produto(novo_produto):
+                return jsonify({
+                    "success": False,
+                    "error": "Erro ao salvar produto"
+                }), 500
             
             return jsonify({
                 "success": True,
@@ -1295,10 +1651,10 @@ def api_admin_products():
             # Atualizar produto existente
             dados = request.get_json()
             
-            print(f"✏️ [{datetime.now().strftime('%H:%M:%S')}] API Admin PUT recebido para produto ID: {dados.get('id')}")
+            logger.info("✏️ API Admin PUT recebido para produto ID: %s", dados.get('id'))
             
             if 'id' not in dados:
-                print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] ID do produto é obrigatório para atualização")
+                logger.error("❌ ID do produto é obrigatório para atualização")
                 return jsonify({
                     "success": False,
                     "error": "ID do produto é obrigatório para atualização"
@@ -1308,13 +1664,13 @@ def api_admin_products():
             produto = gerenciador.buscar_por_id(produto_id)
             
             if not produto:
-                print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Produto não encontrado: ID {produto_id}")
+                logger.error("❌ Produto não encontrado: ID %s", produto_id)
                 return jsonify({
                     "success": False,
                     "error": "Produto não encontrado"
                 }), 404
             
-            print(f"🔄 [{datetime.now().strftime('%H:%M:%S')}] Atualizando produto {produto_id}: {produto.name}")
+            logger.info("🔄 Atualizando produto %s: %s", produto_id, produto.name)
             
             # Atualizar campos permitidos
             campos_atualizaveis = [
@@ -1330,18 +1686,19 @@ def api_admin_products():
                         try:
                             atualizacoes[campo] = float(dados[campo])
                         except:
-                            print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Erro ao converter {campo}: {dados[campo]}")
+                            logger.warning("⚠️ Erro ao converter %s: %s", campo, dados[campo])
                             continue
                     elif campo == 'stock':
                         try:
                             atualizacoes[campo] = int(dados[campo])
                         except:
-                            print(f"⚠️ [{datetime.now().strftime('%H:%M:%S')}] Erro ao converter {campo}: {dados[campo]}")
+                            logger.warning("⚠️ Erro ao converter %s: %s", campo, dados[campo])
                             continue
                     else:
                         atualizacoes[campo] = dados[campo]
             
-            # Aplicar atualizações
+            # Aplicar atualizações (via gerenciador, para manter os índices em dia)
+            campos_mapeados = {}
             for campo, valor in atualizacoes.items():
                 if campo == 'features' and isinstance(valor, str):
                     valor = [f.strip() for f in valor.split('\n') if f.strip()]
@@ -1359,21 +1716,28 @@ def api_admin_products():
                     campo_mapeado = 'discount_percentage'
                 
                 if hasattr(produto, campo_mapeado):
-                    setattr(produto, campo_mapeado, valor)
-                    print(f"   ✅ Campo atualizado: {campo_mapeado} = {valor}")
+                    campos_mapeados[campo_mapeado] = valor
+                    logger.debug("✅ Campo atualizado: %s = %s", campo_mapeado, valor)
             
             # Recalcular desconto se necessário
-            if produto.on_sale and produto.original_price > produto.price:
-                produto.discount_percentage = int(((produto.original_price - produto.price) / produto.original_price) * 100)
-                print(f"   ✅ Desconto recalculado: {produto.discount_percentage}%")
+            on_sale = campos_mapeados.get('on_sale', produto.on_sale)
+            original_price = campos_mapeados.get('original_price', produto.original_price)
+            price = campos_mapeados.get('price', produto.price)
+            if on_sale and original_price > price:
+                campos_mapeados['discount_percentage'] = int(((original_price - price) / original_price) * 100)
+                logger.debug("✅ Desconto recalculado: %s%%", campos_mapeados['discount_percentage'])
             
-            # Atualizar data de modificação
-            produto.updated_at = datetime.now().isoformat()
+            # Atualizar campos e data de modificação
+            gerenciador.atualizar_produto(produto_id, campos_mapeados)
             
-            # Salvar em arquivo JSON
-            salvar_produtos_json()
+            # Gravar no banco de dados (upsert de uma linha; estoque só se veio no payload)
+            if not persistir_produto(produto, gravar_estoque='stock' in atualizacoes):
+                return jsonify({
+                    "success": False,
+                    "error": "Erro ao salvar produto"
+                }), 500
             
-            print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Produto {produto_id} atualizado com sucesso")
+            logger.info("✅ Produto %s atualizado com sucesso", produto_id)
             
             return jsonify({
                 "success": True,
@@ -1386,10 +1750,10 @@ def api_admin_products():
             # Remover produto
             dados = request.get_json()
             
-            print(f"🗑️ [{datetime.now().strftime('%H:%M:%S')}] API Admin DELETE recebido: {json.dumps(dados, indent=2)}")
+            logger.debug("🗑️ API Admin DELETE recebido", extra={"dados": dados})
             
             if 'id' not in dados:
-                print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] ID do produto é obrigatório para exclusão")
+                logger.error("❌ ID do produto é obrigatório para exclusão")
                 return jsonify({
                     "success": False,
                     "error": "ID do produto é obrigatório para exclusão"
@@ -1399,22 +1763,18 @@ def api_admin_products():
             produto = gerenciador.buscar_por_id(produto_id)
             
             if not produto:
-                print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Produto não encontrado para exclusão: ID {produto_id}")
+                logger.error("❌ Produto não encontrado para exclusão: ID %s", produto_id)
                 return jsonify({
                     "success": False,
                     "error": "Produto não encontrado"
                 }), 404
             
-            print(f"🗑️ [{datetime.now().strftime('%H:%M:%S')}] Removendo produto {produto_id}: {produto.name}")
+            logger.info("🗑️ Removendo produto %s: %s", produto_id, produto.name)
             
-            sucesso = gerenciador.remover_produto(produto_id)
+            sucesso = gerenciador.remover_produto(produto_id) and persistir_remocao(produto_id)
             
             if sucesso:
-                # Salvar em arquivo JSON
-                salvar_produtos_json()
-                
-                print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Produto {produto_id} removido com sucesso")
-                print(f"📊 [{datetime.now().strftime('%H:%M:%S')}] Total de produtos após remoção: {len(gerenciador.produtos)}")
+                logger.info("✅ Produto %s removido com sucesso (%s produtos no catálogo)", produto_id, len(gerenciador))
                 
                 return jsonify({
                     "success": True,
@@ -1422,16 +1782,14 @@ def api_admin_products():
                     "authenticated": True
                 })
             else:
-                print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro ao remover produto {produto_id}")
+                logger.error("❌ Erro ao remover produto %s", produto_id)
                 return jsonify({
                     "success": False,
                     "error": "Erro ao remover produto"
                 }), 500
             
     except Exception as e:
-        print(f"❌ [{datetime.now().strftime('%H:%M:%S')}] Erro na API admin: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erro na API admin: %s", e)
         return jsonify({
             "success": False,
             "error": f"Erro interno: {str(e)}"
@@ -1451,39 +1809,19 @@ def admin_stats():
                 "error": "Não autorizado. Token de autenticação necessário."
             }), 401
         
-        produtos_count = len(gerenciador.produtos)
-        
-        # Calcular valor total dos produtos
-        total_value = sum(p.price for p in gerenciador.produtos)
-        
-        # Contar produtos por categoria
-        categorias = {}
-        for produto in gerenciador.produtos:
-            categoria = produto.category
-            categorias[categoria] = categorias.get(categoria, 0) + 1
+        # Contadores mantidos a cada alteração: custo constante, qualquer que seja o tamanho do catálogo
+        stats = gerenciador.estatisticas()
         
-        # Estatísticas do banco de dados
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT COUNT(*) as user_count FROM users')
-        user_count = cursor.fetchone()['user_count']
-        
-        cursor.execute('SELECT COUNT(*) as order_count FROM orders')
-        order_count = cursor.fetchone()['order_count']
-        
-        conn.close()
+        try:
+            stats.update(estatisticas.ler_resumo(conn))
+        finally:
+            conn.close()
         
         return jsonify({
             "success": True,
             "stats": {
-                "total_products": produtos_count,
-                "total_value": total_value,
-                "categories": categorias,
-                "on_sale": len([p for p in gerenciador.produtos if p.on_sale]),
-                "low_stock": len([p for p in gerenciador.produtos if getattr(p, 'stock', 0) < 5]),
-                "total_users": user_count,
-                "total_orders": order_count,
+                **stats,
                 "frete_gratis_minimo": FRETE_GRATIS_ACIMA if FRETE_GRATIS_ACIMA > 0 else None,
                 "frete_padrao": DEFAULT_FRETE
             },
@@ -1495,6 +1833,88 @@ def admin_stats():
             "error": str(e)
         }), 500
 
+@app.route('/api/admin/reports/sales', methods=['GET', 'OPTIONS'])
+def admin_relatorio_vendas():
+    """Relatório de vendas: produtos mais vendidos e receita por categoria (agregados em SQL)"""
+    if request.method == 'OPTIONS':
+        return '', 200
+    
+    try:
+        if not verificar_autenticacao_admin():
+            return jsonify({
+                "success": False,
+                "error": "Não autorizado. Token de autenticação necessário."
+            }), 401
+        
+        limite = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        desde = request.args.get('since')
+        if desde:
+            try:
+                desde = datetime.strptime(desde, '%Y-%m-%d').strftime('%Y-%m-%d')
+            except ValueError:
+                return jsonify({"success": False, "error": "Parâmetro 'since' deve estar no formato YYYY-MM-DD"}), 400
+        
+        conn = get_db_connection()
+        try:
+            mais_vendidos = pedidos.mais_vendidos(conn, limite, desde)
+            categorias = pedidos.receita_por_categoria(conn, desde)
+        finally:
+            conn.close()
+        
+        return jsonify({
+            "success": True,
+            "since": desde,
+            "best_sellers": mais_vendidos,
+            "revenue_by_category": categorias
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/admin/analytics', methods=['GET', 'OPTIONS'])
+def admin_analytics():
+    """Vendas por dia ou hora e por categoria, lidas dos agregados (from/to em YYYY-MM-DD, granularity=day|hour)"""
+    if request.method == 'OPTIONS':
+        return '', 200
+    
+    try:
+        if not verificar_autenticacao_admin():
+            return jsonify({
+                "success": False,
+                "error": "Não autorizado. Token de autenticação necessário."
+            }), 401
+        
+        try:
+            fim = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else relatorios.hoje()
+            inicio = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else fim - timedelta(days=29)
+        except ValueError:
+            return jsonify({"success": False, "error": "Parâmetros 'from' e 'to' devem estar no formato YYYY-MM-DD"}), 400
+        granularidade = request.args.get('granularity', 'day')
+        
+        conn = get_db_connection()
+        try:
+            analytics = relatorios.consultar(conn, inicio, fim, granularidade)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        finally:
+            conn.close()
+        
+        return jsonify({
+            "success": True,
+            "from": inicio.isoformat(),
+            "to": fim.isoformat(),
+            "granularity": granularidade,
+            "timezone_offset_hours": relatorios.RELATORIOS_FUSO_HORAS,
+            **analytics
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
 # ========== HEALTH CHECK ==========
 
 @app.route('/health', methods=['GET'])
@@ -1510,11 +1930,11 @@ def health_check():
                 "flask": "healthy",
                 "database": "unknown",
                 "mercado_pago": "unknown",
-                "produtos": "healthy" if len(gerenciador.produtos) > 0 else "warning",
+                "produtos": "healthy" if len(gerenciador) > 0 else "warning",
                 "admin_auth": "configured" if ADMIN_PASSWORD_HASH and ADMIN_PASSWORD_HASH != "CONFIGURE_ADMIN_PASSWORD_HASH_IN_ENV" else "not_configured"
             },
             "metrics": {
-                "total_produtos": len(gerenciador.produtos),
+                "total_produtos": len(gerenciador),
                 "ambiente": FLASK_ENV,
                 "admin_email": ADMIN_EMAIL
             }
@@ -1531,6 +1951,24 @@ def health_check():
             health_status["components"]["database"] = "unhealthy"
             health_status["status"] = "degraded"
         
+        # Tarefas de manutenção em segundo plano
+        try:
+            health_status["maintenance"] = agendador.estatisticas()
+        except Exception as e:
+            health_status["maintenance"] = {"error": str(e)}
+        
+        # Fila de notificações do Mercado Pago
+        try:
+            health_status["webhooks"] = consumidor_webhooks.estatisticas()
+        except Exception as e:
+            health_status["webhooks"] = {"error": str(e)}
+        
+        # Reconciliação de pedidos pendentes
+        try:
+            health_status["reconciliation"] = reconciliador.estatisticas()
+        except Exception as e:
+            health_status["reconciliation"] = {"error": str(e)}
+        
         # Verificar Mercado Pago (apenas verificação básica)
         if os.environ.get('MP_ACCESS_TOKEN'):
             health_status["components"]["mercado_pago"] = "configured"
@@ -1565,10 +2003,8 @@ def test_endpoint():
 app_start_time = time.time()
 
 if __name__ == '__main__':
-    print("=" * 70)
-    print(" ROMANEL JOIAS - SISTEMA CONFIGURADO PARA PRODUÇÃO")
-    print("=" * 70)
-    print(f"🕒 [{datetime.now().strftime('%H:%M:%S')}] Sistema inicializado com {len(gerenciador.produtos)} produtos")
+    logger.info("ROMANEL JOIAS - SISTEMA CONFIGURADO PARA PRODUÇÃO")
+    logger.info("🕒 Sistema inicializado com %s produtos", len(gerenciador))
     
     # Porta configurada pelo Render ou padrão
     port = int(os.environ.get("PORT", PORT))
@@ -1580,41 +2016,40 @@ if __name__ == '__main__':
     is_render = os.environ.get('RENDER', False)
     
     if is_render:
-        print(f"🚀 Ambiente: RENDER (PRODUÇÃO)")
-        print(f"🌐 URL externa: {RENDER_EXTERNAL_URL or 'Não configurada'}")
-        print(f"🔒 Esquema preferido: {PREFERRED_URL_SCHEME}")
-        print(f"🔄 Forçar HTTPS: {'✅ Sim' if FORCE_HTTPS else '❌ Não'}")
-        print(f"🔓 Permitir HTTP: {'✅ Sim' if ALLOW_HTTP else '❌ Não'}")
-        print(f"🔧 Porta: {port} (Gerenciada automaticamente pelo Render)")
+        logger.info("🚀 Ambiente: RENDER (PRODUÇÃO)")
+        logger.info("🌐 URL externa: %s", RENDER_EXTERNAL_URL or 'Não configurada')
+        logger.info("🔒 Esquema preferido: %s", PREFERRED_URL_SCHEME)
+        logger.info("🔄 Forçar HTTPS: %s", '✅ Sim' if FORCE_HTTPS else '❌ Não')
+        logger.info("🔓 Permitir HTTP: %s", '✅ Sim' if ALLOW_HTTP else '❌ Não')
+        logger.info("🔧 Porta: %s (Gerenciada automaticamente pelo Render)", port)
     else:
-        print(f"💻 Ambiente: LOCAL (SIMULAÇÃO PRODUÇÃO)")
-        print(f"🔧 Porta: {port} (Desenvolvimento local)")
+        logger.info("💻 Ambiente: LOCAL (SIMULAÇÃO PRODUÇÃO)")
+        logger.info("🔧 Porta: %s (Desenvolvimento local)", port)
     
-    print(f"🐛 Debug: {'❌ DESLIGADO' if not debug_mode else '⚠️ ATENÇÃO: LIGADO EM PRODUÇÃO!'}")
+    logger.info("🐛 Debug: %s", '❌ DESLIGADO' if not debug_mode else '⚠️ ATENÇÃO: LIGADO EM PRODUÇÃO!')
     
-    print(f"\n🔐 CONFIGURAÇÕES DE SEGURANÇA:")
-    print(f"   Admin email: {ADMIN_EMAIL}")
-    print(f"   Admin hash configurado: {'✅ Sim' if ADMIN_PASSWORD_HASH and ADMIN_PASSWORD_HASH != 'CONFIGURE_ADMIN_PASSWORD_HASH_IN_ENV' else '❌ Não (configure no .env)'}")
-    print(f"   Token API configurado: {'✅ Sim' if ADMIN_API_TOKEN else '⚠️ Não (usando senha como fallback)'}")
-    print(f"   Tokens armazenados no banco: ✅ Sim")
+    logger.info("🔐 CONFIGURAÇÕES DE SEGURANÇA:")
+    logger.info("Admin email: %s", ADMIN_EMAIL)
+    logger.info("Admin hash configurado: %s", '✅ Sim' if ADMIN_PASSWORD_HASH and ADMIN_PASSWORD_HASH != 'CONFIGURE_ADMIN_PASSWORD_HASH_IN_ENV' else '❌ Não (configure no .env)')
+    logger.info("Token API configurado: %s", '✅ Sim' if ADMIN_API_TOKEN else '⚠️ Não (usando senha como fallback)')
+    logger.info("Tokens armazenados no banco: ✅ Sim")
     
-    print(f"\n💰 CONFIGURAÇÕES DE NEGÓCIO:")
-    print(f"   Frete padrão: R$ {DEFAULT_FRETE:.2f}")
-    print(f"   Frete grátis acima de: {'R$ ' + str(FRETE_GRATIS_ACIMA) if FRETE_GRATIS_ACIMA > 0 else '❌ Desativado'}")
-    print(f"   Produtos cadastrados: {len(gerenciador.produtos)}")
+    logger.info("💰 CONFIGURAÇÕES DE NEGÓCIO:")
+    logger.info("Frete padrão: R$ %.2f", DEFAULT_FRETE)
+    logger.info("Frete grátis acima de: %s", 'R$ ' + str(FRETE_GRATIS_ACIMA) if FRETE_GRATIS_ACIMA > 0 else '❌ Desativado')
+    logger.info("Produtos cadastrados: %s", len(gerenciador))
     
-    print(f"\n🌐 URLs IMPORTANTES:")
-    print(f"   • Site: http://0.0.0.0:{port}")
-    print(f"   • Painel Admin: http://0.0.0.0:{port}/admin")
-    print(f"   • API Produtos: http://0.0.0.0:{port}/api/produtos")
-    print(f"   • API Login (unificada): http://0.0.0.0:{port}/api/login")
-    print(f"   • API Admin Login (backup): http://0.0.0.0:{port}/api/admin/login")
+    logger.info("🌐 URLs IMPORTANTES:")
+    logger.info("• Site: http://0.0.0.0:%s", port)
+    logger.info("• Painel Admin: http://0.0.0.0:%s/admin", port)
+    logger.info("• API Produtos: http://0.0.0.0:%s/api/produtos", port)
+    logger.info("• API Login (unificada): http://0.0.0.0:%s/api/login", port)
+    logger.info("• API Admin Login (backup): http://0.0.0.0:%s/api/admin/login", port)
     
-    print(f"\n🔑 INSTRUÇÕES DE LOGIN:")
-    print(f"   • Usuário comum: Use /api/login com email de usuário")
-    print(f"   • Administrador: Use /api/login com email admin ({ADMIN_EMAIL})")
-    print(f"   Sistema aceita: senha em texto OU hash SHA256")
-    print("=" * 70)
+    logger.info("🔑 INSTRUÇÕES DE LOGIN:")
+    logger.info("• Usuário comum: Use /api/login com email de usuário")
+    logger.info("• Administrador: Use /api/login com email admin (%s)", ADMIN_EMAIL)
+    logger.info("Sistema aceita: senha em texto OU hash SHA256")
 
     # IMPORTANTE: Para Render, usar debug=False sempre
     app.run(host="0.0.0.0", port=port, debug=False)
\ No newline at end of file
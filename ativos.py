@@ -0,0 +1,80 @@
+# ativos.py
+import hashlib
+import os
+from flask import request, send_from_directory
+from paginas import ConteudoComprimido
+
+# CSS e JS ficam em static/ com o nome "lógico" (css/loja.css); na subida do
+# worker cada arquivo ganha uma URL com o hash do conteúdo (css/loja.1a2b3c4d5e.css).
+# Conteúdo novo = URL nova, então a URL com hash pode ficar em cache para sempre.
+ATIVOS_DIRETORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+ATIVOS_CACHE_CONTROL = os.environ.get('ATIVOS_CACHE_CONTROL', 'public, max-age=31536000, immutable')
+
+# Extensões empacotadas -> mimetype (o resto de static/ é servido como arquivo comum)
+TIPOS_ATIVOS = {
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+}
+
+# Tamanho do hash no nome do arquivo
+TAMANHO_HASH = 10
+
+
+def nome_com_hash(caminho, corpo):
+    """css/loja.css + conteúdo -> css/loja.<hash>.css"""
+    base, extensao = os.path.splitext(caminho)
+    return f"{base}.{hashlib.sha256(corpo).hexdigest()[:TAMANHO_HASH]}{extensao}"
+
+
+class Ativos:
+    """Manifesto (nome lógico -> nome com hash) e conteúdo comprimido dos CSS/JS de static/"""
+
+    def __init__(self, app=None, diretorio=ATIVOS_DIRETORIO):
+        self.diretorio = diretorio
+        self.manifesto = {}    # 'css/loja.css' -> 'css/loja.1a2b3c4d5e.css'
+        self.conteudos = {}    # 'css/loja.1a2b3c4d5e.css' -> ConteudoComprimido
+        self.carregar()
+        if app is not None:
+            self.registrar(app)
+
+    def carregar(self):
+        """Lê static/, calcula os hashes e comprime cada arquivo uma vez"""
+        for pasta, _subpastas, arquivos in os.walk(self.diretorio):
+            for arquivo in sorted(arquivos):
+                mimetype = TIPOS_ATIVOS.get(os.path.splitext(arquivo)[1])
+                if mimetype is None:
+                    continue
+                completo = os.path.join(pasta, arquivo)
+                caminho = os.path.relpath(completo, self.diretorio).replace(os.sep, '/')
+                with open(completo, 'rb') as f:
+                    corpo = f.read()
+                versionado = nome_com_hash(caminho, corpo)
+                self.manifesto[caminho] = versionado
+                self.conteudos[versionado] = ConteudoComprimido(corpo, mimetype, ATIVOS_CACHE_CONTROL)
+
+    def registrar(self, app):
+        """Expõe ``asset()`` aos templates e assume a rota /static"""
+        app.jinja_env.globals['asset'] = self.url
+        app.add_url_rule('/static/<path:caminho>', 'static', self.servir)
+
+    def url(self, caminho):
+        """URL versionada de um ativo (``{{ asset('css/loja.css') }}`` nos templates)"""
+        return f"/static/{self.manifesto.get(caminho, caminho)}"
+
+    def servir(self, caminho):
+        """Ativo com hash: da memória, comprimido e imutável. Outros arquivos de static/: do disco."""
+        conteudo = self.conteudos.get(caminho)
+        if conteudo is None:
+            return send_from_directory(self.diretorio, caminho)
+        return conteudo.resposta(request)
+
+    def tamanhos(self):
+        return {caminho: self.conteudos[versionado].tamanhos() for caminho, versionado in self.manifesto.items()}
+
+
+if __name__ == "__main__":
+    # Mostra o manifesto e o tamanho de cada variante (útil no log do build)
+    ativos = Ativos()
+    for caminho, versionado in ativos.manifesto.items():
+        tamanhos = ativos.conteudos[versionado].tamanhos()
+        print(f"📦 {caminho} -> {versionado}: " + ", ".join(f"{codificacao} {tamanho / 1024:.1f} KB" for codificacao, tamanho in tamanhos.items()))
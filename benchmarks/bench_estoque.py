@@ -0,0 +1,83 @@
+# benchmarks/bench_estoque.py
+# Benchmark de contenção das reservas de estoque: vários processos (como os
+# workers do gunicorn) e threads disputando o mesmo SKU.
+# Roda sempre num banco descartável (arquivo temporário), nunca no database.db.
+#
+#   python benchmarks/bench_estoque.py
+#   BENCH_PROCESSOS=8 BENCH_THREADS=20 python benchmarks/bench_estoque.py
+import os
+import sys
+import tempfile
+
+# O banco precisa estar definido antes de importar database. Os processos
+# filhos (spawn) reimportam este módulo e herdam o mesmo arquivo pela variável.
+if 'BENCH_DATABASE' not in os.environ:
+    os.environ['BENCH_DATABASE'] = os.path.join(tempfile.mkdtemp(prefix='bench-estoque-'), 'bench.db')
+os.environ['DATABASE_PATH'] = os.environ['BENCH_DATABASE']
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+
+from database import get_db_connection
+from estoque import ATIVA, EstoqueInsuficiente, reservar
+from migracoes import aplicar_migracoes
+
+PRODUTO_TESTE = 1
+ESTOQUE_INICIAL = int(os.environ.get('BENCH_ESTOQUE', 500))
+PROCESSOS = int(os.environ.get('BENCH_PROCESSOS', 4))
+THREADS = int(os.environ.get('BENCH_THREADS', 50))
+TENTATIVAS = int(os.environ.get('BENCH_TENTATIVAS', 1000))
+
+
+def _tentar(_):
+    inicio = time.perf_counter()
+    try:
+        reservar(f"bench_{uuid.uuid4().hex}", [(PRODUTO_TESTE, 1)])
+        ok = True
+    except EstoqueInsuficiente:
+        ok = False
+    return ok, time.perf_counter() - inicio
+
+
+def _processo(tentativas):
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(_tentar, range(tentativas)))
+
+
+def main():
+    aplicar_migracoes()
+    conn = get_db_connection()
+    conn.execute('''
+        INSERT INTO products (id, code, name, price, stock)
+        VALUES (?, 'BENCH', 'SKU de teste', 1.0, ?)
+    ''', (PRODUTO_TESTE, ESTOQUE_INICIAL))
+    conn.commit()
+    conn.close()
+
+    inicio = time.perf_counter()
+    with Pool(PROCESSOS) as pool:
+        resultados = [r for parte in pool.map(_processo, [TENTATIVAS // PROCESSOS] * PROCESSOS) for r in parte]
+    duracao = time.perf_counter() - inicio
+
+    latencias = sorted(lat * 1000 for _ok, lat in resultados)
+    sucessos = sum(1 for ok, _lat in resultados if ok)
+    conn = get_db_connection()
+    estoque_final = conn.execute('SELECT stock FROM products WHERE id = ?', (PRODUTO_TESTE,)).fetchone()['stock']
+    reservado = conn.execute('SELECT COALESCE(SUM(quantity), 0) FROM stock_reservations WHERE product_id = ? AND status = ?',
+                             (PRODUTO_TESTE, ATIVA)).fetchone()[0]
+    conn.close()
+
+    print(f"📊 {len(resultados)} tentativas ({PROCESSOS} processos x {THREADS} threads) em {duracao:.2f} s "
+          f"-> {len(resultados) / duracao:.0f} reservas/s")
+    print(f"   Sucessos: {sucessos} | Estoque inicial: {ESTOQUE_INICIAL} | Estoque final: {estoque_final} | Reservado: {reservado}")
+    print(f"   Latência p50: {statistics.median(latencias):.2f} ms | p99: {latencias[int(len(latencias) * 0.99) - 1]:.2f} ms")
+    print(f"   {'✅ Sem overselling' if sucessos == ESTOQUE_INICIAL - estoque_final == reservado else '❌ INCONSISTÊNCIA'}")
+    print(f"   Banco descartável: {os.environ['BENCH_DATABASE']}")
+
+
+if __name__ == "__main__":
+    main()
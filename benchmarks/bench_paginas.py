@@ -0,0 +1,49 @@
+# benchmarks/bench_paginas.py
+# Micro-benchmark: render_template x fragmentos pré-renderizados (PaginaCompilada)
+# nas páginas de retorno do pagamento. A equivalência da saída é coberta por
+# tests/test_paginas.py.
+#
+#   python benchmarks/bench_paginas.py
+#   BENCH_ITERACOES=20000 python benchmarks/bench_paginas.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, render_template
+
+from ativos import Ativos
+from paginas import PaginaCompilada
+
+ITERACOES = int(os.environ.get('BENCH_ITERACOES', 5000))
+VARIAVEIS = ('payment_id', 'status', 'external_reference', 'redirect_url')
+EXEMPLOS = [
+    {"payment_id": "1234567890", "status": "approved", "external_reference": "pedido_0f3a9c", "redirect_url": "/"},
+    {"payment_id": "REF_1760000000", "status": "pending", "external_reference": None, "redirect_url": "/"},
+]
+
+
+def main():
+    app = Flask('paginas', static_folder=None)
+    Ativos(app)
+
+    for template in ('pagamentoaprovado.html', 'pagamentopendente.html', 'pagamentorecusado.html'):
+        pagina = PaginaCompilada(app, template, VARIAVEIS, ('external_reference',))
+        with app.test_request_context():
+            inicio = time.perf_counter()
+            for i in range(ITERACOES):
+                render_template(template, **EXEMPLOS[i % 2])
+            jinja = (time.perf_counter() - inicio) / ITERACOES * 1e6
+
+            inicio = time.perf_counter()
+            for i in range(ITERACOES):
+                pagina.renderizar(**EXEMPLOS[i % 2])
+            fragmentos = (time.perf_counter() - inicio) / ITERACOES * 1e6
+
+        print(f"📊 {template}: render_template {jinja:.1f} µs | fragmentos {fragmentos:.1f} µs "
+              f"({jinja / fragmentos:.1f}x) | {sum(len(v) for v in pagina.variantes.values())} fragmentos")
+
+
+if __name__ == "__main__":
+    main()
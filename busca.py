@@ -0,0 +1,200 @@
+# busca.py
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from metricas import ContadorCache
+
+# Pesos de cada campo do produto na pontuação
+PESOS_CAMPOS = {
+    'name': 3.0,
+    'category': 2.0,
+    'features': 1.5,
+    'description': 1.0,
+}
+
+# Palavras muito comuns em português que não ajudam a diferenciar produtos
+STOPWORDS = {
+    'a', 'o', 'as', 'os', 'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'no', 'na',
+    'nos', 'nas', 'com', 'para', 'por', 'um', 'uma', 'uns', 'umas', 'ao', 'aos',
+}
+
+# Termo encontrado só por prefixo vale um pouco menos que o termo exato
+PESO_PREFIXO = 0.8
+
+# Limite de termos expandidos por prefixo (evita explodir com prefixos de 1 letra)
+MAX_EXPANSAO_PREFIXO = 64
+
+TAMANHO_CACHE_CONSULTAS = 256
+
+# Acertos/faltas do cache de consultas (/metrics)
+_metricas_consultas = ContadorCache('busca')
+
+_separador = re.compile(r'[^0-9a-z]+')
+
+def normalizar(texto):
+    """Remove acentos e caixa: 'Anéis Dourados' -> 'aneis dourados'"""
+    if not texto:
+        return ''
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+def tokenizar(texto):
+    """Quebra o texto em termos normalizados, sem stopwords"""
+    return [t for t in _separador.split(normalizar(texto)) if t and t not in STOPWORDS]
+
+
+class IndiceBusca:
+    """Índice invertido dos produtos (nome, categoria, características e descrição).
+
+    Usado por todas as threads do worker: buscas e alterações passam pelo mesmo
+    lock (o cache LRU, a lista ordenada preguiçosa e os postings mudam nas duas).
+    A busca é Python puro, então serializar não tira paralelismo por causa do GIL.
+    """
+
+    def __init__(self):
+        self._postings = {}        # termo -> {produto_id: peso}
+        self._termos_produto = {}  # produto_id -> set(termos)
+        self._termos_ordenados = None   # lista ordenada de termos, recalculada sob demanda
+        self._cache = OrderedDict()     # (consulta, limite) -> [(produto_id, pontuação)]
+        self._lock = threading.Lock()
+
+    def _alterado(self):
+        self._termos_ordenados = None
+        self._cache.clear()
+
+    def adicionar(self, produto):
+        """Indexa (ou reindexa) um produto"""
+        pesos = {}
+        campos = {
+            'name': produto.name,
+            'category': produto.category,
+            'features': ' '.join(str(f) for f in (produto.features or [])),
+            'description': produto.description,
+        }
+        for campo, texto in campos.items():
+            for termo in tokenizar(texto):
+                pesos[termo] = pesos.get(termo, 0.0) + PESOS_CAMPOS[campo]
+
+        with self._lock:
+            self._remover(produto.id)
+            for termo, peso in pesos.items():
+                self._postings.setdefault(termo, {})[produto.id] = peso
+            self._termos_produto[produto.id] = set(pesos)
+            self._alterado()
+
+    def remover(self, produto_id):
+        """Retira um produto do índice"""
+        with self._lock:
+            self._remover(produto_id)
+
+    def _remover(self, produto_id):
+        termos = self._termos_produto.pop(produto_id, None)
+        if not termos:
+            return
+        for termo in termos:
+            postings = self._postings.get(termo)
+            if postings is not None:
+                postings.pop(produto_id, None)
+                if not postings:
+                    del self._postings[termo]
+        self._alterado()
+
+    def limpar(self):
+        """Esvazia o índice"""
+        with self._lock:
+            self._postings.clear()
+            self._termos_produto.clear()
+            self._alterado()
+
+    def _expandir(self, termo, prefixo):
+        """Retorna [(termo_indexado, fator)] que casam com o termo da consulta"""
+        encontrados = []
+        if termo in self._postings:
+            encontrados.append((termo, 1.0))
+        if not prefixo:
+            return encontrados
+
+        if self._termos_ordenados is None:
+            self._termos_ordenados = sorted(self._postings)
+        termos = self._termos_ordenados
+        inicio = bisect.bisect_left(termos, termo)
+        for indexado in termos[inicio:inicio + MAX_EXPANSAO_PREFIXO + 1]:
+            if not indexado.startswith(termo):
+                break
+            if indexado != termo:
+                encontrados.append((indexado, PESO_PREFIXO))
+        return encontrados
+
+    def buscar(self, consulta, limite=10):
+        """Busca produtos; todos os termos precisam casar e o último também casa por prefixo.
+
+        Retorna [(produto_id, pontuação)] em ordem decrescente de relevância.
+        """
+        termos = tokenizar(consulta)
+        if not termos:
+            return []
+
+        chave = (' '.join(termos), limite)
+        with self._lock:
+            resultado = self._cache.get(chave)
+            if resultado is not None:
+                _metricas_consultas.acerto()
+                self._cache.move_to_end(chave)
+                return resultado
+            _metricas_consultas.falta()
+            return self._pontuar(termos, chave, limite)
+
+    def _pontuar(self, termos, chave, limite):
+        """Calcula e guarda no cache o resultado da consulta (chamado com o lock)"""
+        total_produtos = max(len(self._termos_produto), 1)
+
+        # Para cada termo da consulta: [(postings, multiplicador)] dos termos indexados que casam
+        expansoes = []
+        for posicao, termo in enumerate(termos):
+            # O último termo é o que está sendo digitado; os demais casam por prefixo a partir de 3 letras
+            prefixo = posicao == len(termos) - 1 or len(termo) >= 3
+            casados = []
+            for indexado, fator in self._expandir(termo, prefixo):
+                postings = self._postings[indexado]
+                casados.append((postings, math.log(1 + total_produtos / len(postings)) * fator))
+            if not casados:
+                return self._guardar(chave, [])
+            expansoes.append(casados)
+
+        # Começa pelo termo mais seletivo e só consulta os candidatos restantes nos demais
+        expansoes.sort(key=lambda casados: sum(len(postings) for postings, _ in casados))
+
+        pontuacao = {}
+        for postings, multiplicador in expansoes[0]:
+            for produto_id, peso in postings.items():
+                valor = peso * multiplicador
+                if valor > pontuacao.get(produto_id, 0.0):
+                    pontuacao[produto_id] = valor
+
+        for casados in expansoes[1:]:
+            restantes = {}
+            for produto_id, acumulado in pontuacao.items():
+                melhor = 0.0
+                for postings, multiplicador in casados:
+                    peso = postings.get(produto_id)
+                    if peso is not None and peso * multiplicador > melhor:
+                        melhor = peso * multiplicador
+                if melhor:
+                    restantes[produto_id] = acumulado + melhor
+            pontuacao = restantes
+            if not pontuacao:
+                break
+
+        resultado = heapq.nsmallest(limite, pontuacao.items(), key=lambda item: (-item[1], item[0]))
+        return self._guardar(chave, resultado)
+
+    def _guardar(self, chave, resultado):
+        """Guarda o resultado no cache LRU de consultas"""
+        self._cache[chave] = resultado
+        if len(self._cache) > TAMANHO_CACHE_CONSULTAS:
+            self._cache.popitem(last=False)
+        return resultado
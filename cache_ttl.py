@@ -0,0 +1,54 @@
+# cache_ttl.py
+import threading
+import time
+from collections import OrderedDict
+from metricas import ContadorCache
+
+class CacheTTL:
+    """Cache LRU limitado em que cada item expira após um tempo (thread-safe)"""
+
+    def __init__(self, max_itens: int = 1024, ttl: float = 60.0, nome: str = None):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        # Com nome, acertos e faltas aparecem no /metrics (cache_hits_total{cache=nome})
+        self._metricas = ContadorCache(nome) if nome else None
+        self._itens = OrderedDict()    # chave -> (expira_em_monotonic, valor)
+        self._lock = threading.Lock()
+
+    def get(self, chave, padrao=None):
+        """Retorna o valor se existir e não tiver expirado"""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[0] <= time.monotonic():
+                del self._itens[chave]
+                item = None
+            if self._metricas is not None:
+                (self._metricas.falta if item is None else self._metricas.acerto)()
+            if item is None:
+                return padrao
+            self._itens.move_to_end(chave)
+            return item[1]
+
+    def set(self, chave, valor, ttl: float = None):
+        """Guarda um valor; ``ttl`` sobrescreve o tempo de vida padrão"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def invalidar(self, chave):
+        """Remove um item do cache"""
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def limpar(self):
+        """Remove todos os itens"""
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
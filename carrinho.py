@@ -0,0 +1,124 @@
+# carrinho.py
+import os
+
+# Limite de unidades de um mesmo produto por pedido
+CARRINHO_MAX_QUANTIDADE = int(os.environ.get('CARRINHO_MAX_QUANTIDADE', 20))
+
+
+class ErroCarrinho(ValueError):
+    """Carrinho inválido; ``problemas`` lista cada linha rejeitada"""
+
+    def __init__(self, mensagem, problemas=None, status=400):
+        super().__init__(mensagem)
+        self.problemas = problemas or []
+        self.status = status
+
+
+class LinhaCarrinho:
+    """Uma linha do carrinho já precificada com os dados do servidor"""
+
+    __slots__ = ('produto', 'quantidade', 'preco_unitario', 'preco_original', 'subtotal', 'desconto')
+
+    def __init__(self, produto, quantidade):
+        self.produto = produto
+        self.quantidade = quantidade
+        self.preco_unitario = produto.price
+        self.preco_original = max(produto.original_price, produto.price)
+        self.subtotal = round(self.preco_unitario * quantidade, 2)
+        self.desconto = round((self.preco_original - self.preco_unitario) * quantidade, 2)
+
+    def to_dict(self):
+        """Formato do item no pedido e na preferência de pagamento"""
+        return {
+            "id": self.produto.id,
+            "code": self.produto.code,
+            "name": self.produto.name,
+            "category": self.produto.category,
+            "price": self.preco_unitario,
+            "quantity": self.quantidade,
+            "image": self.produto.image
+        }
+
+
+class CarrinhoPrecificado:
+    """Resultado da precificação: linhas, subtotal, descontos, frete e total calculados uma única vez"""
+
+    def __init__(self, linhas, frete_padrao, frete_gratis_acima):
+        self.linhas = linhas
+        self.subtotal = round(sum(linha.subtotal for linha in linhas), 2)
+        self.descontos = round(sum(linha.desconto for linha in linhas), 2)
+        self.quantidade_itens = sum(linha.quantidade for linha in linhas)
+        self.frete_gratis = frete_gratis_acima > 0 and self.subtotal >= frete_gratis_acima
+        self.frete = 0.0 if self.frete_gratis else float(frete_padrao)
+        self.total = round(self.subtotal + self.frete, 2)
+
+    def itens(self):
+        """Linhas no formato de carrinho (para o pedido e o Mercado Pago)"""
+        return [linha.to_dict() for linha in self.linhas]
+
+
+def _normalizar_linha(item, indice):
+    """Lê (id, código, quantidade) de uma linha enviada pelo cliente"""
+    if not isinstance(item, dict):
+        raise ErroCarrinho(f"Item {indice + 1} inválido")
+    produto_id = item.get('id')
+    try:
+        produto_id = int(produto_id) if produto_id is not None else None
+    except (TypeError, ValueError):
+        produto_id = None
+    codigo = item.get('code')
+    try:
+        quantidade = int(item.get('quantity', 1))
+    except (TypeError, ValueError):
+        raise ErroCarrinho(f"Quantidade inválida no item {indice + 1}")
+    if quantidade < 1 or quantidade > CARRINHO_MAX_QUANTIDADE:
+        raise ErroCarrinho(f"Quantidade do item {indice + 1} deve estar entre 1 e {CARRINHO_MAX_QUANTIDADE}")
+    if produto_id is None and not codigo:
+        raise ErroCarrinho(f"Item {indice + 1} sem identificação do produto")
+    return produto_id, codigo, quantidade
+
+def precificar_carrinho(gerenciador, carrinho, frete_padrao, frete_gratis_acima):
+    """Valida o carrinho contra o catálogo e calcula os totais com os preços do servidor.
+
+    Preço, nome e imagem enviados pelo cliente são ignorados. Linhas do mesmo
+    produto são somadas. Levanta ErroCarrinho para produto inexistente,
+    quantidade inválida (400) ou estoque insuficiente (409).
+    """
+    if not isinstance(carrinho, list) or not carrinho:
+        raise ErroCarrinho("Carrinho vazio")
+
+    linhas_cliente = [_normalizar_linha(item, indice) for indice, item in enumerate(carrinho)]
+
+    # Uma única passada no catálogo para todas as linhas
+    por_id, por_codigo = gerenciador.buscar_varios(
+        {produto_id for produto_id, _codigo, _quantidade in linhas_cliente if produto_id is not None},
+        {codigo for produto_id, codigo, _quantidade in linhas_cliente if produto_id is None}
+    )
+
+    quantidades = {}    # id -> (produto, quantidade), na ordem do carrinho
+    problemas = []
+    for produto_id, codigo, quantidade in linhas_cliente:
+        produto = por_id.get(produto_id) if produto_id is not None else por_codigo.get(codigo)
+        if produto is None:
+            problemas.append({"id": produto_id, "code": codigo, "error": "Produto não encontrado"})
+            continue
+        anterior = quantidades.get(produto.id)
+        quantidades[produto.id] = (produto, quantidade + (anterior[1] if anterior else 0))
+
+    if problemas:
+        raise ErroCarrinho("Produto não encontrado no catálogo", problemas)
+
+    linhas = []
+    for produto, quantidade in quantidades.values():
+        if quantidade > CARRINHO_MAX_QUANTIDADE:
+            problemas.append({"id": produto.id, "code": produto.code, "error": f"Máximo de {CARRINHO_MAX_QUANTIDADE} unidades"})
+        elif quantidade > produto.stock:
+            problemas.append({"id": produto.id, "code": produto.code, "error": "Estoque insuficiente", "available": produto.stock})
+        else:
+            linhas.append(LinhaCarrinho(produto, quantidade))
+
+    if problemas:
+        estoque = any(problema["error"] == "Estoque insuficiente" for problema in problemas)
+        raise ErroCarrinho("Estoque insuficiente" if estoque else "Quantidade inválida", problemas, 409 if estoque else 400)
+
+    return CarrinhoPrecificado(linhas, frete_padrao, frete_gratis_acima)
@@ -0,0 +1,144 @@
+# database.py
+import os
+import sqlite3
+import threading
+import time
+import metricas
+
+DATABASE = os.environ.get('DATABASE_PATH', 'database.db')
+
+# Configuração das conexões SQLite
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+DB_CACHED_STATEMENTS = int(os.environ.get('DB_CACHED_STATEMENTS', 256))
+DB_POOL_MAX_IDLE = int(os.environ.get('DB_POOL_MAX_IDLE', 4))
+
+# Pool de conexões por thread (e por processo: cada worker do gunicorn tem o seu)
+_local = threading.local()
+_wal_configurado = False
+_wal_lock = threading.Lock()
+
+class CursorMedido(sqlite3.Cursor):
+    """Cursor que registra o tempo de cada comando no histograma do /metrics"""
+
+    def execute(self, sql, parametros=()):
+        inicio = time.perf_counter()
+        try:
+            return super().execute(sql, parametros)
+        finally:
+            metricas.duracao_sql(sql)(time.perf_counter() - inicio)
+
+    def executemany(self, sql, parametros):
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(sql, parametros)
+        finally:
+            metricas.duracao_sql(sql)(time.perf_counter() - inicio)
+
+class ConexaoReutilizavel(sqlite3.Connection):
+    """Conexão que volta para o pool da thread em vez de ser fechada.
+
+    Comandos (inclusive ``conn.execute``) e commits são medidos para o /metrics.
+    """
+
+    def cursor(self, factory=CursorMedido):
+        return super().cursor(factory)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
+
+    def commit(self):
+        inicio = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            metricas.duracao_sql('COMMIT')(time.perf_counter() - inicio)
+
+    def close(self):
+        # Transação não confirmada é descartada, como num close() de verdade
+        if self.in_transaction:
+            self.rollback()
+        if not _devolver_conexao(self):
+            super().close()
+
+    def fechar_definitivamente(self):
+        super().close()
+
+def _pool_da_thread():
+    """Lista de conexões ociosas da thread atual"""
+    pool = getattr(_local, 'pool', None)
+    if pool is None or getattr(_local, 'pid', None) != os.getpid():
+        # Conexões herdadas de outro processo (fork) não podem ser reutilizadas
+        pool = []
+        _local.pool = pool
+        _local.pid = os.getpid()
+    return pool
+
+def _devolver_conexao(conn):
+    pool = _pool_da_thread()
+    if len(pool) < DB_POOL_MAX_IDLE:
+        pool.append(conn)
+        return True
+    return False
+
+def _nova_conexao():
+    """Abre uma conexão configurada (WAL, synchronous=NORMAL, busy timeout, cache de statements)"""
+    global _wal_configurado
+    conn = sqlite3.connect(
+        DATABASE,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        factory=ConexaoReutilizavel,
+        cached_statements=DB_CACHED_STATEMENTS
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute(f'PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}')
+    conn.execute('PRAGMA synchronous = NORMAL')
+
+    # journal_mode=WAL fica gravado no arquivo; basta ativar uma vez por processo
+    if not _wal_configurado:
+        with _wal_lock:
+            if not _wal_configurado:
+                conn.execute('PRAGMA journal_mode = WAL')
+                _wal_configurado = True
+    return conn
+
+def get_db_connection():
+    """Obtém conexão com o banco de dados (reutilizada do pool da thread; close() a devolve)"""
+    pool = _pool_da_thread()
+    if pool:
+        return pool.pop()
+    return _nova_conexao()
+
+# ========== CONTADORES DE VERSÃO COMPARTILHADOS ENTRE WORKERS ==========
+
+def ler_versao(nome):
+    """Lê o valor atual de um contador de versão (0 se ainda não existir)"""
+    conn = get_db_connection()
+    try:
+        row = conn.execute('SELECT value FROM version_counters WHERE name = ?', (nome,)).fetchone()
+        return row[0] if row else 0
+    finally:
+        conn.close()
+
+def incrementar_versao(nome, conn=None):
+    """Incrementa um contador de versão e retorna o novo valor.
+
+    Se ``conn`` for informado, o incremento participa da transação do chamador.
+    """
+    propria = conn is None
+    if propria:
+        conn = get_db_connection()
+    try:
+        conn.execute('''
+            INSERT INTO version_counters (name, value) VALUES (?, 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1
+        ''', (nome,))
+        valor = conn.execute('SELECT value FROM version_counters WHERE name = ?', (nome,)).fetchone()[0]
+        if propria:
+            conn.commit()
+        return valor
+    finally:
+        if propria:
+            conn.close()
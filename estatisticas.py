@@ -0,0 +1,19 @@
+# estatisticas.py
+
+# ========== CONTADORES DO PAINEL ADMIN ==========
+# Contagens de usuários e pedidos mantidas por triggers na mesma transação de
+# cada INSERT/DELETE: o painel lê uma linha por contador em vez de COUNT(*).
+# Os totais do catálogo (valor em estoque, categorias, promoções, estoque baixo)
+# não ficam aqui: GerenciadorProdutos os mantém junto com o índice em memória,
+# que é reconstruído do banco na carga e sincronizado pelos contadores de versão.
+
+# Tabela -> nome do contador
+CONTADORES = {
+    'users': 'total_users',
+    'orders': 'total_orders',
+}
+
+def ler_resumo(conn):
+    """Retorna {contador: valor} (uma leitura pela chave primária por contador)"""
+    valores = dict(conn.execute('SELECT name, value FROM stats_summary').fetchall())
+    return {contador: valores.get(contador, 0) for contador in CONTADORES.values()}
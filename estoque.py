@@ -0,0 +1,206 @@
+# estoque.py
+import logging
+import os
+import threading
+import time
+from database import DATABASE, get_db_connection, incrementar_versao
+
+logger = logging.getLogger(__name__)
+
+# Contador em version_counters das alterações de estoque (reservas, devoluções,
+# confirmações). Separado do contador do catálogo: um checkout não invalida os
+# caches do catálogo, os workers só atualizam produto.stock (products.stock_version).
+ESTOQUE_VERSAO = 'estoque'
+
+# Tempo que o estoque fica separado para um checkout ainda não pago
+ESTOQUE_RESERVA_TTL = float(os.environ.get('ESTOQUE_RESERVA_TTL', 1800))
+
+# Threads do mesmo worker entram em fila aqui, em vez de disputar o lock do
+# SQLite (cujo busy handler espera com sleeps crescentes e gera cauda longa)
+_escrita_lock = threading.Lock()
+
+# Entre workers, um flock no arquivo ao lado do banco faz o mesmo papel: o kernel
+# acorda o próximo assim que o lock é solto. Sem fcntl (Windows) vale só o busy timeout.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_arquivo_lock = None
+_arquivo_lock_pid = None
+
+class _LockEscrita:
+    """Serializa as transações de reserva: primeiro entre threads, depois entre processos"""
+
+    def __enter__(self):
+        global _arquivo_lock, _arquivo_lock_pid
+        _escrita_lock.acquire()
+        if fcntl is not None:
+            try:
+                if _arquivo_lock is None or _arquivo_lock_pid != os.getpid():
+                    _arquivo_lock = open(f"{DATABASE}.estoque.lock", 'a')
+                    _arquivo_lock_pid = os.getpid()
+                fcntl.flock(_arquivo_lock.fileno(), fcntl.LOCK_EX)
+            except OSError:
+                pass
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None and _arquivo_lock is not None:
+                fcntl.flock(_arquivo_lock.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        finally:
+            _escrita_lock.release()
+
+# Estados de uma reserva
+ATIVA = 'ativa'
+CONFIRMADA = 'confirmada'
+LIBERADA = 'liberada'
+
+class EstoqueInsuficiente(Exception):
+    """O produto não tem unidades suficientes para a reserva"""
+
+    def __init__(self, produto_id, disponivel):
+        super().__init__(f"Estoque insuficiente para o produto {produto_id}")
+        self.produto_id = produto_id
+        self.disponivel = disponivel
+
+
+def reservar(external_reference, itens, ttl=ESTOQUE_RESERVA_TTL):
+    """Debita o estoque de ``itens`` [(produto_id, quantidade)] e registra a reserva.
+
+    Cada débito é um compare-and-swap (``WHERE stock >= ?``) dentro de uma
+    transação curta com BEGIN IMMEDIATE: ou todos os itens são reservados ou
+    nenhum. Chamar de novo com a mesma referência não debita duas vezes.
+    Levanta EstoqueInsuficiente; retorna a nova versão do estoque (None se já reservado).
+    """
+    agora = time.time()
+    conn = get_db_connection()
+    try:
+        # Pré-checagem sem lock (leitura no WAL não bloqueia): SKU esgotado falha na hora
+        for produto_id, quantidade in itens:
+            row = conn.execute('SELECT stock FROM products WHERE id = ?', (produto_id,)).fetchone()
+            if row is None or row['stock'] < quantidade:
+                raise EstoqueInsuficiente(produto_id, row['stock'] if row else 0)
+
+        with _LockEscrita():
+            conn.execute('BEGIN IMMEDIATE')
+            if conn.execute('SELECT 1 FROM stock_reservations WHERE external_reference = ? AND status = ? LIMIT 1',
+                            (external_reference, ATIVA)).fetchone():
+                conn.rollback()
+                return None
+
+            versao = incrementar_versao(ESTOQUE_VERSAO, conn)
+            for produto_id, quantidade in sorted(itens):
+                # Compare-and-swap: só debita se ainda houver unidades suficientes
+                cursor = conn.execute('''
+                    UPDATE products SET stock = stock - ?, stock_version = ?
+                    WHERE id = ? AND stock >= ?
+                ''', (quantidade, versao, produto_id, quantidade))
+                if cursor.rowcount != 1:
+                    row = conn.execute('SELECT stock FROM products WHERE id = ?', (produto_id,)).fetchone()
+                    conn.rollback()
+                    raise EstoqueInsuficiente(produto_id, row['stock'] if row else 0)
+
+            conn.executemany('''
+                INSERT INTO stock_reservations (external_reference, product_id, quantity, status, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(external_reference, produto_id, quantidade, ATIVA, agora, agora + ttl) for produto_id, quantidade in itens])
+            conn.commit()
+            return versao
+    finally:
+        conn.close()
+
+def liberar(conn, external_reference):
+    """Devolve ao estoque as reservas ativas da referência (na transação do chamador)"""
+    rows = conn.execute('SELECT id, product_id, quantity FROM stock_reservations WHERE external_reference = ? AND status = ?',
+                        (external_reference, ATIVA)).fetchall()
+    if not rows:
+        return 0
+    versao = incrementar_versao(ESTOQUE_VERSAO, conn)
+    conn.executemany('UPDATE products SET stock = stock + ?, stock_version = ? WHERE id = ?',
+                     [(row['quantity'], versao, row['product_id']) for row in rows])
+    conn.executemany('UPDATE stock_reservations SET status = ?, released_at = ? WHERE id = ?',
+                     [(LIBERADA, time.time(), row['id']) for row in rows])
+    return len(rows)
+
+def confirmar(conn, external_reference):
+    """Torna definitivas as reservas de um pedido pago (na transação do chamador).
+
+    Se a reserva já tinha expirado e sido devolvida, o estoque é debitado de
+    novo: o pagamento aprovado vale mais que a expiração.
+    """
+    conn.execute('UPDATE stock_reservations SET status = ? WHERE external_reference = ? AND status = ?',
+                 (CONFIRMADA, external_reference, ATIVA))
+    devolvidas = conn.execute('SELECT id, product_id, quantity FROM stock_reservations WHERE external_reference = ? AND status = ?',
+                              (external_reference, LIBERADA)).fetchall()
+    if devolvidas:
+        versao = incrementar_versao(ESTOQUE_VERSAO, conn)
+        conn.executemany('UPDATE products SET stock = MAX(stock - ?, 0), stock_version = ? WHERE id = ?',
+                         [(row['quantity'], versao, row['product_id']) for row in devolvidas])
+        conn.executemany('UPDATE stock_reservations SET status = ?, released_at = NULL WHERE id = ?',
+                         [(CONFIRMADA, row['id']) for row in devolvidas])
+        logger.warning("⚠️ Pedido %s pago após a reserva expirar; estoque debitado novamente", external_reference)
+
+def aplicar_status_pedidos(conn, alterados):
+    """Confirma ou devolve o estoque conforme o novo status de cada pedido"""
+    for external_reference, status in alterados:
+        if status == 'pago':
+            confirmar(conn, external_reference)
+        elif status in ('recusado', 'cancelado'):
+            liberar(conn, external_reference)
+
+def carregar_alteracoes(desde_versao):
+    """Retorna (versao_atual, [(produto_id, estoque)]) dos produtos com estoque alterado desde a versão.
+
+    Lido numa única transação: a versão retornada é consistente com as linhas.
+    """
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN')
+        row = conn.execute('SELECT value FROM version_counters WHERE name = ?', (ESTOQUE_VERSAO,)).fetchone()
+        versao = row[0] if row else 0
+        alterados = [(r['id'], r['stock'] or 0) for r in conn.execute(
+            'SELECT id, stock FROM products WHERE stock_version > ?', (desde_versao,)
+        )]
+        conn.commit()
+        return versao, alterados
+    finally:
+        conn.close()
+
+def cancelar_reserva(external_reference):
+    """Devolve o estoque de um checkout que não chegou a gerar pedido"""
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        liberadas = liberar(conn, external_reference)
+        conn.commit()
+        return liberadas
+    finally:
+        conn.close()
+
+def liberar_expiradas(limite=500):
+    """Devolve as reservas vencidas de pedidos não pagos; retorna quantos pedidos foram tratados"""
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        rows = conn.execute('''
+            SELECT r.external_reference, MAX(o.status) AS order_status
+            FROM stock_reservations r
+            LEFT JOIN orders o ON o.external_reference = r.external_reference
+            WHERE r.status = ? AND r.expires_at <= ?
+            GROUP BY r.external_reference
+            LIMIT ?
+        ''', (ATIVA, time.time(), limite)).fetchall()
+        for row in rows:
+            if row['order_status'] == 'pago':
+                confirmar(conn, row['external_reference'])
+            else:
+                liberar(conn, row['external_reference'])
+        conn.commit()
+        return len(rows)
+    finally:
+        conn.close()
+
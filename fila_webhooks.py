@@ -0,0 +1,227 @@
+# fila_webhooks.py
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from database import get_db_connection
+from gateway_pagamento import ClienteMercadoPago, ClienteMercadoPagoAsync
+import pedidos
+
+logger = logging.getLogger(__name__)
+
+# Configuração do consumidor da fila de webhooks
+WEBHOOK_LOTE = int(os.environ.get('WEBHOOK_LOTE', 100))
+WEBHOOK_INTERVALO = float(os.environ.get('WEBHOOK_INTERVALO', 1.0))
+WEBHOOK_CONCORRENCIA = int(os.environ.get('WEBHOOK_CONCORRENCIA', 4))
+WEBHOOK_MAX_TENTATIVAS = int(os.environ.get('WEBHOOK_MAX_TENTATIVAS', 8))
+# Tempo que um lote fica reservado para um worker antes de outro poder pegá-lo
+WEBHOOK_RESERVA = float(os.environ.get('WEBHOOK_RESERVA', 120))
+
+def identificar_notificacao(dados, args):
+    """Extrai (notification_id, topic, resource_id) do corpo JSON ou da query string (IPN)"""
+    dados = dados or {}
+    topic = dados.get('type') or dados.get('topic') or args.get('type') or args.get('topic')
+    recurso = (dados.get('data') or {}).get('id') or args.get('data.id') or args.get('id')
+    if recurso is None and isinstance(dados.get('resource'), str):
+        recurso = dados['resource'].rstrip('/').rsplit('/', 1)[-1]
+    recurso = str(recurso) if recurso is not None else None
+
+    # O Mercado Pago reenvia a mesma notificação com o mesmo id
+    notificacao = dados.get('id')
+    if notificacao is None:
+        notificacao = f"{topic}:{recurso}:{dados.get('action', '')}"
+    return str(notificacao), topic, recurso
+
+def enfileirar(dados, args):
+    """Grava a notificação na fila. Retorna False se ela já tinha sido recebida."""
+    notification_id, topic, resource_id = identificar_notificacao(dados, args)
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute('''
+            INSERT OR IGNORE INTO webhook_inbox (notification_id, topic, resource_id, payload, received_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (notification_id, topic, resource_id, json.dumps(dados or dict(args), ensure_ascii=False), time.time()))
+        conn.commit()
+        return cursor.rowcount == 1
+    finally:
+        conn.close()
+
+
+class ConsumidorWebhooks:
+    """Thread que aplica as notificações da fila em lotes.
+
+    Cada worker roda um consumidor; os lotes são reservados no banco
+    (claimed_by/claimed_until), então dois workers nunca processam a mesma
+    notificação. O status vem do pagamento consultado no gateway, nunca do
+    corpo da notificação.
+    """
+
+    def __init__(self, cliente: ClienteMercadoPago = None, lote: int = WEBHOOK_LOTE,
+                 intervalo: float = WEBHOOK_INTERVALO, concorrencia: int = WEBHOOK_CONCORRENCIA):
+        self.cliente = cliente
+        self.lote = lote
+        self.intervalo = intervalo
+        self.concorrencia = concorrencia
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = None
+        self._metricas = {"lotes": 0, "processadas": 0, "falhas": 0, "pedidos_atualizados": 0, "ultimo_atraso_ms": 0.0}
+        self._lock = threading.Lock()
+
+    def _cliente(self):
+        if self.cliente is None:
+            self.cliente = ClienteMercadoPago(max_concorrentes=self.concorrencia)
+        return self.cliente
+
+    def iniciar(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name='consumidor-webhooks', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        self._acordar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def notificar(self):
+        """Acorda o consumidor deste worker (chamado após enfileirar)"""
+        self._acordar.set()
+
+    def _loop(self):
+        while not self._parar.is_set():
+            try:
+                # Lote cheio: continua sem esperar
+                if self.processar_lote() >= self.lote:
+                    continue
+            except Exception as e:
+                logger.error("❌ Erro no consumidor de webhooks: %s", e)
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+
+    def _reservar_lote(self):
+        agora = time.time()
+        conn = get_db_connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('''
+                UPDATE webhook_inbox SET claimed_by = ?, claimed_until = ?
+                WHERE id IN (
+                    SELECT id FROM webhook_inbox
+                    WHERE processed_at IS NULL AND next_attempt_at <= ?
+                      AND (claimed_until IS NULL OR claimed_until < ?)
+                    ORDER BY next_attempt_at, id LIMIT ?
+                )
+            ''', (self.dono, agora + WEBHOOK_RESERVA, agora, agora, self.lote))
+            rows = conn.execute('''
+                SELECT id, topic, resource_id, received_at, attempts FROM webhook_inbox
+                WHERE claimed_by = ? AND processed_at IS NULL
+            ''', (self.dono,)).fetchall()
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+    def _consultar_pagamentos(self, ids_pagamento):
+        """Consulta os pagamentos no gateway com concorrência limitada; retorna {id: resposta ou exceção}"""
+        cliente_async = ClienteMercadoPagoAsync(self._cliente(), self.concorrencia)
+        resultados = asyncio.run(cliente_async.mapear('consultar_pagamento', ids_pagamento))
+        return dict(zip(ids_pagamento, resultados))
+
+    def processar_lote(self):
+        """Processa um lote da fila; retorna quantas notificações foram reservadas"""
+        rows = self._reservar_lote()
+        if not rows:
+            return 0
+
+        # Várias notificações do mesmo pagamento viram uma única consulta
+        ids_pagamento = sorted({row['resource_id'] for row in rows if row['topic'] == 'payment' and row['resource_id']})
+        pagamentos = self._consultar_pagamentos(ids_pagamento) if ids_pagamento else {}
+
+        atualizacoes = []
+        concluidas = []
+        falhas = []
+        for row in rows:
+            if row['topic'] != 'payment' or not row['resource_id']:
+                # Outros tópicos (merchant_order, etc.) não alteram pedidos
+                concluidas.append((row['id'], None))
+                continue
+            resultado = pagamentos.get(row['resource_id'])
+            if isinstance(resultado, Exception):
+                falhas.append((row, str(resultado)))
+            elif resultado.get('status') == 200:
+                atualizacoes.append(pedidos.resumo_pagamento(resultado.get('response', {})))
+                concluidas.append((row['id'], None))
+            elif resultado.get('status') == 404:
+                concluidas.append((row['id'], 'Pagamento não encontrado no gateway'))
+            else:
+                falhas.append((row, f"Status {resultado.get('status')}"))
+
+        agora = time.time()
+        conn = get_db_connection()
+        try:
+            # Pedidos e fila na mesma transação: uma notificação nunca é aplicada pela metade
+            conn.execute('BEGIN IMMEDIATE')
+            alterados = pedidos.aplicar_status(conn, atualizacoes)
+            conn.executemany('''
+                UPDATE webhook_inbox SET processed_at = ?, attempts = attempts + 1, last_error = ?, claimed_by = NULL, claimed_until = NULL
+                WHERE id = ?
+            ''', [(agora, erro, id_) for id_, erro in concluidas])
+            for row, erro in falhas:
+                tentativas = row['attempts'] + 1
+                # Backoff exponencial; depois do limite a notificação fica registrada como falha
+                conn.execute('''
+                    UPDATE webhook_inbox
+                    SET attempts = ?, last_error = ?, next_attempt_at = ?, claimed_by = NULL, claimed_until = NULL,
+                        processed_at = CASE WHEN ? >= ? THEN ? END
+                    WHERE id = ?
+                ''', (tentativas, erro, agora + min(2 ** tentativas, 3600), tentativas, WEBHOOK_MAX_TENTATIVAS, agora, row['id']))
+            conn.commit()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._metricas["lotes"] += 1
+            self._metricas["processadas"] += len(concluidas)
+            self._metricas["falhas"] += len(falhas)
+            self._metricas["pedidos_atualizados"] += len(alterados)
+            self._metricas["ultimo_atraso_ms"] = round((agora - min(row['received_at'] for row in rows)) * 1000, 1)
+
+        for external_reference, status in alterados:
+            logger.info("✅ Pedido %s atualizado para '%s'", external_reference, status,
+                        extra={"external_reference": external_reference, "status": status, "origem": "webhook"})
+        return len(rows)
+
+    def estatisticas(self):
+        """Métricas deste worker e tamanho atual da fila"""
+        conn = get_db_connection()
+        try:
+            row = conn.execute('''
+                SELECT COUNT(*) AS pendentes, MIN(received_at) AS mais_antiga
+                FROM webhook_inbox WHERE processed_at IS NULL
+            ''').fetchone()
+        finally:
+            conn.close()
+        with self._lock:
+            metricas = dict(self._metricas)
+        metricas["pendentes"] = row['pendentes']
+        metricas["atraso_mais_antiga_s"] = round(time.time() - row['mais_antiga'], 1) if row['mais_antiga'] else 0
+        return metricas
+
+    def limpar_processadas(self, idade=7 * 24 * 3600):
+        """Remove notificações já processadas há mais de ``idade`` segundos"""
+        conn = get_db_connection()
+        try:
+            cursor = conn.execute('DELETE FROM webhook_inbox WHERE processed_at IS NOT NULL AND processed_at < ?', (time.time() - idade,))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
@@ -0,0 +1,231 @@
+# gateway_pagamento.py
+import asyncio
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+import metricas
+
+load_dotenv()
+
+# Configuração do cliente HTTP do Mercado Pago
+MP_ACCESS_TOKEN = os.environ.get('MP_ACCESS_TOKEN', '')
+MP_API_BASE_URL = os.environ.get('MP_API_BASE_URL', 'https://api.mercadopago.com')
+MP_TIMEOUT_CONEXAO = float(os.environ.get('MP_TIMEOUT_CONEXAO', 3.05))
+MP_TIMEOUT_LEITURA = float(os.environ.get('MP_TIMEOUT_LEITURA', 10))
+MP_MAX_TENTATIVAS = int(os.environ.get('MP_MAX_TENTATIVAS', 3))
+MP_ORCAMENTO_TOTAL = float(os.environ.get('MP_ORCAMENTO_TOTAL', 20))
+MP_POOL_CONEXOES = int(os.environ.get('MP_POOL_CONEXOES', 10))
+# Chamadas simultâneas ao gateway por cliente. O padrão cobre as threads de um
+# worker (gunicorn --threads) e sobra para o agendador; acima disso o gateway
+# está lento e a chamada excedente falha logo (503 + Retry-After no checkout)
+# em vez de segurar a thread esperando vaga.
+MP_MAX_CONCORRENTES = int(os.environ.get('MP_MAX_CONCORRENTES', 4))
+MP_ESPERA_VAGA = float(os.environ.get('MP_ESPERA_VAGA', 0.1))
+
+# Respostas que valem uma nova tentativa
+STATUS_TEMPORARIOS = {408, 425, 429, 500, 502, 503, 504}
+
+# Backoff exponencial com jitter completo
+BACKOFF_BASE = 0.25
+BACKOFF_MAXIMO = 4.0
+
+
+class ErroGateway(Exception):
+    """Falha ao falar com o gateway de pagamento"""
+
+    def __init__(self, mensagem, status=None, resposta=None, temporario=False):
+        super().__init__(mensagem)
+        self.status = status
+        self.resposta = resposta
+        self.temporario = temporario
+
+
+class ClienteMercadoPago:
+    """Cliente HTTP do Mercado Pago com conexões reaproveitadas, timeouts e novas tentativas.
+
+    As respostas seguem o formato do SDK oficial: {"status": int, "response": dict}.
+    ``base_url`` pode apontar para um servidor stub local em testes.
+    """
+
+    def __init__(self, access_token=None, base_url=None, timeout=None, max_tentativas=None,
+                 orcamento_total=None, max_concorrentes=None, espera_vaga=None, sessao=None):
+        self.access_token = MP_ACCESS_TOKEN if access_token is None else access_token
+        self.base_url = (base_url or MP_API_BASE_URL).rstrip('/')
+        self.timeout = timeout or (MP_TIMEOUT_CONEXAO, MP_TIMEOUT_LEITURA)
+        self.max_tentativas = max_tentativas or MP_MAX_TENTATIVAS
+        self.orcamento_total = orcamento_total or MP_ORCAMENTO_TOTAL
+        self.espera_vaga = MP_ESPERA_VAGA if espera_vaga is None else espera_vaga
+        self._vagas = threading.BoundedSemaphore(max_concorrentes or MP_MAX_CONCORRENTES)
+
+        if sessao is None:
+            # Keep-alive: a mesma sessão mantém conexões TLS abertas entre requisições
+            sessao = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=MP_POOL_CONEXOES, pool_maxsize=MP_POOL_CONEXOES, max_retries=0)
+            sessao.mount('https://', adaptador)
+            sessao.mount('http://', adaptador)
+        self.sessao = sessao
+
+    @property
+    def configurado(self):
+        return bool(self.access_token)
+
+    def _cabecalhos(self, chave_idempotencia=None):
+        cabecalhos = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+        }
+        if chave_idempotencia:
+            cabecalhos["X-Idempotency-Key"] = str(chave_idempotencia)
+        return cabecalhos
+
+    def _espera(self, tentativa, retry_after=None):
+        """Tempo até a próxima tentativa (jitter completo, respeitando Retry-After)"""
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAXIMO)
+            except ValueError:
+                pass
+        return random.uniform(0, min(BACKOFF_MAXIMO, BACKOFF_BASE * (2 ** tentativa)))
+
+    def requisitar(self, metodo, caminho, dados=None, params=None, chave_idempotencia=None, operacao=None):
+        """Executa a requisição com novas tentativas quando é seguro repeti-la.
+
+        GET é sempre repetível; POST/PUT só com chave de idempotência.
+        ``operacao`` nomeia a chamada nas métricas (padrão: o método HTTP).
+        """
+        repetivel = metodo.upper() == 'GET' or bool(chave_idempotencia)
+        url = f"{self.base_url}{caminho}"
+        operacao = operacao or metodo.lower()
+        inicio = time.monotonic()
+        resultado = 'exception'
+
+        try:
+            if not self._vagas.acquire(timeout=self.espera_vaga):
+                resultado = 'busy'
+                raise ErroGateway("Gateway de pagamento ocupado, tente novamente", temporario=True)
+            try:
+                tentativa = 0
+                while True:
+                    tentativa += 1
+                    retry_after = None
+                    try:
+                        resposta = self.sessao.request(
+                            metodo, url, json=dados, params=params,
+                            headers=self._cabecalhos(chave_idempotencia), timeout=self.timeout
+                        )
+                        try:
+                            corpo = resposta.json()
+                        except ValueError:
+                            corpo = {"raw": resposta.text}
+
+                        if resposta.status_code not in STATUS_TEMPORARIOS:
+                            resultado = str(resposta.status_code)
+                            return {"status": resposta.status_code, "response": corpo}
+
+                        erro = ErroGateway(f"Status {resposta.status_code}", resposta.status_code, corpo, temporario=True)
+                        retry_after = resposta.headers.get('Retry-After')
+                    except (requests.ConnectionError, requests.Timeout) as e:
+                        erro = ErroGateway(f"Falha de rede: {str(e)}", temporario=True)
+
+                    espera = self._espera(tentativa, retry_after)
+                    decorrido = time.monotonic() - inicio
+                    if (not repetivel or tentativa >= self.max_tentativas
+                            or decorrido + espera >= self.orcamento_total):
+                        resultado = str(erro.status) if erro.status else 'network_error'
+                        raise erro
+                    metricas.GATEWAY_NOVAS_TENTATIVAS.labels(operacao).inc()
+                    time.sleep(espera)
+            finally:
+                self._vagas.release()
+        finally:
+            metricas.GATEWAY_DURACAO.labels(operacao).observe(time.monotonic() - inicio)
+            metricas.GATEWAY_REQUISICOES.labels(operacao, resultado).inc()
+
+    def criar_preferencia(self, dados, chave_idempotencia=None):
+        """POST /checkout/preferences"""
+        return self.requisitar('POST', '/checkout/preferences', dados=dados, chave_idempotencia=chave_idempotencia,
+                               operacao='criar_preferencia')
+
+    def consultar_pagamento(self, payment_id):
+        """GET /v1/payments/{id}"""
+        return self.requisitar('GET', f'/v1/payments/{payment_id}', operacao='consultar_pagamento')
+
+    def buscar_pagamentos(self, external_reference):
+        """GET /v1/payments/search?external_reference=..."""
+        return self.requisitar('GET', '/v1/payments/search', params={
+            "external_reference": external_reference,
+            "sort": "date_created",
+            "criteria": "desc",
+        }, operacao='buscar_pagamentos')
+
+    def listar_meios_pagamento(self):
+        """GET /v1/payment_methods"""
+        return self.requisitar('GET', '/v1/payment_methods', operacao='listar_meios_pagamento')
+
+    def fechar(self):
+        self.sessao.close()
+
+
+class ClienteMercadoPagoAsync:
+    """Variante asyncio: executa as chamadas do cliente síncrono em threads, com concorrência limitada.
+
+    Todas as chamadas (avulsas ou via ``mapear``) passam pelo mesmo semáforo:
+    no máximo ``max_concorrentes`` threads ocupadas com o gateway por vez.
+    """
+
+    def __init__(self, cliente: ClienteMercadoPago = None, max_concorrentes: int = 4):
+        # Cliente próprio, com vagas suficientes para a concorrência pedida
+        self.cliente = cliente or ClienteMercadoPago(max_concorrentes=max_concorrentes)
+        self.max_concorrentes = max_concorrentes
+        self._loop = None
+        self._semaforo = None
+
+    def _vagas(self):
+        """Semáforo do loop em execução (um asyncio.Semaphore fica preso ao loop em que foi usado)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaforo = asyncio.Semaphore(self.max_concorrentes)
+        return self._semaforo
+
+    async def _chamar(self, funcao, *args, **kwargs):
+        async with self._vagas():
+            return await asyncio.to_thread(funcao, *args, **kwargs)
+
+    async def criar_preferencia(self, dados, chave_idempotencia=None):
+        return await self._chamar(self.cliente.criar_preferencia, dados, chave_idempotencia)
+
+    async def consultar_pagamento(self, payment_id):
+        return await self._chamar(self.cliente.consultar_pagamento, payment_id)
+
+    async def buscar_pagamentos(self, external_reference):
+        return await self._chamar(self.cliente.buscar_pagamentos, external_reference)
+
+    async def mapear(self, nome_metodo, argumentos):
+        """Chama ``nome_metodo`` para cada argumento, no máximo ``max_concorrentes`` por vez.
+
+        Retorna a lista de resultados (ou a exceção de cada chamada que falhou), na ordem dos argumentos.
+        """
+        funcao = getattr(self.cliente, nome_metodo)
+        return await asyncio.gather(
+            *(self._chamar(funcao, argumento) for argumento in argumentos),
+            return_exceptions=True
+        )
+
+
+# Cliente compartilhado pelo processo (um pool de conexões por worker)
+_cliente_padrao = None
+_cliente_lock = threading.Lock()
+
+def obter_cliente():
+    """Cliente padrão do processo, criado na primeira chamada"""
+    global _cliente_padrao
+    if _cliente_padrao is None:
+        with _cliente_lock:
+            if _cliente_padrao is None:
+                _cliente_padrao = ClienteMercadoPago()
+    return _cliente_padrao
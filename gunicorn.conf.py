@@ -0,0 +1,24 @@
+# gunicorn.conf.py
+# Lido automaticamente pelo gunicorn (arquivo no diretório atual). Bind, workers
+# e threads continuam na linha de comando (render.yaml / Procfile); aqui ficam só
+# os hooks do master que os workers não conseguem fazer sozinhos.
+import glob
+import os
+import tempfile
+
+# Diretório onde cada worker grava as suas métricas (modo multiprocesso do prometheus_client)
+METRICAS_DIRETORIO_PADRAO = os.path.join(tempfile.gettempdir(), 'romanel-metricas')
+
+
+def on_starting(server):
+    """Antes de criar os workers: diretório das métricas definido e sem arquivos de execuções anteriores"""
+    diretorio = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', METRICAS_DIRETORIO_PADRAO)
+    os.makedirs(diretorio, exist_ok=True)
+    for arquivo in glob.glob(os.path.join(diretorio, '*.db')):
+        os.remove(arquivo)
+
+
+def child_exit(server, worker):
+    """Worker encerrado: os gauges "live" dele deixam de contar (contadores e histogramas continuam somando)"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,145 @@
+# idempotencia.py
+import hashlib
+import json
+import os
+import time
+import uuid
+from database import get_db_connection
+
+# Tempo de vida das chaves de idempotência
+IDEMPOTENCIA_TTL = float(os.environ.get('IDEMPOTENCIA_TTL', 24 * 3600))
+# Chaves derivadas do carrinho (sem cabeçalho Idempotency-Key) valem menos tempo
+IDEMPOTENCIA_TTL_DERIVADA = float(os.environ.get('IDEMPOTENCIA_TTL_DERIVADA', 600))
+# Tempo máximo que uma requisição pode segurar a chave antes de outra assumir
+IDEMPOTENCIA_LOCK = float(os.environ.get('IDEMPOTENCIA_LOCK', 60))
+
+# Estados de uma chave
+PROCESSANDO = 'processando'
+CONCLUIDO = 'concluido'
+
+def impressao_digital(dados):
+    """Hash estável do conteúdo da requisição (ordem das chaves não importa)"""
+    texto = json.dumps(dados, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def chave_derivada(nome, email, carrinho, frete):
+    """Chave para clientes que não enviam Idempotency-Key: mesmo cliente, carrinho e frete"""
+    itens = sorted(
+        (str(item.get('id')), int(item.get('quantity', 1)), float(item.get('price', 0)))
+        for item in carrinho
+    )
+    return 'auto:' + impressao_digital({"nome": nome, "email": email.lower(), "itens": itens, "frete": float(frete)})
+
+
+class Reserva:
+    """Resultado de ``reservar``"""
+
+    def __init__(self, estado, external_reference=None, resposta=None, http_status=None, dono=None):
+        self.estado = estado                        # 'nova', 'concluida', 'em_andamento' ou 'conflito'
+        self.external_reference = external_reference
+        self.resposta = resposta
+        self.http_status = http_status
+        self.dono = dono
+
+
+def reservar(chave, fingerprint, ttl=IDEMPOTENCIA_TTL):
+    """Tenta obter a chave para processar a requisição.
+
+    - 'nova': esta requisição deve processar (e depois chamar ``concluir`` ou ``liberar``)
+    - 'concluida': já processada; ``resposta`` tem o corpo guardado
+    - 'em_andamento': outra requisição está processando agora
+    - 'conflito': a chave já foi usada com outro conteúdo
+    """
+    agora = time.time()
+    dono = uuid.uuid4().hex
+    conn = get_db_connection()
+    try:
+        # BEGIN IMMEDIATE: leitura e escrita da chave são atômicas entre workers
+        conn.execute('BEGIN IMMEDIATE')
+        row = conn.execute('''
+            SELECT fingerprint, status, external_reference, response, http_status, expires_at, locked_until
+            FROM checkout_idempotency WHERE key = ?
+        ''', (chave,)).fetchone()
+
+        if row and row['expires_at'] > agora:
+            if row['fingerprint'] != fingerprint:
+                conn.rollback()
+                return Reserva('conflito')
+            if row['status'] == CONCLUIDO:
+                conn.rollback()
+                return Reserva('concluida', row['external_reference'], json.loads(row['response']), row['http_status'])
+            if row['locked_until'] and row['locked_until'] > agora:
+                conn.rollback()
+                return Reserva('em_andamento', row['external_reference'])
+            # Quem segurava a chave travou ou caiu: assume com a mesma external_reference,
+            # assim o gateway reconhece a repetição pela chave de idempotência
+            external_reference = row['external_reference']
+        else:
+            external_reference = f"pedido_{uuid.uuid4().hex}"
+
+        conn.execute('''
+            INSERT OR REPLACE INTO checkout_idempotency
+                (key, fingerprint, status, external_reference, response, http_status, owner, created_at, expires_at, locked_until)
+            VALUES (?, ?, ?, ?, NULL, NULL, ?, ?, ?, ?)
+        ''', (chave, fingerprint, PROCESSANDO, external_reference, dono, agora, agora + ttl, agora + IDEMPOTENCIA_LOCK))
+        conn.commit()
+        return Reserva('nova', external_reference, dono=dono)
+    finally:
+        conn.close()
+
+def aguardar(chave, fingerprint, espera=5.0, intervalo=0.2):
+    """Espera outra requisição concluir a chave; retorna a Reserva final ou None se não deu tempo"""
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        time.sleep(intervalo)
+        conn = get_db_connection()
+        try:
+            row = conn.execute('''
+                SELECT fingerprint, status, external_reference, response, http_status
+                FROM checkout_idempotency WHERE key = ?
+            ''', (chave,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            # A outra requisição falhou e liberou a chave
+            return None
+        if row['fingerprint'] == fingerprint and row['status'] == CONCLUIDO:
+            return Reserva('concluida', row['external_reference'], json.loads(row['response']), row['http_status'])
+    return None
+
+def concluir(conn, chave, dono, resposta, http_status=200):
+    """Grava a resposta da chave na transação do chamador (junto com o pedido).
+
+    Retorna False se a chave foi assumida por outra requisição; nesse caso o
+    chamador deve desfazer a transação para não gravar o pedido duas vezes.
+    """
+    cursor = conn.execute('''
+        UPDATE checkout_idempotency
+        SET status = ?, response = ?, http_status = ?, locked_until = NULL
+        WHERE key = ? AND owner = ?
+    ''', (CONCLUIDO, json.dumps(resposta, ensure_ascii=False), http_status, chave, dono))
+    return cursor.rowcount == 1
+
+def liberar(chave, dono):
+    """Libera a chave após uma falha, para que a próxima tentativa possa processar.
+
+    Retorna False se a chave já tinha sido assumida por outra requisição.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute('DELETE FROM checkout_idempotency WHERE key = ? AND owner = ? AND status = ?',
+                              (chave, dono, PROCESSANDO))
+        conn.commit()
+        return cursor.rowcount == 1
+    finally:
+        conn.close()
+
+def limpar_expiradas():
+    """Remove chaves expiradas; retorna quantas foram removidas"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute('DELETE FROM checkout_idempotency WHERE expires_at <= ?', (time.time(),))
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
@@ -0,0 +1,166 @@
+# manutencao.py
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Nome da linha de lease disputada pelos workers
+LEASE_AGENDADOR = 'agendador_manutencao'
+
+class AgendadorManutencao:
+    """Executa tarefas periódicas fora do caminho das requisições.
+
+    Todos os workers iniciam o agendador, mas só o detentor do lease em
+    maintenance_leases executa as tarefas; se ele morrer, o lease expira e
+    outro worker assume.
+    """
+
+    def __init__(self, intervalo_tick: float = 15.0, duracao_lease: float = 60.0):
+        self.intervalo_tick = intervalo_tick
+        self.duracao_lease = duracao_lease
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tarefas = {}     # nome -> (intervalo_segundos, funcao)
+        self._parar = threading.Event()
+        self._thread = None
+
+    def registrar(self, nome: str, intervalo: float, funcao):
+        """Registra uma tarefa a ser executada a cada ``intervalo`` segundos"""
+        self._tarefas[nome] = (intervalo, funcao)
+
+    def iniciar(self):
+        """Inicia a thread do agendador (uma vez por processo)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name='agendador-manutencao', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        """Pede para a thread terminar e libera o lease"""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.intervalo_tick)
+        self._liberar_lease()
+
+    def _loop(self):
+        while not self._parar.is_set():
+            try:
+                self.executar_pendentes()
+            except Exception as e:
+                logger.error("❌ Erro no agendador de manutenção: %s", e)
+            self._parar.wait(self.intervalo_tick)
+
+    def _obter_lease(self) -> bool:
+        """Obtém ou renova o lease; retorna True se este processo é o executor"""
+        agora = time.time()
+        conn = get_db_connection()
+        try:
+            cursor = conn.execute('''
+                INSERT INTO maintenance_leases (name, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE maintenance_leases.owner = excluded.owner OR maintenance_leases.expires_at < ?
+            ''', (LEASE_AGENDADOR, self.dono, agora + self.duracao_lease, agora))
+            obtido = cursor.rowcount == 1
+            conn.commit()
+            return obtido
+        finally:
+            conn.close()
+
+    def _liberar_lease(self):
+        conn = get_db_connection()
+        try:
+            conn.execute('DELETE FROM maintenance_leases WHERE name = ? AND owner = ?', (LEASE_AGENDADOR, self.dono))
+            conn.commit()
+        except Exception:
+            pass
+        finally:
+            conn.close()
+
+    def _ultimas_execucoes(self):
+        conn = get_db_connection()
+        try:
+            return {row['name']: row['last_run_at'] for row in conn.execute('SELECT name, last_run_at FROM maintenance_jobs')}
+        finally:
+            conn.close()
+
+    def _registrar_execucao(self, nome, inicio, duracao_ms, erro):
+        conn = get_db_connection()
+        try:
+            conn.execute('''
+                INSERT INTO maintenance_jobs (name, last_run_at, last_duration_ms, max_duration_ms,
+                                              total_duration_ms, runs, failures, last_error, last_owner)
+                VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    last_run_at = excluded.last_run_at,
+                    last_duration_ms = excluded.last_duration_ms,
+                    max_duration_ms = MAX(maintenance_jobs.max_duration_ms, excluded.last_duration_ms),
+                    total_duration_ms = maintenance_jobs.total_duration_ms + excluded.last_duration_ms,
+                    runs = maintenance_jobs.runs + 1,
+                    failures = maintenance_jobs.failures + excluded.failures,
+                    last_error = excluded.last_error,
+                    last_owner = excluded.last_owner
+            ''', (nome, inicio, duracao_ms, duracao_ms, duracao_ms, 1 if erro else 0, erro, self.dono))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def executar_pendentes(self):
+        """Executa as tarefas vencidas, se este processo detiver o lease"""
+        if not self._tarefas or not self._obter_lease():
+            return []
+
+        ultimas = self._ultimas_execucoes()
+        executadas = []
+        for nome, (intervalo, funcao) in self._tarefas.items():
+            if self._parar.is_set():
+                break
+            ultima = ultimas.get(nome)
+            if ultima is not None and time.time() - ultima < intervalo:
+                continue
+            # Renova o lease antes de cada tarefa; se outro worker assumiu, para aqui
+            if not self._obter_lease():
+                break
+
+            inicio = time.time()
+            erro = None
+            try:
+                funcao()
+            except Exception as e:
+                erro = str(e)
+                logger.error("❌ Tarefa de manutenção '%s' falhou: %s", nome, erro)
+            duracao_ms = (time.time() - inicio) * 1000
+            self._registrar_execucao(nome, inicio, duracao_ms, erro)
+            logger.info("🛠️ Tarefa de manutenção '%s' executada em %.1f ms", nome, duracao_ms)
+            executadas.append(nome)
+        return executadas
+
+    def estatisticas(self):
+        """Métricas das tarefas (de todos os workers) e dono atual do lease"""
+        conn = get_db_connection()
+        try:
+            lease = conn.execute('SELECT owner, expires_at FROM maintenance_leases WHERE name = ?', (LEASE_AGENDADOR,)).fetchone()
+            tarefas = {}
+            for row in conn.execute('SELECT * FROM maintenance_jobs ORDER BY name'):
+                tarefas[row['name']] = {
+                    "last_run_at": datetime.fromtimestamp(row['last_run_at']).isoformat() if row['last_run_at'] else None,
+                    "last_duration_ms": round(row['last_duration_ms'] or 0, 2),
+                    "max_duration_ms": round(row['max_duration_ms'] or 0, 2),
+                    "avg_duration_ms": round((row['total_duration_ms'] or 0) / row['runs'], 2) if row['runs'] else 0,
+                    "runs": row['runs'],
+                    "failures": row['failures'],
+                    "last_error": row['last_error']
+                }
+            return {
+                "lease_owner": lease['owner'] if lease and lease['expires_at'] > time.time() else None,
+                "this_worker": self.dono,
+                "jobs": tarefas
+            }
+        finally:
+            conn.close()
@@ -0,0 +1,136 @@
+# metricas.py
+import os
+import time
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# Com vários workers do gunicorn, cada processo grava as métricas em arquivos
+# deste diretório e o /metrics soma todos (modo multiprocesso do prometheus_client).
+# O gunicorn.conf.py define e esvazia o diretório na subida do master; sem a
+# variável (python app.py, flask run) as métricas ficam na memória do processo.
+METRICAS_DIRETORIO = os.environ.get('PROMETHEUS_MULTIPROC_DIR', '')
+# Se definido, o /metrics exige "Authorization: Bearer <token>"
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN', '')
+
+if METRICAS_DIRETORIO:
+    os.makedirs(METRICAS_DIRETORIO, exist_ok=True)
+
+# Limites dos histogramas (segundos). Páginas pré-renderizadas respondem abaixo
+# de 1 ms; o checkout espera o gateway, que pode levar segundos.
+BUCKETS_HTTP = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_SQL = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5)
+BUCKETS_GATEWAY = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30)
+
+# ========== MÉTRICAS ==========
+
+HTTP_REQUISICOES = Counter(
+    'http_requests_total', 'Requisições HTTP por endpoint, método e status',
+    ['endpoint', 'method', 'status']
+)
+HTTP_DURACAO = Histogram(
+    'http_request_duration_seconds', 'Tempo de resposta por endpoint',
+    ['endpoint', 'method'], buckets=BUCKETS_HTTP
+)
+SQL_DURACAO = Histogram(
+    'sqlite_query_duration_seconds', 'Tempo de execução dos comandos SQLite por tipo',
+    ['operation'], buckets=BUCKETS_SQL
+)
+GATEWAY_DURACAO = Histogram(
+    'mercadopago_request_duration_seconds', 'Duração das chamadas ao Mercado Pago (incluindo novas tentativas)',
+    ['operation'], buckets=BUCKETS_GATEWAY
+)
+GATEWAY_REQUISICOES = Counter(
+    'mercadopago_requests_total', 'Chamadas ao Mercado Pago por resultado (status HTTP, network_error, busy)',
+    ['operation', 'result']
+)
+GATEWAY_NOVAS_TENTATIVAS = Counter(
+    'mercadopago_retries_total', 'Novas tentativas após falha temporária do Mercado Pago',
+    ['operation']
+)
+CACHE_ACERTOS = Counter('cache_hits_total', 'Leituras atendidas pelo cache', ['cache'])
+CACHE_FALTAS = Counter('cache_misses_total', 'Leituras que precisaram recalcular o valor', ['cache'])
+# Todos os workers convergem para o mesmo catálogo: vale o valor gravado por último
+CATALOGO_PRODUTOS = Gauge('catalog_products', 'Produtos no catálogo', multiprocess_mode='livemostrecent')
+
+
+class ContadorCache:
+    """Acertos e faltas de um cache nomeado (taxa de acerto = hits / (hits + misses))"""
+
+    __slots__ = ('acerto', 'falta')
+
+    def __init__(self, nome):
+        # Séries resolvidas uma vez: no caminho quente só sobra o incremento
+        self.acerto = CACHE_ACERTOS.labels(nome).inc
+        self.falta = CACHE_FALTAS.labels(nome).inc
+
+
+# ========== SQLITE ==========
+
+# BEGIN IMMEDIATE separado: o tempo dele é a espera pelo lock de escrita
+OPERACOES_SQL = {'select', 'insert', 'update', 'delete', 'begin', 'commit'}
+MAX_COMANDOS_SQL = 4096
+
+# Texto do comando -> observe() do histograma do seu tipo (os comandos se repetem)
+_duracao_sql = {}
+
+def duracao_sql(sql):
+    """Função que registra a duração de ``sql`` no histograma do tipo do comando"""
+    observar = _duracao_sql.get(sql)
+    if observar is None:
+        palavras = sql.split(None, 1)
+        operacao = palavras[0].lower() if palavras else ''
+        if operacao == 'with':
+            operacao = 'select'
+        if operacao not in OPERACOES_SQL:
+            operacao = 'other'
+        observar = SQL_DURACAO.labels(operacao).observe
+        if len(_duracao_sql) < MAX_COMANDOS_SQL:
+            _duracao_sql[sql] = observar
+    return observar
+
+
+# ========== FLASK ==========
+
+# Funções chamadas antes de cada coleta (atualizam gauges com o estado do worker)
+_ao_coletar = []
+
+def ao_coletar(funcao):
+    """Registra ``funcao`` para rodar antes de cada coleta do /metrics (pode ser usado como decorador)"""
+    _ao_coletar.append(funcao)
+    return funcao
+
+def _inicio_requisicao():
+    g.metricas_inicio = time.perf_counter()
+
+def _fim_requisicao(resposta):
+    inicio = g.pop('metricas_inicio', None)
+    if inicio is not None:
+        # Endpoint (nome da view) em vez da URL: número de séries limitado
+        endpoint = request.endpoint or 'unmatched'
+        HTTP_DURACAO.labels(endpoint, request.method).observe(time.perf_counter() - inicio)
+        HTTP_REQUISICOES.labels(endpoint, request.method, str(resposta.status_code)).inc()
+    return resposta
+
+def expor():
+    """GET /metrics no formato texto do Prometheus, somando todos os workers"""
+    if METRICAS_TOKEN and request.headers.get('Authorization') != f"Bearer {METRICAS_TOKEN}":
+        return Response("Não autorizado\n", status=401, mimetype='text/plain')
+    for funcao in _ao_coletar:
+        funcao()
+    if METRICAS_DIRETORIO:
+        colecao = CollectorRegistry()
+        multiprocess.MultiProcessCollector(colecao)
+    else:
+        colecao = REGISTRY
+    return Response(generate_latest(colecao), content_type=CONTENT_TYPE_LATEST)
+
+def instrumentar(app):
+    """Mede cada requisição de ``app`` e expõe /metrics.
+
+    Chamar logo após criar o app, para o início ser marcado antes dos outros before_request.
+    """
+    app.before_request(_inicio_requisicao)
+    app.after_request(_fim_requisicao)
+    app.add_url_rule('/metrics', 'metrics', expor)
@@ -0,0 +1,407 @@
+# migracoes.py
+import json
+import logging
+import os
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# ========== MIGRAÇÕES DO ESQUEMA ==========
+# Cada migração recebe um cursor e roda dentro da sua própria transação.
+# A última versão aplicada fica gravada em PRAGMA user_version.
+# Nunca altere uma migração já publicada: acrescente uma nova ao final.
+# Por isso o DDL e os backfills ficam escritos aqui, sem chamar funções dos
+# outros módulos: mudar o código da aplicação não pode mudar uma migração antiga.
+
+MIGRACOES = []
+
+def migracao(versao, descricao):
+    """Registra uma função como migração do esquema"""
+    def registrar(funcao):
+        MIGRACOES.append((versao, descricao, funcao))
+        return funcao
+    return registrar
+
+@migracao(1, "tabelas admin_tokens, users e orders")
+def _esquema_inicial(cursor):
+    # Tabela de tokens de admin
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS admin_tokens (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            token TEXT UNIQUE NOT NULL,
+            email TEXT NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Tabela de usuários/clientes
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            phone TEXT,
+            address TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Tabela de pedidos
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            items TEXT,
+            total REAL,
+            status TEXT DEFAULT 'pendente',
+            payment_id TEXT,
+            external_reference TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+@migracao(2, "contadores de versão compartilhados entre workers")
+def _contadores_versao(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS version_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+@migracao(3, "catálogo de produtos (products, product_sizes, product_images)")
+def _catalogo(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY,
+            code TEXT NOT NULL,
+            name TEXT NOT NULL,
+            price REAL NOT NULL,
+            image TEXT,
+            description TEXT,
+            features TEXT,
+            category TEXT,
+            color TEXT,
+            gender TEXT,
+            on_sale INTEGER NOT NULL DEFAULT 0,
+            original_price REAL,
+            discount_percentage INTEGER DEFAULT 0,
+            stock INTEGER DEFAULT 0,
+            created_at TEXT,
+            updated_at TEXT,
+            row_version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_code ON products (code)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products (category)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_on_sale ON products (on_sale)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_row_version ON products (row_version)')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS product_sizes (
+            product_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            size TEXT NOT NULL,
+            available INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (product_id, position),
+            FOREIGN KEY (product_id) REFERENCES products (id) ON DELETE CASCADE
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS product_images (
+            product_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            PRIMARY KEY (product_id, position),
+            FOREIGN KEY (product_id) REFERENCES products (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Produtos removidos, para que os outros workers saibam o que descartar
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS product_tombstones (
+            product_id INTEGER PRIMARY KEY,
+            row_version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_product_tombstones_row_version ON product_tombstones (row_version)')
+
+@migracao(4, "índices de pedidos e tokens de admin")
+def _indices_pedidos_tokens(cursor):
+    # Webhook: UPDATE orders ... WHERE payment_id = ? OR external_reference = ?
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_payment_id ON orders (payment_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_external_reference ON orders (external_reference)')
+    # verify_admin_token: índice de cobertura (token, expires_at, email), sem ler a tabela
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_admin_tokens_token_expires ON admin_tokens (token, expires_at, email)')
+    # cleanup_expired_tokens: DELETE ... WHERE expires_at <= ?
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_admin_tokens_expires_at ON admin_tokens (expires_at)')
+
+@migracao(5, "agendador de manutenção (maintenance_leases, maintenance_jobs)")
+def _agendador_manutencao(cursor):
+    # Um único worker por implantação executa as tarefas: quem detém o lease
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS maintenance_leases (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+    # Estado e métricas de cada tarefa, compartilhados entre workers
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS maintenance_jobs (
+            name TEXT PRIMARY KEY,
+            last_run_at REAL,
+            last_duration_ms REAL,
+            max_duration_ms REAL DEFAULT 0,
+            total_duration_ms REAL DEFAULT 0,
+            runs INTEGER DEFAULT 0,
+            failures INTEGER DEFAULT 0,
+            last_error TEXT,
+            last_owner TEXT
+        )
+    ''')
+
+@migracao(6, "chaves de idempotência do checkout (checkout_idempotency)")
+def _idempotencia_checkout(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS checkout_idempotency (
+            key TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            status TEXT NOT NULL,
+            external_reference TEXT NOT NULL,
+            response TEXT,
+            http_status INTEGER,
+            owner TEXT,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            locked_until REAL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_checkout_idempotency_expires_at ON checkout_idempotency (expires_at)')
+
+@migracao(7, "fila de notificações do Mercado Pago (webhook_inbox)")
+def _fila_webhooks(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS webhook_inbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            notification_id TEXT UNIQUE NOT NULL,
+            topic TEXT,
+            resource_id TEXT,
+            payload TEXT,
+            received_at REAL NOT NULL,
+            processed_at REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL DEFAULT 0,
+            claimed_by TEXT,
+            claimed_until REAL,
+            last_error TEXT
+        )
+    ''')
+    # Só as notificações pendentes entram no índice
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_webhook_inbox_pendentes
+        ON webhook_inbox (next_attempt_at, id) WHERE processed_at IS NULL
+    ''')
+
+@migracao(8, "marcação de reconciliação em orders (reconciled_at)")
+def _reconciliacao_pedidos(cursor):
+    colunas = {row[1] for row in cursor.execute('PRAGMA table_info(orders)')}
+    if 'reconciled_at' not in colunas:
+        cursor.execute('ALTER TABLE orders ADD COLUMN reconciled_at REAL')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_status_reconciled ON orders (status, reconciled_at)')
+
+@migracao(9, "reservas de estoque (stock_reservations)")
+def _reservas_estoque(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stock_reservations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            external_reference TEXT NOT NULL,
+            product_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            released_at REAL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_reservations_reference ON stock_reservations (external_reference, status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stock_reservations_expires ON stock_reservations (status, expires_at)')
+
+@migracao(10, "itens dos pedidos normalizados (order_items) + backfill de orders.items")
+def _itens_pedidos(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            product_id INTEGER,
+            code TEXT,
+            name TEXT,
+            category TEXT,
+            unit_price REAL NOT NULL,
+            quantity INTEGER NOT NULL,
+            subtotal REAL NOT NULL,
+            FOREIGN KEY (order_id) REFERENCES orders (id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items (order_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_items_product ON order_items (product_id, order_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_items_category ON order_items (category)')
+
+    # Backfill: copia os itens de orders.items (JSON) para order_items
+    linhas = []
+    for row in cursor.execute('''
+        SELECT id, items FROM orders
+        WHERE items IS NOT NULL AND id NOT IN (SELECT DISTINCT order_id FROM order_items)
+    ''').fetchall():
+        try:
+            itens = json.loads(row[1])
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(itens, list):
+            continue
+        for posicao, item in enumerate(item for item in itens if isinstance(item, dict)):
+            try:
+                produto_id = int(item.get('id'))
+            except (TypeError, ValueError):
+                produto_id = None
+            preco = float(item.get('price', 0) or 0)
+            quantidade = int(item.get('quantity', 1) or 1)
+            linhas.append((row[0], posicao, produto_id, item.get('code'), item.get('name'), item.get('category'),
+                           preco, quantidade, round(preco * quantidade, 2)))
+    cursor.executemany('''
+        INSERT INTO order_items (order_id, position, product_id, code, name, category, unit_price, quantity, subtotal)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', linhas)
+    # Os JSON antigos não tinham categoria nem código: completa pelo catálogo
+    cursor.execute('''
+        UPDATE order_items
+        SET category = COALESCE(category, (SELECT category FROM products WHERE products.id = order_items.product_id)),
+            code = COALESCE(code, (SELECT code FROM products WHERE products.id = order_items.product_id))
+        WHERE category IS NULL OR code IS NULL
+    ''')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_status_created ON orders (status, created_at)')
+
+@migracao(11, "contadores do painel admin (stats_summary) mantidos por triggers")
+def _resumo_admin(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stats_summary (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for tabela, contador in (('users', 'total_users'), ('orders', 'total_orders')):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{tabela}_count_insert AFTER INSERT ON {tabela}
+            BEGIN
+                UPDATE stats_summary SET value = value + 1 WHERE name = '{contador}';
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{tabela}_count_delete AFTER DELETE ON {tabela}
+            BEGIN
+                UPDATE stats_summary SET value = value - 1 WHERE name = '{contador}';
+            END
+        ''')
+        # Ponto de partida: a contagem atual, na mesma transação que cria os triggers
+        cursor.execute(f'''
+            INSERT INTO stats_summary (name, value) SELECT ?, COUNT(*) FROM {tabela} WHERE true
+            ON CONFLICT(name) DO UPDATE SET value = excluded.value
+        ''', (contador,))
+
+@migracao(12, "agregados de vendas por dia, hora e categoria + backfill")
+def _agregados_vendas(cursor):
+    for tabela, balde in (('sales_daily', 'day'), ('sales_hourly', 'hour')):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {tabela} (
+                {balde} TEXT PRIMARY KEY,
+                orders_created INTEGER NOT NULL DEFAULT 0,
+                value_created REAL NOT NULL DEFAULT 0,
+                orders_paid INTEGER NOT NULL DEFAULT 0,
+                revenue REAL NOT NULL DEFAULT 0,
+                orders_refunded INTEGER NOT NULL DEFAULT 0,
+                refunded REAL NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_category_daily (
+            day TEXT NOT NULL,
+            category TEXT NOT NULL,
+            orders INTEGER NOT NULL DEFAULT 0,
+            units INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, category)
+        ) WITHOUT ROWID
+    ''')
+
+    # Backfill a partir de orders/order_items. Pedidos antigos não guardam a data
+    # do pagamento, então pagamentos e devoluções caem no balde da criação. O fuso
+    # é configuração da instalação: lido aqui da mesma variável de ambiente que os
+    # relatórios usam, sem importar relatorios.py. Vira um modificador de data do
+    # SQLite (orders.created_at está em UTC).
+    fuso = f"{int(os.environ.get('RELATORIOS_FUSO_HORAS', -3)):+d} hours"
+    cursor.execute('DELETE FROM sales_daily')
+    cursor.execute('DELETE FROM sales_hourly')
+    cursor.execute('DELETE FROM sales_category_daily')
+    for tabela, balde, formato in (('sales_daily', 'day', '%Y-%m-%d'), ('sales_hourly', 'hour', '%Y-%m-%d %H')):
+        cursor.execute(f'''
+            INSERT INTO {tabela} ({balde}, orders_created, value_created, orders_paid, revenue, orders_refunded, refunded)
+            SELECT strftime('{formato}', created_at, ?), COUNT(*), COALESCE(SUM(total), 0),
+                   SUM(status IN ('pago', 'reembolsado', 'estornado')),
+                   COALESCE(SUM(CASE WHEN status IN ('pago', 'reembolsado', 'estornado') THEN total END), 0),
+                   SUM(status IN ('reembolsado', 'estornado')),
+                   COALESCE(SUM(CASE WHEN status IN ('reembolsado', 'estornado') THEN total END), 0)
+            FROM orders
+            WHERE created_at IS NOT NULL
+            GROUP BY 1
+        ''', (fuso,))
+    cursor.execute('''
+        INSERT INTO sales_category_daily (day, category, orders, units, revenue)
+        SELECT strftime('%Y-%m-%d', o.created_at, ?), COALESCE(oi.category, 'Sem categoria'),
+               COUNT(DISTINCT oi.order_id), SUM(oi.quantity), SUM(oi.subtotal)
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        WHERE o.status IN ('pago', 'reembolsado', 'estornado') AND o.created_at IS NOT NULL
+        GROUP BY 1, 2
+    ''', (fuso,))
+
+@migracao(13, "versão de estoque separada da do catálogo (products.stock_version)")
+def _versao_estoque(cursor):
+    cursor.execute('ALTER TABLE products ADD COLUMN stock_version INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_stock_version ON products (stock_version)')
+
+def versao_atual(conn):
+    """Versão do esquema gravada no banco"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def aplicar_migracoes():
+    """Aplica, em ordem, as migrações ainda não aplicadas. Retorna a versão final do esquema."""
+    conn = get_db_connection()
+    try:
+        for versao, descricao, funcao in sorted(MIGRACOES, key=lambda m: m[0]):
+            if versao <= versao_atual(conn):
+                continue
+
+            # BEGIN IMMEDIATE serializa workers que sobem ao mesmo tempo
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if versao <= versao_atual(conn):
+                    conn.rollback()
+                    continue
+                funcao(conn.cursor())
+                conn.execute(f'PRAGMA user_version = {int(versao)}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            logger.info("🗄️ Migração %s aplicada: %s", versao, descricao)
+
+        return versao_atual(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,170 @@
+# paginas.py
+import gzip
+import hashlib
+import itertools
+import os
+import re
+from flask import Response, render_template
+from jinja2.utils import htmlsafe_json_dumps
+from markupsafe import escape
+
+# Brotli é opcional: sem o pacote, as páginas saem só em gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Cache das páginas no navegador/CDN. O HTML não tem versão na URL e aponta
+# para CSS/JS com hash que só o deploy atual serve: cópia guardada sem revalidar
+# pediria ativos que já não existem (404). Com no-cache toda visita revalida
+# pelo ETag, que costuma dar 304 sem corpo.
+PAGINAS_CACHE_CONTROL = os.environ.get('PAGINAS_CACHE_CONTROL', 'public, no-cache')
+# Desligado (ex.: editando templates em desenvolvimento), cada acesso renderiza de novo
+PAGINAS_PRERENDERIZADAS = os.environ.get('PAGINAS_PRERENDERIZADAS', 'True').lower() == 'true'
+
+# Codificações em ordem de preferência quando o cliente aceita mais de uma
+CODIFICACOES = ('br', 'gzip')
+
+
+class ConteudoComprimido:
+    """Conteúdo fixo (página pré-renderizada, CSS, JS) com as variantes comprimidas prontas"""
+
+    def __init__(self, corpo: bytes, mimetype: str = 'text/html', cache_control: str = PAGINAS_CACHE_CONTROL):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.variantes = {None: corpo}
+        self.variantes['gzip'] = gzip.compress(corpo, compresslevel=9, mtime=0)
+        if brotli is not None:
+            self.variantes['br'] = brotli.compress(corpo, mode=brotli.MODE_TEXT, quality=11)
+        # ETag do conteúdo: igual entre workers e entre deploys que não mudem o arquivo
+        self.etag = hashlib.sha256(corpo).hexdigest()[:32]
+
+    def escolher(self, aceitas):
+        """Melhor codificação disponível entre as aceitas (``request.accept_encodings``)"""
+        for codificacao in CODIFICACOES:
+            if codificacao in self.variantes and aceitas[codificacao]:
+                return codificacao
+        return None
+
+    def resposta(self, request):
+        """Resposta com a variante negociada, ETag por variante, Vary e Cache-Control (304 se o ETag bater)"""
+        codificacao = self.escolher(request.accept_encodings)
+        resposta = Response(self.variantes[codificacao], mimetype=self.mimetype)
+        if codificacao:
+            resposta.headers['Content-Encoding'] = codificacao
+        resposta.headers['Vary'] = 'Accept-Encoding'
+        resposta.headers['Cache-Control'] = self.cache_control
+        resposta.set_etag(f"{self.etag}-{codificacao}" if codificacao else self.etag)
+        return resposta.make_conditional(request)
+
+    def tamanhos(self):
+        """Bytes de cada variante (para logs e health check)"""
+        return {codificacao or 'identity': len(corpo) for codificacao, corpo in self.variantes.items()}
+
+
+class PaginasEstaticas:
+    """Páginas sem variáveis de template, renderizadas e comprimidas na subida do worker"""
+
+    def __init__(self, app, templates):
+        self.app = app
+        self.paginas = {}
+        if PAGINAS_PRERENDERIZADAS:
+            with app.app_context():
+                for template in templates:
+                    self.paginas[template] = ConteudoComprimido(render_template(template).encode('utf-8'))
+
+    def servir(self, template, request):
+        """Resposta pré-renderizada de ``template`` (renderiza na hora se não estiver pronta)"""
+        pagina = self.paginas.get(template)
+        if pagina is None:
+            return render_template(template)
+        return pagina.resposta(request)
+
+    def tamanhos(self):
+        return {template: pagina.tamanhos() for template, pagina in self.paginas.items()}
+
+
+# ========== PÁGINAS COM POUCAS VARIÁVEIS ==========
+# O template é renderizado na subida com um marcador no lugar de cada variável;
+# o HTML vira uma lista de fragmentos fixos e pontos de emenda. O contexto de
+# cada ponto sai do próprio marcador renderizado:
+#   "@@nome@@"  -> passou por |tojson (JavaScript): valor em JSON seguro para HTML
+#   @@NOME@@    -> passou por |upper: valor em maiúsculas, escapado para HTML
+#   @@nome@@    -> texto HTML: valor escapado
+_MARCADOR = re.compile(r'"@@([a-z_]+)@@"|@@([A-Z_]+)@@|@@([a-z_]+)@@')
+
+
+class PaginaCompilada:
+    """Template pré-renderizado em fragmentos; cada acesso só emenda os valores escapados.
+
+    ``variaveis`` são os nomes usados no template; ``condicionais`` os que
+    aparecem em ``{% if %}`` (cada combinação verdadeiro/falso gera uma variante,
+    e um valor falso é renderizado como None).
+    """
+
+    def __init__(self, app, template, variaveis, condicionais=()):
+        self.template = template
+        self.variaveis = tuple(variaveis)
+        self.condicionais = tuple(condicionais)
+        self._dumps = app.json.dumps
+        self.variantes = {}    # (bool de cada condicional) -> [str | (contexto, nome)]
+        with app.app_context():
+            for combinacao in itertools.product((True, False), repeat=len(self.condicionais)):
+                contexto = {nome: f"@@{nome}@@" for nome in self.variaveis}
+                for nome, presente in zip(self.condicionais, combinacao):
+                    if not presente:
+                        contexto[nome] = None
+                self.variantes[combinacao] = self._compilar(render_template(template, **contexto))
+
+    def _compilar(self, html):
+        partes = []
+        inicio = 0
+        for marcador in _MARCADOR.finditer(html):
+            partes.append(html[inicio:marcador.start()])
+            js, maiusculas, texto = marcador.groups()
+            if js:
+                partes.append(('js', js))
+            elif maiusculas:
+                partes.append(('maiusculas', maiusculas.lower()))
+            else:
+                partes.append(('html', texto))
+            inicio = marcador.end()
+        partes.append(html[inicio:])
+        return [parte for parte in partes if parte != '']
+
+    def renderizar(self, **valores):
+        """HTML da página com ``valores`` (nomes fora de ``variaveis`` são ignorados)"""
+        for nome in self.condicionais:
+            if not valores.get(nome):
+                valores[nome] = None
+        partes = []
+        for parte in self.variantes[tuple(bool(valores.get(nome)) for nome in self.condicionais)]:
+            if isinstance(parte, str):
+                partes.append(parte)
+                continue
+            contexto, nome = parte
+            valor = valores.get(nome)
+            if contexto == 'js':
+                partes.append(htmlsafe_json_dumps(valor, dumps=self._dumps))
+            elif contexto == 'maiusculas':
+                partes.append(escape(str(valor).upper()))
+            else:
+                partes.append(escape(str(valor)))
+        return ''.join(partes)
+
+
+class PaginasCompiladas:
+    """Conjunto de PaginaCompilada por template (renderiza na hora se a pré-renderização estiver desligada)"""
+
+    def __init__(self, app, templates):
+        self.paginas = {}
+        if PAGINAS_PRERENDERIZADAS:
+            for template, (variaveis, condicionais) in templates.items():
+                self.paginas[template] = PaginaCompilada(app, template, variaveis, condicionais)
+
+    def renderizar(self, template, **valores):
+        pagina = self.paginas.get(template)
+        if pagina is None:
+            return render_template(template, **valores)
+        return pagina.renderizar(**valores)
+
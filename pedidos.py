@@ -0,0 +1,138 @@
+# pedidos.py
+import estoque
+import relatorios
+
+# ========== STATUS DOS PEDIDOS ==========
+
+# Status do pagamento no Mercado Pago -> status do pedido
+STATUS_MERCADO_PAGO = {
+    'approved': 'pago',
+    'authorized': 'pago',
+    'pending': 'pendente',
+    'in_process': 'pendente',
+    'in_mediation': 'pendente',
+    'rejected': 'recusado',
+    'cancelled': 'cancelado',
+    'refunded': 'reembolsado',
+    'charged_back': 'estornado',
+}
+
+# Novo status -> status de onde o pedido pode vir.
+# Notificações chegam fora de ordem: um 'pending' atrasado não desfaz um 'pago'.
+# 'pago' pode vir de 'recusado'/'cancelado' porque a mesma preferência aceita nova tentativa.
+TRANSICOES_PERMITIDAS = {
+    'pago': ('pendente', 'recusado', 'cancelado'),
+    'recusado': ('pendente',),
+    'cancelado': ('pendente', 'recusado'),
+    'reembolsado': ('pago', 'pendente'),
+    'estornado': ('pago', 'reembolsado'),
+}
+
+def status_do_pagamento(status_mp):
+    """Converte o status do Mercado Pago no status do pedido (None se desconhecido)"""
+    return STATUS_MERCADO_PAGO.get((status_mp or '').lower())
+
+def resumo_pagamento(pagamento):
+    """Extrai (external_reference, payment_id, status do pedido) de um pagamento do Mercado Pago"""
+    return (
+        pagamento.get('external_reference'),
+        str(pagamento['id']) if pagamento.get('id') is not None else None,
+        status_do_pagamento(pagamento.get('status'))
+    )
+
+def aplicar_status(conn, atualizacoes):
+    """Aplica mudanças de status em lote, na transação do chamador.
+
+    ``atualizacoes``: iterável de (external_reference, payment_id, novo_status).
+    Só transições permitidas são aplicadas; as reservas de estoque dos
+    pedidos alterados são confirmadas (pago) ou devolvidas (recusado/cancelado)
+    e os agregados de vendas recebem pagamentos e devoluções.
+    Retorna a lista de (external_reference, novo_status) efetivamente alterados.
+    """
+    alterados = []
+    transicoes = []
+    for external_reference, payment_id, novo_status in atualizacoes:
+        origens = TRANSICOES_PERMITIDAS.get(novo_status)
+        if not external_reference or not origens:
+            continue
+        marcadores = ','.join('?' * len(origens))
+        # O chamador segura o lock de escrita (BEGIN IMMEDIATE): o status lido não muda até o UPDATE
+        rows = conn.execute(f'''
+            SELECT id, status, total FROM orders
+            WHERE external_reference = ? AND status IN ({marcadores})
+        ''', (external_reference, *origens)).fetchall()
+        if not rows:
+            continue
+        conn.executemany('''
+            UPDATE orders SET status = ?, payment_id = COALESCE(?, payment_id) WHERE id = ?
+        ''', [(novo_status, payment_id, row['id']) for row in rows])
+        alterados.append((external_reference, novo_status))
+        transicoes.extend((row['id'], row['total'], row['status'], novo_status) for row in rows)
+    estoque.aplicar_status_pedidos(conn, alterados)
+    relatorios.registrar_transicoes(conn, transicoes)
+    return alterados
+
+# ========== ITENS DOS PEDIDOS ==========
+
+def _linhas_itens(order_id, itens):
+    linhas = []
+    for posicao, item in enumerate(itens):
+        try:
+            produto_id = int(item.get('id'))
+        except (TypeError, ValueError):
+            produto_id = None
+        preco = float(item.get('price', 0) or 0)
+        quantidade = int(item.get('quantity', 1) or 1)
+        linhas.append((order_id, posicao, produto_id, item.get('code'), item.get('name'), item.get('category'),
+                       preco, quantidade, round(preco * quantidade, 2)))
+    return linhas
+
+def gravar_itens(conn, order_id, itens):
+    """Grava os itens de um pedido (lista de dicts id/code/name/category/price/quantity)"""
+    conn.executemany('''
+        INSERT INTO order_items (order_id, position, product_id, code, name, category, unit_price, quantity, subtotal)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', _linhas_itens(order_id, itens))
+
+def inserir_pedido(conn, user_id, itens, total, status, payment_id, external_reference):
+    """Insere o pedido e seus itens e conta a criação nos agregados, na transação do chamador; retorna o id do pedido"""
+    cursor = conn.execute('''
+        INSERT INTO orders (user_id, total, status, payment_id, external_reference)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (user_id, total, status, payment_id, external_reference))
+    order_id = cursor.lastrowid
+    gravar_itens(conn, order_id, itens)
+    relatorios.registrar_criacao(conn, total)
+    return order_id
+
+# ========== RELATÓRIOS ==========
+
+# Pedidos que contam como venda
+STATUS_VENDA = ('pago',)
+
+def mais_vendidos(conn, limite=10, desde=None, status=STATUS_VENDA):
+    """Produtos mais vendidos (unidades e receita), opcionalmente a partir de uma data 'YYYY-MM-DD'"""
+    marcadores = ','.join('?' * len(status))
+    return [dict(row) for row in conn.execute(f'''
+        SELECT oi.product_id, MAX(oi.code) AS code, MAX(oi.name) AS name, MAX(oi.category) AS category,
+               SUM(oi.quantity) AS units, ROUND(SUM(oi.subtotal), 2) AS revenue, COUNT(DISTINCT oi.order_id) AS orders
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        WHERE o.status IN ({marcadores}) AND o.created_at >= ?
+        GROUP BY oi.product_id
+        ORDER BY units DESC, revenue DESC
+        LIMIT ?
+    ''', (*status, desde or '', limite))]
+
+def receita_por_categoria(conn, desde=None, status=STATUS_VENDA):
+    """Unidades e receita por categoria"""
+    marcadores = ','.join('?' * len(status))
+    return [dict(row) for row in conn.execute(f'''
+        SELECT COALESCE(oi.category, 'Sem categoria') AS category,
+               SUM(oi.quantity) AS units, ROUND(SUM(oi.subtotal), 2) AS revenue, COUNT(DISTINCT oi.order_id) AS orders
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        WHERE o.status IN ({marcadores}) AND o.created_at >= ?
+        GROUP BY 1
+        ORDER BY revenue DESC
+    ''', (*status, desde or ''))]
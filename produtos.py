@@ -1,6 +1,18 @@
 # produtos.py
 import json
+import bisect
+import hashlib
+import logging
+import time
 from datetime import datetime
+from busca import IndiceBusca
+from metricas import ContadorCache
+
+logger = logging.getLogger(__name__)
+
+# Acertos/faltas dos caches por versão do catálogo (/metrics)
+_metricas_json = ContadorCache('catalogo_json')
+_metricas_ordenacoes = ContadorCache('catalogo_ordenacoes')
 
 class Produto:
     def __init__(self, 
@@ -109,41 +121,275 @@ class Produto:
         return self.__str__()
 
 
+# Campos com índice de igualdade: nome do filtro -> função que extrai a chave do produto
+CAMPOS_INDEXADOS = {
+    'category': lambda p: p.category,
+    'gender': lambda p: (p.gender or '').lower(),
+    'color': lambda p: (p.color or '').lower(),
+    'on_sale': lambda p: bool(p.on_sale),
+}
+
+# Abaixo disso o produto conta como estoque baixo nas estatísticas do admin
+ESTOQUE_BAIXO = 5
+
+# Alteração só de estoque (checkout) não muda a versão do catálogo: o JSON em
+# cache do /api/produtos é refeito, no máximo, uma vez a cada tantos segundos
+ATRASO_ESTOQUE_JSON = 30
+
+# Ordenações disponíveis na listagem: nome -> (chave ascendente, decrescente?)
+# O ID entra sempre como desempate, para que a chave identifique o produto (cursor)
+ORDENACOES = {
+    'default': (lambda p: (p.id,), False),
+    'price_asc': (lambda p: (p.price, p.id), False),
+    'price_desc': (lambda p: (-p.price, p.id), False),
+    'name': (lambda p: ((p.name or '').lower(), p.id), False),
+    'newest': (lambda p: (p.created_at or '', p.id), True),
+}
+
+# Tipos de cada posição da chave de ordenação, para validar cursores vindos do cliente
+TIPOS_CHAVE_ORDENACAO = {
+    'default': (int,),
+    'price_asc': ((int, float), int),
+    'price_desc': ((int, float), int),
+    'name': (str, int),
+    'newest': (str, int),
+}
+
+
 class GerenciadorProdutos:
     def __init__(self):
-        self.produtos = []
+        # Índices mantidos em sincronia a cada adição, atualização e remoção
+        self._por_id = {}          # id -> Produto (preserva ordem de inserção)
+        self._por_codigo = {}      # código -> Produto
+        self._indices = {campo: {} for campo in CAMPOS_INDEXADOS}   # campo -> valor -> {id: Produto}
+        self._chaves_indexadas = {}    # id -> {campo: valor usado no índice}
+        self._maior_id = 0
+        self._busca = IndiceBusca()    # índice invertido para a busca textual
+        
+        # Estatísticas do admin mantidas junto com os índices (valor em centavos, sem erro de arredondamento).
+        # Ficam fora de stats_summary (que guarda só usuários e pedidos, via triggers): o índice
+        # é reconstruído do banco na carga e segue os contadores de versão, então valor total,
+        # categorias, promoções e estoque baixo são derivados dele a cada adição/atualização/remoção.
+        self._contribuicoes = {}    # id -> (centavos, estoque baixo?) registrados na indexação
+        self._valor_total_centavos = 0
+        self._estoque_baixo = 0
+        
+        # Versão do catálogo: incrementada a cada alteração, invalida o cache serializado
+        self.versao = 0
+        # Versão do estoque: alterada por atualizar_estoque, sem invalidar índices e ordenações
+        self.versao_estoque = 0
+        self._cache_json = None    # (versao, versao_estoque, gerado_em, bytes, etag)
+        self._cache_ordenacoes = {}    # ordenação -> (versao, chaves, produtos)
+    
+    @property
+    def produtos(self):
+        """Lista dos produtos na ordem de inserção"""
+        return list(self._por_id.values())
+    
+    def _indexar(self, produto: Produto):
+        """Registra o produto em todos os índices"""
+        self._por_id[produto.id] = produto
+        self._por_codigo[produto.code] = produto
+        chaves = {}
+        for campo, extrair in CAMPOS_INDEXADOS.items():
+            valor = extrair(produto)
+            self._indices[campo].setdefault(valor, {})[produto.id] = produto
+            chaves[campo] = valor
+        self._chaves_indexadas[produto.id] = chaves
+        centavos = round(produto.price * 100)
+        baixo = getattr(produto, 'stock', 0) < ESTOQUE_BAIXO
+        self._contribuicoes[produto.id] = (centavos, baixo)
+        self._valor_total_centavos += centavos
+        self._estoque_baixo += baixo
+        self._busca.adicionar(produto)
+        if isinstance(produto.id, int) and produto.id > self._maior_id:
+            self._maior_id = produto.id
+    
+    def _desindexar(self, produto: Produto, manter_posicao: bool = False):
+        """Remove o produto de todos os índices (``manter_posicao`` preserva seu lugar na ordem)"""
+        if not manter_posicao:
+            self._por_id.pop(produto.id, None)
+        if self._por_codigo.get(produto.code) is produto:
+            del self._por_codigo[produto.code]
+        for campo, valor in self._chaves_indexadas.pop(produto.id, {}).items():
+            grupo = self._indices[campo].get(valor)
+            if grupo is not None:
+                grupo.pop(produto.id, None)
+                if not grupo:
+                    del self._indices[campo][valor]
+        centavos, baixo = self._contribuicoes.pop(produto.id, (0, False))
+        self._valor_total_centavos -= centavos
+        self._estoque_baixo -= baixo
+        self._busca.remover(produto.id)
     
     def adicionar_produto(self, produto: Produto):
         """Adiciona um produto ao gerenciador"""
-        self.produtos.append(produto)
+        existente = self._por_id.get(produto.id)
+        if existente is not None:
+            self._desindexar(existente, manter_posicao=True)
+        self._indexar(produto)
+        self.versao += 1
     
     def remover_produto(self, produto_id: int) -> bool:
         """Remove um produto pelo ID"""
-        initial_count = len(self.produtos)
-        self.produtos = [p for p in self.produtos if p.id != produto_id]
-        return len(self.produtos) < initial_count
+        produto = self._por_id.get(produto_id)
+        if produto is None:
+            return False
+        self._desindexar(produto)
+        self.versao += 1
+        return True
+    
+    def limpar(self):
+        """Remove todos os produtos e zera os índices"""
+        self._por_id.clear()
+        self._por_codigo.clear()
+        for indice in self._indices.values():
+            indice.clear()
+        self._chaves_indexadas.clear()
+        self._contribuicoes.clear()
+        self._valor_total_centavos = 0
+        self._estoque_baixo = 0
+        self._busca.limpar()
+        self._maior_id = 0
+        self.versao += 1
+    
+    def atualizar_estoque(self, produto_id: int, estoque: int) -> bool:
+        """Atualiza só o estoque de um produto (reservas e devoluções feitas em qualquer worker).
+
+        Índices, ordenações, busca e cursores continuam válidos (nenhum depende
+        do estoque); só o contador de estoque baixo e o JSON em cache mudam.
+        """
+        produto = self._por_id.get(produto_id)
+        if produto is None or produto.stock == estoque:
+            return False
+        produto.stock = int(estoque)
+        centavos, baixo = self._contribuicoes.get(produto_id, (0, False))
+        novo_baixo = produto.stock < ESTOQUE_BAIXO
+        if novo_baixo != baixo:
+            self._contribuicoes[produto_id] = (centavos, novo_baixo)
+            self._estoque_baixo += novo_baixo - baixo
+        self.versao_estoque += 1
+        return True
     
     def buscar_por_id(self, produto_id: int):
         """Busca um produto pelo ID"""
-        for produto in self.produtos:
-            if produto.id == produto_id:
-                return produto
-        return None
+        return self._por_id.get(produto_id)
     
     def buscar_por_codigo(self, codigo: str):
         """Busca um produto pelo código"""
-        for produto in self.produtos:
-            if produto.code == codigo:
-                return produto
-        return None
+        return self._por_codigo.get(codigo)
     
+    def buscar_varios(self, ids=(), codigos=()):
+        """Resolve vários produtos numa passada: retorna ({id: Produto}, {código: Produto}) só com os encontrados"""
+        por_id = self._por_id
+        por_codigo = self._por_codigo
+        return (
+            {produto_id: por_id[produto_id] for produto_id in ids if produto_id in por_id},
+            {codigo: por_codigo[codigo] for codigo in codigos if codigo in por_codigo}
+        )
+
     def listar_por_categoria(self, categoria: str):
         """Lista produtos por categoria"""
-        return [p for p in self.produtos if p.category == categoria]
+        return list(self._indices['category'].get(categoria, {}).values())
     
     def listar_em_promocao(self):
         """Lista produtos em promoção"""
-        return [p for p in self.produtos if p.on_sale]
+        return list(self._indices['on_sale'].get(True, {}).values())
+    
+    def estatisticas(self):
+        """Totais do catálogo para o admin, lidos dos contadores (sem percorrer os produtos)"""
+        return {
+            "total_products": len(self._por_id),
+            "total_value": self._valor_total_centavos / 100,
+            "categories": {categoria: len(grupo) for categoria, grupo in self._indices['category'].items()},
+            "on_sale": len(self._indices['on_sale'].get(True, {})),
+            "low_stock": self._estoque_baixo
+        }
+    
+    def buscar_texto(self, consulta: str, limite: int = 10):
+        """Busca textual (sem acentos, com prefixo) em nome, categoria, características e descrição"""
+        resultado = []
+        for produto_id, _pontuacao in self._busca.buscar(consulta, limite):
+            produto = self._por_id.get(produto_id)
+            if produto is not None:
+                resultado.append(produto)
+        return resultado
+    
+    def _ordenados(self, ordenacao: str):
+        """Retorna (chaves, produtos) do catálogo inteiro na ordenação pedida, em cache por versão"""
+        cache = self._cache_ordenacoes.get(ordenacao)
+        if cache is not None and cache[0] == self.versao:
+            _metricas_ordenacoes.acerto()
+            return cache[1], cache[2]
+        
+        _metricas_ordenacoes.falta()
+        chave, decrescente = ORDENACOES[ordenacao]
+        produtos = sorted(self._por_id.values(), key=chave, reverse=decrescente)
+        chaves = [chave(p) for p in produtos]
+        self._cache_ordenacoes[ordenacao] = (self.versao, chaves, produtos)
+        return chaves, produtos
+    
+    def listar_filtrado(self, filtros: dict = None, preco_min: float = None, preco_max: float = None,
+                        ordenacao: str = 'default', apos: tuple = None, limite: int = 24):
+        """Lista uma página de produtos filtrados e ordenados.
+        
+        ``filtros`` usa os campos de CAMPOS_INDEXADOS (ex.: {'category': 'aneis'});
+        ``apos`` é a chave de ordenação do último item da página anterior (cursor).
+        Retorna (produtos_da_pagina, total, chave_do_ultimo_ou_None).
+        """
+        if ordenacao not in ORDENACOES:
+            raise ValueError(f"Ordenação inválida: {ordenacao}")
+        chave, decrescente = ORDENACOES[ordenacao]
+        
+        # Candidatos: interseção dos índices de igualdade, começando pelo menor
+        candidatos = None
+        grupos = []
+        for campo, valor in (filtros or {}).items():
+            if campo not in CAMPOS_INDEXADOS:
+                raise ValueError(f"Filtro inválido: {campo}")
+            if campo in ('gender', 'color'):
+                valor = (valor or '').lower()
+            grupos.append(self._indices[campo].get(valor, {}))
+        if grupos:
+            grupos.sort(key=len)
+            candidatos = dict(grupos[0])
+            for grupo in grupos[1:]:
+                candidatos = {pid: p for pid, p in candidatos.items() if pid in grupo}
+        
+        # Faixa de preço: busca binária na ordenação por preço
+        if preco_min is not None or preco_max is not None:
+            chaves_preco, por_preco = self._ordenados('price_asc')
+            inicio = 0 if preco_min is None else bisect.bisect_left(chaves_preco, (preco_min,))
+            fim = len(por_preco) if preco_max is None else bisect.bisect_right(chaves_preco, (preco_max, float('inf')))
+            faixa = por_preco[inicio:fim]
+            if candidatos is None:
+                candidatos = {p.id: p for p in faixa}
+            else:
+                candidatos = {p.id: p for p in faixa if p.id in candidatos}
+        
+        if candidatos is None:
+            # Sem filtros: percorre a ordenação pré-calculada a partir do cursor
+            chaves, produtos = self._ordenados(ordenacao)
+        else:
+            produtos = sorted(candidatos.values(), key=chave, reverse=decrescente)
+            chaves = [chave(p) for p in produtos]
+        
+        total = len(produtos)
+        inicio = 0
+        if apos is not None:
+            if decrescente:
+                # Chaves em ordem decrescente: procura pela posição do cursor invertendo a comparação
+                inicio = bisect.bisect_left(chaves, True, key=lambda k: k < apos)
+            else:
+                inicio = bisect.bisect_right(chaves, apos)
+        
+        pagina = produtos[inicio:inicio + limite]
+        proximo = chaves[inicio + limite - 1] if inicio + limite < total else None
+        return pagina, total, proximo
+    
+    def proximo_id(self) -> int:
+        """Retorna o próximo ID livre (maior ID já usado + 1)"""
+        return self._maior_id + 1
     
     def atualizar_produto(self, produto_id: int, dados_atualizados: dict):
         """Atualiza um produto existente"""
@@ -151,16 +397,42 @@ class GerenciadorProdutos:
         if not produto:
             return False
         
+        # Retira dos índices antes de alterar campos indexados (código, categoria, promoção)
+        id_original = produto.id
+        self._desindexar(produto, manter_posicao=True)
         for key, value in dados_atualizados.items():
             if hasattr(produto, key):
                 setattr(produto, key, value)
         
         produto.updated_at = datetime.now().isoformat()
+        if produto.id != id_original:
+            self._por_id.pop(id_original, None)
+        self._indexar(produto)
+        self.versao += 1
         return True
     
     def to_json(self):
         """Converte todos os produtos para JSON"""
-        return [produto.to_dict() for produto in self.produtos]
+        return [produto.to_dict() for produto in self._por_id.values()]
+    
+    def to_json_bytes(self):
+        """Retorna (bytes, etag) do catálogo serializado, reaproveitando o cache enquanto a versão não mudar.
+
+        Mudança só de estoque reaproveita o cache por até ATRASO_ESTOQUE_JSON segundos.
+        """
+        cache = self._cache_json
+        if cache is not None and cache[0] == self.versao and (
+                cache[1] == self.versao_estoque or time.monotonic() - cache[2] < ATRASO_ESTOQUE_JSON):
+            _metricas_json.acerto()
+            return cache[3], cache[4]
+        
+        _metricas_json.falta()
+        versao, versao_estoque = self.versao, self.versao_estoque
+        corpo = json.dumps(self.to_json(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        # ETag derivado do conteúdo: igual entre workers que tenham o mesmo catálogo
+        etag = hashlib.sha256(corpo).hexdigest()[:32]
+        self._cache_json = (versao, versao_estoque, time.monotonic(), corpo, etag)
+        return corpo, etag
     
     def salvar_para_arquivo(self, caminho_arquivo: str):
         """Salva todos os produtos em um arquivo JSON"""
@@ -169,7 +441,7 @@ class GerenciadorProdutos:
                 json.dump(self.to_json(), f, ensure_ascii=False, indent=2)
             return True
         except Exception as e:
-            print(f"Erro ao salvar produtos: {str(e)}")
+            logger.error("❌ Erro ao salvar produtos: %s", e)
             return False
     
     def carregar_de_arquivo(self, caminho_arquivo: str):
@@ -178,21 +450,21 @@ class GerenciadorProdutos:
             with open(caminho_arquivo, 'r', encoding='utf-8') as f:
                 produtos_data = json.load(f)
             
-            self.produtos.clear()
+            self.limpar()
             for produto_data in produtos_data:
                 produto = Produto.from_dict(produto_data)
                 self.adicionar_produto(produto)
             
             return True
         except FileNotFoundError:
-            print(f"Arquivo {caminho_arquivo} não encontrado")
+            logger.warning("⚠️ Arquivo %s não encontrado", caminho_arquivo)
             return False
         except Exception as e:
-            print(f"Erro ao carregar produtos: {str(e)}")
+            logger.error("❌ Erro ao carregar produtos: %s", e)
             return False
     
     def __len__(self):
-        return len(self.produtos)
+        return len(self._por_id)
     
     def __iter__(self):
-        return iter(self.produtos)
\ No newline at end of file
+        return iter(list(self._por_id.values()))
\ No newline at end of file
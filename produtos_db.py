@@ -0,0 +1,214 @@
+# produtos_db.py
+import json
+from database import get_db_connection
+from produtos import Produto
+
+# Nome do contador em version_counters incrementado a cada gravação do catálogo
+CATALOGO_VERSAO = 'catalogo'
+
+def _proxima_versao(conn):
+    """Incrementa o contador do catálogo dentro da transação atual"""
+    conn.execute('''
+        INSERT INTO version_counters (name, value) VALUES (?, 1)
+        ON CONFLICT(name) DO UPDATE SET value = value + 1
+    ''', (CATALOGO_VERSAO,))
+    return conn.execute('SELECT value FROM version_counters WHERE name = ?', (CATALOGO_VERSAO,)).fetchone()[0]
+
+def _gravar_produto(conn, produto: Produto, versao: int, gravar_estoque: bool = False):
+    """Upsert de um produto e de seus tamanhos/imagens.
+
+    O estoque só é gravado na inserção ou com ``gravar_estoque``: o valor em
+    memória pode estar atrasado em relação às reservas feitas por outros workers.
+    """
+    conn.execute('''
+        INSERT INTO products (id, code, name, price, image, description, features, category,
+                              color, gender, on_sale, original_price, discount_percentage, stock,
+                              created_at, updated_at, row_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            code = excluded.code,
+            name = excluded.name,
+            price = excluded.price,
+            image = excluded.image,
+            description = excluded.description,
+            features = excluded.features,
+            category = excluded.category,
+            color = excluded.color,
+            gender = excluded.gender,
+            on_sale = excluded.on_sale,
+            original_price = excluded.original_price,
+            discount_percentage = excluded.discount_percentage,
+            stock = CASE WHEN ? THEN excluded.stock ELSE stock END,
+            created_at = excluded.created_at,
+            updated_at = excluded.updated_at,
+            row_version = excluded.row_version
+    ''', (
+        produto.id,
+        produto.code,
+        produto.name,
+        produto.price,
+        produto.image,
+        produto.description,
+        json.dumps(produto.features, ensure_ascii=False),
+        produto.category,
+        produto.color,
+        produto.gender,
+        1 if produto.on_sale else 0,
+        produto.original_price,
+        int(produto.discount_percentage or 0),
+        produto.stock,
+        produto.created_at,
+        produto.updated_at,
+        versao,
+        1 if gravar_estoque else 0
+    ))
+
+    conn.execute('DELETE FROM product_sizes WHERE product_id = ?', (produto.id,))
+    conn.executemany(
+        'INSERT INTO product_sizes (product_id, position, size, available) VALUES (?, ?, ?, ?)',
+        [
+            (produto.id, posicao, str(tamanho.get('size', '')), 1 if tamanho.get('available', True) else 0)
+            for posicao, tamanho in enumerate(produto.sizes)
+            if isinstance(tamanho, dict)
+        ]
+    )
+
+    conn.execute('DELETE FROM product_images WHERE product_id = ?', (produto.id,))
+    conn.executemany(
+        'INSERT INTO product_images (product_id, position, url) VALUES (?, ?, ?)',
+        [(produto.id, posicao, url) for posicao, url in enumerate(produto.additional_images) if url]
+    )
+
+    conn.execute('DELETE FROM product_tombstones WHERE product_id = ?', (produto.id,))
+
+def salvar_produto(produto: Produto, gravar_estoque: bool = False):
+    """Grava (insere ou atualiza) um único produto e retorna a nova versão do catálogo"""
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        versao = _proxima_versao(conn)
+        _gravar_produto(conn, produto, versao, gravar_estoque)
+        conn.commit()
+        return versao
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def salvar_produtos(produtos):
+    """Grava vários produtos numa única transação e retorna a nova versão do catálogo"""
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        versao = _proxima_versao(conn)
+        for produto in produtos:
+            _gravar_produto(conn, produto, versao)
+        conn.commit()
+        return versao
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def remover_produto(produto_id: int):
+    """Remove um produto do banco e retorna a nova versão do catálogo"""
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        versao = _proxima_versao(conn)
+        conn.execute('DELETE FROM product_sizes WHERE product_id = ?', (produto_id,))
+        conn.execute('DELETE FROM product_images WHERE product_id = ?', (produto_id,))
+        conn.execute('DELETE FROM products WHERE id = ?', (produto_id,))
+        conn.execute('''
+            INSERT INTO product_tombstones (product_id, row_version) VALUES (?, ?)
+            ON CONFLICT(product_id) DO UPDATE SET row_version = excluded.row_version
+        ''', (produto_id, versao))
+        conn.commit()
+        return versao
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def contar_produtos():
+    """Número de produtos gravados no banco"""
+    conn = get_db_connection()
+    try:
+        return conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+    finally:
+        conn.close()
+
+def _montar_produtos(conn, rows, desde_versao: int):
+    """Constrói objetos Produto a partir das linhas de products alteradas desde a versão (com tamanhos e imagens)"""
+    if not rows:
+        return []
+
+    # Subconsulta em vez de "IN (?, ?, ...)" com um parâmetro por id: o SQLite
+    # limita o número de variáveis por comando (999 nas versões antigas)
+    selecao = 'SELECT id FROM products WHERE row_version > ?'
+
+    tamanhos = {}
+    for row in conn.execute(f'''
+        SELECT product_id, size, available FROM product_sizes
+        WHERE product_id IN ({selecao}) ORDER BY product_id, position
+    ''', (desde_versao,)):
+        tamanhos.setdefault(row['product_id'], []).append({"size": row['size'], "available": bool(row['available'])})
+
+    imagens = {}
+    for row in conn.execute(f'''
+        SELECT product_id, url FROM product_images
+        WHERE product_id IN ({selecao}) ORDER BY product_id, position
+    ''', (desde_versao,)):
+        imagens.setdefault(row['product_id'], []).append(row['url'])
+
+    produtos = []
+    for row in rows:
+        produtos.append(Produto(
+            id=row['id'],
+            code=row['code'],
+            name=row['name'],
+            price=row['price'],
+            image=row['image'] or '',
+            additional_images=imagens.get(row['id'], []),
+            description=row['description'] or '',
+            features=json.loads(row['features']) if row['features'] else [],
+            category=row['category'] or '',
+            sizes=tamanhos.get(row['id']),
+            color=row['color'],
+            gender=row['gender'],
+            on_sale=bool(row['on_sale']),
+            original_price=row['original_price'],
+            discount_percentage=row['discount_percentage'] or 0,
+            stock=row['stock'] or 0,
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        ))
+    return produtos
+
+def carregar_alteracoes(desde_versao: int = 0):
+    """Retorna (versao_atual, produtos_alterados, ids_removidos) desde a versão informada.
+
+    Com ``desde_versao=0`` retorna o catálogo inteiro. Tudo é lido numa única
+    transação, então a versão retornada é consistente com as linhas.
+    """
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN')
+        row = conn.execute('SELECT value FROM version_counters WHERE name = ?', (CATALOGO_VERSAO,)).fetchone()
+        versao = row[0] if row else 0
+
+        rows = conn.execute('SELECT * FROM products WHERE row_version > ? ORDER BY id', (desde_versao,)).fetchall()
+        produtos = _montar_produtos(conn, rows, desde_versao)
+
+        removidos = []
+        if desde_versao > 0:
+            removidos = [r[0] for r in conn.execute(
+                'SELECT product_id FROM product_tombstones WHERE row_version > ?', (desde_versao,)
+            )]
+        conn.commit()
+        return versao, produtos, removidos
+    finally:
+        conn.close()
@@ -0,0 +1,163 @@
+# reconciliacao.py
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from database import get_db_connection
+from gateway_pagamento import ClienteMercadoPago, ClienteMercadoPagoAsync
+import pedidos
+
+logger = logging.getLogger(__name__)
+
+# Configuração da reconciliação de pedidos pendentes
+RECONCILIACAO_LOTE = int(os.environ.get('RECONCILIACAO_LOTE', 50))
+RECONCILIACAO_CONCORRENCIA = int(os.environ.get('RECONCILIACAO_CONCORRENCIA', 4))
+RECONCILIACAO_MAX_LOTES = int(os.environ.get('RECONCILIACAO_MAX_LOTES', 20))
+# Pedidos mais novos que isso ainda podem estar com o cliente na tela de pagamento
+RECONCILIACAO_IDADE_MINIMA = float(os.environ.get('RECONCILIACAO_IDADE_MINIMA', 120))
+# Intervalo mínimo entre duas consultas do mesmo pedido
+RECONCILIACAO_REVERIFICAR = float(os.environ.get('RECONCILIACAO_REVERIFICAR', 900))
+# Pedidos pendentes mais antigos que isso não são mais consultados
+RECONCILIACAO_JANELA_DIAS = int(os.environ.get('RECONCILIACAO_JANELA_DIAS', 7))
+
+def escolher_pagamento(pagamentos):
+    """Entre os pagamentos de um pedido, prefere o aprovado; senão o mais recente"""
+    for pagamento in pagamentos:
+        if pedidos.status_do_pagamento(pagamento.get('status')) == 'pago':
+            return pagamento
+    return pagamentos[0] if pagamentos else None
+
+
+class ReconciliadorPagamentos:
+    """Consulta no gateway os pedidos parados em 'pendente' e aplica o status real.
+
+    Os pedidos são lidos em lotes; cada lote é consultado com concorrência
+    limitada e gravado numa única transação. ``cliente`` pode ser qualquer
+    objeto com ``buscar_pagamentos(external_reference)`` (ex.: um gateway falso).
+    """
+
+    def __init__(self, cliente=None, lote: int = RECONCILIACAO_LOTE, concorrencia: int = RECONCILIACAO_CONCORRENCIA,
+                 max_lotes: int = RECONCILIACAO_MAX_LOTES):
+        self.cliente = cliente
+        self.lote = lote
+        self.concorrencia = concorrencia
+        self.max_lotes = max_lotes
+        self._lock = threading.Lock()
+        self._metricas = {"execucoes": 0, "consultados": 0, "atualizados": 0, "falhas": 0,
+                          "ultima_execucao": None, "ultima_duracao_ms": 0.0, "pedidos_por_segundo": 0.0}
+
+    def _cliente(self):
+        if self.cliente is None:
+            self.cliente = ClienteMercadoPago(max_concorrentes=self.concorrencia)
+        return self.cliente
+
+    def _proximo_lote(self, conn, agora):
+        return conn.execute('''
+            SELECT id, external_reference FROM orders
+            WHERE status = 'pendente' AND external_reference IS NOT NULL
+              AND created_at >= datetime('now', ?) AND created_at <= datetime('now', ?)
+              AND (reconciled_at IS NULL OR reconciled_at < ?)
+            ORDER BY reconciled_at IS NOT NULL, reconciled_at, id
+            LIMIT ?
+        ''', (f'-{RECONCILIACAO_JANELA_DIAS} days', f'-{int(RECONCILIACAO_IDADE_MINIMA)} seconds',
+              agora - RECONCILIACAO_REVERIFICAR, self.lote)).fetchall()
+
+    def _consultar(self, referencias):
+        """buscar_pagamentos para cada referência, no máximo ``concorrencia`` por vez"""
+        return asyncio.run(ClienteMercadoPagoAsync(self._cliente(), self.concorrencia).mapear('buscar_pagamentos', referencias))
+
+    def processar_lote(self, rows):
+        """Consulta e grava um lote; retorna (atualizados, falhas)"""
+        referencias = [row['external_reference'] for row in rows]
+        resultados = self._consultar(referencias)
+
+        atualizacoes = []
+        falhas = 0
+        for referencia, resultado in zip(referencias, resultados):
+            if isinstance(resultado, Exception) or resultado.get('status') != 200:
+                falhas += 1
+                continue
+            pagamento = escolher_pagamento(resultado.get('response', {}).get('results', []))
+            if pagamento is not None:
+                external_reference, payment_id, status = pedidos.resumo_pagamento(pagamento)
+                atualizacoes.append((external_reference or referencia, payment_id, status))
+
+        agora = time.time()
+        conn = get_db_connection()
+        try:
+            # Uma transação por lote: status novos + marcação de consulta
+            conn.execute('BEGIN IMMEDIATE')
+            alterados = pedidos.aplicar_status(conn, atualizacoes)
+            conn.executemany('UPDATE orders SET reconciled_at = ? WHERE id = ?', [(agora, row['id']) for row in rows])
+            conn.commit()
+        finally:
+            conn.close()
+
+        for external_reference, status in alterados:
+            logger.info("🔄 Reconciliação: pedido %s -> '%s'", external_reference, status,
+                        extra={"external_reference": external_reference, "status": status, "origem": "reconciliacao"})
+        return len(alterados), falhas
+
+    def executar(self):
+        """Processa até ``max_lotes`` lotes de pedidos pendentes; retorna o resumo da execução"""
+        inicio = time.time()
+        consultados = atualizados = falhas = 0
+
+        for _ in range(self.max_lotes):
+            conn = get_db_connection()
+            try:
+                rows = self._proximo_lote(conn, time.time())
+            finally:
+                conn.close()
+            if not rows:
+                break
+            lote_atualizados, lote_falhas = self.processar_lote(rows)
+            consultados += len(rows)
+            atualizados += lote_atualizados
+            falhas += lote_falhas
+            if len(rows) < self.lote:
+                break
+
+        duracao = time.time() - inicio
+        resumo = {
+            "consultados": consultados,
+            "atualizados": atualizados,
+            "falhas": falhas,
+            "duracao_ms": round(duracao * 1000, 1),
+            "pedidos_por_segundo": round(consultados / duracao, 1) if duracao > 0 and consultados else 0.0
+        }
+        with self._lock:
+            self._metricas["execucoes"] += 1
+            self._metricas["consultados"] += consultados
+            self._metricas["atualizados"] += atualizados
+            self._metricas["falhas"] += falhas
+            self._metricas["ultima_execucao"] = datetime.fromtimestamp(inicio).isoformat()
+            self._metricas["ultima_duracao_ms"] = resumo["duracao_ms"]
+            self._metricas["pedidos_por_segundo"] = resumo["pedidos_por_segundo"]
+        return resumo
+
+    def estatisticas(self):
+        """Métricas deste worker e atraso atual (pedido pendente mais antigo ainda não consultado)"""
+        conn = get_db_connection()
+        try:
+            row = conn.execute('''
+                SELECT COUNT(*) AS pendentes,
+                       MIN(CASE WHEN reconciled_at IS NULL THEN created_at END) AS mais_antigo_sem_consulta,
+                       MIN(reconciled_at) AS consulta_mais_antiga
+                FROM orders
+                WHERE status = 'pendente' AND created_at >= datetime('now', ?)
+            ''', (f'-{RECONCILIACAO_JANELA_DIAS} days',)).fetchone()
+        finally:
+            conn.close()
+        with self._lock:
+            metricas = dict(self._metricas)
+        metricas["pendentes"] = row['pendentes']
+        if row['mais_antigo_sem_consulta']:
+            criado = datetime.strptime(row['mais_antigo_sem_consulta'], '%Y-%m-%d %H:%M:%S')
+            metricas["atraso_s"] = round((datetime.utcnow() - criado).total_seconds(), 1)
+        else:
+            metricas["atraso_s"] = round(time.time() - row['consulta_mais_antiga'], 1) if row['consulta_mais_antiga'] else 0
+        return metricas
+
@@ -0,0 +1,156 @@
+# registro.py
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+
+# ========== CONFIGURAÇÃO DO LOGGING ==========
+# Nível padrão e níveis por módulo: LOG_LEVELS="apimercadopago=WARNING,app.acessos=DEBUG"
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_LEVELS = os.environ.get('LOG_LEVELS', '')
+# json (uma linha JSON por registro, para o agregador de logs) ou texto (leitura no terminal)
+LOG_FORMATO = os.environ.get('LOG_FORMATO', 'json').lower()
+# Fração dos registros INFO/DEBUG mantida por logger (WARNING para cima nunca é amostrado)
+LOG_AMOSTRAGEM = os.environ.get('LOG_AMOSTRAGEM', 'app.acessos=0.05')
+# Registros aguardando escrita; com a fila cheia o registro é descartado, nunca bloqueia a requisição
+LOG_FILA_MAXIMA = int(os.environ.get('LOG_FILA_MAXIMA', 10000))
+
+# Atributos que todo LogRecord tem: o resto veio de ``extra=`` e vira campo no JSON
+_ATRIBUTOS_PADRAO = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+def _ler_pares(texto):
+    """'a=1,b=2' -> {'a': '1', 'b': '2'}"""
+    pares = {}
+    for item in texto.split(','):
+        if '=' in item:
+            chave, valor = item.split('=', 1)
+            pares[chave.strip()] = valor.strip()
+    return pares
+
+
+class FormatadorJSON(logging.Formatter):
+    """Um objeto JSON por linha: ts, level, logger, msg, campos de ``extra`` e exceção"""
+
+    def format(self, record):
+        dados = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for chave, valor in record.__dict__.items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith('_'):
+                dados[chave] = valor
+        if record.exc_info:
+            dados["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            dados["exc"] = record.exc_text
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class FiltroAmostragem(logging.Filter):
+    """Mantém só uma fração dos registros INFO/DEBUG dos loggers configurados (e dos filhos deles)"""
+
+    def __init__(self, taxas):
+        super().__init__()
+        # Prefixos mais longos primeiro: 'app.acessos.produtos' vence 'app.acessos'
+        self.taxas = sorted(taxas.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        for nome, taxa in self.taxas:
+            if record.name == nome or record.name.startswith(nome + '.'):
+                return taxa >= 1 or random.random() < taxa
+        return True
+
+
+class HandlerFila(logging.handlers.QueueHandler):
+    """Entrega o registro a uma fila limitada; formatação e escrita ficam com a thread do listener"""
+
+    def __init__(self, fila):
+        super().__init__(fila)
+        self.descartados = 0
+
+    def prepare(self, record):
+        # Só a mensagem é resolvida aqui (os argumentos podem mudar depois); o JSON é montado no listener
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+
+class ListenerFila(logging.handlers.QueueListener):
+    """QueueListener cujo sinal de parada espera vaga na fila (com a fila cheia, put_nowait falharia)"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+_estado = {"pid": None, "handler": None, "listener": None}
+_lock = threading.Lock()
+
+def configurar_logging():
+    """Configura o logger raiz uma vez por processo (seguro chamar de novo após um fork)"""
+    with _lock:
+        if _estado["pid"] == os.getpid():
+            return
+        saida = logging.StreamHandler(sys.stdout)
+        if LOG_FORMATO == 'texto':
+            saida.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s %(name)s: %(message)s', '%H:%M:%S'))
+        else:
+            saida.setFormatter(FormatadorJSON())
+
+        fila = queue.Queue(LOG_FILA_MAXIMA)
+        handler = HandlerFila(fila)
+        taxas = {nome: float(taxa) for nome, taxa in _ler_pares(LOG_AMOSTRAGEM).items()}
+        if taxas:
+            handler.addFilter(FiltroAmostragem(taxas))
+        listener = ListenerFila(fila, saida)
+        listener.start()
+
+        raiz = logging.getLogger()
+        if _estado["handler"] is not None:
+            raiz.removeHandler(_estado["handler"])
+        raiz.addHandler(handler)
+        raiz.setLevel(LOG_LEVEL)
+        for nome, nivel in _ler_pares(LOG_LEVELS).items():
+            logging.getLogger(nome).setLevel(nivel.upper())
+
+        _estado.update(pid=os.getpid(), handler=handler, listener=listener)
+
+def encerrar_logging():
+    """Escreve o que ainda está na fila e para a thread do listener"""
+    listener = _estado["listener"]
+    if listener is not None and _estado["pid"] == os.getpid():
+        listener.stop()
+        _estado["listener"] = None
+
+def estatisticas():
+    """Ocupação da fila e registros descartados por fila cheia (neste processo)"""
+    handler = _estado["handler"]
+    if handler is None:
+        return {"fila": 0, "descartados": 0}
+    return {"fila": handler.queue.qsize(), "descartados": handler.descartados}
+
+def _apos_fork():
+    # A thread do listener não sobrevive ao fork (gunicorn --preload): o filho monta a sua
+    global _lock
+    _lock = threading.Lock()
+    if _estado["pid"] is not None:
+        _estado.update(pid=None, listener=None)
+        configurar_logging()
+
+atexit.register(encerrar_logging)
+os.register_at_fork(after_in_child=_apos_fork)
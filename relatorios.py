@@ -0,0 +1,135 @@
+# relatorios.py
+import os
+from datetime import datetime, timedelta, timezone
+
+# ========== AGREGADOS DE VENDAS ==========
+# Totais por dia, por hora e por categoria/dia, somados na mesma transação em
+# que o pedido é criado ou muda de status. Um relatório lê só os baldes do
+# período pedido (busca pela chave primária), nunca a tabela orders.
+
+# Fuso dos baldes (horas em relação ao UTC); o padrão é o horário de Brasília
+RELATORIOS_FUSO_HORAS = int(os.environ.get('RELATORIOS_FUSO_HORAS', -3))
+FUSO = timezone(timedelta(hours=RELATORIOS_FUSO_HORAS))
+
+# Períodos máximos aceitos pela consulta, por granularidade
+RELATORIOS_MAX_DIAS = int(os.environ.get('RELATORIOS_MAX_DIAS', 400))
+RELATORIOS_MAX_DIAS_HORARIO = int(os.environ.get('RELATORIOS_MAX_DIAS_HORARIO', 31))
+
+# Status em que o pedido já foi pago em algum momento / teve o valor devolvido
+STATUS_PAGOS = ('pago', 'reembolsado', 'estornado')
+STATUS_DEVOLVIDOS = ('reembolsado', 'estornado')
+
+COLUNAS_TOTAIS = ('orders_created', 'value_created', 'orders_paid', 'revenue', 'orders_refunded', 'refunded')
+
+def _somar(conn, tabela, chaves, incrementos):
+    """Upsert que soma ``incrementos`` ao balde identificado por ``chaves``"""
+    colunas = [*chaves, *incrementos]
+    atribuicoes = ', '.join(f'{coluna} = {coluna} + excluded.{coluna}' for coluna in incrementos)
+    conn.execute(f'''
+        INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})
+        ON CONFLICT({', '.join(chaves)}) DO UPDATE SET {atribuicoes}
+    ''', (*chaves.values(), *incrementos.values()))
+
+def _baldes(quando=None):
+    """(dia, hora) no fuso dos relatórios"""
+    quando = quando or datetime.now(FUSO)
+    return quando.strftime('%Y-%m-%d'), quando.strftime('%Y-%m-%d %H')
+
+def _somar_totais(conn, incrementos, quando=None):
+    dia, hora = _baldes(quando)
+    _somar(conn, 'sales_daily', {'day': dia}, incrementos)
+    _somar(conn, 'sales_hourly', {'hour': hora}, incrementos)
+
+def registrar_criacao(conn, total):
+    """Conta um pedido criado agora (na transação do chamador)"""
+    _somar_totais(conn, {'orders_created': 1, 'value_created': float(total or 0)})
+
+def registrar_transicoes(conn, transicoes):
+    """Soma pagamentos e devoluções de ``transicoes`` [(order_id, total, status_anterior, novo_status)].
+
+    O balde é o momento da transição. Um pedido que vai direto de 'pendente'
+    para reembolsado/estornado conta como pago e devolvido.
+    """
+    pagos = []
+    for order_id, total, anterior, novo in transicoes:
+        total = float(total or 0)
+        if anterior not in STATUS_PAGOS and novo in STATUS_PAGOS:
+            _somar_totais(conn, {'orders_paid': 1, 'revenue': total})
+            pagos.append(order_id)
+        if anterior not in STATUS_DEVOLVIDOS and novo in STATUS_DEVOLVIDOS:
+            _somar_totais(conn, {'orders_refunded': 1, 'refunded': total})
+
+    if pagos:
+        dia, _hora = _baldes()
+        marcadores = ','.join('?' * len(pagos))
+        for row in conn.execute(f'''
+            SELECT COALESCE(category, 'Sem categoria') AS category, COUNT(DISTINCT order_id) AS orders,
+                   SUM(quantity) AS units, SUM(subtotal) AS revenue
+            FROM order_items WHERE order_id IN ({marcadores})
+            GROUP BY 1
+        ''', pagos).fetchall():
+            _somar(conn, 'sales_category_daily', {'day': dia, 'category': row['category']},
+                   {'orders': row['orders'], 'units': row['units'], 'revenue': row['revenue']})
+
+# ========== CONSULTA ==========
+
+def _periodo(inicio, fim, granularidade):
+    """Lista dos baldes de ``inicio`` a ``fim`` (datas), inclusive"""
+    if granularidade == 'hour':
+        passo, formato = timedelta(hours=1), '%Y-%m-%d %H'
+        atual, limite = datetime.combine(inicio, datetime.min.time()), datetime.combine(fim, datetime.max.time())
+    else:
+        passo, formato = timedelta(days=1), '%Y-%m-%d'
+        atual, limite = inicio, fim
+    baldes = []
+    while atual <= limite:
+        baldes.append(atual.strftime(formato))
+        atual += passo
+    return baldes
+
+def consultar(conn, inicio, fim, granularidade='day'):
+    """Série de ``inicio`` a ``fim`` (datas, inclusive) por dia ou por hora, totais e categorias.
+
+    Baldes sem vendas aparecem zerados. Levanta ValueError para período ou granularidade inválidos.
+    """
+    if granularidade not in ('day', 'hour'):
+        raise ValueError("Granularidade deve ser 'day' ou 'hour'")
+    if fim < inicio:
+        raise ValueError("Data final anterior à inicial")
+    maximo = RELATORIOS_MAX_DIAS_HORARIO if granularidade == 'hour' else RELATORIOS_MAX_DIAS
+    if (fim - inicio).days + 1 > maximo:
+        raise ValueError(f"Período máximo para granularidade '{granularidade}': {maximo} dias")
+
+    tabela = 'sales_hourly' if granularidade == 'hour' else 'sales_daily'
+    baldes = _periodo(inicio, fim, granularidade)
+    encontrados = {row[granularidade]: row for row in conn.execute(f'''
+        SELECT * FROM {tabela} WHERE {granularidade} BETWEEN ? AND ?
+    ''', (baldes[0], baldes[-1])).fetchall()}
+
+    serie = []
+    totais = dict.fromkeys(COLUNAS_TOTAIS, 0)
+    for balde in baldes:
+        row = encontrados.get(balde)
+        ponto = {granularidade: balde}
+        for coluna in COLUNAS_TOTAIS:
+            valor = row[coluna] if row else 0
+            ponto[coluna] = round(valor, 2) if isinstance(valor, float) else valor
+            totais[coluna] += valor
+        serie.append(ponto)
+    totais = {coluna: round(valor, 2) for coluna, valor in totais.items()}
+    totais["net_revenue"] = round(totais["revenue"] - totais["refunded"], 2)
+    totais["average_ticket"] = round(totais["revenue"] / totais["orders_paid"], 2) if totais["orders_paid"] else 0
+
+    categorias = [dict(row) for row in conn.execute('''
+        SELECT category, SUM(orders) AS orders, SUM(units) AS units, ROUND(SUM(revenue), 2) AS revenue
+        FROM sales_category_daily
+        WHERE day BETWEEN ? AND ?
+        GROUP BY category
+        ORDER BY revenue DESC
+    ''', (inicio.strftime('%Y-%m-%d'), fim.strftime('%Y-%m-%d'))).fetchall()]
+
+    return {"series": serie, "totals": totais, "categories": categorias}
+
+def hoje():
+    """Data de hoje no fuso dos relatórios"""
+    return datetime.now(FUSO).date()
@@ -0,0 +1,2811 @@
+        // ========== VARIÁVEIS GLOBAIS ==========
+        let products = [];
+        let orders = [];
+        let refunds = [];
+        let notifications = [];
+        let currentProductFilter = 'all';
+        let currentOrderStatusFilter = '';
+        let currentRefundStatusFilter = '';
+        let unsavedChanges = false;
+        let apiStatus = 'unknown';
+        let currentAdminToken = null;
+
+        // Status de reembolso
+        const refundStatuses = {
+            PENDING: 'pending',
+            APPROVED: 'approved',
+            REJECTED: 'rejected',
+            PROCESSING: 'processing',
+            COMPLETED: 'completed'
+        };
+
+        // Status de pedido
+        const orderStatuses = [
+            { key: 'received', label: 'Pedido Recebido', icon: '📥' },
+            { key: 'approved', label: 'Pagamento Aprovado', icon: '✅' },
+            { key: 'preparing', label: 'Preparando Pedido', icon: '🔧' },
+            { key: 'ready', label: 'Pronto para Entrega', icon: '📦' },
+            { key: 'shipped', label: 'Pedido Enviado', icon: '🚚' },
+            { key: 'delivered', label: 'Entregue', icon: '🏠' },
+            { key: 'cancelled', label: 'Cancelado', icon: '❌' }
+        ];
+
+        // ========== INICIALIZAÇÃO ==========
+        document.addEventListener('DOMContentLoaded', function() {
+            console.log('🔄 Painel de Administrador - Inicializando...');
+
+            // Primeiro verificar se há redirecionamento na URL
+            if (checkRedirectInURL()) {
+                return;
+            }
+
+            // Verificar autenticação
+            checkAdminAuthAndRedirect();
+
+            // Verificar status da API
+            checkApiStatus();
+
+            // Carregar dados
+            loadData();
+
+            // Inicializar dashboard
+            updateDashboard();
+
+            // Atualizar hora atual
+            updateCurrentTime();
+            setInterval(updateCurrentTime, 60000);
+
+            // Verificar alterações não salvas a cada 10 segundos
+            setInterval(checkUnsavedChanges, 10000);
+
+            // Adicionar listener para antes de sair da página
+            window.addEventListener('beforeunload', function(e) {
+                if (unsavedChanges) {
+                    e.preventDefault();
+                    e.returnValue = 'Você tem alterações não salvas. Tem certeza que deseja sair?';
+                }
+            });
+
+            // Adicionar botão de teste
+            setTimeout(addTestButton, 1000);
+        });
+
+        // ========== VERIFICAÇÃO DE AUTENTICAÇÃO E REDIRECIONAMENTO ==========
+        function checkAdminAuthAndRedirect() {
+            const adminToken = localStorage.getItem('adminToken');
+            const tokenExpiry = localStorage.getItem('adminTokenExpiry');
+            const currentTime = new Date().getTime();
+
+            // Verificar se há um token válido
+            if (adminToken && tokenExpiry && currentTime < parseInt(tokenExpiry)) {
+                currentAdminToken = adminToken;
+                console.log('✅ Admin autenticado via token');
+
+                // Se já estiver na página admin, não fazer nada
+                if (window.location.pathname.includes('/admin')) {
+                    return true;
+                }
+
+                return true;
+            } else {
+                // Token inválido ou expirado, mostrar modal de login
+                showLoginModal();
+                return false;
+            }
+        }
+
+        // ========== FUNÇÃO DE REDIRECIONAMENTO APÓS LOGIN ==========
+        function handleLoginRedirect(redirectUrl) {
+            console.log('🔀 Tentando redirecionar para:', redirectUrl);
+
+            if (redirectUrl) {
+                // Se a URL contiver token, processá-lo primeiro
+                if (redirectUrl.includes('/admin/redirect?token=')) {
+                    const urlObj = new URL(redirectUrl, window.location.origin);
+                    const token = urlObj.searchParams.get('token');
+
+                    if (token) {
+                        // Salvar token no localStorage
+                        localStorage.setItem('adminToken', token);
+                        const expiryTime = new Date().getTime() + (24 * 60 * 60 * 1000); // 24 horas
+                        localStorage.setItem('adminTokenExpiry', expiryTime.toString());
+                        currentAdminToken = token;
+
+                        console.log('🔑 Token salvo no localStorage');
+                    }
+                }
+
+                // Aguardar um momento e redirecionar
+                setTimeout(() => {
+                    console.log('🔄 Redirecionando para:', redirectUrl);
+                    window.location.href = redirectUrl;
+                }, 500);
+            }
+        }
+
+        // ========== VERIFICAÇÃO DE REDIRECIONAMENTO NA URL ==========
+        function checkRedirectInURL() {
+            const urlParams = new URLSearchParams(window.location.search);
+            const redirectUrl = urlParams.get('redirect');
+
+            if (redirectUrl && redirectUrl.includes('/admin')) {
+                console.log('🔀 Redirecionamento detectado na URL:', redirectUrl);
+                handleLoginRedirect(redirectUrl);
+                return true;
+            }
+            return false;
+        }
+
+        // ========== VERIFICAÇÃO DE API ==========
+        async function checkApiStatus() {
+            try {
+                console.log('🔍 Verificando status da API...');
+
+                // Testar API pública
+                const publicResponse = await fetch('/api/produtos');
+                const publicStatus = publicResponse.ok;
+
+                // Testar API admin
+                const adminResponse = await fetch('/api/admin/products', {
+                    headers: getAuthHeaders()
+                });
+                const adminStatus = adminResponse.ok;
+
+                if (publicStatus && adminStatus) {
+                    apiStatus = 'online';
+                    showApiStatus('✅ API online e funcionando', 'api-success');
+                    document.getElementById('sync-badge').style.display = 'none';
+                } else {
+                    apiStatus = 'partial';
+                    showApiStatus('⚠️ API parcialmente disponível', 'api-warning');
+                    document.getElementById('sync-badge').style.display = 'flex';
+                }
+
+                return apiStatus;
+            } catch (error) {
+                apiStatus = 'offline';
+                showApiStatus('❌ API offline - Verifique o servidor Flask', 'api-error');
+                document.getElementById('sync-badge').style.display = 'flex';
+                return apiStatus;
+            }
+        }
+
+        function showApiStatus(message, type) {
+            const statusArea = document.getElementById('api-status');
+            if (statusArea) {
+                statusArea.textContent = message;
+                statusArea.className = `api-status ${type}`;
+                statusArea.style.display = 'block';
+
+                // Atualizar status em tempo real
+                showRealTimeStatus(message, type);
+            }
+        }
+
+        function showRealTimeStatus(message, type) {
+            const statusDiv = document.getElementById('real-time-status');
+            if (statusDiv) {
+                statusDiv.textContent = `🔄 ${message}`;
+                statusDiv.className = `real-time-status ${type}`;
+                statusDiv.style.display = 'block';
+
+                // Esconder após 5 segundos
+                setTimeout(() => {
+                    statusDiv.style.display = 'none';
+                }, 5000);
+            }
+        }
+
+        // ========== AUTENTICAÇÃO (CORRIGIDA) ==========
+        function checkAdminAuth() {
+            const adminToken = localStorage.getItem('adminToken');
+            const tokenExpiry = localStorage.getItem('adminTokenExpiry');
+            const currentTime = new Date().getTime();
+
+            // Verificar se há um token válido
+            if (adminToken && tokenExpiry && currentTime < parseInt(tokenExpiry)) {
+                currentAdminToken = adminToken;
+                console.log('✅ Admin autenticado via token');
+                return true;
+            } else {
+                // Token inválido ou expirado, mostrar modal de login
+                showLoginModal();
+                return false;
+            }
+        }
+
+        function getAuthHeaders() {
+            const headers = {
+                'Content-Type': 'application/json'
+            };
+
+            if (currentAdminToken) {
+                headers['Authorization'] = `Bearer ${currentAdminToken}`;
+            }
+
+            return headers;
+        }
+
+        function showLoginModal() {
+            // Criar modal de login
+            const loginModal = document.createElement('div');
+            loginModal.id = 'login-modal';
+            loginModal.className = 'modal-overlay';
+            loginModal.style.display = 'flex';
+            loginModal.innerHTML = `
+                <div class="modal-content" style="max-width: 400px;">
+                    <div class="modal-header">
+                        <h3 class="modal-title">🔐 Acesso Administrativo</h3>
+                    </div>
+                    <div style="padding: 20px;">
+                        <div class="form-group">
+                            <label for="admin-email">E-mail</label>
+                            <input type="email" id="admin-email" class="form-control" placeholder="admin@romaneljoias.com" autocomplete="email">
+                        </div>
+                        <div class="form-group">
+                            <label for="admin-password-login">Senha</label>
+                            <input type="password" id="admin-password-login" class="form-control" placeholder="Digite sua senha" autocomplete="current-password">
+                        </div>
+                        <div class="form-group">
+                            <label>
+                                <input type="checkbox" id="remember-me" checked>
+                                Lembrar-me
+                            </label>
+                        </div>
+                        <div id="login-feedback" style="margin: 10px 0;"></div>
+                        <div class="action-buttons mt-3">
+                            <button class="btn btn-success" onclick="performAdminLogin()" style="width: 100%;">
+                                🔑 Entrar
+                            </button>
+                            <button class="btn btn-danger" onclick="redirectToHome()" style="width: 100%; margin-top: 10px;">
+                                🏠 Voltar ao Site
+                            </button>
+                        </div>
+                        <p class="text-muted mt-3" style="font-size: 12px; text-align: center;">
+                            Sistema compatível com senha em texto ou hash SHA256<br>
+                            Acesso restrito aos administradores do sistema.
+                        </p>
+                    </div>
+                </div>
+            `;
+
+            document.body.appendChild(loginModal);
+
+            // Adicionar evento para tecla Enter
+            document.getElementById('admin-password-login').addEventListener('keypress', function(e) {
+                if (e.key === 'Enter') {
+                    performAdminLogin();
+                }
+            });
+        }
+
+        async function performAdminLogin() {
+            const email = document.getElementById('admin-email').value;
+            const password = document.getElementById('admin-password-login').value;
+            const rememberMe = document.getElementById('remember-me').checked;
+            const feedbackDiv = document.getElementById('login-feedback');
+
+            console.log('🔑 Tentando login com email:', email);
+
+            if (!email || !password) {
+                showLoginFeedback('❌ Por favor, preencha todos os campos.', 'error');
+                return;
+            }
+
+            // Validar formato de e-mail
+            const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+            if (!emailRegex.test(email)) {
+                showLoginFeedback('❌ Por favor, insira um e-mail válido.', 'error');
+                return;
+            }
+
+            showLoading('🔐 Verificando credenciais...');
+
+            try {
+                // TENTAR LOGIN UNIFICADO PRIMEIRO
+                const response = await fetch('/api/login', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify({
+                        email: email.trim(),
+                        password: password,
+                        // Nota: o campo 'senha' também funciona para compatibilidade
+                    })
+                });
+
+                console.log('🔑 Status da resposta:', response.status);
+
+                if (!response.ok) {
+                    // Se for 401, tentar rota específica de admin como fallback
+                    if (response.status === 401) {
+                        console.log('🔄 Tentando rota específica de admin como fallback...');
+                        const adminResponse = await fetch('/api/admin/login', {
+                            method: 'POST',
+                            headers: {
+                                'Content-Type': 'application/json',
+                            },
+                            body: JSON.stringify({
+                                email: email.trim(),
+                                password: password,
+                                rememberMe: rememberMe
+                            })
+                        });
+
+                        if (!adminResponse.ok) {
+                            throw new Error('E-mail ou senha incorretos');
+                        }
+
+                        const result = await adminResponse.json();
+                        processLoginResult(result, email, rememberMe);
+                        return;
+                    }
+                    throw new Error(`Erro HTTP: ${response.status}`);
+                }
+
+                const result = await response.json();
+                console.log('🔑 Resposta da API:', result);
+
+                // Verificar se é login de admin
+                if (result.success && result.user && result.user.role === 'admin') {
+                    processLoginResult(result, email, rememberMe);
+                } else if (result.success) {
+                    // É um usuário comum, mas estamos no painel admin
+                    hideLoading();
+                    showLoginFeedback('❌ Este é um usuário comum. Apenas administradores podem acessar o painel.', 'error');
+                    // Limpar campo de senha
+                    document.getElementById('admin-password-login').value = '';
+                } else {
+                    hideLoading();
+                    showLoginFeedback(`❌ ${result.error || 'E-mail ou senha incorretos. Tente novamente.'}`, 'error');
+                    // Limpar campo de senha
+                    document.getElementById('admin-password-login').value = '';
+                }
+            } catch (error) {
+                hideLoading();
+                console.error('❌ Erro no login:', error);
+
+                // Mensagem de erro mais amigável
+                let errorMessage = '❌ Erro ao conectar ao servidor';
+                if (error.message.includes('E-mail ou senha incorretos')) {
+                    errorMessage = '❌ E-mail ou senha incorretos. Verifique suas credenciais.';
+                } else if (error.message.includes('Failed to fetch')) {
+                    errorMessage = '❌ Não foi possível conectar ao servidor. Verifique se o servidor Flask está rodando.';
+                }
+
+                showLoginFeedback(errorMessage, 'error');
+
+                // Limpar campo de senha
+                document.getElementById('admin-password-login').value = '';
+            }
+        }
+
+        function processLoginResult(result, email, rememberMe) {
+            // Login bem-sucedido
+            const token = result.token;
+            const expiryTime = new Date().getTime() + (rememberMe ? 7 * 24 * 60 * 60 * 1000 : 24 * 60 * 60 * 1000);
+
+            // Salvar token
+            currentAdminToken = token;
+            localStorage.setItem('adminToken', token);
+            localStorage.setItem('adminTokenExpiry', expiryTime.toString());
+            localStorage.setItem('adminEmail', email);
+
+            // Remover modal
+            const loginModal = document.getElementById('login-modal');
+            if (loginModal) {
+                loginModal.remove();
+            }
+
+            hideLoading();
+            showAlert(`✅ Bem-vindo, ${email}! Login realizado com sucesso.`, 'success');
+            console.log('✅ Login administrativo realizado com sucesso');
+
+            // **CORREÇÃO CRÍTICA**: Redirecionar automaticamente
+            if (result.redirect_url) {
+                console.log('🔀 Redirecionando para:', result.redirect_url);
+                // Forçar redirecionamento
+                setTimeout(() => {
+                    window.location.href = result.redirect_url;
+                }, 100);
+            } else if (result.user && result.user.role === 'admin') {
+                console.log('🔀 Redirecionando para /admin (fallback)');
+                setTimeout(() => {
+                    window.location.href = '/admin';
+                }, 100);
+            } else {
+                console.log('⚠️ Nenhuma URL de redirecionamento fornecida');
+            }
+        }
+
+        function showLoginFeedback(message, type) {
+            const feedbackDiv = document.getElementById('login-feedback');
+            if (feedbackDiv) {
+                feedbackDiv.innerHTML = `
+                    <div style="padding: 10px; border-radius: 4px; background-color: ${type === 'error' ? '#f8d7da' : '#d4edda'}; color: ${type === 'error' ? '#721c24' : '#155724'};">
+                        ${message}
+                    </div>
+                `;
+            }
+        }
+
+        function logout() {
+            showConfirmation(
+                'Sair do Painel',
+                'Tem certeza que deseja sair do painel de administrador?',
+                async function() {
+                    // Se houver token, invalidar no servidor
+                    if (currentAdminToken) {
+                        try {
+                            await fetch('/api/admin/logout', {
+                                method: 'POST',
+                                headers: {
+                                    'Authorization': `Bearer ${currentAdminToken}`,
+                                    'Content-Type': 'application/json'
+                                }
+                            });
+                        } catch (error) {
+                            console.log('⚠️ Erro ao invalidar token no servidor:', error);
+                        }
+                    }
+
+                    // Limpar dados de sessão
+                    localStorage.removeItem('adminToken');
+                    localStorage.removeItem('adminTokenExpiry');
+                    localStorage.removeItem('adminEmail');
+                    currentAdminToken = null;
+
+                    // Redirecionar para a página principal
+                    window.location.href = '/';
+                }
+            );
+        }
+
+        function redirectToHome() {
+            window.location.href = '/';
+        }
+
+        function checkAdminAuthInFunction() {
+            if (!currentAdminToken) {
+                showAlert('❌ Acesso não autorizado. Faça login novamente.', 'danger');
+                showLoginModal();
+                return false;
+            }
+            return true;
+        }
+
+        // ========== FUNÇÃO AUXILIAR PARA TESTE ==========
+        function testAdminRedirect() {
+            console.log('🧪 Testando redirecionamento admin...');
+
+            // Simular um login bem-sucedido
+            const testToken = 'test-token-' + Date.now();
+            localStorage.setItem('adminToken', testToken);
+            localStorage.setItem('adminTokenExpiry', (new Date().getTime() + 3600000).toString());
+
+            // Redirecionar para admin
+            window.location.href = '/admin/redirect?token=' + testToken;
+        }
+
+        // ========== ADICIONAR BOTÃO DE TESTE NO DASHBOARD ==========
+        function addTestButton() {
+            const dashboardSection = document.getElementById('dashboard-section');
+            if (dashboardSection) {
+                const testButton = document.createElement('button');
+                testButton.className = 'btn btn-warning mt-3';
+                testButton.innerHTML = '🧪 Testar Redirecionamento';
+                testButton.onclick = testAdminRedirect;
+
+                const quickActions = dashboardSection.querySelector('.action-buttons');
+                if (quickActions) {
+                    quickActions.appendChild(testButton);
+                }
+            }
+        }
+
+        // ========== COMUNICAÇÃO COM API ==========
+        async function syncWithAPI() {
+            if (!checkAdminAuthInFunction()) return;
+
+            showLoading('🔄 Sincronizando com a API...');
+
+            try {
+                // Primeiro verifica status da API
+                await checkApiStatus();
+
+                if (apiStatus === 'offline') {
+                    hideLoading();
+                    showAlert('❌ Não foi possível sincronizar. API offline.', 'danger');
+                    return;
+                }
+
+                // Carrega produtos da API Flask
+                await fetchProductsFromAPI();
+
+                // Sincroniza produtos locais com a API
+                await syncLocalProductsWithAPI();
+
+                hideLoading();
+                showAlert('✅ Sincronização concluída com sucesso!', 'success');
+
+                // Forçar atualização do site principal
+                await forceSiteUpdate();
+
+            } catch (error) {
+                console.error('❌ Erro na sincronização:', error);
+                hideLoading();
+                showAlert('❌ Erro na sincronização: ' + error.message, 'danger');
+            }
+        }
+
+        async function fetchProductsFromAPI() {
+            try {
+                console.log('📦 Carregando produtos da API...');
+
+                const response = await fetch('/api/admin/products', {
+                    headers: getAuthHeaders()
+                });
+
+                if (!response.ok) {
+                    if (response.status === 401) {
+                        console.log('❌ Token inválido, mostrando modal de login');
+                        showLoginModal();
+                        return false;
+                    }
+                    throw new Error(`API retornou status ${response.status}`);
+                }
+
+                const result = await response.json();
+
+                if (result.success && result.products) {
+                    // Atualizar produtos locais com dados da API
+                    products = result.products;
+                    localStorage.setItem('romanelProducts', JSON.stringify(products));
+
+                    console.log(`✅ Carregados ${products.length} produtos da API`);
+
+                    // Log detalhado
+                    console.log('📋 Lista de produtos carregados:');
+                    products.forEach((p, i) => {
+                        console.log(`   ${i+1}. ${p.name} (ID: ${p.id}, Cód: ${p.code}) - R$ ${p.price}`);
+                    });
+
+                    renderProducts();
+                    updateDashboard();
+
+                    return true;
+                } else {
+                    console.error('❌ API retornou erro:', result.error);
+                    return false;
+                }
+            } catch (error) {
+                console.warn('⚠️ Não foi possível carregar produtos da API:', error);
+                // Fallback: carregar do localStorage
+                const storedProducts = localStorage.getItem('romanelProducts');
+                if (storedProducts) {
+                    products = JSON.parse(storedProducts);
+                    console.log(`📦 Carregados ${products.length} produtos do localStorage como fallback`);
+                    renderProducts();
+                    updateDashboard();
+                }
+                return false;
+            }
+        }
+
+        async function syncLocalProductsWithAPI() {
+            try {
+                console.log('🔄 Sincronizando produtos locais com a API...');
+
+                const localProducts = JSON.parse(localStorage.getItem('romanelProducts') || '[]');
+                const apiProducts = await getApiProducts();
+
+                // Encontrar produtos que existem localmente mas não na API
+                const productsToSync = localProducts.filter(localProduct => {
+                    return !apiProducts.some(apiProduct => apiProduct.code === localProduct.code);
+                });
+
+                if (productsToSync.length > 0) {
+                    console.log(`📤 Enviando ${productsToSync.length} produtos para a API...`);
+
+                    for (const product of productsToSync) {
+                        await saveProductToAPI(product);
+                    }
+
+                    console.log('✅ Produtos sincronizados com a API');
+                } else {
+                    console.log('✅ Todos os produtos já estão sincronizados com a API');
+                }
+
+                return true;
+            } catch (error) {
+                console.error('❌ Erro ao sincronizar produtos:', error);
+                return false;
+            }
+        }
+
+        async function getApiProducts() {
+            try {
+                const response = await fetch('/api/admin/products', {
+                    headers: getAuthHeaders()
+                });
+                const result = await response.json();
+                return result.success ? result.products : [];
+            } catch (error) {
+                console.error('❌ Erro ao obter produtos da API:', error);
+                return [];
+            }
+        }
+
+        async function saveProductToAPI(productData) {
+            try {
+                console.log('📤 Enviando produto para API:', productData.name);
+
+                const response = await fetch('/api/admin/products', {
+                    method: 'POST',
+                    headers: getAuthHeaders(),
+                    body: JSON.stringify(productData)
+                });
+
+                if (!response.ok) {
+                    const errorText = await response.text();
+                    throw new Error(`HTTP ${response.status}: ${errorText}`);
+                }
+
+                const result = await response.json();
+
+                if (result.success) {
+                    console.log('✅ Produto salvo na API:', result);
+                    showFormFeedback('✅ Produto salvo com sucesso na API!', 'success');
+                    return result;
+                } else {
+                    console.error('❌ Erro ao salvar produto na API:', result.error);
+                    showFormFeedback(`❌ Erro: ${result.error}`, 'error');
+                    return null;
+                }
+            } catch (error) {
+                console.error('❌ Erro na requisição:', error);
+                showFormFeedback(`❌ Erro de conexão: ${error.message}`, 'error');
+                return null;
+            }
+        }
+
+        async function updateProductInAPI(productId, productData) {
+            try {
+                console.log('📤 Atualizando produto na API:', productId);
+
+                const response = await fetch('/api/admin/products', {
+                    method: 'PUT',
+                    headers: getAuthHeaders(),
+                    body: JSON.stringify({
+                        id: productId,
+                        ...productData
+                    })
+                });
+
+                const result = await response.json();
+
+                if (result.success) {
+                    console.log('✅ Produto atualizado na API:', result);
+                    return result;
+                } else {
+                    console.error('❌ Erro ao atualizar produto na API:', result.error);
+                    return null;
+                }
+            } catch (error) {
+                console.error('❌ Erro na requisição:', error);
+                return null;
+            }
+        }
+
+        async function deleteProductFromAPI(productId) {
+            try {
+                console.log('📤 Removendo produto da API:', productId);
+
+                const response = await fetch('/api/admin/products', {
+                    method: 'DELETE',
+                    headers: getAuthHeaders(),
+                    body: JSON.stringify({id: productId})
+                });
+
+                const result = await response.json();
+
+                if (result.success) {
+                    console.log('✅ Produto removido da API:', result);
+                    return result;
+                } else {
+                    console.error('❌ Erro ao remover produto da API:', result.error);
+                    return null;
+                }
+            } catch (error) {
+                console.error('❌ Erro na requisição:', error);
+                return null;
+            }
+        }
+
+        // ========== FUNÇÕES DE TESTE ==========
+        async function testSaveProduct() {
+            if (!checkAdminAuthInFunction()) return;
+
+            console.log('🧪 Testando salvamento de produto...');
+
+            const testProduct = {
+                name: "Produto Teste " + Date.now(),
+                code: "TEST" + Date.now(),
+                price: 99.99,
+                category: "aneis",
+                color: "Prata",
+                gender: "feminino",
+                image: "https://via.placeholder.com/300x300?text=Produto+Teste",
+                description: "Produto de teste",
+                stock: 10,
+                onSale: false
+            };
+
+            showLoading('🧪 Testando API...');
+
+            try {
+                const result = await saveProductToAPI(testProduct);
+
+                if (result && result.success) {
+                    showAlert('✅ Teste de API bem-sucedido! Produto salvo.', 'success');
+
+                    // Atualizar lista de produtos
+                    await fetchProductsFromAPI();
+
+                    // Verificar se o produto está na API pública
+                    setTimeout(async () => {
+                        await verifyProductInPublicAPI(testProduct.code);
+                    }, 1000);
+                } else {
+                    showAlert('❌ Teste de API falhou. Verifique o servidor.', 'danger');
+                }
+            } catch (error) {
+                showAlert('❌ Erro no teste: ' + error.message, 'danger');
+            } finally {
+                hideLoading();
+            }
+        }
+
+        async function verifyProductInPublicAPI(productCode) {
+            try {
+                console.log(`🔍 Verificando produto ${productCode} na API pública...`);
+
+                const response = await fetch('/api/produtos');
+                const publicProducts = await response.json();
+
+                const foundProduct = publicProducts.find(p => p.code === productCode);
+
+                if (foundProduct) {
+                    showAlert(`✅ SUCESSO! Produto ${productCode} está disponível na loja!`, 'success');
+                    console.log('✅ Produto encontrado na API pública:', foundProduct);
+                } else {
+                    showAlert(`⚠️ Produto salvo mas NÃO encontrado na API pública. Recarregue a página da loja.`, 'warning');
+                    console.warn('⚠️ Produto não encontrado na API pública');
+                }
+            } catch (error) {
+                console.error('❌ Erro ao verificar API pública:', error);
+            }
+        }
+
+        async function testIntegration() {
+            if (!checkAdminAuthInFunction()) return;
+
+            console.log('🧪 Iniciando teste completo de integração...');
+
+            showLoading('🧪 Testando integração...');
+
+            try {
+                // 1. Testar API pública
+                const publicResponse = await fetch('/api/produtos');
+                const publicProducts = await publicResponse.json();
+
+                // 2. Testar API admin
+                const adminResponse = await fetch('/api/admin/products', {
+                    headers: getAuthHeaders()
+                });
+                const adminResult = await adminResponse.json();
+
+                // 3. Verificar status
+                const publicCount = Array.isArray(publicProducts) ? publicProducts.length : 0;
+                const adminCount = adminResult.success ? (adminResult.products?.length || 0) : 0;
+
+                let results = `
+🧪 RESULTADO DOS TESTES:
+
+✅ API Pública (/api/produtos): ${publicCount} produtos
+✅ API Admin (/api/admin/products): ${adminCount} produtos
+${publicCount === adminCount ? '✅ SINCRONIZAÇÃO: PERFEITA' : '⚠️ SINCRONIZAÇÃO: DIFERENÇA ENCONTRADA'}
+
+📊 Status do sistema:
+• Servidor Flask: ${publicResponse.ok ? '✅ ONLINE' : '❌ OFFLINE'}
+• API Admin: ${adminResponse.ok ? '✅ ONLINE' : '❌ OFFLINE'}
+• Produtos sincronizados: ${publicCount === adminCount ? '✅ SIM' : '❌ NÃO'}
+                `;
+
+                hideLoading();
+
+                if (publicCount === 0 && adminCount === 0) {
+                    results += '\n\n⚠️ ATENÇÃO: Nenhum produto encontrado no sistema!';
+                }
+
+                alert(results);
+
+                // Mostrar detalhes no console
+                console.log('📋 Produtos na API pública:', publicProducts);
+                console.log('📋 Produtos na API admin:', adminResult.products);
+
+            } catch (error) {
+                hideLoading();
+                showAlert('❌ Erro nos testes: ' + error.message, 'danger');
+                console.error('❌ Erro nos testes:', error);
+            }
+        }
+
+        async function checkProductSync() {
+            if (!checkAdminAuthInFunction()) return;
+
+            showLoading('🔍 Verificando sincronização...');
+
+            try {
+                const publicResponse = await fetch('/api/produtos');
+                const publicProducts = await publicResponse.json();
+
+                const adminResponse = await fetch('/api/admin/products', {
+                    headers: getAuthHeaders()
+                });
+                const adminResult = await adminResponse.json();
+
+                const publicCount = Array.isArray(publicProducts) ? publicProducts.length : 0;
+                const adminCount = adminResult.success ? (adminResult.products?.length || 0) : 0;
+
+                let syncMessage = '';
+
+                if (publicCount === adminCount) {
+                    syncMessage = `✅ Sincronização perfeita! ${publicCount} produtos em ambos os lados.`;
+                    showAlert(syncMessage, 'success');
+                } else {
+                    syncMessage = `⚠️ Diferença encontrada! API Pública: ${publicCount}, API Admin: ${adminCount}`;
+                    showAlert(syncMessage, 'warning');
+
+                    // Sugerir correção
+                    const fix = confirm(`${syncMessage}\n\nDeseja sincronizar agora?`);
+                    if (fix) {
+                        await syncWithAPI();
+                    }
+                }
+
+                hideLoading();
+
+            } catch (error) {
+                hideLoading();
+                showAlert('❌ Erro ao verificar sincronização: ' + error.message, 'danger');
+            }
+        }
+
+        // ========== FUNÇÃO PRINCIPAL DE SALVAR PRODUTO ==========
+        async function saveProduct(e) {
+            e.preventDefault();
+
+            if (!checkAdminAuthInFunction()) return;
+
+            showLoading('💾 Salvando produto...');
+
+            try {
+                // 1. Coletar dados do formulário
+                const formData = collectProductFormData();
+
+                // 2. Validar dados
+                if (!validateProductForm(formData)) {
+                    hideLoading();
+                    return;
+                }
+
+                // 3. Enviar para API Flask
+                console.log('📤 Enviando produto para API Flask:', formData);
+                const apiResult = await saveProductToAPI(formData);
+
+                if (apiResult && apiResult.success) {
+                    console.log('✅ Produto salvo na API com ID:', apiResult.id);
+
+                    // 4. Atualizar localmente
+                    const newProduct = {
+                        ...formData,
+                        id: apiResult.id || formData.id,
+                        createdAt: new Date().toISOString(),
+                        updatedAt: new Date().toISOString()
+                    };
+
+                    // Adicionar à lista local
+                    const existingIndex = products.findIndex(p => p.id === newProduct.id);
+                    if (existingIndex >= 0) {
+                        products[existingIndex] = newProduct;
+                    } else {
+                        products.push(newProduct);
+                    }
+
+                    // 5. Salvar no localStorage
+                    localStorage.setItem('romanelProducts', JSON.stringify(products));
+
+                    // 6. Atualizar interface
+                    hideAddProductForm();
+                    renderProducts();
+                    updateDashboard();
+
+                    // 7. Verificar na API pública
+                    setTimeout(async () => {
+                        await verifyProductInPublicAPI(newProduct.code);
+                    }, 1500);
+
+                    // 8. Mostrar sucesso
+                    hideLoading();
+                    showAlert('✅ Produto salvo com sucesso!', 'success');
+
+                    // 9. Sugerir verificação no site
+                    setTimeout(() => {
+                        const verify = confirm('Produto salvo com sucesso!\n\nDeseja abrir o site principal para verificar?');
+                        if (verify) {
+                            window.open('/', '_blank');
+                        }
+                    }, 1000);
+
+                } else {
+                    hideLoading();
+                    showAlert('❌ Erro ao salvar produto na API. Verifique o servidor Flask.', 'danger');
+                }
+
+            } catch (error) {
+                console.error('❌ Erro ao salvar produto:', error);
+                hideLoading();
+                showAlert('❌ Erro ao salvar produto: ' + error.message, 'danger');
+            }
+        }
+
+        function collectProductFormData() {
+            const isOnSale = document.getElementById('product-on-sale').checked;
+
+            // Calcular preços
+            let price = parseFloat(document.getElementById('product-price').value);
+            let originalPrice = price;
+            let discountPercentage = 0;
+
+            if (isOnSale) {
+                originalPrice = parseFloat(document.getElementById('original-price').value) || price;
+                discountPercentage = parseFloat(document.getElementById('discount-percentage').value) || 0;
+
+                if (discountPercentage > 0) {
+                    price = originalPrice - (originalPrice * (discountPercentage / 100));
+                } else if (originalPrice > price) {
+                    discountPercentage = Math.round(((originalPrice - price) / originalPrice) * 100);
+                }
+            }
+
+            // Processar tamanhos
+            const sizesInput = document.getElementById('product-sizes').value;
+            const sizes = sizesInput.trim() !== '' ? 
+                sizesInput.split(',').map(s => ({ 
+                    size: s.trim(), 
+                    available: true 
+                })) : 
+                [{ size: "Único", available: true }];
+
+            // Processar características
+            const featuresInput = document.getElementById('product-features').value;
+            const features = featuresInput.trim() !== '' ? 
+                featuresInput.split('\n').map(f => f.trim()).filter(f => f !== '') : 
+                [];
+
+            // Gerar ID (será substituído pelo ID da API se houver sucesso)
+            const productId = products.length > 0 ? Math.max(...products.map(p => p.id)) + 1 : 1;
+
+            return {
+                id: productId,
+                code: document.getElementById('product-code').value,
+                name: document.getElementById('product-name').value,
+                price: price,
+                originalPrice: originalPrice,
+                discountPercentage: discountPercentage,
+                onSale: isOnSale,
+                category: document.getElementById('product-category').value,
+                gender: document.getElementById('product-gender').value,
+                color: document.getElementById('product-color').value,
+                stock: parseInt(document.getElementById('product-stock').value) || 0,
+                sizes: sizes,
+                image: document.getElementById('product-image').value,
+                description: document.getElementById('product-description').value,
+                features: features,
+                additionalImages: [],
+                createdAt: new Date().toISOString(),
+                updatedAt: new Date().toISOString()
+            };
+        }
+
+        function validateProductForm(formData) {
+            // Validar campos obrigatórios
+            const requiredFields = [
+                { field: formData.name, name: 'Nome do Produto' },
+                { field: formData.code, name: 'Código' },
+                { field: formData.price, name: 'Preço' },
+                { field: formData.category, name: 'Categoria' },
+                { field: formData.image, name: 'URL da Imagem' }
+            ];
+
+            for (const req of requiredFields) {
+                if (!req.field || req.field.toString().trim() === '') {
+                    showFormFeedback(`❌ Campo obrigatório: ${req.name}`, 'error');
+                    return false;
+                }
+            }
+
+            // Validar preço
+            if (formData.price <= 0) {
+                showFormFeedback('❌ Preço deve ser maior que zero', 'error');
+                return false;
+            }
+
+            // Validar URL da imagem
+            try {
+                new URL(formData.image);
+            } catch (e) {
+                showFormFeedback('❌ URL da imagem inválida', 'error');
+                return false;
+            }
+
+            return true;
+        }
+
+        function showFormFeedback(message, type) {
+            const feedbackDiv = document.getElementById('form-api-feedback');
+            if (feedbackDiv) {
+                feedbackDiv.innerHTML = `
+                    <div class="api-status api-${type === 'error' ? 'error' : 'success'}">
+                        ${message}
+                    </div>
+                `;
+
+                // Limpar após 5 segundos
+                setTimeout(() => {
+                    feedbackDiv.innerHTML = '';
+                }, 5000);
+            }
+        }
+
+        // ========== FUNÇÃO ATUALIZAR PRODUTO ==========
+        async function updateProduct(productId) {
+            if (!checkAdminAuthInFunction()) return;
+
+            showLoading('✏️ Atualizando produto...');
+
+            try {
+                const productIndex = products.findIndex(p => p.id === productId);
+                if (productIndex === -1) throw new Error('Produto não encontrado');
+
+                // Coletar dados do formulário
+                const updatedData = collectProductFormData();
+                updatedData.id = productId; // Manter o ID original
+
+                // Atualizar na API Flask
+                const apiResult = await updateProductInAPI(productId, updatedData);
+
+                if (apiResult && apiResult.success) {
+                    console.log('✅ Produto atualizado na API');
+
+                    // Atualizar localmente
+                    products[productIndex] = {
+                        ...products[productIndex],
+                        ...updatedData,
+                        updatedAt: new Date().toISOString()
+                    };
+
+                    // Salvar no localStorage
+                    localStorage.setItem('romanelProducts', JSON.stringify(products));
+
+                    // Atualizar interface
+                    hideAddProductForm();
+                    renderProducts();
+                    updateDashboard();
+
+                    // Verificar na API pública
+                    setTimeout(async () => {
+                        await verifyProductInPublicAPI(updatedData.code);
+                    }, 1500);
+
+                    hideLoading();
+                    showAlert('✅ Produto atualizado com sucesso!', 'success');
+
+                } else {
+                    hideLoading();
+                    showAlert('❌ Erro ao atualizar produto na API', 'danger');
+                }
+
+            } catch (error) {
+                console.error('❌ Erro ao atualizar produto:', error);
+                hideLoading();
+                showAlert('❌ Erro ao atualizar produto: ' + error.message, 'danger');
+            }
+        }
+
+        // ========== FUNÇÃO EXCLUIR PRODUTO ==========
+        async function deleteProduct(productId) {
+            if (!checkAdminAuthInFunction()) return;
+
+            showConfirmation(
+                'Excluir Produto',
+                'Tem certeza que deseja excluir este produto? Esta ação não pode ser desfeita.',
+                async function() {
+                    showLoading('🗑️ Excluindo produto...');
+
+                    try {
+                        const product = products.find(p => p.id === productId);
+                        if (!product) {
+                            hideLoading();
+                            showAlert('Produto não encontrado', 'danger');
+                            return;
+                        }
+
+                        // Remover da API Flask
+                        const apiResult = await deleteProductFromAPI(productId);
+
+                        // Remover localmente (independente do resultado da API)
+                        products = products.filter(p => p.id !== productId);
+                        localStorage.setItem('romanelProducts', JSON.stringify(products));
+
+                        // Atualizar interface
+                        renderProducts();
+                        updateDashboard();
+
+                        hideLoading();
+
+                        if (apiResult && apiResult.success) {
+                            showAlert('✅ Produto excluído com sucesso!', 'success');
+                        } else {
+                            showAlert('⚠️ Produto removido localmente, mas pode ainda existir na API', 'warning');
+                        }
+
+                    } catch (error) {
+                        console.error('❌ Erro ao excluir produto:', error);
+                        hideLoading();
+                        showAlert('❌ Erro ao excluir produto: ' + error.message, 'danger');
+                    }
+                }
+            );
+        }
+
+        // ========== FUNÇÃO FORÇAR ATUALIZAÇÃO DO SITE ==========
+        async function forceSiteUpdate() {
+            try {
+                console.log('🔄 Forçando atualização do site principal...');
+
+                // Recarregar produtos da API pública
+                const publicResponse = await fetch('/api/produtos');
+                const publicProducts = await publicResponse.json();
+
+                console.log(`📦 Produtos na API pública: ${publicProducts.length}`);
+
+                if (publicProducts.length > 0) {
+                    showRealTimeStatus(`✅ Site principal atualizado (${publicProducts.length} produtos)`, 'api-success');
+
+                    // Abrir site principal em nova aba para verificação
+                    setTimeout(() => {
+                        const verify = confirm(`Site principal atualizado com ${publicProducts.length} produtos.\n\nAbrir agora?`);
+                        if (verify) {
+                            const siteWindow = window.open('/', '_blank');
+                            if (siteWindow) {
+                                // Enviar mensagem para recarregar produtos
+                                setTimeout(() => {
+                                    siteWindow.postMessage({ type: 'forceReloadProducts' }, '*');
+                                }, 1000);
+                            }
+                        }
+                    }, 1000);
+                } else {
+                    showRealTimeStatus('⚠️ API pública não retornou produtos', 'api-warning');
+                }
+
+            } catch (error) {
+                console.error('❌ Erro ao forçar atualização:', error);
+                showRealTimeStatus('❌ Erro ao atualizar site', 'api-error');
+            }
+        }
+
+        // ========== FUNÇÕES AUXILIARES ==========
+        function checkUnsavedChanges() {
+            // Verificar se há produtos não sincronizados
+            const localProducts = JSON.parse(localStorage.getItem('romanelProducts') || '[]');
+            unsavedChanges = localProducts.length > products.length;
+
+            if (unsavedChanges) {
+                document.getElementById('sync-badge').style.display = 'flex';
+            } else {
+                document.getElementById('sync-badge').style.display = 'none';
+            }
+        }
+
+        // ========== MANTENDO AS OUTRAS FUNÇÕES EXISTENTES ==========
+        function loadData() {
+            try {
+                // Primeiro tenta carregar da API
+                fetchProductsFromAPI().then(apiSuccess => {
+                    if (!apiSuccess) {
+                        // Se falhar, carrega do localStorage
+                        const storedProducts = localStorage.getItem('romanelProducts');
+                        if (storedProducts) {
+                            products = JSON.parse(storedProducts);
+                        } else {
+                            products = [];
+                        }
+                    }
+
+                    // Carregar pedidos
+                    const storedOrders = localStorage.getItem('romanelOrders');
+                    if (storedOrders) {
+                        orders = JSON.parse(storedOrders);
+                    } else {
+                        orders = [];
+                    }
+
+                    // Carregar reembolsos
+                    const storedRefunds = localStorage.getItem('romanelRefunds');
+                    if (storedRefunds) {
+                        refunds = JSON.parse(storedRefunds);
+                    } else {
+                        refunds = [];
+                    }
+
+                    // Carregar notificações
+                    const storedNotifications = localStorage.getItem('romanelRefundNotifications');
+                    if (storedNotifications) {
+                        notifications = JSON.parse(storedNotifications);
+                    } else {
+                        notifications = [];
+                    }
+
+                    console.log('Dados carregados:', { 
+                        products: products.length, 
+                        orders: orders.length, 
+                        refunds: refunds.length, 
+                        notifications: notifications.length 
+                    });
+
+                    // Atualizar interfaces
+                    updateDashboard();
+                    renderProducts();
+                    renderOrders();
+                    renderRefunds();
+                    renderNotifications();
+
+                }).catch(error => {
+                    console.error('Erro ao carregar dados:', error);
+                    showAlert('Erro ao carregar dados do sistema', 'danger');
+                });
+
+            } catch (error) {
+                console.error('Erro ao carregar dados:', error);
+                showAlert('Erro ao carregar dados do sistema', 'danger');
+            }
+        }
+
+        function saveData() {
+            try {
+                localStorage.setItem('romanelProducts', JSON.stringify(products));
+                localStorage.setItem('romanelOrders', JSON.stringify(orders));
+                localStorage.setItem('romanelRefunds', JSON.stringify(refunds));
+                localStorage.setItem('romanelRefundNotifications', JSON.stringify(notifications));
+                console.log('✅ Dados salvos no localStorage');
+            } catch (error) {
+                console.error('❌ Erro ao salvar dados:', error);
+                showAlert('Erro ao salvar dados', 'danger');
+            }
+        }
+
+        // ========== NAVEGAÇÃO ==========
+        function showSection(sectionId) {
+            // Esconder todas as seções
+            document.querySelectorAll('.admin-section').forEach(section => {
+                section.classList.remove('active');
+            });
+
+            // Remover classe active de todos os botões
+            document.querySelectorAll('.admin-nav-btn').forEach(btn => {
+                btn.classList.remove('active');
+            });
+
+            // Mostrar seção selecionada
+            const section = document.getElementById(sectionId + '-section');
+            if (section) {
+                section.classList.add('active');
+            }
+
+            // Ativar botão correspondente
+            const activeBtn = Array.from(document.querySelectorAll('.admin-nav-btn')).find(btn => 
+                btn.textContent.includes(getSectionIcon(sectionId))
+            );
+            if (activeBtn) {
+                activeBtn.classList.add('active');
+            }
+
+            // Atualizar dados da seção
+            switch(sectionId) {
+                case 'dashboard':
+                    updateDashboard();
+                    break;
+                case 'products':
+                    renderProducts();
+                    break;
+                case 'orders':
+                    renderOrders();
+                    break;
+                case 'refunds':
+                    updateRefundStats();
+                    renderRefunds();
+                    break;
+                case 'notifications':
+                    renderNotifications();
+                    break;
+            }
+        }
+
+        function getSectionIcon(sectionId) {
+            const icons = {
+                'dashboard': '📊',
+                'products': '🛍️',
+                'orders': '📦',
+                'refunds': '💰',
+                'notifications': '🔔',
+                'settings': '⚙️'
+            };
+            return icons[sectionId] || '📋';
+        }
+
+        // ========== DASHBOARD ==========
+        function updateDashboard() {
+            // Atualizar estatísticas
+            document.getElementById('total-products').textContent = products.length;
+            document.getElementById('total-orders').textContent = orders.length;
+            document.getElementById('pending-orders').textContent = orders.filter(o => 
+                ['received', 'approved', 'preparing'].includes(o.status)
+            ).length;
+            document.getElementById('pending-refunds').textContent = refunds.filter(r => 
+                r.status === refundStatuses.PENDING
+            ).length;
+            document.getElementById('total-revenue').textContent = formatCurrency(
+                orders.filter(o => o.status === 'delivered').reduce((sum, o) => sum + o.total, 0)
+            );
+            document.getElementById('today-orders').textContent = orders.filter(o => 
+                new Date(o.createdAt).toDateString() === new Date().toDateString()
+            ).length;
+
+            // Atualizar estatísticas recentes
+            updateRecentStats();
+        }
+
+        function updateRecentStats() {
+            const statsContainer = document.getElementById('recent-stats');
+            if (!statsContainer) return;
+
+            const today = new Date();
+            const last7Days = [];
+            for (let i = 6; i >= 0; i--) {
+                const date = new Date(today);
+                date.setDate(date.getDate() - i);
+                last7Days.push(date.toISOString().split('T')[0]);
+            }
+
+            const ordersByDate = {};
+            const revenueByDate = {};
+
+            last7Days.forEach(date => {
+                ordersByDate[date] = 0;
+                revenueByDate[date] = 0;
+            });
+
+            orders.forEach(order => {
+                const orderDate = order.createdAt.split('T')[0];
+                if (ordersByDate[orderDate] !== undefined) {
+                    ordersByDate[orderDate]++;
+                    revenueByDate[orderDate] += order.total;
+                }
+            });
+
+            let statsHTML = '<div style="max-height: 200px; overflow-y: auto;">';
+            last7Days.forEach(date => {
+                const dateFormatted = new Date(date).toLocaleDateString('pt-BR');
+                statsHTML += `
+                    <div style="border-bottom: 1px solid #eee; padding: 5px 0;">
+                        <strong>${dateFormatted}:</strong> ${ordersByDate[date]} pedidos, 
+                        ${formatCurrency(revenueByDate[date])}
+                    </div>
+                `;
+            });
+            statsHTML += '</div>';
+
+            statsContainer.innerHTML = statsHTML;
+        }
+
+        function updateCurrentTime() {
+            const timeElement = document.getElementById('current-time');
+            if (timeElement) {
+                const now = new Date();
+                timeElement.textContent = now.toLocaleString('pt-BR', {
+                    weekday: 'long',
+                    year: 'numeric',
+                    month: 'long',
+                    day: 'numeric',
+                    hour: '2-digit',
+                    minute: '2-digit'
+                });
+            }
+        }
+
+        // ========== PRODUTOS ==========
+        function showAddProductForm() {
+            document.getElementById('add-product-form').classList.remove('d-none');
+            document.getElementById('product-form').reset();
+            document.getElementById('sale-fields').classList.add('d-none');
+
+            // Definir comportamento padrão para novo produto
+            const form = document.getElementById('product-form');
+            form.onsubmit = function(e) {
+                e.preventDefault();
+                saveProduct(e);
+            };
+
+            // Alterar texto do botão
+            form.querySelector('button[type="submit"]').textContent = '💾 Salvar Produto';
+        }
+
+        function hideAddProductForm() {
+            document.getElementById('add-product-form').classList.add('d-none');
+        }
+
+        function toggleSaleFields() {
+            const saleFields = document.getElementById('sale-fields');
+            const onSaleCheckbox = document.getElementById('product-on-sale');
+            saleFields.classList.toggle('d-none', !onSaleCheckbox.checked);
+        }
+
+        function setProductFilter(filter) {
+            currentProductFilter = filter;
+
+            // Atualizar botões
+            document.querySelectorAll('.filter-btn').forEach(btn => {
+                btn.classList.remove('active');
+            });
+
+            event.target.classList.add('active');
+
+            renderProducts();
+        }
+
+        function filterProducts() {
+            const searchTerm = document.getElementById('product-search').value.toLowerCase();
+            const categoryFilter = document.getElementById('category-filter').value;
+
+            const filteredProducts = products.filter(product => {
+                // Busca por termo
+                const matchesSearch = searchTerm === '' || 
+                    product.name.toLowerCase().includes(searchTerm) ||
+                    product.code.toLowerCase().includes(searchTerm) ||
+                    product.category.toLowerCase().includes(searchTerm);
+
+                // Filtro por categoria
+                const matchesCategory = categoryFilter === '' || product.category === categoryFilter;
+
+                // Filtro personalizado
+                let matchesCustomFilter = true;
+                switch(currentProductFilter) {
+                    case 'sale':
+                        matchesCustomFilter = product.onSale;
+                        break;
+                    case 'low-stock':
+                        matchesCustomFilter = product.stock < 5;
+                        break;
+                }
+
+                return matchesSearch && matchesCategory && matchesCustomFilter;
+            });
+
+            renderProducts(filteredProducts);
+        }
+
+        function renderProducts(filteredProducts = products) {
+            const container = document.getElementById('products-container');
+            if (!container) return;
+
+            if (filteredProducts.length === 0) {
+                container.innerHTML = `
+                    <div class="text-center p-3">
+                        <p class="text-muted">Nenhum produto encontrado</p>
+                        <button class="btn btn-success mt-2" onclick="showAddProductForm()">
+                            ➕ Adicionar Primeiro Produto
+                        </button>
+                    </div>
+                `;
+                return;
+            }
+
+            container.innerHTML = filteredProducts.map(product => `
+                <div class="product-card">
+                    <img src="${product.image}" alt="${product.name}" class="product-image"
+                         onerror="this.src='https://via.placeholder.com/300x200?text=Produto'">
+                    <div class="product-info">
+                        <h4 class="product-title">${product.name}</h4>
+                        <p class="text-muted" style="font-size: 12px;">Código: ${product.code}</p>
+
+                        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
+                            <span class="product-price">
+                                ${product.onSale ? `
+                                    <span style="text-decoration: line-through; color: #999; margin-right: 5px;">
+                                        ${formatCurrency(product.originalPrice)}
+                                    </span>
+                                    ${formatCurrency(product.price)}
+                                    <span style="color: #e74c3c; font-size: 12px; margin-left: 5px;">
+                                        ${product.discountPercentage}% OFF
+                                    </span>
+                                ` : formatCurrency(product.price)}
+                            </span>
+                            <span class="gender-badge gender-${product.gender}" style="padding: 3px 8px; background: #f0f0f0; border-radius: 4px; font-size: 12px;">
+                                ${getGenderName(product.gender)}
+                            </span>
+                        </div>
+
+                        <p style="font-size: 12px; color: #666;">
+                            <strong>Categoria:</strong> ${getCategoryName(product.category)}<br>
+                            <strong>Cor:</strong> ${product.color}<br>
+                            <strong>Estoque:</strong> ${product.stock} unidades
+                        </p>
+
+                        <div class="action-buttons mt-3">
+                            <button class="btn btn-sm btn-warning" onclick="editProduct(${product.id})">
+                                ✏️ Editar
+                            </button>
+                            <button class="btn btn-sm btn-danger" onclick="deleteProduct(${product.id})">
+                                🗑️ Excluir
+                            </button>
+                            <button class="btn btn-sm btn-info" onclick="viewProductDetails(${product.id})">
+                                👁️ Ver
+                            </button>
+                            <button class="btn btn-sm btn-primary" onclick="testProductOnSite(${product.id})">
+                                🌐 Testar no Site
+                            </button>
+                        </div>
+                    </div>
+                </div>
+            `).join('');
+        }
+
+        function testProductOnSite(productId) {
+            const product = products.find(p => p.id === productId);
+            if (!product) return;
+
+            console.log(`🌐 Testando produto ${product.code} no site principal...`);
+
+            // Abrir site principal em nova aba
+            const siteWindow = window.open('/', '_blank');
+
+            // Depois que a janela carregar, verificar se o produto está lá
+            setTimeout(() => {
+                if (siteWindow) {
+                    // Enviar mensagem para a janela principal recarregar produtos
+                    siteWindow.postMessage({ 
+                        type: 'reloadProducts',
+                        productCode: product.code 
+                    }, '*');
+
+                    showAlert(`🌐 Site principal aberto. Verifique se o produto "${product.name}" aparece na lista.`, 'info');
+                }
+            }, 2000);
+        }
+
+        function viewProductDetails(productId) {
+            const product = products.find(p => p.id === productId);
+            if (!product) return;
+
+            alert(`
+📦 Detalhes do Produto #${product.id}
+
+Nome: ${product.name}
+Código: ${product.code}
+Preço: ${formatCurrency(product.price)}
+${product.onSale ? `Preço Original: ${formatCurrency(product.originalPrice)} (${product.discountPercentage}% OFF)` : ''}
+Categoria: ${getCategoryName(product.category)}
+Gênero: ${getGenderName(product.gender)}
+Cor: ${product.color}
+Estoque: ${product.stock} unidades
+Descrição: ${product.description || 'Nenhuma'}
+Características: ${product.features ? product.features.join(', ') : 'Nenhuma'}
+Tamanhos: ${product.sizes ? product.sizes.map(s => s.size).join(', ') : 'Único'}
+Data de criação: ${new Date(product.createdAt).toLocaleString('pt-BR')}
+Última atualização: ${new Date(product.updatedAt).toLocaleString('pt-BR')}
+            `);
+        }
+
+        function editProduct(productId) {
+            const product = products.find(p => p.id === productId);
+            if (!product) return;
+
+            showAddProductForm();
+
+            // Preencher formulário
+            document.getElementById('product-name').value = product.name;
+            document.getElementById('product-code').value = product.code;
+            document.getElementById('product-price').value = product.price;
+            document.getElementById('product-category').value = product.category;
+            document.getElementById('product-color').value = product.color;
+            document.getElementById('product-gender').value = product.gender;
+            document.getElementById('product-stock').value = product.stock;
+            document.getElementById('product-image').value = product.image;
+            document.getElementById('product-description').value = product.description || '';
+            document.getElementById('product-features').value = product.features ? product.features.join('\n') : '';
+            document.getElementById('product-sizes').value = product.sizes ? 
+                product.sizes.map(s => s.size).join(', ') : '';
+
+            // Preencher campos de promoção
+            document.getElementById('product-on-sale').checked = product.onSale;
+            if (product.onSale) {
+                document.getElementById('original-price').value = product.originalPrice;
+                document.getElementById('discount-percentage').value = product.discountPercentage;
+                document.getElementById('sale-fields').classList.remove('d-none');
+            }
+
+            // Alterar comportamento do formulário para edição
+            const form = document.getElementById('product-form');
+            form.onsubmit = async function(e) {
+                e.preventDefault();
+                await updateProduct(productId);
+            };
+
+            // Alterar texto do botão
+            form.querySelector('button[type="submit"]').textContent = '💾 Atualizar Produto';
+        }
+
+        // ========== PEDIDOS ==========
+        function filterOrders() {
+            currentOrderStatusFilter = document.getElementById('order-status-filter').value;
+            renderOrders();
+        }
+
+        function renderOrders() {
+            const tbody = document.getElementById('orders-table-body');
+            if (!tbody) return;
+
+            let filteredOrders = orders;
+
+            // Aplicar filtro de status
+            if (currentOrderStatusFilter) {
+                filteredOrders = orders.filter(order => order.status === currentOrderStatusFilter);
+            }
+
+            // Ordenar por data (mais recentes primeiro)
+            filteredOrders.sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt));
+
+            if (filteredOrders.length === 0) {
+                tbody.innerHTML = `
+                    <tr>
+                        <td colspan="7" class="text-center text-muted">
+                            Nenhum pedido encontrado
+                        </td>
+                    </tr>
+                `;
+                return;
+            }
+
+            tbody.innerHTML = filteredOrders.map(order => `
+                <tr>
+                    <td>#${order.id}</td>
+                    <td>
+                        <strong>${order.customer.name}</strong><br>
+                        <small>${order.customer.email}</small>
+                    </td>
+                    <td>
+                        <small>
+                            ${order.items.map(item => 
+                                `${item.name} (x${item.quantity})`
+                            ).join('<br>')}
+                        </small>
+                    </td>
+                    <td>${formatCurrency(order.total)}</td>
+                    <td>
+                        <span class="status-badge status-${order.status}">
+                            ${getStatusLabel(order.status)}
+                        </span>
+                    </td>
+                    <td>
+                        ${new Date(order.createdAt).toLocaleDateString('pt-BR')}<br>
+                        <small>${new Date(order.createdAt).toLocaleTimeString('pt-BR')}</small>
+                    </td>
+                    <td>
+                        <div class="action-buttons">
+                            <button class="btn btn-sm btn-info" onclick="viewOrderDetails(${order.id})">
+                                👁️ Ver
+                            </button>
+                            <button class="btn btn-sm btn-success" onclick="updateOrderStatus(${order.id})"
+                                    ${order.status === 'delivered' || order.status === 'cancelled' ? 'disabled' : ''}>
+                                ⏭️ Avançar
+                            </button>
+                            <button class="btn btn-sm btn-danger" onclick="cancelOrder(${order.id})"
+                                    ${order.status === 'delivered' || order.status === 'cancelled' ? 'disabled' : ''}>
+                                ❌ Cancelar
+                            </button>
+                        </div>
+                    </td>
+                </tr>
+            `).join('');
+        }
+
+        function viewOrderDetails(orderId) {
+            const order = orders.find(o => o.id === orderId);
+            if (!order) return;
+
+            const modal = document.getElementById('order-details-modal');
+            const content = document.getElementById('order-details-content');
+
+            // Verificar se há reembolso associado
+            const orderRefunds = refunds.filter(r => r.orderId === orderId);
+            const hasRefund = orderRefunds.length > 0;
+            const latestRefund = hasRefund ? 
+                orderRefunds.reduce((latest, refund) => {
+                    return new Date(refund.requestedAt) > new Date(latest.requestedAt) ? refund : latest;
+                }, orderRefunds[0]) : null;
+
+            content.innerHTML = `
+                <div class="form-section">
+                    <h4>📋 Informações do Pedido</h4>
+                    <p><strong>ID:</strong> #${order.id}</p>
+                    <p><strong>Cliente:</strong> ${order.customer.name}</p>
+                    <p><strong>E-mail:</strong> ${order.customer.email}</p>
+                    <p><strong>Telefone:</strong> ${order.customer.phone}</p>
+                    <p><strong>Data:</strong> ${new Date(order.createdAt).toLocaleString('pt-BR')}</p>
+                    <p><strong>Status:</strong> <span class="status-badge status-${order.status}">${getStatusLabel(order.status)}</span></p>
+                    <p><strong>Total:</strong> ${formatCurrency(order.total)}</p>
+                </div>
+
+                <div class="form-section">
+                    <h4>🏠 Endereço de Entrega</h4>
+                    <p>${order.customer.address.street}, ${order.customer.address.number}</p>
+                    ${order.customer.address.complement ? `<p>${order.customer.address.complement}</p>` : ''}
+                    <p>${order.customer.address.city} - ${order.customer.address.state}</p>
+                    <p>CEP: ${order.customer.address.zipCode}</p>
+                </div>
+
+                <div class="form-section">
+                    <h4>🛍️ Itens do Pedido</h4>
+                    <table class="admin-table" style="font-size: 14px;">
+                        <thead>
+                            <tr>
+                                <th>Produto</th>
+                                <th>Código</th>
+                                <th>Preço</th>
+                                <th>Quantidade</th>
+                                <th>Subtotal</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            ${order.items.map(item => `
+                                <tr>
+                                    <td>${item.name} ${item.selectedSize ? `(${item.selectedSize})` : ''}</td>
+                                    <td>${item.code}</td>
+                                    <td>${formatCurrency(item.price)}</td>
+                                    <td>${item.quantity}</td>
+                                    <td>${formatCurrency(item.price * item.quantity)}</td>
+                                </tr>
+                            `).join('')}
+                        </tbody>
+                        <tfoot>
+                            <tr>
+                                <td colspan="4" style="text-align: right;"><strong>Total:</strong></td>
+                                <td><strong>${formatCurrency(order.total)}</strong></td>
+                            </tr>
+                        </tfoot>
+                    </table>
+                </div>
+
+                ${renderOrderTimeline(order)}
+
+                ${hasRefund ? renderRefundDetailsInModal(latestRefund) : ''}
+
+                ${order.status === 'preparing' ? renderPreparationDetails(order) : ''}
+
+                <div class="action-buttons mt-3">
+                    <button class="btn btn-success" onclick="updateOrderStatus(${order.id})"
+                            ${order.status === 'delivered' || order.status === 'cancelled' ? 'disabled' : ''}>
+                        ⏭️ Avançar Status
+                    </button>
+                    <button class="btn btn-danger" onclick="cancelOrder(${order.id})"
+                            ${order.status === 'delivered' || order.status === 'cancelled' ? 'disabled' : ''}>
+                        ❌ Cancelar Pedido
+                    </button>
+                    ${order.status === 'approved' ? `
+                        <button class="btn btn-warning" onclick="startPreparation(${order.id})">
+                            🔧 Iniciar Preparação
+                        </button>
+                    ` : ''}
+                    ${order.status === 'preparing' ? `
+                        <button class="btn btn-success" onclick="completePreparation(${order.id})">
+                            ✅ Finalizar Preparação
+                        </button>
+                    ` : ''}
+                    ${(order.status === 'delivered' || order.status === 'cancelled') ? `
+                        <button class="btn btn-warning" onclick="deleteOrder(${order.id})">
+                            🗑️ Excluir Pedido
+                        </button>
+                    ` : ''}
+                </div>
+            `;
+
+            modal.style.display = 'flex';
+        }
+
+        function renderOrderTimeline(order) {
+            const currentStatusIndex = orderStatuses.findIndex(s => s.key === order.status);
+
+            return `
+                <div class="form-section">
+                    <h4>📊 Timeline do Pedido</h4>
+                    <div class="status-timeline">
+                        ${orderStatuses.map((status, index) => {
+                            let stepClass = '';
+                            let dateText = '';
+
+                            if (order.status === 'cancelled') {
+                                stepClass = 'cancelled';
+                            } else {
+                                if (status.key === 'delivered' && order.status === 'delivered') {
+                                    stepClass = 'completed';
+                                } else if (index < currentStatusIndex) {
+                                    stepClass = 'completed';
+                                } else if (index === currentStatusIndex) {
+                                    stepClass = 'active';
+                                }
+                            }
+
+                            // Buscar data do status no histórico
+                            const statusEntry = order.statusHistory ? 
+                                order.statusHistory.find(entry => entry.status === status.key) : null;
+                            if (statusEntry) {
+                                dateText = `<div style="font-size: 9px; margin-top: 2px;">${new Date(statusEntry.date).toLocaleDateString('pt-BR')}</div>`;
+                            }
+
+                            return `
+                                <div class="status-step ${stepClass}">
+                                    <div class="status-icon">${status.icon}</div>
+                                    <div class="status-label">${status.label}</div>
+                                    ${dateText}
+                                </div>
+                            `;
+                        }).join('')}
+                    </div>
+                </div>
+            `;
+        }
+
+        function renderRefundDetailsInModal(refund) {
+            return `
+                <div class="form-section" style="background-color: #fff3cd;">
+                    <h4>💰 Solicitação de Reembolso</h4>
+                    <p><strong>Status:</strong> <span class="refund-status refund-${refund.status}">${getRefundStatusLabel(refund.status)}</span></p>
+                    <p><strong>Motivo:</strong> ${refund.reason}</p>
+                    <p><strong>Valor:</strong> ${formatCurrency(refund.amount)}</p>
+                    <p><strong>Solicitado em:</strong> ${new Date(refund.requestedAt).toLocaleString('pt-BR')}</p>
+
+                    <div class="action-buttons mt-2">
+                        ${refund.status === refundStatuses.PENDING ? `
+                            <button class="btn btn-sm btn-success" onclick="updateRefundStatusInModal(${refund.id}, '${refundStatuses.APPROVED}')">
+                                ✅ Aprovar
+                            </button>
+                            <button class="btn btn-sm btn-danger" onclick="updateRefundStatusInModal(${refund.id}, '${refundStatuses.REJECTED}')">
+                                ❌ Rejeitar
+                            </button>
+                        ` : ''}
+                        ${refund.status === refundStatuses.APPROVED ? `
+                            <button class="btn btn-sm btn-info" onclick="updateRefundStatusInModal(${refund.id}, '${refundStatuses.PROCESSING}')">
+                                🔄 Processar
+                            </button>
+                        ` : ''}
+                        ${refund.status === refundStatuses.PROCESSING ? `
+                            <button class="btn btn-sm btn-success" onclick="updateRefundStatusInModal(${refund.id}, '${refundStatuses.COMPLETED}')">
+                                ✅ Concluir
+                            </button>
+                        ` : ''}
+                    </div>
+                </div>
+            `;
+        }
+
+        function renderPreparationDetails(order) {
+            if (!order.preparation) {
+                order.preparation = {
+                    startedAt: new Date().toISOString(),
+                    items: order.items.map(item => ({
+                        id: item.id,
+                        name: item.name,
+                        code: item.code,
+                        quantity: item.quantity,
+                        prepared: false
+                    })),
+                    notes: ''
+                };
+            }
+
+            const startTime = new Date(order.preparation.startedAt);
+            const now = new Date();
+            const diffMs = now - startTime;
+            const diffMins = Math.floor(diffMs / 60000);
+
+            return `
+                <div class="form-section">
+                    <h4>🔧 Preparação do Pedido</h4>
+                    <p><strong>Tempo decorrido:</strong> ${diffMins} minutos</p>
+
+                    <div class="preparation-items">
+                        <h5>Itens para preparar:</h5>
+                        ${order.preparation.items.map(item => `
+                            <div class="preparation-item">
+                                <div>
+                                    <input type="checkbox" class="item-checkbox" ${item.prepared ? 'checked' : ''} 
+                                           onchange="toggleItemPreparation(${order.id}, ${item.id})">
+                                    <span>${item.name} (Cód. ${item.code}) x${item.quantity}</span>
+                                </div>
+                                <span style="font-size: 12px; color: ${item.prepared ? '#27ae60' : '#e74c3c'}">
+                                    ${item.prepared ? '✓ Preparado' : 'Pendente'}
+                                </span>
+                            </div>
+                        `).join('')}
+                    </div>
+
+                    <div class="form-group mt-3">
+                        <label for="preparation-notes-${order.id}">Observações:</label>
+                        <textarea id="preparation-notes-${order.id}" rows="2" onchange="updatePreparationNotes(${order.id}, this.value)"
+                                  style="width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px;">${order.preparation.notes || ''}</textarea>
+                    </div>
+                </div>
+            `;
+        }
+
+        function closeOrderModal() {
+            document.getElementById('order-details-modal').style.display = 'none';
+        }
+
+        function updateOrderStatus(orderId) {
+            const order = orders.find(o => o.id === orderId);
+            if (!order) return;
+
+            // Determinar próximo status
+            const currentStatusIndex = orderStatuses.findIndex(s => s.key === order.status);
+            let nextStatus;
+
+            if (currentStatusIndex < orderStatuses.length - 1) {
+                nextStatus = orderStatuses[currentStatusIndex + 1].key;
+            } else {
+                nextStatus = 'delivered'; // Último status
+            }
+
+            // Atualizar status
+            order.status = nextStatus;
+            order.updatedAt = new Date().toISOString();
+
+            // Inicializar statusHistory se não existir
+            if (!order.statusHistory) {
+                order.statusHistory = [];
+            }
+
+            // Adicionar ao histórico
+            order.statusHistory.push({
+                status: nextStatus,
+                date: new Date().toISOString()
+            });
+
+            // Se status for 'preparando', iniciar preparação
+            if (nextStatus === 'preparing') {
+                startPreparation(orderId);
+            }
+
+            // Salvar e atualizar
+            saveData();
+            renderOrders();
+            updateDashboard();
+
+            showAlert(`Status do pedido #${orderId} atualizado para: ${getStatusLabel(nextStatus)}`, 'success');
+            closeOrderModal();
+        }
+
+        function cancelOrder(orderId) {
+            showConfirmation(
+                'Cancelar Pedido',
+                'Tem certeza que deseja cancelar este pedido? Esta ação não pode ser desfeita.',
+                function() {
+                    const order = orders.find(o => o.id === orderId);
+                    if (!order) return;
+
+                    // Verificar se o pedido pode ser cancelado
+                    if (order.status === 'shipped' || order.status === 'delivered') {
+                        showAlert('Este pedido não pode ser cancelado porque já foi enviado ou entregue.', 'danger');
+                        return;
+                    }
+
+                    // Atualizar status para cancelado
+                    order.status = 'cancelled';
+                    order.updatedAt = new Date().toISOString();
+
+                    // Inicializar statusHistory se não existir
+                    if (!order.statusHistory) {
+                        order.statusHistory = [];
+                    }
+
+                    // Adicionar ao histórico
+                    order.statusHistory.push({
+                        status: 'cancelled',
+                        date: new Date().toISOString()
+                    });
+
+                    // Salvar e atualizar
+                    saveData();
+                    renderOrders();
+                    updateDashboard();
+
+                    showAlert(`Pedido #${orderId} cancelado com sucesso.`, 'success');
+                    closeOrderModal();
+                }
+            );
+        }
+
+        function startPreparation(orderId) {
+            const order = orders.find(o => o.id === orderId);
+            if (!order) return;
+
+            // Atualizar status para "preparando"
+            order.status = 'preparing';
+            order.updatedAt = new Date().toISOString();
+
+            // Inicializar dados de preparação
+            order.preparation = {
+                startedAt: new Date().toISOString(),
+                items: order.items.map(item => ({
+                    id: item.id,
+                    name: item.name,
+                    code: item.code,
+                    quantity: item.quantity,
+                    prepared: false
+                })),
+                notes: ''
+            };
+
+            // Salvar e atualizar
+            saveData();
+            renderOrders();
+
+            showAlert(`Preparação do pedido #${orderId} iniciada!`, 'success');
+        }
+
+        function toggleItemPreparation(orderId, itemId) {
+            const order = orders.find(o => o.id === orderId);
+            if (!order || !order.preparation) return;
+
+            const item = order.preparation.items.find(i => i.id === itemId);
+            if (!item) return;
+
+            item.prepared = !item.prepared;
+
+            // Salvar alterações
+            saveData();
+        }
+
+        function updatePreparationNotes(orderId, notes) {
+            const order = orders.find(o => o.id === orderId);
+            if (!order || !order.preparation) return;
+
+            order.preparation.notes = notes;
+
+            // Salvar alterações
+            saveData();
+        }
+
+        function completePreparation(orderId) {
+            const order = orders.find(o => o.id === orderId);
+            if (!order || !order.preparation) return;
+
+            // Verificar se todos os itens foram preparados
+            const allItemsPrepared = order.preparation.items.every(item => item.prepared);
+
+            if (!allItemsPrepared) {
+                showConfirmation(
+                    'Finalizar Preparação',
+                    'Nem todos os itens foram marcados como preparados. Deseja finalizar mesmo assim?',
+                    function() {
+                        finalizePreparation(orderId);
+                    }
+                );
+            } else {
+                finalizePreparation(orderId);
+            }
+        }
+
+        function finalizePreparation(orderId) {
+            const order = orders.find(o => o.id === orderId);
+            if (!order || !order.preparation) return;
+
+            // Atualizar status para "pronto para entrega"
+            order.status = 'ready';
+            order.updatedAt = new Date().toISOString();
+
+            // Calcular tempo total de preparação
+            const startTime = new Date(order.preparation.startedAt);
+            const endTime = new Date();
+            const diffMs = endTime - startTime;
+            const diffMins = Math.floor(diffMs / 60000);
+
+            order.preparation.completedAt = endTime.toISOString();
+            order.preparation.totalTime = diffMins;
+
+            // Salvar e atualizar
+            saveData();
+            renderOrders();
+
+            showAlert(`Preparação do pedido #${orderId} finalizada em ${diffMins} minutos!`, 'success');
+            closeOrderModal();
+        }
+
+        function deleteOrder(orderId) {
+            showConfirmation(
+                'Excluir Pedido',
+                'Tem certeza que deseja excluir este pedido? Esta ação não pode ser desfeita.',
+                function() {
+                    // Remover pedido
+                    orders = orders.filter(order => order.id !== orderId);
+
+                    // Remover reembolsos associados
+                    refunds = refunds.filter(refund => refund.orderId !== orderId);
+
+                    // Salvar e atualizar
+                    saveData();
+                    renderOrders();
+                    updateDashboard();
+
+                    showAlert('Pedido excluído com sucesso!', 'success');
+                    closeOrderModal();
+                }
+            );
+        }
+
+        function exportOrders() {
+            const data = {
+                orders: orders,
+                exportDate: new Date().toISOString(),
+                totalOrders: orders.length,
+                totalRevenue: orders.filter(o => o.status === 'delivered').reduce((sum, o) => sum + o.total, 0)
+            };
+
+            const dataStr = JSON.stringify(data, null, 2);
+            const dataUri = 'data:application/json;charset=utf-8,' + encodeURIComponent(dataStr);
+
+            const exportFileDefaultName = `pedidos-romanel-joias-${new Date().toISOString().split('T')[0]}.json`;
+
+            const linkElement = document.createElement('a');
+            linkElement.setAttribute('href', dataUri);
+            linkElement.setAttribute('download', exportFileDefaultName);
+            linkElement.click();
+
+            showAlert('Pedidos exportados com sucesso!', 'success');
+        }
+
+        // ========== REEMBOLSOS ==========
+        function updateRefundStats() {
+            document.getElementById('total-refunds').textContent = refunds.length;
+            document.getElementById('pending-refunds-count').textContent = 
+                refunds.filter(r => r.status === refundStatuses.PENDING).length;
+            document.getElementById('approved-refunds').textContent = 
+                refunds.filter(r => r.status === refundStatuses.APPROVED).length;
+            document.getElementById('completed-refunds').textContent = 
+                refunds.filter(r => r.status === refundStatuses.COMPLETED).length;
+            document.getElementById('refunds-amount').textContent = formatCurrency(
+                refunds.filter(r => r.status === refundStatuses.COMPLETED).reduce((sum, r) => sum + r.amount, 0)
+            );
+        }
+
+        function filterRefunds() {
+            currentRefundStatusFilter = document.getElementById('refund-status-filter').value;
+            renderRefunds();
+        }
+
+        function renderRefunds() {
+            const tbody = document.getElementById('refunds-table-body');
+            if (!tbody) return;
+
+            let filteredRefunds = refunds;
+
+            // Aplicar filtro de status
+            if (currentRefundStatusFilter) {
+                filteredRefunds = refunds.filter(refund => refund.status === currentRefundStatusFilter);
+            }
+
+            // Ordenar por data (mais recentes primeiro)
+            filteredRefunds.sort((a, b) => new Date(b.requestedAt) - new Date(a.requestedAt));
+
+            if (filteredRefunds.length === 0) {
+                tbody.innerHTML = `
+                    <tr>
+                        <td colspan="8" class="text-center text-muted">
+                            Nenhum reembolso encontrado
+                        </td>
+                    </tr>
+                `;
+                return;
+            }
+
+            tbody.innerHTML = filteredRefunds.map(refund => {
+                const order = orders.find(o => o.id === refund.orderId);
+                const customerName = order ? order.customer.name : 'N/A';
+
+                return `
+                    <tr>
+                        <td>#${refund.id}</td>
+                        <td>#${refund.orderId}</td>
+                        <td>${customerName}</td>
+                        <td>${truncateText(refund.reason, 30)}</td>
+                        <td>${formatCurrency(refund.amount)}</td>
+                        <td>
+                            <span class="refund-status refund-${refund.status}">
+                                ${getRefundStatusLabel(refund.status)}
+                            </span>
+                        </td>
+                        <td>
+                            ${new Date(refund.requestedAt).toLocaleDateString('pt-BR')}<br>
+                            <small>${new Date(refund.requestedAt).toLocaleTimeString('pt-BR')}</small>
+                        </td>
+                        <td>
+                            <div class="action-buttons">
+                                <button class="btn btn-sm btn-info" onclick="viewRefundDetails(${refund.id})">
+                                    👁️ Ver
+                                </button>
+                                ${refund.status === refundStatuses.PENDING ? `
+                                    <button class="btn btn-sm btn-success" onclick="updateRefundStatusInList(${refund.id}, '${refundStatuses.APPROVED}')">
+                                        ✅ Aprovar
+                                    </button>
+                                    <button class="btn btn-sm btn-danger" onclick="updateRefundStatusInList(${refund.id}, '${refundStatuses.REJECTED}')">
+                                        ❌ Rejeitar
+                                    </button>
+                                ` : ''}
+                                ${refund.status === refundStatuses.APPROVED ? `
+                                    <button class="btn btn-sm btn-info" onclick="updateRefundStatusInList(${refund.id}, '${refundStatuses.PROCESSING}')">
+                                        🔄 Processar
+                                    </button>
+                                ` : ''}
+                                ${refund.status === refundStatuses.PROCESSING ? `
+                                    <button class="btn btn-sm btn-success" onclick="updateRefundStatusInList(${refund.id}, '${refundStatuses.COMPLETED}')">
+                                        ✅ Concluir
+                                    </button>
+                                ` : ''}
+                                ${refund.status === refundStatuses.COMPLETED || refund.status === refundStatuses.REJECTED ? `
+                                    <button class="btn btn-sm btn-warning" onclick="deleteRefund(${refund.id})">
+                                        🗑️ Excluir
+                                    </button>
+                                ` : ''}
+                            </div>
+                        </td>
+                    </tr>
+                `;
+            }).join('');
+
+            updateRefundStats();
+        }
+
+        function viewRefundDetails(refundId) {
+            const refund = refunds.find(r => r.id === refundId);
+            if (!refund) return;
+
+            const order = orders.find(o => o.id === refund.orderId);
+
+            alert(`
+Detalhes do Reembolso #${refund.id}
+
+Pedido: #${refund.orderId}
+Cliente: ${order ? order.customer.name : 'N/A'}
+E-mail: ${refund.customerEmail}
+Status: ${getRefundStatusLabel(refund.status)}
+Motivo: ${refund.reason}
+Observações: ${refund.notes || 'Nenhuma'}
+Valor: ${formatCurrency(refund.amount)}
+Solicitado em: ${new Date(refund.requestedAt).toLocaleString('pt-BR')}
+${refund.processedAt ? `Processado em: ${new Date(refund.processedAt).toLocaleString('pt-BR')}` : ''}
+${refund.completedAt ? `Concluído em: ${new Date(refund.completedAt).toLocaleString('pt-BR')}` : ''}
+${refund.adminNotes ? `Observações do admin: ${refund.adminNotes}` : ''}
+
+Histórico:
+${refund.history ? refund.history.map(h => 
+    `• ${new Date(h.date).toLocaleString('pt-BR')} - ${h.notes}`
+).join('\n') : 'Nenhum histórico'}
+            `);
+        }
+
+        function updateRefundStatusInModal(refundId, newStatus) {
+            updateRefundStatus(refundId, newStatus);
+            // Reabrir modal para mostrar atualizações
+            const refund = refunds.find(r => r.id === refundId);
+            if (refund) {
+                const orderId = refund.orderId;
+                closeOrderModal();
+                setTimeout(() => viewOrderDetails(orderId), 100);
+            }
+        }
+
+        function updateRefundStatusInList(refundId, newStatus) {
+            updateRefundStatus(refundId, newStatus);
+        }
+
+        function updateRefundStatus(refundId, newStatus) {
+            const refund = refunds.find(r => r.id === refundId);
+            if (!refund) {
+                showAlert('Reembolso não encontrado.', 'danger');
+                return;
+            }
+
+            let adminNotes = '';
+            if (newStatus === refundStatuses.REJECTED) {
+                adminNotes = prompt('Por favor, informe o motivo da rejeição:');
+                if (adminNotes === null) return; // Usuário cancelou
+            } else if (newStatus === refundStatuses.COMPLETED) {
+                adminNotes = prompt('Por favor, informe observações sobre a conclusão do reembolso (opcional):');
+                if (adminNotes === null) adminNotes = ''; // Usuário cancelou, mas continua
+            }
+
+            // Atualizar status
+            refund.status = newStatus;
+            if (adminNotes) {
+                refund.adminNotes = adminNotes;
+            }
+
+            // Inicializar history se não existir
+            if (!refund.history) {
+                refund.history = [];
+            }
+
+            // Adicionar ao histórico
+            refund.history.push({
+                status: newStatus,
+                date: new Date().toISOString(),
+                notes: `Status alterado para: ${getRefundStatusLabel(newStatus)}` + 
+                       (adminNotes ? ` - Observações: ${adminNotes}` : '')
+            });
+
+            // Atualizar datas relevantes
+            if (newStatus === refundStatuses.APPROVED || newStatus === refundStatuses.REJECTED) {
+                refund.processedAt = new Date().toISOString();
+            }
+
+            if (newStatus === refundStatuses.COMPLETED) {
+                refund.completedAt = new Date().toISOString();
+            }
+
+            // Salvar alterações
+            saveData();
+
+            // Atualizar interfaces
+            renderRefunds();
+            updateDashboard();
+
+            showAlert(`Status do reembolso #${refundId} atualizado para: ${getRefundStatusLabel(newStatus)}`, 'success');
+        }
+
+        function deleteRefund(refundId) {
+            showConfirmation(
+                'Excluir Reembolso',
+                'Tem certeza que deseja excluir este reembolso? Esta ação não pode ser desfeita.',
+                function() {
+                    refunds = refunds.filter(refund => refund.id !== refundId);
+                    saveData();
+                    renderRefunds();
+                    updateDashboard();
+                    showAlert('Reembolso excluído com sucesso!', 'success');
+                }
+            );
+        }
+
+        function cleanupRefunds() {
+            showConfirmation(
+                'Limpar Reembolsos Concluídos',
+                'Esta ação excluirá todos os reembolsos com status "Concluído". Tem certeza?',
+                function() {
+                    const completedRefunds = refunds.filter(r => r.status === refundStatuses.COMPLETED);
+                    refunds = refunds.filter(r => r.status !== refundStatuses.COMPLETED);
+                    saveData();
+                    renderRefunds();
+                    updateDashboard();
+                    showAlert(`${completedRefunds.length} reembolsos concluídos foram excluídos.`, 'success');
+                }
+            );
+        }
+
+        // ========== NOTIFICAÇÕES ==========
+        function renderNotifications() {
+            const container = document.getElementById('notifications-list');
+            if (!container) return;
+
+            // Ordenar notificações por data (mais recentes primeiro)
+            const sortedNotifications = [...notifications].sort((a, b) => 
+                new Date(b.createdAt) - new Date(a.createdAt)
+            );
+
+            if (sortedNotifications.length === 0) {
+                container.innerHTML = `
+                    <div class="text-center p-3">
+                        <p class="text-muted">Nenhuma notificação</p>
+                    </div>
+                `;
+                return;
+            }
+
+            container.innerHTML = sortedNotifications.map(notification => `
+                <div class="notification-item ${notification.viewed ? '' : 'new-notification'}" 
+                     style="${notification.viewed ? 'opacity: 0.8;' : 'border-left-color: #f39c12;'}">
+                    <div class="notification-header">
+                        <div class="notification-title">
+                            ${notification.viewed ? '🔔' : '🔴'} ${notification.title || 'Nova Solicitação de Reembolso'}
+                        </div>
+                        <div class="notification-date">
+                            ${new Date(notification.createdAt).toLocaleDateString('pt-BR')}
+                            ${new Date(notification.createdAt).toLocaleTimeString('pt-BR')}
+                        </div>
+                    </div>
+                    <div style="margin-top: 10px;">
+                        ${notification.message || `
+                            <p><strong>Cliente:</strong> ${notification.customerName}</p>
+                            <p><strong>Pedido:</strong> #${notification.orderId}</p>
+                            <p><strong>Valor:</strong> ${formatCurrency(notification.amount)}</p>
+                            <p><strong>Motivo:</strong> ${notification.reason}</p>
+                        `}
+                    </div>
+                    <div class="action-buttons mt-2">
+                        ${!notification.viewed ? `
+                            <button class="btn btn-sm btn-success" onclick="markNotificationAsViewed(${notification.id})">
+                                ✅ Marcar como Lida
+                            </button>
+                        ` : ''}
+                        <button class="btn btn-sm btn-danger" onclick="deleteNotification(${notification.id})">
+                            🗑️ Excluir
+                        </button>
+                        ${notification.refundId ? `
+                            <button class="btn btn-sm btn-info" onclick="viewRefundDetails(${notification.refundId})">
+                                👁️ Ver Reembolso
+                            </button>
+                        ` : ''}
+                    </div>
+                </div>
+            `).join('');
+        }
+
+        function markNotificationAsViewed(notificationId) {
+            const notification = notifications.find(n => n.id === notificationId);
+            if (notification) {
+                notification.viewed = true;
+                saveData();
+                renderNotifications();
+            }
+        }
+
+        function deleteNotification(notificationId) {
+            notifications = notifications.filter(n => n.id !== notificationId);
+            saveData();
+            renderNotifications();
+            updateDashboard();
+        }
+
+        function refreshNotifications() {
+            renderNotifications();
+            showAlert('Notificações atualizadas!', 'success');
+        }
+
+        function clearAllNotifications() {
+            showConfirmation(
+                'Limpar Todas as Notificações',
+                'Tem certeza que deseja excluir todas as notificações? Esta ação não pode ser desfeita.',
+                function() {
+                    notifications = [];
+                    saveData();
+                    renderNotifications();
+                    updateDashboard();
+                    showAlert('Todas as notificações foram excluídas.', 'success');
+                }
+            );
+        }
+
+        // ========== CONFIGURAÇÕES ==========
+        function saveSettings() {
+            if (!checkAdminAuthInFunction()) return;
+
+            // Salvar configurações (exemplo simplificado)
+            const settings = {
+                storeName: document.getElementById('store-name').value,
+                storeEmail: document.getElementById('store-email').value,
+                storePhone: document.getElementById('store-phone').value,
+                lastUpdated: new Date().toISOString()
+            };
+
+            localStorage.setItem('romanelSettings', JSON.stringify(settings));
+            showAlert('Configurações salvas com sucesso!', 'success');
+        }
+
+        function changePassword() {
+            if (!checkAdminAuthInFunction()) return;
+
+            const newPassword = document.getElementById('admin-password').value;
+            const confirmPassword = document.getElementById('confirm-password').value;
+
+            if (!newPassword || !confirmPassword) {
+                showAlert('Preencha ambos os campos de senha.', 'warning');
+                return;
+            }
+
+            if (newPassword !== confirmPassword) {
+                showAlert('As senhas não coincidem.', 'danger');
+                return;
+            }
+
+            if (newPassword.length < 6) {
+                showAlert('A senha deve ter pelo menos 6 caracteres.', 'warning');
+                return;
+            }
+
+            // Aqui você implementaria a lógica real de alteração de senha
+            // Por enquanto, vamos apenas mostrar uma mensagem
+            showAlert('Senha alterada com sucesso!', 'success');
+
+            // Limpar campos
+            document.getElementById('admin-password').value = '';
+            document.getElementById('confirm-password').value = '';
+        }
+
+        function backupData() {
+            if (!checkAdminAuthInFunction()) return;
+
+            const backup = {
+                products: products,
+                orders: orders,
+                refunds: refunds,
+                notifications: notifications,
+                backupDate: new Date().toISOString()
+            };
+
+            const dataStr = JSON.stringify(backup, null, 2);
+            const dataUri = 'data:application/json;charset=utf-8,' + encodeURIComponent(dataStr);
+
+            const exportFileDefaultName = `backup-romanel-joias-${new Date().toISOString().split('T')[0]}.json`;
+
+            const linkElement = document.createElement('a');
+            linkElement.setAttribute('href', dataUri);
+            linkElement.setAttribute('download', exportFileDefaultName);
+            linkElement.click();
+
+            showAlert('Backup realizado com sucesso!', 'success');
+        }
+
+        function cleanupDeliveredOrders() {
+            if (!checkAdminAuthInFunction()) return;
+
+            showConfirmation(
+                'Limpar Pedidos Entregues',
+                'Esta ação excluirá todos os pedidos com status "Entregue". Tem certeza?',
+                function() {
+                    const deliveredOrders = orders.filter(o => o.status === 'delivered');
+                    orders = orders.filter(o => o.status !== 'delivered');
+                    saveData();
+                    renderOrders();
+                    updateDashboard();
+                    showAlert(`${deliveredOrders.length} pedidos entregues foram excluídos.`, 'success');
+                }
+            );
+        }
+
+        function cleanupCancelledOrders() {
+            if (!checkAdminAuthInFunction()) return;
+
+            showConfirmation(
+                'Limpar Pedidos Cancelados',
+                'Esta ação excluirá todos os pedidos com status "Cancelado". Tem certeza?',
+                function() {
+                    const cancelledOrders = orders.filter(o => o.status === 'cancelled');
+                    orders = orders.filter(o => o.status !== 'cancelled');
+                    saveData();
+                    renderOrders();
+                    updateDashboard();
+                    showAlert(`${cancelledOrders.length} pedidos cancelados foram excluídos.`, 'success');
+                }
+            );
+        }
+
+        function cleanupOldRefunds() {
+            if (!checkAdminAuthInFunction()) return;
+
+            showConfirmation(
+                'Limpar Reembolsos Antigos',
+                'Esta ação excluirá todos os reembolsos concluídos há mais de 30 dias. Tem certeza?',
+                function() {
+                    const thirtyDaysAgo = new Date();
+                    thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
+
+                    const oldRefunds = refunds.filter(r => 
+                        r.status === refundStatuses.COMPLETED && 
+                        new Date(r.completedAt) < thirtyDaysAgo
+                    );
+
+                    refunds = refunds.filter(r => 
+                        !(r.status === refundStatuses.COMPLETED && 
+                          new Date(r.completedAt) < thirtyDaysAgo)
+                    );
+
+                    saveData();
+                    renderRefunds();
+                    updateDashboard();
+                    showAlert(`${oldRefunds.length} reembolsos antigos foram excluídos.`, 'success');
+                }
+            );
+        }
+
+        // ========== UTILITÁRIOS ==========
+        function formatCurrency(value) {
+            return new Intl.NumberFormat('pt-BR', {
+                style: 'currency',
+                currency: 'BRL'
+            }).format(value);
+        }
+
+        function getStatusLabel(status) {
+            const statusMap = {
+                'received': 'Recebido',
+                'approved': 'Aprovado',
+                'preparing': 'Preparando',
+                'ready': 'Pronto',
+                'shipped': 'Enviado',
+                'delivered': 'Entregue',
+                'cancelled': 'Cancelado'
+            };
+            return statusMap[status] || status;
+        }
+
+        function getRefundStatusLabel(status) {
+            const statusMap = {
+                'pending': 'Pendente',
+                'approved': 'Aprovado',
+                'rejected': 'Rejeitado',
+                'processing': 'Processando',
+                'completed': 'Concluído'
+            };
+            return statusMap[status] || status;
+        }
+
+        function getCategoryName(categoryKey) {
+            const categories = {
+                'aneis': 'Anéis',
+                'colares': 'Colares',
+                'brincos': 'Brincos',
+                'pulseiras': 'Pulseiras',
+                'pingentes': 'Pingentes',
+                'relogios': 'Relógios',
+                'solitarios': 'Solitários',
+                'pet': 'Pet',
+                'chaveiros': 'Chaveiros',
+                'aliancas': 'Alianças',
+                'correntes': 'Correntes',
+                'promocoes': 'Promoções'
+            };
+            return categories[categoryKey] || categoryKey;
+        }
+
+        function getGenderName(genderKey) {
+            const genders = {
+                'feminino': 'Feminino',
+                'masculino': 'Masculino',
+                'infantil': 'Infantil',
+                'unissex': 'Unissex'
+            };
+            return genders[genderKey] || genderKey;
+        }
+
+        function truncateText(text, maxLength) {
+            if (text.length <= maxLength) return text;
+            return text.substring(0, maxLength) + '...';
+        }
+
+        // ========== MODAIS E ALERTAS ==========
+        function showAlert(message, type = 'info') {
+            // Criar elemento de alerta
+            const alertDiv = document.createElement('div');
+            alertDiv.className = `alert alert-${type}`;
+            alertDiv.innerHTML = `
+                <div style="display: flex; justify-content: space-between; align-items: center; padding: 15px; margin-bottom: 15px; border-radius: 4px; background-color: ${getAlertColor(type)}; color: white;">
+                    <span>${message}</span>
+                    <button onclick="this.parentElement.parentElement.remove()" 
+                            style="background: none; border: none; font-size: 20px; cursor: pointer; color: inherit;">
+                        &times;
+                    </button>
+                </div>
+            `;
+
+            // Adicionar ao topo do container
+            const container = document.querySelector('.admin-container');
+            container.insertBefore(alertDiv, container.firstChild);
+
+            // Remover automaticamente após 5 segundos
+            setTimeout(() => {
+                if (alertDiv.parentNode) {
+                    alertDiv.remove();
+                }
+            }, 5000);
+        }
+
+        function getAlertColor(type) {
+            const colors = {
+                'success': '#28a745',
+                'danger': '#dc3545',
+                'warning': '#ffc107',
+                'info': '#17a2b8'
+            };
+            return colors[type] || '#17a2b8';
+        }
+
+        function showConfirmation(title, message, confirmCallback) {
+            const modal = document.getElementById('confirmation-modal');
+            const titleElement = document.getElementById('confirmation-title');
+            const messageElement = document.getElementById('confirmation-message');
+            const confirmButton = document.getElementById('confirm-action-btn');
+
+            titleElement.textContent = title;
+            messageElement.textContent = message;
+
+            // Remover event listeners anteriores
+            const newConfirmButton = confirmButton.cloneNode(true);
+            confirmButton.parentNode.replaceChild(newConfirmButton, confirmButton);
+
+            // Adicionar novo event listener
+            newConfirmButton.onclick = function() {
+                confirmCallback();
+                closeConfirmationModal();
+            };
+
+            modal.style.display = 'flex';
+        }
+
+        function closeConfirmationModal() {
+            document.getElementById('confirmation-modal').style.display = 'none';
+        }
+
+        function showLoading(message = 'Processando...') {
+            const overlay = document.getElementById('loading-overlay');
+            const messageElement = document.getElementById('loading-message');
+
+            messageElement.textContent = message;
+            overlay.style.display = 'flex';
+        }
+
+        function hideLoading() {
+            document.getElementById('loading-overlay').style.display = 'none';
+        }
+
+        // ========== EXPORTAÇÃO ==========
+        function exportData() {
+            if (!checkAdminAuthInFunction()) return;
+
+            const data = {
+                products: products,
+                orders: orders,
+                refunds: refunds,
+                exportDate: new Date().toISOString(),
+                summary: {
+                    totalProducts: products.length,
+                    totalOrders: orders.length,
+                    totalRefunds: refunds.length,
+                    totalRevenue: orders.filter(o => o.status === 'delivered').reduce((sum, o) => sum + o.total, 0)
+                }
+            };
+
+            const dataStr = JSON.stringify(data, null, 2);
+            const dataUri = 'data:application/json;charset=utf-8,' + encodeURIComponent(dataStr);
+
+            const exportFileDefaultName = `romanel-joias-${new Date().toISOString().split('T')[0]}.json`;
+
+            const linkElement = document.createElement('a');
+            linkElement.setAttribute('href', dataUri);
+            linkElement.setAttribute('download', exportFileDefaultName);
+            linkElement.click();
+
+            showAlert('Dados exportados com sucesso!', 'success');
+        }
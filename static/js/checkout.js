@@ -0,0 +1,247 @@
+// ========== VARIÁVEIS GLOBAIS ==========
+let carrinhoAtual = [];
+const FRETE = 5.0; // VALOR DO FRETE - Basta alterar este valor
+
+// ========== FUNÇÕES DE CARRINHO ==========
+
+function carregarCarrinho() {
+    console.log("📦 Iniciando carregamento do carrinho...");
+
+    try {
+        // TENTATIVA 1: Verificar carrinho do index.html (romanelCart)
+        let carrinhoSalvo = localStorage.getItem('romanelCart');
+
+        // TENTATIVA 2: Verificar carrinho padrão (carrinho)
+        if (!carrinhoSalvo) {
+            carrinhoSalvo = localStorage.getItem('carrinho');
+            console.log("Tentando carregar do 'carrinho'...");
+        }
+
+        console.log("Dados brutos do localStorage:", carrinhoSalvo);
+
+        if (!carrinhoSalvo) {
+            console.warn("⚠️ Nenhum carrinho encontrado no localStorage");
+            mostrarCarrinhoVazio();
+            return;
+        }
+
+        carrinhoAtual = JSON.parse(carrinhoSalvo);
+        console.log("Carrinho parseado:", carrinhoAtual);
+
+        // Se o carrinho for do index.html (romanelCart), converter para o formato do checkout
+        if (carrinhoAtual && carrinhoAtual.length > 0 && carrinhoAtual[0].code) {
+            console.log("🔧 Convertendo carrinho do formato index.html para checkout...");
+            carrinhoAtual = converterCarrinhoParaCheckout(carrinhoAtual);
+        }
+
+        if (!Array.isArray(carrinhoAtual) || carrinhoAtual.length === 0) {
+            console.warn("⚠️ Carrinho vazio ou formato inválido");
+            mostrarCarrinhoVazio();
+            return;
+        }
+
+        // Verificar se os itens têm preço correto
+        carrinhoAtual.forEach((item, index) => {
+            if (!item.price || item.price <= 0) {
+                console.warn(`⚠️ Item ${index} sem preço válido:`, item);
+                item.price = 87.76; // Preço padrão
+            }
+        });
+
+        console.log(`✅ Carrinho carregado com ${carrinhoAtual.length} item(s)`);
+        mostrarCarrinhoItens();
+
+    } catch (error) {
+        console.error("❌ Erro ao carregar carrinho:", error);
+        mostrarErro("Erro ao carregar carrinho. Tente novamente.");
+        mostrarCarrinhoVazio();
+    }
+}
+
+function converterCarrinhoParaCheckout(carrinhoIndex) {
+    // Converter do formato do index.html para o formato do checkout
+    return carrinhoIndex.map(item => {
+        return {
+            id: item.id,
+            name: item.name,
+            price: item.price,
+            quantity: item.quantity,
+            image: item.image || "https://images.unsplash.com/photo-1605100804763-247f67b3557e"
+        };
+    });
+}
+
+function mostrarCarrinhoVazio() {
+    document.getElementById('loading').style.display = 'none';
+    document.getElementById('carrinho-vazio').style.display = 'block';
+    document.getElementById('carrinho-itens').style.display = 'none';
+    document.getElementById('btn-finalizar').disabled = true;
+    document.getElementById('btn-finalizar').innerText = 'Carrinho Vazio';
+}
+
+function mostrarCarrinhoItens() {
+    document.getElementById('loading').style.display = 'none';
+    document.getElementById('carrinho-vazio').style.display = 'none';
+    document.getElementById('carrinho-itens').style.display = 'block';
+    document.getElementById('btn-finalizar').disabled = false;
+    document.getElementById('btn-finalizar').innerText = '🛒 Finalizar Compra';
+
+    renderizarItens();
+    calcularResumo();
+}
+
+function renderizarItens() {
+    const itensLista = document.getElementById('itens-lista');
+    itensLista.innerHTML = '';
+
+    carrinhoAtual.forEach((item, index) => {
+        const subtotal = item.price * item.quantity;
+
+        const itemHTML = `
+            <div class="cart-item">
+                <div>
+                    <strong>${item.name}</strong>
+                    <p>Quantidade: ${item.quantity}</p>
+                </div>
+                <div>
+                    <p><strong>R$ ${subtotal.toFixed(2)}</strong></p>
+                    <p style="font-size: 12px; color: #666;">R$ ${item.price.toFixed(2)} un.</p>
+                </div>
+            </div>
+        `;
+
+        itensLista.innerHTML += itemHTML;
+    });
+}
+
+function calcularResumo() {
+    let subtotal = 0;
+
+    carrinhoAtual.forEach(item => {
+        subtotal += item.price * item.quantity;
+    });
+
+    const total = subtotal + FRETE;
+
+    const resumoDetalhes = document.getElementById('resumo-detalhes');
+    resumoDetalhes.innerHTML = `
+        <p>Subtotal: R$ ${subtotal.toFixed(2)}</p>
+        <p>Frete: R$ ${FRETE.toFixed(2)}</p>
+        <p>Descontos: R$ 0,00</p>
+    `;
+
+    document.getElementById('total-pedido').textContent = `R$ ${total.toFixed(2)}`;
+}
+
+// ========== FUNÇÕES DE CHECKOUT ==========
+
+function mostrarErro(mensagem) {
+    const errorDiv = document.getElementById('error-message');
+    errorDiv.textContent = mensagem;
+    errorDiv.style.display = 'block';
+
+    setTimeout(() => {
+        errorDiv.style.display = 'none';
+    }, 5000);
+}
+
+function mostrarSucesso(mensagem) {
+    const successDiv = document.getElementById('success-message');
+    successDiv.textContent = mensagem;
+    successDiv.style.display = 'block';
+}
+
+async function finalizarCompra(event) {
+    event.preventDefault();
+
+    console.log("Iniciando finalização da compra...");
+
+    // Coletar dados do formulário
+    const formData = new FormData(event.target);
+    const nome = formData.get('nome');
+    const email = formData.get('email');
+    const telefone = formData.get('telefone');
+    const endereco = formData.get('endereco');
+
+    // Validar dados
+    if (!nome || !email) {
+        alert("Por favor, preencha o nome e e-mail.");
+        return;
+    }
+
+    // Obter carrinho do localStorage
+    let carrinho = JSON.parse(localStorage.getItem('romanelCart') || '[]');
+    if (carrinho.length === 0) {
+        carrinho = JSON.parse(localStorage.getItem('carrinho') || '[]');
+    }
+
+    if (carrinho.length === 0) {
+        alert("Seu carrinho está vazio!");
+        return;
+    }
+
+    // Converter para formato do checkout se necessário
+    let carrinhoParaEnviar = carrinho;
+    if (carrinho[0] && carrinho[0].code) {
+        carrinhoParaEnviar = carrinho.map(item => ({
+            id: item.id,
+            name: item.name,
+            price: item.price,
+            quantity: item.quantity || 1,
+            image: item.image
+        }));
+    }
+
+    console.log("Enviando dados para o servidor...");
+
+    try {
+        const response = await fetch('/checkout', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                nome: nome,
+                email: email,
+                telefone: telefone || '',
+                endereco: endereco || '',
+                carrinho: carrinhoParaEnviar,
+                frete: 5.00 // Valor do frete
+            })
+        });
+
+        const resultado = await response.json();
+
+        if (resultado.success && resultado.redirect_url) {
+            console.log("Redirecionando para pagamento...");
+
+            // Limpar carrinho após sucesso
+            localStorage.removeItem('romanelCart');
+            localStorage.removeItem('carrinho');
+
+            // Redirecionar para Mercado Pago
+            window.location.href = resultado.redirect_url;
+        } else {
+            console.error("Erro na finalização:", resultado.error);
+            alert(`Erro: ${resultado.error || 'Erro desconhecido'}`);
+        }
+    } catch (error) {
+        console.error("Erro na finalização:", error);
+        alert("Erro de conexão com o servidor. Tente novamente.");
+    }
+}
+
+// ========== INICIALIZAÇÃO ==========
+
+document.addEventListener('DOMContentLoaded', function() {
+    console.log("✅ Página de checkout carregada");
+
+    // Carregar carrinho
+    carregarCarrinho();
+
+    // Configurar formulário
+    document.getElementById('checkout-form').addEventListener('submit', finalizarCompra);
+});
+
+// Debug: Mostrar no console quando a página carrega
+console.log("🔄 Script checkout.js carregado");
@@ -0,0 +1,1795 @@
+// ========== VARIÁVEIS GLOBAIS ==========
+
+// Dados iniciais com produtos (serão carregados da API)
+let products = [];
+let cart = [];
+let orders = [];
+let currentCategory = 'todos';
+let selectedSizes = {};
+let users = [];
+let currentUser = null;
+
+// Para guardar a posição de scroll
+let lastScrollPosition = 0;
+
+// Definir os status de reembolso
+const refundStatuses = {
+    PENDING: 'pending',
+    APPROVED: 'approved',
+    REJECTED: 'rejected',
+    PROCESSING: 'processing',
+    COMPLETED: 'completed'
+};
+
+// Razões para reembolso
+const refundReasons = [
+    "Produto com defeito",
+    "Produto não corresponde à descrição",
+    "Produto danificado durante o transporte",
+    "Tamanho incorreto",
+    "Arrependimento da compra",
+    "Produto não entregue",
+    "Outro motivo"
+];
+
+// Inicializar array de reembolsos
+let refunds = [];
+
+// Inicializar array de notificações de reembolso
+let refundNotifications = [];
+
+// Definir os status de entrega e preparação
+const orderStatuses = [
+    { key: 'received', label: 'Pedido Recebido', icon: '📥' },
+    { key: 'approved', label: 'Pagamento Aprovado', icon: '✅' },
+    { key: 'preparing', label: 'Preparando Pedido', icon: '🔧' },
+    { key: 'ready', label: 'Pronto para Entrega', icon: '📦' },
+    { key: 'shipped', label: 'Pedido Enviado', icon: '🚚' },
+    { key: 'delivered', label: 'Entregue', icon: '🏠' }
+];
+
+// ========== CONFIGURAÇÕES DA API ==========
+
+// IMPORTANTE: Configuração da URL da API
+// Se estiver rodando localmente com Flask na porta 5000:
+const API_BASE_URL = window.location.origin; // Usa a mesma origem do site
+// OU defina manualmente se necessário:
+// const API_BASE_URL = 'http://localhost:5000';
+
+// Endpoints da API
+const API_ENDPOINTS = {
+    produtos: `${API_BASE_URL}/api/produtos`,
+    login: `${API_BASE_URL}/api/login`,
+    register: `${API_BASE_URL}/api/register`,
+    checkout: `${API_BASE_URL}/checkout`,
+    adminProducts: `${API_BASE_URL}/api/admin/products`
+};
+
+// ========== ELEMENTOS DOM ==========
+
+const productsGrid = document.getElementById('productsGrid');
+const productPages = document.getElementById('productPages');
+const productsSection = document.getElementById('products');
+const cartIcon = document.getElementById('cartIcon');
+const cartModal = document.getElementById('cartModal');
+const closeCart = document.getElementById('closeCart');
+const cartItems = document.getElementById('cartItems');
+const cartTotal = document.getElementById('cartTotal');
+const cartCount = document.querySelector('.cart-count');
+const authModal = document.getElementById('authModal');
+const loginForm = document.getElementById('loginForm');
+const registerForm = document.getElementById('registerForm');
+const loginBtn = document.getElementById('loginBtn');
+const userInfo = document.getElementById('userInfo');
+const userName = document.getElementById('userName');
+const customerOrders = document.getElementById('customerOrders');
+const customerOrdersList = document.getElementById('customerOrdersList');
+const paymentSuccessPage = document.getElementById('paymentSuccessPage');
+const paymentErrorPage = document.getElementById('paymentErrorPage');
+const successCountdownElement = document.getElementById('successCountdown');
+const errorCountdownElement = document.getElementById('errorCountdown');
+const loadingOverlay = document.getElementById('loadingOverlay');
+const loadingMessage = document.getElementById('loadingMessage');
+const checkoutModal = document.getElementById('checkoutModal');
+const checkoutForm = document.getElementById('checkoutForm');
+const checkoutBtn = document.getElementById('checkoutBtn');
+const paymentMethod = document.getElementById('paymentMethod');
+const productsLoading = document.getElementById('productsLoading');
+
+// Contadores para redirecionamento automático
+let successSeconds = 15;
+let errorSeconds = 10;
+let successCountdownInterval;
+let errorCountdownInterval;
+
+// ========== FUNÇÕES DE API ==========
+
+async function loadProductsFromAPI() {
+    try {
+        console.log('Carregando produtos da API...');
+        console.log('URL da API:', API_ENDPOINTS.produtos);
+
+        const response = await fetch(API_ENDPOINTS.produtos, {
+            method: 'GET',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            },
+            mode: 'cors'
+        });
+
+        console.log('Status da resposta:', response.status, response.statusText);
+
+        if (!response.ok) {
+            if (response.status === 404) {
+                throw new Error(`Rota da API não encontrada. Verifique se o Flask está rodando em ${API_BASE_URL}`);
+            }
+            throw new Error(`Erro na API: ${response.status} - ${response.statusText}`);
+        }
+
+        const data = await response.json();
+        console.log('Produtos carregados da API:', data);
+
+        // Verificar se a resposta é um array
+        if (!Array.isArray(data)) {
+            console.warn('A resposta da API não é um array. Formato recebido:', data);
+            // Tenta extrair produtos de diferentes formatos
+            if (data.products && Array.isArray(data.products)) {
+                data = data.products;
+            } else if (data.data && Array.isArray(data.data)) {
+                data = data.data;
+            } else {
+                throw new Error('Formato de dados inválido da API');
+            }
+        }
+
+        // Converter os dados da API para o formato esperado
+        products = data.map(product => ({
+            id: product.id || parseInt(Math.random() * 1000),
+            code: product.code || `ROM${(product.id || '').toString().padStart(3, '0')}`,
+            name: product.name || product.title || 'Produto sem nome',
+            price: parseFloat(product.price) || 0,
+            image: product.image || product.image_url || 'https://images.unsplash.com/photo-1605100804763-247f67b3557e?ixlib=rb-4.0.3&auto=format&fit=crop&w=600&q=80',
+            additionalImages: product.additionalImages || product.images || [],
+            description: product.description || '',
+            features: product.features || [],
+            category: product.category || 'outros',
+            sizes: product.sizes || [{ size: "Único", available: true }],
+            color: product.color || 'Prata',
+            gender: product.gender || 'feminino',
+            onSale: product.onSale || product.on_sale || false,
+            originalPrice: parseFloat(product.originalPrice || product.original_price || product.price) || 0,
+            discountPercentage: product.discountPercentage || product.discount_percentage || 0
+        }));
+
+        console.log(`✅ ${products.length} produtos carregados da API`);
+
+        // Atualizar contagens de categorias
+        updateCategoryCounts();
+
+        // Renderizar produtos
+        renderProducts();
+        createProductPages();
+
+    } catch (error) {
+        console.error('❌ Erro ao carregar produtos da API:', error);
+
+        // Mostrar mensagem de erro
+        if (productsGrid) {
+            productsGrid.innerHTML = `
+                <div class="error-message">
+                    <h3>❌ Erro ao carregar produtos</h3>
+                    <p>Não foi possível carregar os produtos da loja.</p>
+                    <p><strong>Erro:</strong> ${error.message}</p>
+                    <p><strong>URL da API:</strong> ${API_ENDPOINTS.produtos}</p>
+                    <p><strong>Base URL:</strong> ${API_BASE_URL}</p>
+                    <div style="margin-top: 20px;">
+                        <button onclick="testarConexaoAPI()" class="btn">Testar Conexão</button>
+                        <button onclick="loadProductsFromAPI()" class="btn" style="margin-left: 10px;">Tentar Novamente</button>
+                    </div>
+                </div>
+            `;
+        }
+    }
+}
+
+async function testarConexaoAPI() {
+    try {
+        console.log('Testando conexão com a API...');
+        const response = await fetch(API_BASE_URL + '/health');
+        if (response.ok) {
+            const data = await response.json();
+            alert(`✅ Conexão com o servidor OK\nStatus: ${data.status}\nAmbiente: ${data.metrics?.ambiente || 'desconhecido'}`);
+        } else {
+            alert(`⚠️ Servidor respondeu com status ${response.status}`);
+        }
+    } catch (error) {
+        alert(`❌ Não foi possível conectar ao servidor:\n${error.message}\n\nVerifique se o Flask está rodando em ${API_BASE_URL}`);
+    }
+}
+
+function updateCategoryCounts() {
+    // Contar produtos por categoria
+    const categoryCounts = {};
+    products.forEach(product => {
+        const category = product.category;
+        categoryCounts[category] = (categoryCounts[category] || 0) + 1;
+    });
+
+    // Atualizar contadores na interface
+    Object.keys(categoryCounts).forEach(category => {
+        const element = document.getElementById(`categoryCount-${category}`);
+        if (element) {
+            element.textContent = `${categoryCounts[category]} ${categoryCounts[category] === 1 ? 'modelo' : 'modelos'}`;
+        }
+    });
+
+    // Contar promoções
+    const promoCount = products.filter(product => product.onSale).length;
+    const promoElement = document.getElementById('categoryCount-promocoes');
+    if (promoElement) {
+        promoElement.textContent = `${promoCount} ${promoCount === 1 ? 'oferta' : 'ofertas'}`;
+    }
+}
+
+// ========== INICIALIZAÇÃO ==========
+
+document.addEventListener('DOMContentLoaded', async function() {
+    console.log('DOM Carregado - Iniciando aplicação');
+    console.log('URL Base:', window.location.origin);
+    console.log('API Base URL:', API_BASE_URL);
+
+    // Testar conexão inicial
+    console.log('Testando conexão inicial com o servidor...');
+    try {
+        const testResponse = await fetch(API_BASE_URL + '/health');
+        if (testResponse.ok) {
+            console.log('✅ Servidor está respondendo');
+        } else {
+            console.warn(`⚠️ Servidor respondeu com status: ${testResponse.status}`);
+        }
+    } catch (error) {
+        console.warn('⚠️ Não foi possível conectar ao servidor na inicialização:', error.message);
+    }
+
+    // Inicializar produtos da API
+    await loadProductsFromAPI();
+
+    // Carregar outros dados do localStorage
+    loadOrdersFromStorage();
+    loadRefundsFromStorage();
+    loadRefundNotificationsFromStorage();
+    loadCartFromStorage();
+
+    if (productsGrid && cartIcon) {
+        updateCartCount();
+        checkLoggedInUser();
+
+        // Mostrar a home page inicialmente
+        showHomePage();
+
+        // Event Listeners
+        if (cartIcon) cartIcon.addEventListener('click', openCart);
+        if (closeCart) closeCart.addEventListener('click', closeCartModal);
+        if (loginBtn) loginBtn.addEventListener('click', openAuthModal);
+
+        // Fechar modais ao clicar fora
+        window.addEventListener('click', function(event) {
+            if (event.target === cartModal) closeCartModal();
+            if (event.target === authModal) closeAuthModal();
+            if (event.target === loadingOverlay) closeLoadingOverlay();
+            if (event.target === checkoutModal) closeCheckoutModal();
+        });
+    }
+});
+
+// ========== FUNÇÕES DE CARREGAMENTO ==========
+
+function loadCartFromStorage() {
+    const storedCart = localStorage.getItem('romanelCart');
+    if (storedCart) {
+        try {
+            cart = JSON.parse(storedCart);
+            console.log('Carrinho carregado do localStorage:', cart.length, 'itens');
+        } catch (error) {
+            console.error('Erro ao carregar carrinho:', error);
+            cart = [];
+        }
+    }
+}
+
+function saveCartToStorage() {
+    localStorage.setItem('romanelCart', JSON.stringify(cart));
+
+    // Também salvar no formato do checkout para compatibilidade
+    const checkoutCart = cart.map(item => ({
+        id: item.id,
+        name: item.name,
+        price: item.price,
+        quantity: item.quantity,
+        image: item.image || "https://images.unsplash.com/photo-1605100804763-247f67b3557e"
+    }));
+    localStorage.setItem('carrinho', JSON.stringify(checkoutCart));
+
+    console.log('Carrinho salvo no localStorage:', cart.length, 'itens');
+}
+
+function loadOrdersFromStorage() {
+    const storedOrders = localStorage.getItem('romanelOrders');
+    if (storedOrders) {
+        try {
+            orders = JSON.parse(storedOrders);
+        } catch (error) {
+            console.error('Erro ao carregar pedidos:', error);
+            orders = [];
+        }
+    }
+}
+
+function saveOrdersToStorage() {
+    localStorage.setItem('romanelOrders', JSON.stringify(orders));
+}
+
+function loadRefundsFromStorage() {
+    const storedRefunds = localStorage.getItem('romanelRefunds');
+    if (storedRefunds) {
+        try {
+            refunds = JSON.parse(storedRefunds);
+        } catch (error) {
+            console.error('Erro ao carregar reembolsos:', error);
+            refunds = [];
+        }
+    }
+}
+
+function saveRefundsToStorage() {
+    localStorage.setItem('romanelRefunds', JSON.stringify(refunds));
+}
+
+function loadRefundNotificationsFromStorage() {
+    const storedNotifications = localStorage.getItem('romanelRefundNotifications');
+    if (storedNotifications) {
+        try {
+            refundNotifications = JSON.parse(storedNotifications);
+        } catch (error) {
+            console.error('Erro ao carregar notificações:', error);
+            refundNotifications = [];
+        }
+    }
+}
+
+function saveRefundNotificationsToStorage() {
+    localStorage.setItem('romanelRefundNotifications', JSON.stringify(refundNotifications));
+}
+
+// ========== FUNÇÕES DE AUTENTICAÇÃO ==========
+
+// Função de cadastro - CORRIGIDA (usa /api/register)
+async function cadastrarUsuario(event) {
+    event.preventDefault();
+
+    const nome = document.getElementById('registerName').value;
+    const email = document.getElementById('registerEmail').value.trim();
+    const senha = document.getElementById('registerPassword').value;
+    const confirmarSenha = document.getElementById('registerConfirmPassword').value;
+
+    if (senha !== confirmarSenha) {
+        alert("As senhas não coincidem!");
+        return;
+    }
+
+    try {
+        // ✅ CORREÇÃO: Usar rota correta /api/register
+        const response = await fetch(API_ENDPOINTS.register, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                nome: nome,
+                email: email,
+                senha: senha,
+                confirmar_senha: confirmarSenha
+            })
+        });
+
+        const resultado = await response.json();
+
+        if (resultado.success) {
+            alert("Cadastro realizado com sucesso! Faça login.");
+            // Fechar modal de cadastro e abrir login
+            showAuthForm('login');
+        } else {
+            alert(`Erro: ${resultado.error}`);
+        }
+    } catch (error) {
+        alert("Erro de conexão com o servidor.");
+    }
+}
+
+// Função de login - CORRIGIDA (usa /api/login) COM REDIRECIONAMENTO PARA ADMIN
+async function fazerLogin(event) {
+    event.preventDefault();
+
+    const email = document.getElementById('loginEmail').value.trim();
+    const senha = document.getElementById('loginPassword').value;
+
+    console.log('Tentando login com:', email);
+
+    try {
+        // ✅ CORREÇÃO: Usar rota correta /api/login
+        const response = await fetch(API_ENDPOINTS.login, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                email: email,
+                senha: senha
+            })
+        });
+
+        const resultado = await response.json();
+
+        if (resultado.success) {
+            // ✅ CORREÇÃO ADICIONADA: Redirecionamento ESPECÍFICO para admin
+            if (resultado.user.role === "admin" && resultado.redirect_url) {
+                console.log("✅ Admin autenticado, redirecionando para:", resultado.redirect_url);
+                // Fechar modal de login
+                closeAuthModal();
+                // Redirecionar imediatamente para o painel admin
+                window.location.href = resultado.redirect_url;
+                return; // Importante: parar execução aqui
+            }
+
+            // Atualizar dados do usuário (para usuários normais)
+            currentUser = {
+                id: resultado.user.id,
+                name: resultado.user.name,
+                email: resultado.user.email,
+                isAdmin: resultado.user.is_admin || resultado.user.isAdmin || false
+            };
+
+            // Salvar usuário no localStorage
+            localStorage.setItem('currentUser', JSON.stringify(currentUser));
+
+            // Atualizar interface
+            updateUserInterface();
+            closeAuthModal();
+
+            showNotification("Login realizado com sucesso!");
+
+            // Se for admin, mostrar link para painel admin
+            if (currentUser.isAdmin) {
+                const adminLink = document.getElementById('adminLink');
+                if (adminLink) {
+                    adminLink.style.display = 'inline-block';
+                }
+            }
+        } else {
+            alert(`Erro: ${resultado.error || 'E-mail ou senha incorretos!'}`);
+        }
+    } catch (error) {
+        console.error('Erro de conexão:', error);
+        alert("Erro de conexão com o servidor. Tente novamente.");
+    }
+}
+
+function logout() {
+    currentUser = null;
+    localStorage.removeItem('currentUser');
+    updateUserInterface();
+    showNotification('Logout realizado com sucesso!');
+}
+
+function checkLoggedInUser() {
+    const storedUser = localStorage.getItem('currentUser');
+    if (storedUser) {
+        try {
+            currentUser = JSON.parse(storedUser);
+            updateUserInterface();
+        } catch (error) {
+            console.error('Erro ao carregar usuário:', error);
+        }
+    }
+
+    const storedUsers = localStorage.getItem('users');
+    if (storedUsers) {
+        try {
+            users = JSON.parse(storedUsers);
+        } catch (error) {
+            console.error('Erro ao carregar usuários:', error);
+        }
+    }
+}
+
+function updateUserInterface() {
+    if (currentUser) {
+        if (userInfo) userInfo.style.display = 'block';
+        if (loginBtn) loginBtn.style.display = 'none';
+        if (userName) userName.textContent = currentUser.name;
+
+        // Mostrar link do painel admin se o usuário for administrador
+        const adminLink = document.getElementById('adminLink');
+        if (adminLink) {
+            if (currentUser.isAdmin) {
+                adminLink.style.display = 'inline-block';
+            } else {
+                adminLink.style.display = 'none';
+            }
+        }
+    } else {
+        if (userInfo) userInfo.style.display = 'none';
+        if (loginBtn) loginBtn.style.display = 'block';
+        const adminLink = document.getElementById('adminLink');
+        if (adminLink) adminLink.style.display = 'none';
+    }
+}
+
+function openAuthModal() {
+    if (authModal) authModal.style.display = 'flex';
+}
+
+function closeAuthModal() {
+    if (authModal) authModal.style.display = 'none';
+}
+
+function showAuthForm(formType) {
+    // Atualizar tabs
+    document.querySelectorAll('.auth-tab').forEach(tab => {
+        tab.classList.remove('active');
+    });
+
+    event.target.classList.add('active');
+
+    // Mostrar formulário correto
+    document.querySelectorAll('.auth-form').forEach(form => {
+        form.classList.remove('active');
+    });
+
+    if (formType === 'login') {
+        document.getElementById('loginForm').classList.add('active');
+    } else {
+        document.getElementById('registerForm').classList.add('active');
+    }
+}
+
+// ========== FUNÇÕES DE INTERFACE ==========
+
+function showNotification(message) {
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background-color: #b8860b;
+        color: white;
+        padding: 15px 20px;
+        border-radius: 4px;
+        z-index: 10000;
+        box-shadow: 0 3px 10px rgba(0,0,0,0.2);
+    `;
+    notification.textContent = message;
+    document.body.appendChild(notification);
+
+    setTimeout(() => {
+        document.body.removeChild(notification);
+    }, 3000);
+}
+
+function showLoadingOverlay(message = 'Processando...') {
+    if (loadingOverlay) {
+        loadingOverlay.style.display = 'flex';
+        if (loadingMessage) {
+            loadingMessage.textContent = message;
+        }
+    }
+}
+
+function closeLoadingOverlay() {
+    if (loadingOverlay) {
+        loadingOverlay.style.display = 'none';
+    }
+}
+
+function getGenderName(genderKey) {
+    const genders = {
+        'feminino': 'Feminino',
+        'masculino': 'Masculino',
+        'infantil': 'Infantil',
+        'unissex': 'Unissex'
+    };
+    return genders[genderKey] || genderKey;
+}
+
+function getGenderClass(genderKey) {
+    const genderClasses = {
+        'feminino': 'gender-feminino',
+        'masculino': 'gender-masculino',
+        'infantil': 'gender-infantil',
+        'unissex': 'gender-unissex'
+    };
+    return genderClasses[genderKey] || '';
+}
+
+function getCategoryName(categoryKey) {
+    const categories = {
+        'aneis': 'Anéis',
+        'colares': 'Colares',
+        'brincos': 'Brincos',
+        'pulseiras': 'Pulseiras',
+        'pingentes': 'Pingentes',
+        'relogios': 'Relógios',
+        'solitarios': 'Solitários',
+        'pet': 'Pet',
+        'chaveiros': 'Chaveiros',
+        'aliancas': 'Alianças',
+        'correntes': 'Correntes',
+        'promocoes': 'Promoções',
+        'outros': 'Outros'
+    };
+    return categories[categoryKey] || categoryKey;
+}
+
+// ========== FUNÇÕES DE PRODUTOS ==========
+
+function renderProducts() {
+    if (!productsGrid) return;
+
+    // Remover mensagem de carregamento
+    if (productsLoading) {
+        productsLoading.style.display = 'none';
+    }
+
+    productsGrid.innerHTML = '';
+
+    if (products.length === 0) {
+        productsGrid.innerHTML = `
+            <div class="error-message">
+                <h3>📭 Nenhum produto encontrado</h3>
+                <p>Não há produtos disponíveis na loja no momento.</p>
+                <button onclick="loadProductsFromAPI()" class="btn">Recarregar Produtos</button>
+            </div>
+        `;
+        return;
+    }
+
+    let filteredProducts = products;
+    if (currentCategory !== 'todos') {
+        if (currentCategory === 'promocoes') {
+            filteredProducts = products.filter(product => product.onSale);
+        } else {
+            filteredProducts = products.filter(product => product.category === currentCategory);
+        }
+    }
+
+    if (filteredProducts.length === 0) {
+        productsGrid.innerHTML = `
+            <div class="error-message">
+                <h3>📭 Nenhum produto nesta categoria</h3>
+                <p>Não há produtos na categoria "${getCategoryName(currentCategory)}" no momento.</p>
+                <button onclick="filterProducts('todos')" class="btn">Ver Todos os Produtos</button>
+            </div>
+        `;
+        return;
+    }
+
+    filteredProducts.forEach(product => {
+        const productCard = document.createElement('div');
+        productCard.className = 'product-card';
+
+        const promoBadge = product.onSale ? `<div class="promo-badge">${product.discountPercentage}% OFF</div>` : '';
+
+        const priceHTML = product.onSale ?
+            `<p class="product-price">
+                <span class="original-price">R$ ${product.originalPrice.toFixed(2)}</span>
+                <span class="discount-price">R$ ${product.price.toFixed(2)}</span>
+            </p>` :
+            `<p class="product-price">R$ ${product.price.toFixed(2)}</p>`;
+
+        const genderBadge = `<span class="gender-badge ${getGenderClass(product.gender)}">${getGenderName(product.gender)}</span>`;
+
+        productCard.innerHTML = `
+            ${promoBadge}
+            <a href="javascript:void(0)" onclick="showProductPage(${product.id})" class="product-image-link">
+                <img src="${product.image}" alt="${product.name}" class="product-image"
+                     onerror="this.src='https://images.unsplash.com/photo-1605100804763-247f67b3557e?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=600&q=80'">
+            </a>
+            <div class="product-info">
+                <h3 class="product-title">${product.name} ${genderBadge}</h3>
+                <p class="product-code">Cód. ${product.code}</p>
+                <p><strong>Cor:</strong> ${product.color}</p>
+                ${priceHTML}
+                <button class="btn add-to-cart-btn" data-id="${product.id}">Adicionar ao Carrinho</button>
+            </div>
+        `;
+        productsGrid.appendChild(productCard);
+    });
+
+    document.querySelectorAll('.add-to-cart-btn').forEach(button => {
+        button.addEventListener('click', function() {
+            const productId = parseInt(this.getAttribute('data-id'));
+            addToCart(productId);
+        });
+    });
+}
+
+function hideAllProductPages() {
+    document.querySelectorAll('.product-detail').forEach(page => {
+        page.classList.remove('active');
+    });
+}
+
+function filterProducts(category) {
+    currentCategory = category;
+
+    // Atualizar botões ativos
+    document.querySelectorAll('.filter-btn').forEach(btn => {
+        btn.classList.remove('active');
+    });
+
+    event.target.classList.add('active');
+
+    renderProducts();
+}
+
+function showProductPage(productId) {
+    // Parar contadores
+    stopAllCountdowns();
+
+    // Salvar a posição atual do scroll antes de mostrar a página do produto
+    saveScrollPosition();
+
+    hideAllProductPages();
+    document.querySelector('.banner').style.display = 'none';
+    document.querySelector('.categories').style.display = 'none';
+    if (productsSection) productsSection.style.display = 'none';
+    if (customerOrders) customerOrders.style.display = 'none';
+    document.getElementById('about').style.display = 'none';
+    if (paymentSuccessPage) paymentSuccessPage.style.display = 'none';
+    if (paymentErrorPage) paymentErrorPage.style.display = 'none';
+
+    const productPage = document.getElementById(`product-page-${productId}`);
+    if (productPage) {
+        productPage.classList.add('active');
+        window.scrollTo(0, 0);
+    } else {
+        // Se a página do produto não existe, criar dinamicamente
+        createProductPage(productId);
+        const newProductPage = document.getElementById(`product-page-${productId}`);
+        if (newProductPage) {
+            newProductPage.classList.add('active');
+            window.scrollTo(0, 0);
+        }
+    }
+}
+
+function createProductPage(productId) {
+    const product = products.find(p => p.id === productId);
+    if (!product) return;
+
+    const productPage = document.createElement('div');
+    productPage.className = 'product-detail';
+    productPage.id = `product-page-${productId}`;
+
+    const allImages = [product.image, ...product.additionalImages];
+    const thumbnailsHTML = allImages.map((img, index) => `
+        <img src="${img}" alt="Miniatura ${index + 1}" class="thumbnail ${index === 0 ? 'active' : ''}"
+             onclick="changeMainImage(${product.id}, '${img}', this)"
+             onerror="this.src='https://images.unsplash.com/photo-1605100804763-247f67b3557e?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=600&q=80'">
+    `).join('');
+
+    const sizesHTML = product.sizes.map(size => {
+        const isAvailable = size.available;
+        const isSelected = selectedSizes[product.id] === size.size;
+        const onclickHandler = isAvailable ? `selectSize(${product.id}, '${size.size}')` : '';
+
+        return `
+        <div class="size-option ${isAvailable ? '' : 'unavailable'} ${isSelected ? 'selected' : ''}"
+             onclick="${onclickHandler}">
+            ${size.size}
+        </div>
+    `;
+    }).join('');
+
+    const priceHTML = product.onSale ?
+        `<p class="product-detail-price">
+            <span class="original-price">R$ ${product.originalPrice.toFixed(2)}</span>
+            <span class="discount-price">R$ ${product.price.toFixed(2)}</span>
+            <span style="color: #dc3545; font-size: 18px;">(${product.discountPercentage}% OFF)</span>
+        </p>` :
+        `<p class="product-detail-price">R$ ${product.price.toFixed(2)}</p>`;
+
+    const genderInfo = `<p><strong>Gênero:</strong> <span class="gender-badge ${getGenderClass(product.gender)}">${getGenderName(product.gender)}</span></p>`;
+    const colorInfo = `<p><strong>Cor:</strong> ${product.color}</p>`;
+
+    productPage.innerHTML = `
+        <button class="back-button" onclick="showProductsPage(true)">
+            ← Voltar para Produtos
+        </button>
+        <div class="product-detail-container">
+            <div class="product-images">
+                <img src="${product.image}" alt="${product.name}" class="main-image" id="main-image-${productId}"
+                     onerror="this.src='https://images.unsplash.com/photo-1605100804763-247f67b3557e?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=600&q=80'">
+                <div class="thumbnail-container">
+                    ${thumbnailsHTML}
+                </div>
+            </div>
+            <div class="product-detail-info">
+                <h1>${product.name}</h1>
+                <p class="product-detail-code">Cód. ${product.code}</p>
+                ${genderInfo}
+                ${colorInfo}
+                ${priceHTML}
+                <p class="product-detail-description">${product.description}</p>
+
+                ${product.sizes.length > 1 ? `
+                <div class="size-selector">
+                    <h3>Selecione o Tamanho:</h3>
+                    <div class="size-options">
+                        ${sizesHTML}
+                    </div>
+                </div>
+                ` : ''}
+
+                ${product.features && product.features.length > 0 ? `
+                <div class="product-features">
+                    <h3>Características:</h3>
+                    <ul>
+                        ${product.features.map(feature => `<li>${feature}</li>`).join('')}
+                    </ul>
+                </div>
+                ` : ''}
+
+                <div class="delivery-notice">
+                    <strong>Atenção:</strong> A entrega será realizada somente mediante apresentação de documento de identidade.
+                </div>
+
+                <button class="btn" style="margin-top: 20px; padding: 15px 30px; font-size: 18px;"
+                        onclick="addToCartWithSize(${product.id})">
+                    Adicionar ao Carrinho
+                </button>
+            </div>
+        </div>
+    `;
+
+    if (productPages) {
+        productPages.appendChild(productPage);
+    }
+}
+
+function createProductPages() {
+    if (!productPages) return;
+
+    productPages.innerHTML = '';
+
+    // Criar páginas para todos os produtos
+    products.forEach(product => {
+        createProductPage(product.id);
+    });
+}
+
+function changeMainImage(productId, imageUrl, thumbnail) {
+    const mainImage = document.getElementById(`main-image-${productId}`);
+    if (mainImage) {
+        mainImage.src = imageUrl;
+    }
+
+    // Atualizar miniaturas ativas
+    if (thumbnail) {
+        document.querySelectorAll(`#product-page-${productId} .thumbnail`).forEach(thumb => {
+            thumb.classList.remove('active');
+        });
+
+        thumbnail.classList.add('active');
+    }
+}
+
+function selectSize(productId, size) {
+    selectedSizes[productId] = size;
+
+    // Atualizar visual dos botões de tamanho
+    document.querySelectorAll(`#product-page-${productId} .size-option`).forEach(option => {
+        option.classList.remove('selected');
+    });
+
+    // Encontrar o botão correto e adicionar a classe selected
+    const sizeOptions = document.querySelectorAll(`#product-page-${productId} .size-option`);
+    sizeOptions.forEach(option => {
+        if (option.textContent.trim() === size && !option.classList.contains('unavailable')) {
+            option.classList.add('selected');
+        }
+    });
+}
+
+function showProductsPage(restoreScroll = false) {
+    // Parar contadores
+    stopAllCountdowns();
+
+    hideAllProductPages();
+    document.querySelector('.banner').style.display = 'none';
+    document.querySelector('.categories').style.display = 'none';
+    if (productsSection) productsSection.style.display = 'block';
+    if (customerOrders) customerOrders.style.display = 'none';
+    document.getElementById('about').style.display = 'none';
+    if (paymentSuccessPage) paymentSuccessPage.style.display = 'none';
+    if (paymentErrorPage) paymentErrorPage.style.display = 'none';
+
+    // Se restoreScroll for true, restaurar a posição do scroll
+    if (restoreScroll) {
+        setTimeout(() => {
+            restoreScrollPosition();
+        }, 100);
+    } else {
+        // Se não for para restaurar scroll, vá para o topo da página de produtos
+        setTimeout(() => {
+            if (productsSection) {
+                productsSection.scrollIntoView({ behavior: 'smooth' });
+            }
+        }, 100);
+    }
+}
+
+function scrollToProducts() {
+    if (productsSection) {
+        productsSection.scrollIntoView({ behavior: 'smooth' });
+    }
+}
+
+// ========== FUNÇÕES DO CARRINHO ==========
+
+function addToCart(productId) {
+    const product = products.find(p => p.id === productId);
+    if (!product) {
+        console.error('Produto não encontrado:', productId);
+        showNotification('Produto não encontrado!');
+        return;
+    }
+
+    // Se o produto tem tamanhos, redirecionar para a página do produto
+    if (product.sizes && product.sizes.length > 1) {
+        showProductPage(productId);
+        return;
+    }
+
+    const existingItem = cart.find(item => item.id === productId);
+
+    if (existingItem) {
+        existingItem.quantity += 1;
+    } else {
+        cart.push({
+            id: product.id,
+            code: product.code,
+            name: product.name,
+            price: product.price,
+            image: product.image,
+            quantity: 1,
+            selectedSize: product.sizes && product.sizes.length === 1 ? product.sizes[0].size : null,
+            color: product.color
+        });
+    }
+
+    saveCartToStorage();
+    updateCartCount();
+    showNotification(`${product.name} adicionado ao carrinho!`);
+}
+
+function addToCartWithSize(productId) {
+    const selectedSize = selectedSizes[productId];
+    const product = products.find(p => p.id === productId);
+    if (!product) {
+        console.error('Produto não encontrado:', productId);
+        showNotification('Produto não encontrado!');
+        return;
+    }
+
+    // Se o produto tem múltiplos tamanhos, verificar se um foi selecionado
+    if (product.sizes.length > 1 && !selectedSize) {
+        alert('Por favor, selecione um tamanho antes de adicionar ao carrinho.');
+        return;
+    }
+
+    const sizeAvailable = product.sizes.find(s =>
+        (product.sizes.length === 1 && s.size === "Único") ||
+        (selectedSize && s.size === selectedSize && s.available)
+    );
+
+    if (!sizeAvailable) {
+        alert('Este tamanho não está disponível no momento.');
+        return;
+    }
+
+    const finalSize = product.sizes.length === 1 ? "Único" : selectedSize;
+    const existingItem = cart.find(item => item.id === productId && item.selectedSize === finalSize);
+
+    if (existingItem) {
+        existingItem.quantity += 1;
+    } else {
+        cart.push({
+            id: product.id,
+            code: product.code,
+            name: product.name,
+            price: product.price,
+            image: product.image,
+            quantity: 1,
+            selectedSize: finalSize,
+            color: product.color
+        });
+    }
+
+    saveCartToStorage();
+    updateCartCount();
+    showNotification(`${product.name} ${finalSize !== "Único" ? `(Tamanho: ${finalSize})` : ''} adicionado ao carrinho!`);
+}
+
+function updateQuantity(productId, change) {
+    const item = cart.find(item => item.id === productId);
+    if (!item) return;
+
+    item.quantity += change;
+
+    if (item.quantity <= 0) {
+        removeFromCart(productId);
+    } else {
+        saveCartToStorage();
+        updateCartCount();
+        renderCartItems();
+    }
+}
+
+function removeFromCart(productId) {
+    cart = cart.filter(item => item.id !== productId);
+    saveCartToStorage();
+    updateCartCount();
+    renderCartItems();
+}
+
+function updateCartCount() {
+    const count = cart.reduce((total, item) => total + item.quantity, 0);
+    if (cartCount) cartCount.textContent = count;
+}
+
+function openCart() {
+    // Parar contadores
+    stopAllCountdowns();
+
+    renderCartItems();
+    if (cartModal) cartModal.style.display = 'flex';
+}
+
+function closeCartModal() {
+    if (cartModal) cartModal.style.display = 'none';
+}
+
+function irParaCheckout() {
+    if (cart.length === 0) {
+        alert('Seu carrinho está vazio!');
+        return;
+    }
+
+    closeCartModal();
+    // Redirecionar para a página de checkout
+    window.location.href = '/checkout.html';
+}
+
+function renderCartItems() {
+    if (!cartItems || !cartTotal) return;
+
+    cartItems.innerHTML = '';
+    let total = 0;
+
+    if (cart.length === 0) {
+        cartItems.innerHTML = '<p>Seu carrinho está vazio</p>';
+        cartTotal.textContent = '0.00';
+        return;
+    }
+
+    cart.forEach(item => {
+        const itemTotal = item.price * item.quantity;
+        total += itemTotal;
+
+        const cartItem = document.createElement('div');
+        cartItem.className = 'cart-item';
+        cartItem.innerHTML = `
+            <div class="cart-item-info">
+                <img src="${item.image}" alt="${item.name}" class="cart-item-image"
+                     onerror="this.src='https://images.unsplash.com/photo-1605100804763-247f67b3557e?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=600&q=80'">
+                <div class="cart-item-details">
+                    <h4>${item.name}</h4>
+                    <p class="cart-item-code">Cód. ${item.code}</p>
+                    <p>R$ ${item.price.toFixed(2)}</p>
+                    ${item.selectedSize && item.selectedSize !== "Único" ? `<p><strong>Tamanho:</strong> ${item.selectedSize}</p>` : ''}
+                    ${item.color ? `<p><strong>Cor:</strong> ${item.color}</p>` : ''}
+                </div>
+            </div>
+            <div class="cart-item-quantity">
+                <button class="quantity-btn" onclick="updateQuantity(${item.id}, -1)">-</button>
+                <span class="quantity">${item.quantity}</span>
+                <button class="quantity-btn" onclick="updateQuantity(${item.id}, 1)">+</button>
+            </div>
+            <div class="cart-item-total">
+                R$ ${itemTotal.toFixed(2)}
+            </div>
+            <button class="remove-btn" onclick="removeFromCart(${item.id})">Remover</button>
+        `;
+        cartItems.appendChild(cartItem);
+    });
+
+    cartTotal.textContent = total.toFixed(2);
+}
+
+// ========== FUNÇÕES DE NAVEGAÇÃO ==========
+
+function showHomePage() {
+    // Parar contadores
+    stopAllCountdowns();
+
+    hideAllProductPages();
+    document.querySelector('.banner').style.display = 'block';
+    document.querySelector('.categories').style.display = 'block';
+    if (productsSection) productsSection.style.display = 'block';
+    if (customerOrders) customerOrders.style.display = 'none';
+    document.getElementById('about').style.display = 'block';
+    if (paymentSuccessPage) paymentSuccessPage.style.display = 'none';
+    if (paymentErrorPage) paymentErrorPage.style.display = 'none';
+
+    window.scrollTo(0, 0);
+}
+
+function showAboutPage() {
+    // Parar contadores
+    stopAllCountdowns();
+
+    hideAllProductPages();
+    document.querySelector('.banner').style.display = 'none';
+    document.querySelector('.categories').style.display = 'none';
+    if (productsSection) productsSection.style.display = 'none';
+    if (customerOrders) customerOrders.style.display = 'none';
+    document.getElementById('about').style.display = 'block';
+    if (paymentSuccessPage) paymentSuccessPage.style.display = 'none';
+    if (paymentErrorPage) paymentErrorPage.style.display = 'none';
+
+    window.scrollTo(0, 0);
+}
+
+function showCustomerOrders() {
+    if (!currentUser) {
+        openAuthModal();
+        return;
+    }
+
+    // Parar contadores
+    stopAllCountdowns();
+
+    hideAllProductPages();
+    document.querySelector('.banner').style.display = 'none';
+    document.querySelector('.categories').style.display = 'none';
+    if (productsSection) productsSection.style.display = 'none';
+    document.getElementById('about').style.display = 'none';
+    if (paymentSuccessPage) paymentSuccessPage.style.display = 'none';
+    if (paymentErrorPage) paymentErrorPage.style.display = 'none';
+
+    if (customerOrders) {
+        customerOrders.style.display = 'block';
+        renderCustomerOrders();
+        window.scrollTo(0, 0);
+    }
+}
+
+// ========== FUNÇÕES DE SCROLL ==========
+
+function saveScrollPosition() {
+    lastScrollPosition = window.pageYOffset || document.documentElement.scrollTop;
+}
+
+function restoreScrollPosition() {
+    window.scrollTo(0, lastScrollPosition);
+}
+
+// ========== FUNÇÕES DE CHECKOUT ==========
+
+function openCheckoutModal() {
+    if (cart.length === 0) {
+        alert('Seu carrinho está vazio!');
+        return;
+    }
+
+    closeCartModal();
+    if (checkoutModal) {
+        checkoutModal.style.display = 'flex';
+    }
+}
+
+function closeCheckoutModal() {
+    if (checkoutModal) {
+        checkoutModal.style.display = 'none';
+    }
+}
+
+function togglePaymentFields() {
+    const paymentMethod = document.getElementById('paymentMethod').value;
+
+    // Esconder todos os campos
+    document.getElementById('creditCardFields').style.display = 'none';
+    document.getElementById('pixFields').style.display = 'none';
+    document.getElementById('boletoFields').style.display = 'none';
+    document.getElementById('mercadopagoFields').style.display = 'none';
+
+    // Mostrar apenas o campo correspondente
+    if (paymentMethod === 'credit' || paymentMethod === 'debit') {
+        document.getElementById('creditCardFields').style.display = 'block';
+    } else if (paymentMethod === 'pix') {
+        document.getElementById('pixFields').style.display = 'block';
+    } else if (paymentMethod === 'boleto') {
+        document.getElementById('boletoFields').style.display = 'block';
+    } else if (paymentMethod === 'mercadopago') {
+        document.getElementById('mercadopagoFields').style.display = 'block';
+    }
+}
+
+function processPayment(e) {
+    e.preventDefault();
+
+    if (cart.length === 0) {
+        alert('Seu carrinho está vazio!');
+        return;
+    }
+
+    // Simular processamento de pagamento
+    showLoadingOverlay('Processando seu pagamento...');
+
+    // Simular delay de processamento
+    setTimeout(() => {
+        closeLoadingOverlay();
+        closeCheckoutModal();
+
+        // Simular sucesso ou erro aleatório (80% sucesso, 20% erro)
+        const success = Math.random() < 0.8;
+
+        if (success) {
+            // Criar pedido
+            const orderId = orders.length > 0 ? Math.max(...orders.map(o => o.id)) + 1 : 1;
+
+            const newOrder = {
+                id: orderId,
+                customer: {
+                    name: document.getElementById('fullName').value,
+                    email: document.getElementById('email').value,
+                    phone: document.getElementById('phone').value,
+                    address: {
+                        street: document.getElementById('address').value,
+                        number: document.getElementById('number').value,
+                        complement: document.getElementById('complement').value,
+                        zipCode: document.getElementById('zipCode').value,
+                        city: document.getElementById('city').value,
+                        state: document.getElementById('state').value
+                    }
+                },
+                items: [...cart],
+                total: cart.reduce((total, item) => total + (item.price * item.quantity), 0),
+                status: 'received',
+                createdAt: new Date().toISOString(),
+                updatedAt: new Date().toISOString(),
+                statusHistory: [{
+                    status: 'received',
+                    date: new Date().toISOString()
+                }]
+            };
+
+            orders.push(newOrder);
+            saveOrdersToStorage();
+
+            // Limpar carrinho
+            cart = [];
+            saveCartToStorage();
+            updateCartCount();
+
+            // Mostrar página de sucesso
+            showPaymentSuccessPage(orderId);
+        } else {
+            showPaymentErrorPage();
+        }
+    }, 2000);
+}
+
+// ========== FUNÇÕES DE PAGAMENTO ==========
+
+function startSuccessCountdown() {
+    clearInterval(successCountdownInterval);
+    successSeconds = 15;
+    if (successCountdownElement) successCountdownElement.textContent = successSeconds;
+
+    successCountdownInterval = setInterval(() => {
+        successSeconds--;
+        if (successCountdownElement) successCountdownElement.textContent = successSeconds;
+
+        if (successSeconds <= 0) {
+            clearInterval(successCountdownInterval);
+            showHomePage();
+        }
+    }, 1000);
+}
+
+function startErrorCountdown() {
+    clearInterval(errorCountdownInterval);
+    errorSeconds = 10;
+    if (errorCountdownElement) errorCountdownElement.textContent = errorSeconds;
+
+    errorCountdownInterval = setInterval(() => {
+        errorSeconds--;
+        if (errorCountdownElement) errorCountdownElement.textContent = errorSeconds;
+
+        if (errorSeconds <= 0) {
+            clearInterval(errorCountdownInterval);
+            openCart();
+        }
+    }, 1000);
+}
+
+function stopAllCountdowns() {
+    clearInterval(successCountdownInterval);
+    clearInterval(errorCountdownInterval);
+}
+
+function showPaymentSuccessPage(orderId) {
+    // Parar todos os contadores
+    stopAllCountdowns();
+
+    // Ocultar todas as outras seções
+    hideAllProductPages();
+    document.querySelector('.banner').style.display = 'none';
+    document.querySelector('.categories').style.display = 'none';
+    if (productsSection) productsSection.style.display = 'none';
+    if (customerOrders) customerOrders.style.display = 'none';
+    document.getElementById('about').style.display = 'none';
+    if (paymentErrorPage) paymentErrorPage.style.display = 'none';
+
+    // Atualizar informações do pedido
+    const orderNumberElement = document.getElementById('orderNumber');
+    if (orderNumberElement) {
+        orderNumberElement.textContent = `ROM-${new Date().getFullYear()}-${orderId}`;
+    }
+
+    const orderDateElement = document.getElementById('orderDate');
+    if (orderDateElement) {
+        orderDateElement.textContent = new Date().toLocaleDateString('pt-BR');
+    }
+
+    // Mostrar página de sucesso
+    if (paymentSuccessPage) {
+        paymentSuccessPage.style.display = 'block';
+        window.scrollTo(0, 0);
+    }
+
+    // Iniciar contador de redirecionamento
+    startSuccessCountdown();
+}
+
+function showPaymentErrorPage() {
+    // Parar todos os contadores
+    stopAllCountdowns();
+
+    // Ocultar todas as outras seções
+    hideAllProductPages();
+    document.querySelector('.banner').style.display = 'none';
+    document.querySelector('.categories').style.display = 'none';
+    if (productsSection) productsSection.style.display = 'none';
+    if (customerOrders) customerOrders.style.display = 'none';
+    document.getElementById('about').style.display = 'none';
+    if (paymentSuccessPage) paymentSuccessPage.style.display = 'none';
+
+    // Mostrar página de erro
+    if (paymentErrorPage) {
+        paymentErrorPage.style.display = 'block';
+        window.scrollTo(0, 0);
+    }
+
+    // Iniciar contador de redirecionamento
+    startErrorCountdown();
+}
+
+// FUNÇÃO ATUALIZADA COM NOVOS CONTATOS
+function showContactPage() {
+    stopAllCountdowns();
+    alert("Para falar com nosso suporte:\n\nEmail: seunovoemail@exemplo.com\nTelefone/WhatsApp: (11) 98765-4321\n\nEntraremos em contato em breve!");
+}
+
+// ========== FUNÇÕES DE PEDIDOS ==========
+
+function getStatusLabel(status) {
+    const statusMap = {
+        'received': 'Pedido Recebido',
+        'approved': 'Pagamento Aprovado',
+        'preparing': 'Preparando Pedido',
+        'ready': 'Pronto para Entrega',
+        'shipped': 'Pedido Enviado',
+        'delivered': 'Entregue',
+        'cancelled': 'Cancelado'
+    };
+
+    return statusMap[status] || status;
+}
+
+function renderStatusTimeline(order) {
+    let timelineHTML = '<div class="delivery-status"><div class="status-timeline">';
+
+    const currentStatusIndex = orderStatuses.findIndex(s => s.key === order.status);
+
+    orderStatuses.forEach((status, index) => {
+        let stepClass = '';
+        let dateText = '';
+
+        // Verificar se este status já foi completado
+        if (order.status === 'cancelled') {
+            stepClass = 'cancelled';
+        } else {
+            // Se for a etapa "delivered", usar 'completed' em vez de 'active'
+            if (status.key === 'delivered' && order.status === 'delivered') {
+                stepClass = 'completed';
+            } else if (index < currentStatusIndex) {
+                stepClass = 'completed';
+            } else if (index === currentStatusIndex) {
+                stepClass = 'active';
+            }
+        }
+
+        // Buscar a data do status no histórico
+        const statusEntry = order.statusHistory ? order.statusHistory.find(entry => entry.status === status.key) : null;
+        if (statusEntry) {
+            dateText = `<div class="status-date">${new Date(statusEntry.date).toLocaleDateString('pt-BR')}</div>`;
+        }
+
+        timelineHTML += `
+            <div class="status-step ${stepClass}">
+                <div class="status-icon">${status.icon}</div>
+                <div class="status-label">${status.label}</div>
+                ${dateText}
+            </div>
+        `;
+    });
+
+    timelineHTML += '</div></div>';
+    return timelineHTML;
+}
+
+// ========== FUNÇÕES DE REEMBOLSO ==========
+
+function getRefundStatusLabel(status) {
+    const statusMap = {
+        'pending': 'Pendente',
+        'approved': 'Aprovado',
+        'rejected': 'Rejeitado',
+        'processing': 'Processando',
+        'completed': 'Concluído'
+    };
+
+    return statusMap[status] || status;
+}
+
+function canDeleteRefund(refund) {
+    const order = orders.find(o => o.id === refund.orderId);
+    if (!order) return false;
+
+    // Verificar se o pedido foi entregue e o reembolso está concluído
+    return order.status === 'delivered' && refund.status === refundStatuses.COMPLETED;
+}
+
+// ========== FUNÇÕES DE PEDIDOS DO CLIENTE ==========
+
+function renderCustomerOrders() {
+    if (!customerOrdersList) return;
+
+    customerOrdersList.innerHTML = '';
+
+    // Filtrar pedidos do usuário atual
+    const userOrders = orders.filter(order => order.customer.email === currentUser.email);
+
+    if (userOrders.length === 0) {
+        customerOrdersList.innerHTML = '<p>Você ainda não fez nenhum pedido.</p>';
+        return;
+    }
+
+    // Ordenar pedidos do mais recente para o mais antigo
+    const sortedOrders = [...userOrders].sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt));
+
+    sortedOrders.forEach(order => {
+        const orderCard = document.createElement('div');
+        orderCard.className = 'order-card';
+
+        // Timeline de status
+        const statusTimeline = renderStatusTimeline(order);
+
+        // Verificar se há solicitação de reembolso para este pedido
+        const orderRefunds = refunds.filter(refund => refund.orderId === order.id);
+        const hasPendingRefund = orderRefunds.some(refund => refund.status === refundStatuses.PENDING);
+        const hasApprovedRefund = orderRefunds.some(refund => refund.status === refundStatuses.APPROVED);
+        const hasCompletedRefund = orderRefunds.some(refund => refund.status === refundStatuses.COMPLETED);
+        const hasRefund = orderRefunds.length > 0;
+
+        // Determinar se o pedido pode ter reembolso solicitado
+        const canRequestRefund = (
+            order.status === 'delivered' &&
+            !hasPendingRefund &&
+            !hasApprovedRefund &&
+            !hasCompletedRefund &&
+            // Limite de tempo para solicitação (7 dias após entrega)
+            isWithinRefundPeriod(order)
+        );
+
+        // Seção de reembolso
+        const refundSection = hasRefund ?
+            renderRefundSection(order.id, orderRefunds) :
+            (canRequestRefund ? renderRefundRequestSection(order.id) : '');
+
+        orderCard.innerHTML = `
+            <div class="order-header">
+                <h3>Pedido #${order.id}</h3>
+                <span class="status-badge status-${order.status}">
+                    ${getStatusLabel(order.status)}
+                </span>
+            </div>
+            <div class="order-items">
+                ${order.items.map(item => `
+                    <div class="order-item">
+                        <span>${item.name} ${item.selectedSize ? `(Tamanho: ${item.selectedSize})` : ''} x${item.quantity}</span>
+                        <span>R$ ${(item.price * item.quantity).toFixed(2)}</span>
+                    </div>
+                `).join('')}
+            </div>
+            <div class="order-total">
+                Total: R$ ${order.total.toFixed(2)}
+            </div>
+            <div class="preparation-time">
+                Pedido realizado em: ${new Date(order.createdAt).toLocaleDateString('pt-BR')}
+            </div>
+            ${statusTimeline}
+            ${refundSection}
+        `;
+        customerOrdersList.appendChild(orderCard);
+    });
+}
+
+function isWithinRefundPeriod(order) {
+    // Encontrar a data de entrega
+    const deliveredEntry = order.statusHistory ? order.statusHistory.find(entry => entry.status === 'delivered') : null;
+    if (!deliveredEntry) return false;
+
+    const deliveredDate = new Date(deliveredEntry.date);
+    const currentDate = new Date();
+    const diffTime = currentDate - deliveredDate;
+    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
+
+    return diffDays <= 7;
+}
+
+function renderRefundRequestSection(orderId) {
+    const order = orders.find(o => o.id === orderId);
+    if (!order) return '';
+
+    // Verificar prazo de reembolso
+    const deliveredEntry = order.statusHistory ? order.statusHistory.find(entry => entry.status === 'delivered') : null;
+    if (!deliveredEntry) return '';
+
+    const deliveredDate = new Date(deliveredEntry.date);
+    const currentDate = new Date();
+    const diffTime = currentDate - deliveredDate;
+    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
+    const daysLeft = 7 - diffDays;
+
+    // Determinar classe CSS baseada no prazo restante
+    let deadlineClass = 'refund-deadline';
+    if (daysLeft <= 2) {
+        deadlineClass += ' warning';
+    }
+
+    return `
+        <div class="refund-section">
+            <div class="refund-header">
+                <h4>Solicitar Reembolso</h4>
+            </div>
+            <div class="${deadlineClass}">
+                <strong>Prazo para solicitar reembolso:</strong> ${daysLeft} ${daysLeft === 1 ? 'dia restante' : 'dias restantes'} (até 7 dias após a entrega)
+            </div>
+            <p>Se você não está satisfeito com sua compra, pode solicitar um reembolso.</p>
+            <div class="refund-reasons">
+                <h5>Motivo do reembolso:</h5>
+                ${refundReasons.map((reason, index) => `
+                    <div class="refund-reason">
+                        <label>
+                            <input type="radio" name="refundReason-${orderId}" value="${reason}" ${index === 0 ? 'checked' : ''}>
+                            ${reason}
+                        </label>
+                    </div>
+                `).join('')}
+            </div>
+            <div class="refund-notes">
+                <label for="refundNotes-${orderId}">Observações adicionais:</label>
+                <textarea id="refundNotes-${orderId}" placeholder="Descreva com mais detalhes o motivo do reembolso..."></textarea>
+            </div>
+            <div class="refund-actions">
+                <button class="request-refund-btn" onclick="requestRefund(${orderId})">
+                    Solicitar Reembolso
+                </button>
+            </div>
+        </div>
+    `;
+}
+
+function requestRefund(orderId) {
+    if (!currentUser) {
+        alert('Você precisa estar logado para solicitar um reembolso.');
+        return;
+    }
+
+    const order = orders.find(o => o.id === orderId);
+    if (!order) {
+        alert('Pedido não encontrado.');
+        return;
+    }
+
+    // Verificar se está dentro do prazo de reembolso
+    if (!isWithinRefundPeriod(order)) {
+        alert('O prazo para solicitar reembolso (7 dias após a entrega) expirou.');
+        return;
+    }
+
+    // Verificar se já existe uma solicitação de reembolso pendente
+    const existingRefund = refunds.find(r =>
+        r.orderId === orderId &&
+        (r.status === refundStatuses.PENDING || r.status === refundStatuses.APPROVED)
+    );
+
+    if (existingRefund) {
+        alert('Já existe uma solicitação de reembolso para este pedido.');
+        return;
+    }
+
+    // Obter motivo selecionado
+    const reasonRadio = document.querySelector(`input[name="refundReason-${orderId}"]:checked`);
+    if (!reasonRadio) {
+        alert('Por favor, selecione um motivo para o reembolso.');
+        return;
+    }
+
+    const reason = reasonRadio.value;
+    const notes = document.getElementById(`refundNotes-${orderId}`).value;
+
+    // Criar nova solicitação de reembolso
+    const newRefund = {
+        id: refunds.length > 0 ? Math.max(...refunds.map(r => r.id)) + 1 : 1,
+        orderId: orderId,
+        customerEmail: currentUser.email,
+        reason: reason,
+        notes: notes,
+        amount: order.total,
+        status: refundStatuses.PENDING,
+        requestedAt: new Date().toISOString(),
+        history: [{
+            status: refundStatuses.PENDING,
+            date: new Date().toISOString(),
+            notes: 'Solicitação de reembolso criada pelo cliente'
+        }]
+    };
+
+    refunds.push(newRefund);
+    saveRefundsToStorage();
+
+    // Atualizar interface
+    renderCustomerOrders();
+
+    showNotification('Solicitação de reembolso enviada com sucesso!');
+}
+
+function deleteRefund(refundId) {
+    const refund = refunds.find(r => r.id === refundId);
+    if (!refund) {
+        alert('Reembolso não encontrado.');
+        return;
+    }
+
+    // VERIFICAÇÃO: Confirmar se o reembolso pode ser excluído
+    if (!canDeleteRefund(refund)) {
+        alert('Este reembolso não pode ser excluído porque o ciclo de entrega não está completo ou o reembolso não foi concluído.');
+        return;
+    }
+
+    if (!confirm('Tem certeza que deseja excluir este reembolso? Esta ação não pode ser desfeita.')) {
+        return;
+    }
+
+    // Remover reembolso do array
+    refunds = refunds.filter(refund => refund.id !== refundId);
+
+    // Atualizar localStorage
+    saveRefundsToStorage();
+
+    // Atualizar interface
+    renderCustomerOrders();
+
+    showNotification('Reembolso excluído com sucesso!');
+}
+
+function renderRefundSection(orderId, orderRefunds) {
+    // Obter o reembolso mais recente
+    const latestRefund = orderRefunds.reduce((latest, refund) => {
+        return new Date(refund.requestedAt) > new Date(latest.requestedAt) ? refund : latest;
+    }, orderRefunds[0]);
+
+    const statusClass = `refund-${latestRefund.status}`;
+    const statusLabel = getRefundStatusLabel(latestRefund.status);
+
+    // Botão para cliente excluir reembolso quando o ciclo estiver completo
+    let clientDeleteButton = '';
+    if (canDeleteRefund(latestRefund)) {
+        clientDeleteButton = `
+            <div class="refund-actions-section">
+                <button class="delete-refund-btn" onclick="deleteRefund(${latestRefund.id})">
+                    Excluir Reembolso
+                </button>
+            </div>
+        `;
+    }
+
+    // Mensagem especial para reembolso concluído
+    const completedMessage = latestRefund.status === refundStatuses.COMPLETED ?
+        `<div class="delivery-notice" style="margin-top: 15px; background-color: #d4edda; border-color: #c3e6cb;">
+            <strong>✓ Reembolso Concluído:</strong> O valor do reembolso foi processado e creditado em sua conta.
+            ${latestRefund.adminNotes ? `<br><strong>Observações:</strong> ${latestRefund.adminNotes}` : ''}
+        </div>` : '';
+
+    return `
+        <div class="refund-section">
+            <div class="refund-header">
+                <h4>Solicitação de Reembolso</h4>
+                <div class="refund-status ${statusClass}">
+                    ${statusLabel}
+                </div>
+            </div>
+            <div class="refund-details">
+                <h4>Detalhes do Reembolso</h4>
+                <p><strong>Motivo:</strong> ${latestRefund.reason}</p>
+                <p><strong>Observações:</strong> ${latestRefund.notes || 'Nenhuma observação adicional'}</p>
+                <p><strong>Valor solicitado:</strong> R$ ${latestRefund.amount.toFixed(2)}</p>
+                <p><strong>Solicitado em:</strong> ${new Date(latestRefund.requestedAt).toLocaleDateString('pt-BR')}</p>
+                ${latestRefund.processedAt ? `<p><strong>Processado em:</strong> ${new Date(latestRefund.processedAt).toLocaleDateString('pt-BR')}</p>` : ''}
+                ${latestRefund.completedAt ? `<p><strong>Concluído em:</strong> ${new Date(latestRefund.completedAt).toLocaleDateString('pt-BR')}</p>` : ''}
+                ${latestRefund.adminNotes ? `<p><strong>Observações da loja:</strong> ${latestRefund.adminNotes}</p>` : ''}
+            </div>
+            ${clientDeleteButton}
+            ${completedMessage}
+        </div>
+    `;
+}
+
+// ========== EXPORTAÇÃO DE FUNÇÕES ==========
+
+// Exportar funções para o escopo global
+window.addToCart = addToCart;
+window.addToCartWithSize = addToCartWithSize;
+window.updateQuantity = updateQuantity;
+window.removeFromCart = removeFromCart;
+window.showProductPage = showProductPage;
+window.showProductsPage = showProductsPage;
+window.showHomePage = showHomePage;
+window.showAboutPage = showAboutPage;
+window.showCustomerOrders = showCustomerOrders;
+window.filterProducts = filterProducts;
+window.changeMainImage = changeMainImage;
+window.selectSize = selectSize;
+window.openAuthModal = openAuthModal;
+window.showAuthForm = showAuthForm;
+window.logout = logout;
+window.requestRefund = requestRefund;
+window.deleteRefund = deleteRefund;
+window.canDeleteRefund = canDeleteRefund;
+window.showPaymentSuccessPage = showPaymentSuccessPage;
+window.showPaymentErrorPage = showPaymentErrorPage;
+window.showContactPage = showContactPage;
+window.openCart = openCart;
+window.stopAllCountdowns = stopAllCountdowns;
+window.scrollToProducts = scrollToProducts;
+window.processPayment = processPayment;
+window.togglePaymentFields = togglePaymentFields;
+window.openCheckoutModal = openCheckoutModal;
+window.closeCheckoutModal = closeCheckoutModal;
+window.irParaCheckout = irParaCheckout;
+window.loadProductsFromAPI = loadProductsFromAPI;
+window.cadastrarUsuario = cadastrarUsuario;
+window.fazerLogin = fazerLogin;
+window.testarConexaoAPI = testarConexaoAPI;
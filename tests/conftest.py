@@ -0,0 +1,119 @@
+# tests/conftest.py
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Os módulos da loja ficam na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class GatewayStub:
+    """Servidor HTTP local no lugar da API do Mercado Pago.
+
+    ``respostas`` é a fila de (status, corpo, cabeçalhos, atraso) devolvida em
+    ordem; vazia, responde 200 com ``padrao``. Registra as requisições recebidas
+    e o pico de requisições simultâneas.
+    """
+
+    def __init__(self):
+        self.respostas = []
+        self.padrao = (200, {"ok": True}, {}, 0)
+        self.requisicoes = []
+        self.simultaneas = 0
+        self.pico = 0
+        self._lock = threading.Lock()
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.servidor.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.servidor.server_port}"
+
+    def _proxima(self, requisicao):
+        with self._lock:
+            self.requisicoes.append(requisicao)
+            self.simultaneas += 1
+            self.pico = max(self.pico, self.simultaneas)
+            return self.respostas.pop(0) if self.respostas else self.padrao
+
+    def _terminou(self):
+        with self._lock:
+            self.simultaneas -= 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _responder(self):
+                tamanho = int(self.headers.get('Content-Length', 0))
+                corpo_recebido = self.rfile.read(tamanho) if tamanho else b''
+                status, corpo, cabecalhos, atraso = stub._proxima({
+                    "metodo": self.command,
+                    "caminho": self.path,
+                    "cabecalhos": dict(self.headers),
+                    "corpo": json.loads(corpo_recebido) if corpo_recebido else None,
+                })
+                try:
+                    if atraso:
+                        time.sleep(atraso)
+                    dados = json.dumps(corpo).encode()
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(dados)))
+                    for nome, valor in cabecalhos.items():
+                        self.send_header(nome, valor)
+                    self.end_headers()
+                    self.wfile.write(dados)
+                except (BrokenPipeError, ConnectionResetError):
+                    # O cliente desistiu (timeout)
+                    pass
+                finally:
+                    stub._terminou()
+
+            do_GET = do_POST = do_PUT = _responder
+
+        return Handler
+
+    def iniciar(self):
+        threading.Thread(target=self.servidor.serve_forever, args=(0.05,), daemon=True).start()
+
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+@pytest.fixture
+def banco(tmp_path, monkeypatch):
+    """Banco SQLite descartável, com todas as migrações aplicadas"""
+    import database
+    import estoque
+    import migracoes
+
+    caminho = str(tmp_path / 'teste.db')
+    monkeypatch.setattr(database, 'DATABASE', caminho)
+    monkeypatch.setattr(database, '_wal_configurado', False)
+    # O lock de escrita do estoque fica num arquivo ao lado do banco
+    monkeypatch.setattr(estoque, 'DATABASE', caminho)
+    monkeypatch.setattr(estoque, '_arquivo_lock', None)
+    # Conexões da thread abertas para outro arquivo não podem ser reaproveitadas
+    database._local.pool = []
+    migracoes.aplicar_migracoes()
+    yield database
+    for conn in database._local.pool:
+        conn.fechar_definitivamente()
+    database._local.pool = []
+
+
+@pytest.fixture
+def gateway_stub():
+    stub = GatewayStub()
+    stub.iniciar()
+    yield stub
+    stub.parar()
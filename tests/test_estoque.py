@@ -0,0 +1,150 @@
+# tests/test_estoque.py
+import threading
+
+import pytest
+
+import estoque
+from estoque import EstoqueInsuficiente
+
+
+def criar_produto(banco, produto_id=1, estoque_inicial=10):
+    conn = banco.get_db_connection()
+    conn.execute("INSERT INTO products (id, code, name, price, stock) VALUES (?, ?, 'Produto', 10.0, ?)",
+                 (produto_id, f'P{produto_id}', estoque_inicial))
+    conn.commit()
+    conn.close()
+
+def estoque_de(banco, produto_id=1):
+    conn = banco.get_db_connection()
+    try:
+        return conn.execute('SELECT stock FROM products WHERE id = ?', (produto_id,)).fetchone()['stock']
+    finally:
+        conn.close()
+
+def reservas(banco, external_reference):
+    conn = banco.get_db_connection()
+    try:
+        return [(r['product_id'], r['quantity'], r['status']) for r in conn.execute(
+            'SELECT product_id, quantity, status FROM stock_reservations WHERE external_reference = ? ORDER BY product_id',
+            (external_reference,)
+        )]
+    finally:
+        conn.close()
+
+def expirar(banco, external_reference):
+    conn = banco.get_db_connection()
+    conn.execute('UPDATE stock_reservations SET expires_at = 0 WHERE external_reference = ?', (external_reference,))
+    conn.commit()
+    conn.close()
+
+def criar_pedido(banco, external_reference, status):
+    conn = banco.get_db_connection()
+    conn.execute('INSERT INTO orders (user_id, items, total, status, external_reference) VALUES (1, ?, 10.0, ?, ?)',
+                 ('[]', status, external_reference))
+    conn.commit()
+    conn.close()
+
+
+# ========== RESERVA ==========
+
+def test_reserva_debita_estoque_e_e_idempotente(banco):
+    criar_produto(banco, estoque_inicial=10)
+
+    assert estoque.reservar('pedido_1', [(1, 3)]) is not None
+    assert estoque.reservar('pedido_1', [(1, 3)]) is None
+
+    assert estoque_de(banco) == 7
+    assert reservas(banco, 'pedido_1') == [(1, 3, estoque.ATIVA)]
+
+
+def test_reserva_e_tudo_ou_nada(banco):
+    criar_produto(banco, 1, estoque_inicial=5)
+    criar_produto(banco, 2, estoque_inicial=1)
+
+    with pytest.raises(EstoqueInsuficiente) as erro:
+        estoque.reservar('pedido_1', [(1, 2), (2, 2)])
+
+    assert erro.value.produto_id == 2 and erro.value.disponivel == 1
+    assert (estoque_de(banco, 1), estoque_de(banco, 2)) == (5, 1)
+    assert reservas(banco, 'pedido_1') == []
+
+
+def test_reservas_concorrentes_nao_vendem_alem_do_estoque(banco):
+    criar_produto(banco, estoque_inicial=20)
+    resultados = []
+    lock = threading.Lock()
+    largada = threading.Barrier(50)
+
+    def tentar(n):
+        largada.wait()
+        try:
+            estoque.reservar(f'pedido_{n}', [(1, 1)])
+            ok = True
+        except EstoqueInsuficiente:
+            ok = False
+        with lock:
+            resultados.append(ok)
+
+    threads = [threading.Thread(target=tentar, args=(n,)) for n in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    conn = banco.get_db_connection()
+    reservado = conn.execute('SELECT SUM(quantity) FROM stock_reservations WHERE status = ?', (estoque.ATIVA,)).fetchone()[0]
+    conn.close()
+    assert resultados.count(True) == 20
+    assert estoque_de(banco) == 0
+    assert reservado == 20
+
+
+# ========== EXPIRAÇÃO ==========
+
+def test_liberar_expiradas_devolve_estoque_apos_ttl(banco):
+    criar_produto(banco, estoque_inicial=10)
+    estoque.reservar('pedido_vencido', [(1, 4)], ttl=0)
+    estoque.reservar('pedido_valido', [(1, 2)])
+    criar_pedido(banco, 'pedido_vencido', 'pendente')
+
+    assert estoque.liberar_expiradas() == 1
+
+    assert estoque_de(banco) == 8
+    assert reservas(banco, 'pedido_vencido') == [(1, 4, estoque.LIBERADA)]
+    assert reservas(banco, 'pedido_valido') == [(1, 2, estoque.ATIVA)]
+
+
+def test_liberar_expiradas_confirma_pedido_ja_pago(banco):
+    criar_produto(banco, estoque_inicial=10)
+    estoque.reservar('pedido_1', [(1, 4)], ttl=0)
+    criar_pedido(banco, 'pedido_1', 'pago')
+
+    assert estoque.liberar_expiradas() == 1
+
+    assert estoque_de(banco) == 6
+    assert reservas(banco, 'pedido_1') == [(1, 4, estoque.CONFIRMADA)]
+
+
+def test_confirmar_debita_de_novo_reserva_ja_devolvida(banco):
+    criar_produto(banco, estoque_inicial=10)
+    estoque.reservar('pedido_1', [(1, 4)])
+    expirar(banco, 'pedido_1')
+    estoque.liberar_expiradas()
+    assert estoque_de(banco) == 10
+
+    # O pagamento chega depois da expiração
+    conn = banco.get_db_connection()
+    conn.execute('BEGIN IMMEDIATE')
+    estoque.confirmar(conn, 'pedido_1')
+    conn.commit()
+    conn.close()
+
+    assert estoque_de(banco) == 6
+    assert reservas(banco, 'pedido_1') == [(1, 4, estoque.CONFIRMADA)]
+    # Confirmar de novo não debita outra vez
+    conn = banco.get_db_connection()
+    conn.execute('BEGIN IMMEDIATE')
+    estoque.confirmar(conn, 'pedido_1')
+    conn.commit()
+    conn.close()
+    assert estoque_de(banco) == 6
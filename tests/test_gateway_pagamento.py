@@ -0,0 +1,137 @@
+# tests/test_gateway_pagamento.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+import gateway_pagamento
+from gateway_pagamento import ClienteMercadoPago, ClienteMercadoPagoAsync, ErroGateway
+
+
+@pytest.fixture(autouse=True)
+def backoff_curto(monkeypatch):
+    # Novas tentativas sem esperar o backoff de produção
+    monkeypatch.setattr(gateway_pagamento, 'BACKOFF_BASE', 0.01)
+
+
+def criar_cliente(stub, **opcoes):
+    opcoes.setdefault('timeout', (1, 1))
+    return ClienteMercadoPago(access_token='TEST-abc', base_url=stub.url, **opcoes)
+
+
+# ========== NOVAS TENTATIVAS ==========
+
+def test_post_com_chave_repete_apos_falha_temporaria(gateway_stub):
+    gateway_stub.respostas = [(503, {}, {}, 0), (201, {"id": "pref"}, {}, 0)]
+    cliente = criar_cliente(gateway_stub)
+
+    resultado = cliente.criar_preferencia({"items": []}, chave_idempotencia='pedido_1')
+
+    assert resultado == {"status": 201, "response": {"id": "pref"}}
+    assert len(gateway_stub.requisicoes) == 2
+    # A mesma chave em todas as tentativas: o gateway não cria a preferência duas vezes
+    assert {r["cabecalhos"]["X-Idempotency-Key"] for r in gateway_stub.requisicoes} == {'pedido_1'}
+
+
+def test_post_sem_chave_nao_repete(gateway_stub):
+    gateway_stub.respostas = [(503, {}, {}, 0)]
+    cliente = criar_cliente(gateway_stub)
+
+    with pytest.raises(ErroGateway) as erro:
+        cliente.requisitar('POST', '/checkout/preferences', dados={})
+
+    assert erro.value.status == 503 and erro.value.temporario
+    assert len(gateway_stub.requisicoes) == 1
+
+
+def test_get_desiste_apos_max_tentativas(gateway_stub):
+    gateway_stub.padrao = (500, {}, {}, 0)
+    cliente = criar_cliente(gateway_stub, max_tentativas=3)
+
+    with pytest.raises(ErroGateway) as erro:
+        cliente.consultar_pagamento(123)
+
+    assert erro.value.status == 500
+    assert len(gateway_stub.requisicoes) == 3
+
+
+def test_erro_definitivo_nao_repete(gateway_stub):
+    gateway_stub.respostas = [(404, {"message": "not found"}, {}, 0)]
+    cliente = criar_cliente(gateway_stub)
+
+    assert cliente.consultar_pagamento(123) == {"status": 404, "response": {"message": "not found"}}
+    assert len(gateway_stub.requisicoes) == 1
+
+
+# ========== TIMEOUT ==========
+
+def test_timeout_de_leitura_vira_erro_temporario(gateway_stub):
+    gateway_stub.padrao = (200, {}, {}, 1.0)
+    cliente = criar_cliente(gateway_stub, timeout=(1, 0.2), max_tentativas=2)
+
+    inicio = time.monotonic()
+    with pytest.raises(ErroGateway) as erro:
+        cliente.consultar_pagamento(123)
+
+    assert erro.value.temporario and erro.value.status is None
+    assert len(gateway_stub.requisicoes) == 2
+    # Duas tentativas de 0,2 s, sem esperar a resposta lenta
+    assert time.monotonic() - inicio < 0.9
+
+
+# ========== BULKHEAD ==========
+
+def test_chamada_excedente_falha_sem_esperar_vaga(gateway_stub):
+    gateway_stub.padrao = (200, {}, {}, 0.5)
+    cliente = criar_cliente(gateway_stub, max_concorrentes=1, espera_vaga=0)
+
+    lenta = threading.Thread(target=cliente.consultar_pagamento, args=(1,))
+    lenta.start()
+    while not gateway_stub.requisicoes:
+        time.sleep(0.01)
+
+    inicio = time.monotonic()
+    with pytest.raises(ErroGateway) as erro:
+        cliente.consultar_pagamento(2)
+    decorrido = time.monotonic() - inicio
+    lenta.join()
+
+    assert erro.value.temporario
+    assert decorrido < 0.2
+    assert len(gateway_stub.requisicoes) == 1
+
+
+def test_async_chamadas_avulsas_respeitam_o_limite(gateway_stub):
+    gateway_stub.padrao = (200, {}, {}, 0.1)
+    # Vagas de sobra no cliente síncrono: o limite vem só do semáforo do cliente async
+    cliente_async = ClienteMercadoPagoAsync(criar_cliente(gateway_stub, max_concorrentes=10), max_concorrentes=2)
+
+    async def varias():
+        return await asyncio.gather(*(cliente_async.consultar_pagamento(i) for i in range(6)))
+
+    resultados = asyncio.run(varias())
+
+    assert [r["status"] for r in resultados] == [200] * 6
+    assert gateway_stub.pico == 2
+
+
+def test_async_mapear_divide_o_limite_com_chamadas_avulsas(gateway_stub):
+    gateway_stub.padrao = (200, {}, {}, 0.1)
+    cliente_async = ClienteMercadoPagoAsync(criar_cliente(gateway_stub, max_concorrentes=10), max_concorrentes=3)
+
+    async def misturadas():
+        return await asyncio.gather(
+            cliente_async.mapear('consultar_pagamento', range(4)),
+            cliente_async.buscar_pagamentos('pedido_1'),
+            cliente_async.consultar_pagamento(99),
+        )
+
+    # O mesmo cliente em dois loops seguidos (asyncio.run cria um loop novo a cada vez)
+    for _ in range(2):
+        mapeados, busca, avulsa = asyncio.run(misturadas())
+        assert [r["status"] for r in mapeados] == [200] * 4
+        assert busca["status"] == avulsa["status"] == 200
+
+    assert gateway_stub.pico == 3
+    assert len(gateway_stub.requisicoes) == 12
@@ -0,0 +1,36 @@
+# tests/test_paginas.py
+import pytest
+from flask import Flask, render_template
+
+from ativos import Ativos
+from paginas import PaginaCompilada
+
+VARIAVEIS = ('payment_id', 'status', 'external_reference', 'redirect_url')
+
+EXEMPLOS = [
+    {"payment_id": "1234567890", "status": "approved", "external_reference": "pedido_0f3a9c", "redirect_url": "/"},
+    {"payment_id": "REF_1760000000", "status": "pending", "external_reference": None, "redirect_url": "/"},
+    {"payment_id": "REF_1760000000", "status": "rejected", "external_reference": "", "redirect_url": "/"},
+    # Valores vêm da query string: precisam sair escapados no HTML e no JavaScript
+    {"payment_id": '"</script><img src=x onerror=alert(1)>', "status": "<b>&'", "external_reference": "a\u2028b",
+     "redirect_url": "/checkout.html"},
+    {"payment_id": "1", "status": "approved", "external_reference": "</script><script>alert(1)</script>",
+     "redirect_url": "javascript:alert('x') "},
+]
+
+
+@pytest.fixture(scope='module')
+def app():
+    # Raiz do app = raiz do repositório (templates/ e static/)
+    app = Flask('paginas', static_folder=None)
+    Ativos(app)
+    return app
+
+
+@pytest.mark.parametrize('template', ['pagamentoaprovado.html', 'pagamentorecusado.html', 'pagamentopendente.html'])
+@pytest.mark.parametrize('valores', EXEMPLOS, ids=range(len(EXEMPLOS)))
+def test_pagina_compilada_igual_ao_render_template(app, template, valores):
+    pagina = PaginaCompilada(app, template, VARIAVEIS, ('external_reference',))
+
+    with app.test_request_context():
+        assert pagina.renderizar(**valores) == render_template(template, **valores)
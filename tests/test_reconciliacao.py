@@ -0,0 +1,183 @@
+# tests/test_reconciliacao.py
+import threading
+import time
+
+import pytest
+
+import estoque
+from reconciliacao import ReconciliadorPagamentos
+
+
+class GatewayFalso:
+    """buscar_pagamentos sem rede: responde conforme ``pagamentos`` (referência -> status do Mercado Pago).
+
+    Referência ausente: nenhum pagamento. Valor Exception: a chamada falha.
+    Valor int: o gateway responde esse status HTTP.
+    """
+
+    def __init__(self, pagamentos=None, latencia=0.0):
+        self.pagamentos = pagamentos or {}
+        self.latencia = latencia
+        self.chamadas = []
+        self.simultaneas = 0
+        self.pico = 0
+        self._lock = threading.Lock()
+
+    def buscar_pagamentos(self, external_reference):
+        with self._lock:
+            self.chamadas.append(external_reference)
+            self.simultaneas += 1
+            self.pico = max(self.pico, self.simultaneas)
+        try:
+            if self.latencia:
+                time.sleep(self.latencia)
+            resposta = self.pagamentos.get(external_reference)
+            if isinstance(resposta, Exception):
+                raise resposta
+            if isinstance(resposta, int):
+                return {"status": resposta, "response": {}}
+            if resposta is None:
+                return {"status": 200, "response": {"results": []}}
+            return {"status": 200, "response": {"results": [
+                {"id": 1000 + len(self.chamadas), "status": resposta, "external_reference": external_reference}
+            ]}}
+        finally:
+            with self._lock:
+                self.simultaneas -= 1
+
+
+def criar_pedidos(banco, referencias, idade="-1 hour", status='pendente'):
+    conn = banco.get_db_connection()
+    try:
+        conn.executemany('''
+            INSERT INTO orders (items, total, status, external_reference, created_at)
+            VALUES ('[]', 10, ?, ?, datetime('now', ?))
+        ''', [(status, referencia, idade) for referencia in referencias])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def pedidos(banco):
+    conn = banco.get_db_connection()
+    try:
+        return {row['external_reference']: dict(row) for row in conn.execute(
+            'SELECT external_reference, status, payment_id, reconciled_at FROM orders')}
+    finally:
+        conn.close()
+
+
+def test_aplica_o_status_de_cada_pagamento(banco):
+    criar_pedidos(banco, ['aprovado', 'recusado', 'pendente', 'sem_pagamento', 'erro_rede', 'erro_http'])
+    gateway = GatewayFalso({
+        'aprovado': 'approved',
+        'recusado': 'rejected',
+        'pendente': 'in_process',
+        'erro_rede': ConnectionError('sem rede'),
+        'erro_http': 503,
+    })
+
+    resumo = ReconciliadorPagamentos(cliente=gateway).executar()
+
+    assert resumo["consultados"] == 6
+    assert resumo["atualizados"] == 2
+    assert resumo["falhas"] == 2
+    estado = pedidos(banco)
+    assert {ref: pedido['status'] for ref, pedido in estado.items()} == {
+        'aprovado': 'pago',
+        'recusado': 'recusado',
+        'pendente': 'pendente',
+        'sem_pagamento': 'pendente',
+        'erro_rede': 'pendente',
+        'erro_http': 'pendente',
+    }
+    assert estado['aprovado']['payment_id'] is not None
+
+
+def test_pagamento_recusado_devolve_a_reserva_de_estoque(banco):
+    conn = banco.get_db_connection()
+    conn.execute("INSERT INTO products (id, code, name, price, stock) VALUES (1, 'A1', 'Anel', 10, 5)")
+    conn.commit()
+    conn.close()
+    estoque.reservar('reservado', [(1, 3)])
+    criar_pedidos(banco, ['reservado'])
+
+    ReconciliadorPagamentos(cliente=GatewayFalso({'reservado': 'rejected'})).executar()
+
+    conn = banco.get_db_connection()
+    try:
+        assert conn.execute('SELECT stock FROM products WHERE id = 1').fetchone()[0] == 5
+    finally:
+        conn.close()
+
+
+def test_processa_em_lotes_ate_o_maximo_por_execucao(banco):
+    referencias = [f'pedido_{i}' for i in range(7)]
+    criar_pedidos(banco, referencias)
+    gateway = GatewayFalso()
+
+    reconciliador = ReconciliadorPagamentos(cliente=gateway, lote=3, max_lotes=2)
+    primeira = reconciliador.executar()
+    segunda = reconciliador.executar()
+
+    # Dois lotes de 3 na primeira execução; o pedido restante fica para a seguinte
+    assert primeira["consultados"] == 6
+    assert segunda["consultados"] == 1
+    assert sorted(gateway.chamadas) == referencias
+
+
+def test_consultas_do_lote_respeitam_a_concorrencia(banco):
+    criar_pedidos(banco, [f'pedido_{i}' for i in range(12)])
+    gateway = GatewayFalso(latencia=0.05)
+
+    inicio = time.monotonic()
+    resumo = ReconciliadorPagamentos(cliente=gateway, lote=12, concorrencia=4).executar()
+    decorrido = time.monotonic() - inicio
+
+    assert resumo["consultados"] == 12
+    assert gateway.pico == 4
+    # 12 consultas de 50 ms, 4 por vez: ~150 ms em vez de 600 ms em série
+    assert decorrido < 0.45
+
+
+def test_marca_reconciled_at_e_nao_reconsulta_logo_em_seguida(banco):
+    criar_pedidos(banco, ['falhou', 'sem_pagamento'])
+    gateway = GatewayFalso({'falhou': 500})
+    reconciliador = ReconciliadorPagamentos(cliente=gateway)
+
+    antes = time.time()
+    reconciliador.executar()
+
+    # Consultado, mesmo sem mudança de status ou com falha
+    for pedido in pedidos(banco).values():
+        assert pedido['reconciled_at'] >= antes
+    assert reconciliador.executar()["consultados"] == 0
+    assert len(gateway.chamadas) == 2
+
+
+def test_ignora_pedidos_recentes_antigos_e_ja_resolvidos(banco):
+    criar_pedidos(banco, ['recente'], idade='-10 seconds')
+    criar_pedidos(banco, ['fora_da_janela'], idade='-8 days')
+    criar_pedidos(banco, ['ja_pago'], status='pago')
+    criar_pedidos(banco, ['elegivel'])
+    gateway = GatewayFalso({'elegivel': 'approved'})
+
+    resumo = ReconciliadorPagamentos(cliente=gateway).executar()
+
+    assert gateway.chamadas == ['elegivel']
+    assert resumo["atualizados"] == 1
+    assert pedidos(banco)['recente']['reconciled_at'] is None
+
+
+@pytest.mark.parametrize('status_mp, esperado', [('approved', 'pago'), ('cancelled', 'cancelado')])
+def test_estatisticas_refletem_a_execucao(banco, status_mp, esperado):
+    criar_pedidos(banco, ['pedido'])
+    reconciliador = ReconciliadorPagamentos(cliente=GatewayFalso({'pedido': status_mp}))
+
+    reconciliador.executar()
+    metricas = reconciliador.estatisticas()
+
+    assert pedidos(banco)['pedido']['status'] == esperado
+    assert metricas["execucoes"] == 1
+    assert metricas["consultados"] == 1 and metricas["atualizados"] == 1
+    assert metricas["pendentes"] == 0